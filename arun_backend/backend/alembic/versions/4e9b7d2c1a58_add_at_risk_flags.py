@@ -0,0 +1,40 @@
+"""Add at-risk flags table
+
+Revision ID: 4e9b7d2c1a58
+Revises: d71a3f5c8b26
+Create Date: 2026-10-19 15:02:17.318240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e9b7d2c1a58'
+down_revision: Union[str, None] = 'd71a3f5c8b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('at_risk_flags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('flag', sa.String(length=50), nullable=False),
+    sa.Column('severity', sa.String(length=10), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('details', sa.JSON(), nullable=True),
+    sa.Column('swept_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_at_risk_flags_id'), 'at_risk_flags', ['id'], unique=False)
+    op.create_index(op.f('ix_at_risk_flags_student_id'), 'at_risk_flags', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_at_risk_flags_student_id'), table_name='at_risk_flags')
+    op.drop_index(op.f('ix_at_risk_flags_id'), table_name='at_risk_flags')
+    op.drop_table('at_risk_flags')
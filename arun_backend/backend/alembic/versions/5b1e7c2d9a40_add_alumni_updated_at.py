@@ -0,0 +1,28 @@
+"""Add alumni updated_at
+
+Revision ID: 5b1e7c2d9a40
+Revises: 443c08b3ab80
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, None] = '443c08b3ab80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('alumni', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Existing rows have not changed since they were imported
+    op.execute("UPDATE alumni SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column('alumni', 'updated_at')
@@ -0,0 +1,63 @@
+"""Add wellbeing rollups table
+
+Revision ID: a93e6f1b2c74
+Revises: 4e9b7d2c1a58
+Create Date: 2026-10-19 16:21:44.902315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93e6f1b2c74'
+down_revision: Union[str, None] = '4e9b7d2c1a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('wellbeing_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.String(length=10), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('screen_time_count', sa.Integer(), nullable=False),
+    sa.Column('screen_time_mean', sa.Float(), nullable=True),
+    sa.Column('screen_time_min', sa.Float(), nullable=True),
+    sa.Column('screen_time_max', sa.Float(), nullable=True),
+    sa.Column('screen_time_decayed', sa.Float(), nullable=True),
+    sa.Column('screen_time_decayed_weight', sa.Float(), nullable=False),
+    sa.Column('social_media_count', sa.Integer(), nullable=False),
+    sa.Column('social_media_mean', sa.Float(), nullable=True),
+    sa.Column('social_media_min', sa.Float(), nullable=True),
+    sa.Column('social_media_max', sa.Float(), nullable=True),
+    sa.Column('social_media_decayed', sa.Float(), nullable=True),
+    sa.Column('social_media_decayed_weight', sa.Float(), nullable=False),
+    sa.Column('focus_score_count', sa.Integer(), nullable=False),
+    sa.Column('focus_score_mean', sa.Float(), nullable=True),
+    sa.Column('focus_score_min', sa.Float(), nullable=True),
+    sa.Column('focus_score_max', sa.Float(), nullable=True),
+    sa.Column('focus_score_decayed', sa.Float(), nullable=True),
+    sa.Column('focus_score_decayed_weight', sa.Float(), nullable=False),
+    sa.Column('sleep_count', sa.Integer(), nullable=False),
+    sa.Column('sleep_mean', sa.Float(), nullable=True),
+    sa.Column('sleep_min', sa.Float(), nullable=True),
+    sa.Column('sleep_max', sa.Float(), nullable=True),
+    sa.Column('sleep_decayed', sa.Float(), nullable=True),
+    sa.Column('sleep_decayed_weight', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('student_id', 'period', 'period_start', name='uq_wellbeing_rollup_period')
+    )
+    op.create_index(op.f('ix_wellbeing_rollups_id'), 'wellbeing_rollups', ['id'], unique=False)
+    op.create_index(op.f('ix_wellbeing_rollups_student_id'), 'wellbeing_rollups', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_wellbeing_rollups_student_id'), table_name='wellbeing_rollups')
+    op.drop_index(op.f('ix_wellbeing_rollups_id'), table_name='wellbeing_rollups')
+    op.drop_table('wellbeing_rollups')
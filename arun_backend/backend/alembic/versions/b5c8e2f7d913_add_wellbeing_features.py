@@ -0,0 +1,36 @@
+"""Add wellbeing features table
+
+Revision ID: b5c8e2f7d913
+Revises: a93e6f1b2c74
+Create Date: 2026-10-19 17:48:03.226911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c8e2f7d913'
+down_revision: Union[str, None] = 'a93e6f1b2c74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('wellbeing_features',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(length=20), nullable=False),
+    sa.Column('decayed_sum', sa.Float(), nullable=False),
+    sa.Column('decayed_weight', sa.Float(), nullable=False),
+    sa.Column('anchor_date', sa.Date(), nullable=False),
+    sa.Column('observations', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'metric')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('wellbeing_features')
@@ -0,0 +1,26 @@
+"""Add cohort benchmark stale flag
+
+Revision ID: b7e1c4d8f203
+Revises: f4b8d2e6a153
+Create Date: 2026-10-20 11:02:37.640912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c4d8f203'
+down_revision: Union[str, None] = 'f4b8d2e6a153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cohort_benchmarks', sa.Column('stale', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('cohort_benchmarks', 'stale')
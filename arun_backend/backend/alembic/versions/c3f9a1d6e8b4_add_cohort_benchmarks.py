@@ -0,0 +1,52 @@
+"""Add cohort benchmark tables
+
+Revision ID: c3f9a1d6e8b4
+Revises: b5c8e2f7d913
+Create Date: 2026-10-19 19:02:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a1d6e8b4'
+down_revision: Union[str, None] = 'b5c8e2f7d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cohort_members',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('major', sa.String(), nullable=False),
+    sa.Column('semester', sa.Integer(), nullable=False),
+    sa.Column('screen_time', sa.Float(), nullable=True),
+    sa.Column('sleep', sa.Float(), nullable=True),
+    sa.Column('focus', sa.Float(), nullable=True),
+    sa.Column('study_hours', sa.Float(), nullable=True),
+    sa.Column('gpa', sa.Float(), nullable=True),
+    sa.Column('attendance', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+    op.create_index(op.f('ix_cohort_members_major'), 'cohort_members', ['major'], unique=False)
+    op.create_table('cohort_benchmarks',
+    sa.Column('major', sa.String(), nullable=False),
+    sa.Column('semester', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(length=20), nullable=False),
+    sa.Column('sample_size', sa.Integer(), nullable=False),
+    sa.Column('sorted_values', sa.JSON(), nullable=False),
+    sa.Column('deciles', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('major', 'semester', 'metric')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cohort_benchmarks')
+    op.drop_index(op.f('ix_cohort_members_major'), table_name='cohort_members')
+    op.drop_table('cohort_members')
@@ -0,0 +1,43 @@
+"""Add keyset pagination indexes
+
+Revision ID: c8a2f5e9d314
+Revises: b7e1c4d8f203
+Create Date: 2026-10-20 14:26:05.117384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a2f5e9d314'
+down_revision: Union[str, None] = 'b7e1c4d8f203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables listed by (created_at, id); legacy rows without a creation time
+# keep sorting first
+CREATED_AT_TABLES = ('students', 'skill_assessments', 'recommendations')
+
+
+def upgrade() -> None:
+    for table in CREATED_AT_TABLES:
+        op.execute(f"UPDATE {table} SET created_at = '1970-01-01 00:00:00' WHERE created_at IS NULL")
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_students_created_at_id', 'students', ['created_at', 'id'], unique=False)
+    op.create_index('ix_skill_assessments_student_created_at_id', 'skill_assessments', ['student_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_recommendations_student_created_at_id', 'recommendations', ['student_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_daily_logs_student_date_id', 'daily_logs', ['student_id', 'date', 'id'], unique=False)
+    op.create_index('ix_student_activities_student_date_id', 'student_activities', ['student_id', 'date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_activities_student_date_id', table_name='student_activities')
+    op.drop_index('ix_daily_logs_student_date_id', table_name='daily_logs')
+    op.drop_index('ix_recommendations_student_created_at_id', table_name='recommendations')
+    op.drop_index('ix_skill_assessments_student_created_at_id', table_name='skill_assessments')
+    op.drop_index('ix_students_created_at_id', table_name='students')
+    for table in CREATED_AT_TABLES:
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,44 @@
+"""Add streaming behavioral statistics tables
+
+Revision ID: d71a3f5c8b26
+Revises: 8c4f2a6d1e93
+Create Date: 2026-10-19 13:40:52.104877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71a3f5c8b26'
+down_revision: Union[str, None] = '8c4f2a6d1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('behavioral_stat_members',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('gpa', sa.Float(), nullable=False),
+    sa.Column('screen_time', sa.Float(), nullable=False),
+    sa.Column('focus_score', sa.Float(), nullable=False),
+    sa.Column('sleep', sa.Float(), nullable=False),
+    sa.Column('trajectory_score', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+    op.create_table('behavioral_stat_cells',
+    sa.Column('metric', sa.String(), nullable=False),
+    sa.Column('gpa_cell', sa.Integer(), nullable=False),
+    sa.Column('value_cell', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'gpa_cell', 'value_cell')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('behavioral_stat_cells')
+    op.drop_table('behavioral_stat_members')
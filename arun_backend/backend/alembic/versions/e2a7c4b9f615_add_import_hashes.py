@@ -0,0 +1,29 @@
+"""Add import content hashes
+
+Revision ID: e2a7c4b9f615
+Revises: c3f9a1d6e8b4
+Create Date: 2026-10-19 21:14:07.652390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4b9f615'
+down_revision: Union[str, None] = 'c3f9a1d6e8b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL until the next import: existing rows are then updated once
+    op.add_column('students', sa.Column('import_hash', sa.String(length=64), nullable=True))
+    op.add_column('alumni', sa.Column('import_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('alumni', 'import_hash')
+    op.drop_column('students', 'import_hash')
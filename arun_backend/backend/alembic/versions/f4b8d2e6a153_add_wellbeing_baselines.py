@@ -0,0 +1,41 @@
+"""Add wellbeing baselines table
+
+Revision ID: f4b8d2e6a153
+Revises: e2a7c4b9f615
+Create Date: 2026-10-19 22:36:41.508217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2e6a153'
+down_revision: Union[str, None] = 'e2a7c4b9f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('wellbeing_baselines',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('reported_on', sa.Date(), nullable=False),
+    sa.Column('screen_time_hours', sa.Numeric(precision=4, scale=2), nullable=False),
+    sa.Column('educational_app_hours', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('social_media_hours', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('entertainment_hours', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('productivity_hours', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('communication_hours', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('focus_score', sa.Numeric(precision=3, scale=2), nullable=True),
+    sa.Column('sleep_duration_hours', sa.Numeric(precision=3, scale=1), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('wellbeing_baselines')
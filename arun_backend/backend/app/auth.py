@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from passlib.exc import UnknownHashError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
@@ -45,9 +46,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         hashed_password: Hashed password from database
         
     Returns:
-        True if password matches, False otherwise
+        True if password matches, False otherwise (also for stored values
+        that are not a password hash, e.g. users imported without one)
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except UnknownHashError:
+        return False
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
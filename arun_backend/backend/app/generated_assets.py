@@ -0,0 +1,156 @@
+"""
+Generated admin artifacts served like static files.
+
+Downloads such as the alumni CSV template and its field documentation are
+built by code, but their bytes only change with the application. Each one
+is registered with @generated_asset and built on its first request, then
+kept for the life of the process (one deployed APP_VERSION):
+
+- the body is encoded once, and gzip compressed once when it is worth it
+  (GZIP_MIN_BYTES)
+- ETag is the app version plus a hash of the bytes; Last-Modified is when
+  it was built
+- If-None-Match (or, without it, If-Modified-Since) matching the cached
+  asset is answered 304 Not Modified with no body
+- Cache-Control makes browsers revalidate on every use, which costs one
+  304 while the asset is unchanged
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response, status
+
+# Application version: generated assets are rebuilt when it changes
+APP_VERSION = os.getenv("APP_VERSION", "1.0.0")
+
+# Smaller bodies are sent uncompressed (gzip overhead outweighs the gain)
+GZIP_MIN_BYTES = 256
+
+CACHE_CONTROL = "private, no-cache"
+
+
+class GeneratedAsset:
+    """Encoded body of a generated artifact and its validators."""
+    
+    def __init__(self, content: bytes, media_type: str):
+        self.content = content
+        self.media_type = media_type
+        self.gzip_content = gzip.compress(content, mtime=0) if len(content) >= GZIP_MIN_BYTES else None
+        
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        self.etag = f'"{APP_VERSION}-{digest}"'
+        # Compressed bytes differ, so the gzip representation has its own tag
+        self.gzip_etag = f'"{APP_VERSION}-{digest}-gzip"'
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+    
+    def not_modified(self, request: Request) -> bool:
+        """Whether the client's cached copy is this asset."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return bool(tags & {"*", self.etag, self.gzip_etag})
+        
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified <= since
+        return False
+
+
+_builders: Dict[str, tuple] = {}
+_assets: Dict[str, GeneratedAsset] = {}
+_lock = threading.Lock()
+
+
+def generated_asset(name: str, media_type: str):
+    """
+    Register the builder of a generated asset (decorator).
+    
+    The builder returns bytes, text (UTF-8) or, for JSON assets, the data.
+    
+    Raises:
+        ValueError: An asset of this name is already registered
+    """
+    def register(builder: Callable[[], Any]) -> Callable[[], Any]:
+        if name in _builders:
+            raise ValueError(f"Generated asset '{name}' is already registered")
+        _builders[name] = (builder, media_type)
+        return builder
+    return register
+
+
+def get_asset(name: str) -> GeneratedAsset:
+    """
+    Cached asset, built on first use.
+    
+    Raises:
+        KeyError: No asset of this name is registered
+    """
+    asset = _assets.get(name)
+    if asset is not None:
+        return asset
+    
+    with _lock:
+        if name not in _assets:
+            builder, media_type = _builders[name]
+            content = builder()
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            elif not isinstance(content, bytes):
+                # Same encoding as FastAPI's JSONResponse
+                content = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            _assets[name] = GeneratedAsset(content, media_type)
+        return _assets[name]
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = coding.partition(";")
+        if token.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def asset_response(request: Request, name: str, filename: Optional[str] = None) -> Response:
+    """
+    Response serving a generated asset: 304 when the client's copy is
+    current, else the body (gzip when accepted) with its validators.
+    
+    Args:
+        request: Incoming request (conditional and Accept-Encoding headers)
+        name: Registered asset name
+        filename: Sent as an attachment with this name
+    """
+    asset = get_asset(name)
+    compressed = asset.gzip_content is not None and _accepts_gzip(request)
+    
+    headers = {
+        "ETag": asset.gzip_etag if compressed else asset.etag,
+        "Last-Modified": format_datetime(asset.last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if asset.not_modified(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if compressed:
+        headers["Content-Encoding"] = "gzip"
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return Response(
+        content=asset.gzip_content if compressed else asset.content,
+        media_type=asset.media_type,
+        headers=headers
+    )
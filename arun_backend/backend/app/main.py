@@ -2,13 +2,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.routes import students, analytics, metrics, gamification, community, activities, auth, prediction, admin, student_profile, skills, behavioral
+from app.services.alumni_snapshot import load_alumni_snapshot
+from app.services.analytics_executor import get_analytics_executor
+from app.services.diagnostics_service import get_diagnostics_service
+from app.db import engine
+from app.generated_assets import APP_VERSION
 import os
 
 # Create FastAPI app with enhanced documentation
 app = FastAPI(
     title="Trajectory-X API",
     description="Advanced AI-powered University Student Trajectory Planning & Analytics",
-    version="1.0.0"
+    version=APP_VERSION
 )
 
 # Add CORS middleware
@@ -22,6 +27,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor of list endpoints
 )
 
 # Include routes
@@ -47,6 +53,22 @@ if not os.path.exists(STATIC_DIR):
 
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
+# Map the alumni vector snapshot (ALUMNI_SNAPSHOT_PATH) so similarity search
+# works before Qdrant is reachable; see export_alumni_snapshot.py
+@app.on_event("startup")
+def map_alumni_snapshot():
+    load_alumni_snapshot()
+
+# Sample slow statements for the admin diagnostics (SLOW_QUERY_THRESHOLD_MS)
+@app.on_event("startup")
+def install_slow_query_sampler():
+    get_diagnostics_service().sampler.install(engine)
+
+# Stop the analytics worker processes
+@app.on_event("shutdown")
+def stop_analytics_executor():
+    get_analytics_executor().shutdown()
+
 # Optional root route to show backend status
 @app.get("/")
 def root():
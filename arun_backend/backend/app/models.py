@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Date, Time, ARRAY, Text, Enum, CheckConstraint, UniqueConstraint, Numeric
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Date, Time, ARRAY, Text, Enum, CheckConstraint, UniqueConstraint, Index, Numeric, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -53,7 +53,8 @@ class Student(Base):
     study_hours_per_week = Column(Numeric(4, 1))
     project_count = Column(Integer, default=0)
     vector_id = Column(String)  # Reference to Qdrant vector
-    created_at = Column(DateTime, default=datetime.utcnow)
+    import_hash = Column(String(64))  # Content hash of the last imported CSV row
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Arun's additional fields (keeping for extended functionality)
@@ -83,6 +84,11 @@ class Student(Base):
     role_relevance = Column(Float) # 0-100%
     placement_attempts = Column(Integer)
     months_to_get_placed = Column(Integer)
+    
+    __table_args__ = (
+        # Keyset pages of the student list (see app.pagination)
+        Index('ix_students_created_at_id', 'created_at', 'id'),
+    )
 
 class Alumni(Base):
     """
@@ -110,7 +116,9 @@ class Alumni(Base):
     
     # Vector reference
     vector_id = Column(String)  # Reference to Qdrant vector
+    import_hash = Column(String(64))  # Content hash of the last imported CSV row
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class StudentSubjectScore(Base):
     __tablename__ = "student_subject_scores"
@@ -236,7 +244,10 @@ class Recommendation(Base):
     timeline = Column(String)  # e.g., "2 weeks", "1 month"
     completed = Column(Boolean, default=False, index=True)
     completed_at = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (
+        Index('ix_recommendations_student_created_at_id', 'student_id', 'created_at', 'id'),
+    )
 
 class Skill(Base):
     """
@@ -268,7 +279,10 @@ class SkillAssessment(Base):
     quiz_score = Column(Float)
     voice_score = Column(Float)
     final_score = Column(Float)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (
+        Index('ix_skill_assessments_student_created_at_id', 'student_id', 'created_at', 'id'),
+    )
 
 class LLMLog(Base):
     __tablename__ = "llm_logs"
@@ -298,6 +312,9 @@ class DailyLog(Base):
     mood_score = Column(Float) # 1-10
     focus_hours = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        Index('ix_daily_logs_student_date_id', 'student_id', 'date', 'id'),
+    )
 
 class StudentActivity(Base):
     """
@@ -348,6 +365,11 @@ class StudentActivity(Base):
     # === OPTIONAL: RECURRING EVENTS ===
     is_recurring = Column(Boolean, default=False)  # Does this repeat?
     recurrence_rule = Column(String)  # "DAILY", "WEEKLY", "MONTHLY"
+    
+    __table_args__ = (
+        # Keyset pages of a student's activities (see app.pagination)
+        Index('ix_student_activities_student_date_id', 'student_id', 'date', 'id'),
+    )
 
 class VectorProfile(Base):
     __tablename__ = "vector_profiles"
@@ -357,3 +379,171 @@ class VectorProfile(Base):
     last_updated = Column(DateTime, default=datetime.utcnow)
     profile_summary = Column(Text) # Text used to generate the vector
     embedding_vector = Column(ARRAY(Float)) # The actual list of numbers (e.g. [0.1, -0.2...])
+
+class AnalyticsSnapshot(Base):
+    """
+    Materialized result of an expensive cohort-wide analysis, rebuilt when
+    it gets too old (computed_at).
+    """
+    __tablename__ = "analytics_snapshots"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, unique=True)  # e.g. "behavioral_correlations"
+    payload = Column(JSON, nullable=False)
+    sample_size = Column(Integer, default=0)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class BehavioralStatMember(Base):
+    """
+    Values a student currently contributes to the streaming behavioral statistics
+    (GPA, average screen time/focus/sleep, latest trajectory score).
+    Only students with all values present are members.
+    """
+    __tablename__ = "behavioral_stat_members"
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    gpa = Column(Float, nullable=False)
+    screen_time = Column(Float, nullable=False)
+    focus_score = Column(Float, nullable=False)
+    sleep = Column(Float, nullable=False)
+    trajectory_score = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class BehavioralStatCell(Base):
+    """
+    Quantile sketch cell: number of member students with a GPA and a metric
+    value in the given grid cells (see behavioral_stats.SKETCH_GRIDS).
+    """
+    __tablename__ = "behavioral_stat_cells"
+    metric = Column(String, primary_key=True)  # screen_time | focus_score | sleep
+    gpa_cell = Column(Integer, primary_key=True)
+    value_cell = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class AtRiskFlagRecord(Base):
+    """
+    At-risk flag raised for a student by the population-wide sweep.
+    Each sweep replaces the previous set of flags.
+    """
+    __tablename__ = "at_risk_flags"
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
+    flag = Column(String(50), nullable=False)  # e.g. "excessive_screen_time"
+    severity = Column(String(10), nullable=False)  # high | medium | low
+    description = Column(Text, nullable=False)
+    details = Column(JSON)  # metric_value/threshold or metrics/thresholds
+    swept_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class WellbeingRollup(Base):
+    """
+    Per-student daily or weekly (ISO week, Monday start) aggregate of digital
+    wellbeing data, maintained on every insert/update (see wellbeing_rollup_service).
+    For each metric: number of recorded values, mean, min, max and a
+    time-decayed mean of the student's history up to the end of the period.
+    """
+    __tablename__ = "wellbeing_rollups"
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
+    period = Column(String(10), nullable=False)  # day | week
+    period_start = Column(Date, nullable=False)
+    
+    screen_time_count = Column(Integer, nullable=False, default=0)
+    screen_time_mean = Column(Float)
+    screen_time_min = Column(Float)
+    screen_time_max = Column(Float)
+    screen_time_decayed = Column(Float)
+    screen_time_decayed_weight = Column(Float, nullable=False, default=0)
+    
+    social_media_count = Column(Integer, nullable=False, default=0)
+    social_media_mean = Column(Float)
+    social_media_min = Column(Float)
+    social_media_max = Column(Float)
+    social_media_decayed = Column(Float)
+    social_media_decayed_weight = Column(Float, nullable=False, default=0)
+    
+    focus_score_count = Column(Integer, nullable=False, default=0)
+    focus_score_mean = Column(Float)
+    focus_score_min = Column(Float)
+    focus_score_max = Column(Float)
+    focus_score_decayed = Column(Float)
+    focus_score_decayed_weight = Column(Float, nullable=False, default=0)
+    
+    sleep_count = Column(Integer, nullable=False, default=0)
+    sleep_mean = Column(Float)
+    sleep_min = Column(Float)
+    sleep_max = Column(Float)
+    sleep_decayed = Column(Float)
+    sleep_decayed_weight = Column(Float, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('student_id', 'period', 'period_start', name='uq_wellbeing_rollup_period'),
+    )
+
+class WellbeingFeature(Base):
+    """
+    Exponentially decayed mean of one behavioral metric over a student's whole
+    history (see feature_store). The mean is decayed_sum / decayed_weight;
+    both are expressed relative to anchor_date, the latest observed day.
+    """
+    __tablename__ = "wellbeing_features"
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    metric = Column(String(20), primary_key=True)  # screen_time | social_media | sleep | focus | study_hours
+    decayed_sum = Column(Float, nullable=False, default=0)
+    decayed_weight = Column(Float, nullable=False, default=0)
+    anchor_date = Column(Date, nullable=False)
+    observations = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class WellbeingBaseline(Base):
+    """
+    Self-reported wellbeing of a student (survey import), stored once rather
+    than as synthetic days. A prior for the daily metrics until the student's
+    first wellbeing day arrives (see feature_store and behavioral_analysis_service).
+    """
+    __tablename__ = "wellbeing_baselines"
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    source = Column(String(20), nullable=False, default='survey')
+    reported_on = Column(Date, nullable=False)
+    
+    screen_time_hours = Column(Numeric(4, 2), nullable=False)
+    educational_app_hours = Column(Numeric(4, 2), default=0)
+    social_media_hours = Column(Numeric(4, 2), default=0)
+    entertainment_hours = Column(Numeric(4, 2), default=0)
+    productivity_hours = Column(Numeric(4, 2), default=0)
+    communication_hours = Column(Numeric(4, 2), default=0)
+    focus_score = Column(Numeric(3, 2))
+    sleep_duration_hours = Column(Numeric(3, 1))
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CohortMember(Base):
+    """
+    Values a student currently contributes to the cohort percentile tables
+    (see cohort_benchmark_service). NULL when the student has no value.
+    """
+    __tablename__ = "cohort_members"
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    major = Column(String, nullable=False, index=True)
+    semester = Column(Integer, nullable=False)  # 0 when unknown
+    screen_time = Column(Float)
+    sleep = Column(Float)
+    focus = Column(Float)
+    study_hours = Column(Float)
+    gpa = Column(Float)
+    attendance = Column(Float)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CohortBenchmark(Base):
+    """
+    Sorted values and deciles of one metric within a cohort: the students of
+    a major and semester, or of the whole major when semester is 0.
+    """
+    __tablename__ = "cohort_benchmarks"
+    major = Column(String, primary_key=True)
+    semester = Column(Integer, primary_key=True)
+    metric = Column(String(20), primary_key=True)  # screen_time | sleep | focus | study_hours | gpa | attendance
+    sample_size = Column(Integer, nullable=False, default=0)
+    sorted_values = Column(JSON, nullable=False)
+    deciles = Column(JSON)  # 0th, 10th, ..., 100th percentile (NULL when empty)
+    stale = Column(Boolean, nullable=False, default=False)  # members changed since sorted_values was computed
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,181 @@
+"""
+Keyset pagination shared by the list endpoints.
+
+A page is one query selecting only the requested columns (fields=),
+ordered by a key such as (created_at, id) and starting after the last key
+of the previous page, so the cost of a page does not grow with how deep
+it is (no OFFSET). Rows are returned as plain dicts built from Row tuples,
+without loading ORM objects.
+
+Key columns must be NOT NULL (NULL never compares, so such rows would be
+skipped) and are compared as they are, so an index on the filter columns
+followed by the key, e.g. (student_id, created_at, id), serves a page as
+one index range scan.
+
+The key of the page's last row is returned as an opaque cursor in the
+X-Next-Cursor header; it is absent on the last page. Page sizes are
+capped at MAX_PAGE_SIZE.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Date, DateTime, Time, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """Query parameters of a paginated endpoint (use as a dependency)."""
+    
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} of the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Rows per page"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)")
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.fields = fields
+
+
+def _key_type(column):
+    for column_type in (DateTime, Date, Time):
+        if isinstance(column.type, column_type):
+            return column_type
+    return None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor of a row's key values."""
+    encoded = json.dumps([value.isoformat() if isinstance(value, (date, time)) else value for value in values])
+    return base64.urlsafe_b64encode(encoded.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, key_columns: Sequence) -> List[Any]:
+    """
+    Key values of a cursor, typed like the key columns.
+    
+    Raises:
+        ValueError: Malformed cursor or not one of these keys
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Malformed cursor")
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise ValueError("Cursor does not belong to this listing")
+    
+    parsers = {DateTime: datetime.fromisoformat, Date: date.fromisoformat, Time: time.fromisoformat}
+    try:
+        return [
+            parsers[_key_type(column)](value) if _key_type(column) else value
+            for column, value in zip(key_columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise ValueError("Cursor does not belong to this listing")
+
+
+def select_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Requested fields, in the order of allowed.
+    
+    Raises:
+        ValueError: Unknown field
+    """
+    if not fields:
+        return list(allowed)
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}")
+    return [name for name in allowed if name in requested]
+
+
+def keyset_page(
+    db: Session,
+    model,
+    fields: Sequence[str],
+    key: Sequence[str],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: Sequence = (),
+    descending: bool = False
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of a table's rows.
+    
+    Args:
+        model: Mapped class
+        fields: Columns to return
+        key: NOT NULL columns ordering the rows, unique together (last one
+             the primary key)
+        cursor: Cursor returned with the previous page
+        limit: Rows per page
+        filters: WHERE conditions
+        descending: Newest (highest key) first
+    
+    Returns:
+        tuple: (rows as dicts of the fields, next cursor or None on the last page)
+    
+    Raises:
+        ValueError: Invalid cursor
+    """
+    table = model.__table__
+    keys = [table.c[name] for name in key]
+    
+    statement = select(*[table.c[name] for name in fields], *keys).where(*filters)
+    if cursor:
+        after = tuple_(*[
+            literal(value, column.type) for column, value in zip(keys, decode_cursor(cursor, keys))
+        ])
+        statement = statement.where(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+    statement = statement.order_by(*[
+        column.desc() if descending else column.asc() for column in keys
+    ]).limit(limit + 1)
+    
+    rows = db.execute(statement).all()
+    next_cursor = encode_cursor(rows[limit - 1][len(fields):]) if len(rows) > limit else None
+    return [dict(zip(fields, row[:len(fields)])) for row in rows[:limit]], next_cursor
+
+
+def paginate(
+    db: Session,
+    model,
+    schema: Type[BaseModel],
+    key: Sequence[str],
+    params: PageParams,
+    filters: Sequence = (),
+    descending: bool = False
+) -> JSONResponse:
+    """
+    Response of a paginated list endpoint: the page's rows with the fields
+    of schema (or the requested ones) and the X-Next-Cursor header.
+    
+    Raises:
+        HTTPException: 400 for unknown fields or an invalid cursor
+    """
+    try:
+        fields = select_fields(params.fields, list(schema.model_fields))
+        rows, next_cursor = keyset_page(
+            db, model, fields, key, params.cursor, params.limit, filters, descending
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return JSONResponse(jsonable_encoder(rows), headers=headers)
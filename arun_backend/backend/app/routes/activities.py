@@ -17,6 +17,7 @@ from datetime import date, time, datetime
 
 from app.db import get_db
 from app.models import StudentActivity
+from app.pagination import PageParams, paginate
 
 router = APIRouter(prefix="/activities", tags=["activities"])
 
@@ -121,28 +122,33 @@ def create_activity(
 @router.post("/fetch", response_model=List[ActivityResponse])
 def get_activities(
     request: ActivityFetchRequest,
+    params: PageParams = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     READ: Get activities with optional filters (POST method)
     
+    Activities come a page at a time, by date (then creation order); pass
+    the X-Next-Cursor header of a page as ?cursor= to get the next one,
+    and ?fields=id,title,... to get only some fields.
+    
     Example usage:
-    POST /activities/fetch
+    POST /activities/fetch?limit=100
     {
         "student_id": 1,
         "activity_date": "2026-02-17",
         "activity_type": "schedule"
     }
     """
-    query = db.query(StudentActivity).filter(StudentActivity.student_id == request.student_id)
+    filters = [StudentActivity.student_id == request.student_id]
     
     if request.activity_date:
-        query = query.filter(StudentActivity.date == request.activity_date)
+        filters.append(StudentActivity.date == request.activity_date)
     
     if request.activity_type:
-        query = query.filter(StudentActivity.activity_type == request.activity_type)
+        filters.append(StudentActivity.activity_type == request.activity_type)
     
-    return query.order_by(StudentActivity.date, StudentActivity.start_time).all()
+    return paginate(db, StudentActivity, ActivityResponse, ('date', 'id'), params, filters=filters)
 
 @router.patch("/{activity_id}", response_model=ActivityResponse)
 def update_activity(
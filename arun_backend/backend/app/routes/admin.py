@@ -2,26 +2,37 @@
 Admin routes for Trajectory Engine MVP
 
 This module provides admin-only endpoints for:
-- Alumni data import (CSV upload)
-- CSV template download
+- Student and alumni data import (CSV upload, background jobs)
+- Streaming data export (CSV, Parquet) for the analytics team
+- Database diagnostics (table estimates, index usage, slow queries, row sampler)
+- CSV template download (generated once, served with ETag/gzip)
 - Analytics and reporting
+- Vector schema versions and background re-indexing
+- Background analytics jobs (process pool) and their results
 - System management
 
 All endpoints require admin authentication.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 import io
 import csv
-from datetime import datetime
+from datetime import date, datetime
 
 from app.db import get_db
 from app.models import User
 from app.auth import get_current_user
+from app.generated_assets import asset_response, generated_asset
+from app.services.vector_backfill_service import get_vector_backfill_service
+from app.services.analytics_executor import ANALYSIS_KINDS, get_analytics_executor
+from app.services.import_job_service import IMPORT_KINDS, get_import_job_service
+from app.services.export_service import EXPORT_DATASETS, MEDIA_TYPES, get_export_service
+from app.services.diagnostics_service import MAX_SAMPLE_ROWS, get_diagnostics_service
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -55,37 +66,9 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
 # CSV TEMPLATE DOWNLOAD ENDPOINT (Task 19.4)
 # ============================================================================
 
-@router.get("/alumni-template")
-async def download_alumni_template(
-    admin: User = Depends(require_admin)
-):
-    """
-    Download CSV template for alumni data import.
-    
-    Returns a CSV file with:
-    - Header row with all required columns
-    - 3 example rows with sample data
-    - Comments explaining each field
-    
-    **Required columns:**
-    - name: Alumni full name
-    - major: Major/specialization (e.g., "Computer Science")
-    - graduation_year: Year of graduation (e.g., 2023)
-    - gpa: GPA on 10.0 scale (0.0-10.0)
-    - attendance: Attendance percentage (0-100)
-    - placement_status: "Placed" or "Not Placed"
-    - company_tier: "Tier1", "Tier2", or "Tier3" (if placed)
-    - role_title: Job role (e.g., "Software Engineer")
-    - salary_range: Salary range (e.g., "15-20 LPA")
-    - role_to_major_match_score: How well job matches major (0-100)
-    
-    **Optional columns:**
-    - study_hours_per_week: Average study hours per week
-    - project_count: Number of projects completed
-    
-    Returns:
-        StreamingResponse: CSV file download
-    """
+@generated_asset("alumni-template", "text/csv")
+def build_alumni_template() -> str:
+    """Alumni import template: header row and example rows."""
     # Create CSV in memory
     output = io.StringIO()
     writer = csv.writer(output)
@@ -174,30 +157,53 @@ async def download_alumni_template(
     csv_content = output.getvalue()
     output.close()
     
-    # Create streaming response
-    response = StreamingResponse(
-        iter([csv_content]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=alumni_import_template_{datetime.now().strftime('%Y%m%d')}.csv"
-        }
-    )
-    
-    return response
+    return csv_content
 
 
-@router.get("/alumni-template/info")
-async def get_template_info(
+@router.get("/alumni-template")
+async def download_alumni_template(
+    request: Request,
     admin: User = Depends(require_admin)
 ):
     """
-    Get information about the alumni CSV template format.
+    Download CSV template for alumni data import.
+    
+    Returns a CSV file with:
+    - Header row with all required columns
+    - 3 example rows with sample data
+    - Comments explaining each field
+    
+    **Required columns:**
+    - name: Alumni full name
+    - major: Major/specialization (e.g., "Computer Science")
+    - graduation_year: Year of graduation (e.g., 2023)
+    - gpa: GPA on 10.0 scale (0.0-10.0)
+    - attendance: Attendance percentage (0-100)
+    - placement_status: "Placed" or "Not Placed"
+    - company_tier: "Tier1", "Tier2", or "Tier3" (if placed)
+    - role_title: Job role (e.g., "Software Engineer")
+    - salary_range: Salary range (e.g., "15-20 LPA")
+    - role_to_major_match_score: How well job matches major (0-100)
+    
+    **Optional columns:**
+    - study_hours_per_week: Average study hours per week
+    - project_count: Number of projects completed
     
-    Returns detailed field descriptions and validation rules.
+    The file is built once and cached (ETag, Last-Modified, gzip, 304).
     
     Returns:
-        dict: Template information with field descriptions
+        Response: CSV file download
     """
+    return asset_response(
+        request,
+        "alumni-template",
+        filename=f"alumni_import_template_{datetime.now().strftime('%Y%m%d')}.csv"
+    )
+
+
+@generated_asset("alumni-template-info", "application/json")
+def build_template_info() -> dict:
+    """Field descriptions and validation rules of the alumni template."""
     return {
         "template_name": "Alumni Import Template",
         "version": "1.0",
@@ -305,6 +311,359 @@ async def get_template_info(
     }
 
 
+@router.get("/alumni-template/info")
+async def get_template_info(
+    request: Request,
+    admin: User = Depends(require_admin)
+):
+    """
+    Get information about the alumni CSV template format.
+    
+    Returns detailed field descriptions and validation rules (built once
+    and cached like the template).
+    
+    Returns:
+        Response: Template information with field descriptions (JSON)
+    """
+    return asset_response(request, "alumni-template-info")
+
+
+# ============================================================================
+# CSV IMPORT
+# ============================================================================
+
+@router.post("/import/{kind}", status_code=status.HTTP_202_ACCEPTED)
+async def start_csv_import(
+    kind: str,
+    file: UploadFile = File(...),
+    admin: User = Depends(require_admin)
+):
+    """
+    Import students (survey export) or alumni (alumni template) from a CSV.
+    
+    The upload is spooled to disk and its header checked; rows are then
+    parsed, validated and loaded in chunks by a background job, and the new
+    records are vectorized in batches. Poll GET /import/jobs/{job_id} for
+    progress (rows/s) and row errors.
+    
+    Returns:
+        dict: The import job
+    """
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown import kind '{kind}'. Available: {', '.join(IMPORT_KINDS)}"
+        )
+    
+    try:
+        # Blocking file copy, off the event loop
+        return await run_in_threadpool(
+            get_import_job_service().start_import, kind, file.file, file.filename or "upload.csv"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/import/jobs/{job_id}")
+async def get_csv_import_job(
+    job_id: str,
+    admin: User = Depends(require_admin)
+):
+    """
+    Get the progress of a CSV import job.
+    
+    Returns:
+        dict: Job status, row counts, rows/s, row errors and vectorization result
+    """
+    job = get_import_job_service().get_job(job_id)
+    
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
+        )
+    
+    return job
+
+
+# ============================================================================
+# DATA EXPORT
+# ============================================================================
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query("csv", description="csv or parquet"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    since: Optional[date] = Query(None, description="Rows dated on or after this day"),
+    until: Optional[date] = Query(None, description="Rows dated before this day"),
+    admin: User = Depends(require_admin)
+):
+    """
+    Export students, alumni, trajectory_scores or wellbeing_rollups.
+    
+    The file is streamed while it is read: rows come from a server-side
+    cursor in batches and are sent as CSV chunks or Parquet row groups, so
+    memory stays constant whatever the table size. since/until filter on
+    the dataset's date column (updated_at, calculated_at or period_start).
+    
+    Returns:
+        StreamingResponse: CSV or Parquet file download
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown dataset '{dataset}'. Available: {', '.join(EXPORT_DATASETS)}"
+        )
+    
+    selected = [name.strip() for name in columns.split(',') if name.strip()] if columns else None
+    
+    try:
+        stream = get_export_service().export(dataset, format, selected, since, until)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(e)
+        )
+    
+    return StreamingResponse(
+        stream,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f"attachment; filename={dataset}_{datetime.now().strftime('%Y%m%d')}.{format}"
+        }
+    )
+
+
+# ============================================================================
+# DIAGNOSTICS
+# ============================================================================
+
+@router.get("/diagnostics")
+async def get_diagnostics(
+    slow_query_limit: int = Query(20, ge=1, le=100),
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Database diagnostics without full-table reads.
+    
+    Returns:
+        dict: {
+            'dialect': str,
+            'tables': Row estimates (pg_class) and scan counters per table,
+            'indexes': Index scans and sizes, least used first (None if unavailable),
+            'slow_queries': pg_stat_statements top statements and recent
+                            slow statement samples of this process
+        }
+    """
+    service = get_diagnostics_service()
+    return {
+        'dialect': db.get_bind().dialect.name,
+        'tables': service.table_stats(db),
+        'indexes': service.index_usage(db),
+        'slow_queries': service.slow_queries(db, limit=slow_query_limit)
+    }
+
+
+@router.get("/diagnostics/sample/{table}")
+async def sample_table_rows(
+    table: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_SAMPLE_ROWS),
+    fields: Optional[str] = None,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    One page of a table's rows in primary key order (password hashes are
+    never returned). Pass next_cursor as ?cursor= for the next page.
+    
+    Returns:
+        dict: {'table', 'rows', 'next_cursor'}
+    """
+    try:
+        return get_diagnostics_service().sample_rows(db, table, cursor, limit, fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# ============================================================================
+# VECTOR VERSIONS AND BACKFILL
+# ============================================================================
+
+class VectorBackfillRequest(BaseModel):
+    """Request body for starting a vector backfill."""
+    version: int
+    activate: bool = True
+
+
+@router.get("/vectors/versions")
+async def get_vector_versions(
+    admin: User = Depends(require_admin)
+):
+    """
+    Get the active and dual-write vector versions of each Qdrant collection.
+    
+    Returns:
+        dict: Per collection active_version, write_versions and collection info
+    """
+    service = get_vector_backfill_service()
+    return {
+        "qdrant_available": service.qdrant.is_available,
+        "collections": service.get_version_status()
+    }
+
+
+@router.post("/vectors/backfill", status_code=status.HTTP_202_ACCEPTED)
+async def start_vector_backfill(
+    request: VectorBackfillRequest,
+    admin: User = Depends(require_admin)
+):
+    """
+    Re-embed all students and alumni into a new vector schema version.
+    
+    Runs in the background: writes go to both versions while the backfill
+    runs, and reads flip atomically to the new version when it completes
+    (unless activate is false). Poll GET /vectors/backfill/{job_id}.
+    
+    Returns:
+        dict: The created backfill job
+    """
+    service = get_vector_backfill_service()
+    
+    if not service.qdrant.is_available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Vector database unavailable. Please try again later."
+        )
+    
+    try:
+        return service.start_backfill(request.version, activate=request.activate)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/vectors/backfill/{job_id}")
+async def get_vector_backfill(
+    job_id: str,
+    admin: User = Depends(require_admin)
+):
+    """
+    Get the progress of a vector backfill job.
+    
+    Returns:
+        dict: Job status, per-collection progress and activation state
+    """
+    job = get_vector_backfill_service().get_job(job_id)
+    
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Backfill job {job_id} not found"
+        )
+    
+    return job
+
+
+# ============================================================================
+# ANALYTICS JOBS
+# ============================================================================
+
+class AnalyticsJobRequest(BaseModel):
+    """Request body for starting an analytics job."""
+    kind: str  # correlations | at_risk_sweep | gap_aggregates
+
+
+@router.post("/analytics/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def start_analytics_job(
+    request: AnalyticsJobRequest,
+    admin: User = Depends(require_admin)
+):
+    """
+    Run a population-wide analysis in the background worker processes.
+    
+    A job of the same kind that is still running is returned instead of
+    starting another. Poll GET /analytics/jobs/{job_id}, then read
+    GET /analytics/results/{kind}.
+    
+    Returns:
+        dict: The analytics job
+    """
+    try:
+        return get_analytics_executor().submit(request.kind)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}. Available: {', '.join(ANALYSIS_KINDS)}"
+        )
+
+
+@router.get("/analytics/jobs/{job_id}")
+async def get_analytics_job(
+    job_id: str,
+    admin: User = Depends(require_admin)
+):
+    """
+    Get the status of an analytics job.
+    
+    Returns:
+        dict: Job status and, once completed, the result version
+    """
+    job = get_analytics_executor().get_job(job_id)
+    
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Analytics job {job_id} not found"
+        )
+    
+    return job
+
+
+@router.get("/analytics/results/{kind}")
+async def get_analytics_result(
+    kind: str,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Latest finished result of an analysis (never computes).
+    
+    Returns:
+        dict: kind, version, computed_at and result
+    """
+    try:
+        result = get_analytics_executor().get_result(db, kind)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No finished '{kind}' analysis yet. Start one with POST /analytics/jobs."
+        )
+    
+    return result
+
+
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 from app.db import get_db
+from app.pagination import PageParams, paginate
 from app.models import TrajectoryScore, Recommendation, GapAnalysis
 from datetime import datetime
 
@@ -18,10 +19,13 @@ class TrajectoryResponse(BaseModel):
 class RecommendationResponse(BaseModel):
     id: int
     student_id: int
-    content: str
-    impact_level: str
-    estimated_score_gain: float
+    title: str
+    description: str
+    impact: str
+    estimated_points: Optional[float] = None
+    timeline: Optional[str] = None
     completed: bool
+    created_at: Optional[datetime] = None
     class Config: from_attributes = True
 
 class GapAnalysisResponse(BaseModel):
@@ -43,8 +47,11 @@ def get_trajectory_score(request: AnalyticsFetchRequest, db: Session = Depends(g
     return score
 
 @router.post("/fetch-recommendations", response_model=List[RecommendationResponse])
-def get_recommendations(request: AnalyticsFetchRequest, db: Session = Depends(get_db)):
-    return db.query(Recommendation).filter(Recommendation.student_id == request.student_id).all()
+def get_recommendations(request: AnalyticsFetchRequest, params: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(
+        db, Recommendation, RecommendationResponse, ('created_at', 'id'), params,
+        filters=[Recommendation.student_id == request.student_id]
+    )
 
 @router.post("/fetch-gap-analysis", response_model=List[GapAnalysisResponse])
 def get_gap_analysis(request: AnalyticsFetchRequest, db: Session = Depends(get_db)):
@@ -4,15 +4,18 @@ Behavioral Analysis Routes - Task 22
 Provides endpoints for behavioral pattern analysis and at-risk detection.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+from datetime import datetime
 
 from app.db import get_db
 from app.auth import get_current_user
 from app.models import User, Student
-from app.services.behavioral_analysis_service import get_behavioral_analysis_service
+from app.services.behavioral_analysis_service import BehavioralDataLoader, get_behavioral_analysis_service
+from app.services.cohort_benchmark_service import ALL_SEMESTERS, get_cohort_benchmark_service
+from app.services.analytics_executor import get_analytics_executor
 
 router = APIRouter(prefix="/api/behavioral", tags=["behavioral"])
 
@@ -50,11 +53,62 @@ class AtRiskResponse(BaseModel):
     message: str
 
 
+class AtRiskStudent(BaseModel):
+    """Student flagged by the at-risk sweep."""
+    student_id: int
+    name: Optional[str] = None
+    flags: List[AtRiskFlag]
+    risk_level: str
+
+
+class AtRiskPageResponse(BaseModel):
+    """One page of students flagged by the last at-risk sweep."""
+    total: int
+    page: int
+    page_size: int
+    swept_at: Optional[datetime] = None
+    students: List[AtRiskStudent]
+
+
+class AtRiskSweepResponse(BaseModel):
+    """At-risk sweep summary."""
+    students_evaluated: int
+    students_flagged: int
+    flags: int
+    swept_at: datetime
+
+
 class ComparisonMetric(BaseModel):
     """Comparison metric."""
     student: float
     optimal: float
     status: str
+    percentile: Optional[float] = None  # Rank within the student's cohort
+
+
+class BenchmarkMetric(BaseModel):
+    """Student's position on one metric within their cohort."""
+    value: float
+    percentile: float
+    median: Optional[float] = None
+    deciles: Optional[List[float]] = None
+    sample_size: int
+    cohort: str  # semester | major
+
+
+class BenchmarkResponse(BaseModel):
+    """Student's percentile ranks within their major/semester cohort."""
+    student_id: int
+    major: str
+    semester: int
+    metrics: Dict[str, BenchmarkMetric]
+
+
+class CohortBenchmarkResponse(BaseModel):
+    """Deciles of every metric of one cohort."""
+    major: str
+    semester: int
+    metrics: Dict[str, Dict[str, Any]]
 
 
 class ComparisonResponse(BaseModel):
@@ -211,6 +265,7 @@ def generate_recommendations(
 
 @router.get("/correlations", response_model=CorrelationResponse, status_code=status.HTTP_200_OK)
 async def get_correlations(
+    response: Response,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
@@ -222,8 +277,17 @@ async def get_correlations(
     - Focus score vs trajectory score correlation
     - Sleep duration vs academic performance correlation
     - Optimal ranges for each metric
+    
+    Served from streaming statistics that every wellbeing, GPA and
+    trajectory update keeps current. When they are missing or a day old, a
+    background analytics job rebuilds them (its ID is returned in the
+    X-Analytics-Job header) and the current statistics, or the defaults
+    before the first rebuild, are served meanwhile.
     """
     service = get_behavioral_analysis_service()
+    if service.needs_refresh(db):
+        job = get_analytics_executor().submit('correlations')
+        response.headers['X-Analytics-Job'] = job['job_id']
     correlations = service.calculate_correlations(db)
     interpretations = interpret_correlations(correlations)
     
@@ -237,6 +301,23 @@ async def get_correlations(
     )
 
 
+@router.post("/correlations/refresh", status_code=status.HTTP_202_ACCEPTED)
+async def refresh_correlations(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Rebuild the streaming correlation statistics from scratch now (Admin only).
+    
+    They are otherwise updated with every student's new data and rebuilt
+    once they are a day old. Runs as a background analytics job; poll
+    GET /api/admin/analytics/jobs/{job_id}, then read GET /correlations.
+    
+    Returns:
+        dict: The analytics job
+    """
+    return get_analytics_executor().submit('correlations')
+
+
 @router.get("/at-risk", response_model=AtRiskResponse, status_code=status.HTTP_200_OK)
 async def get_at_risk_patterns(
     student: Student = Depends(require_student),
@@ -283,6 +364,72 @@ async def get_at_risk_patterns(
     )
 
 
+@router.get("/at-risk/all", response_model=AtRiskPageResponse, status_code=status.HTTP_200_OK)
+async def get_all_at_risk_students(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    severity: Optional[str] = Query(None, pattern="^(high|medium|low)$"),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    List every student flagged by the last at-risk sweep (Admin only).
+    
+    Most severe first. Filter with `severity` to only list students with at
+    least one flag of that severity. Run POST /at-risk/sweep to refresh.
+    """
+    service = get_behavioral_analysis_service()
+    result = service.get_at_risk_page(db, page=page, page_size=page_size, severity=severity)
+    
+    return AtRiskPageResponse(
+        total=result['total'],
+        page=page,
+        page_size=page_size,
+        swept_at=result['swept_at'],
+        students=[
+            AtRiskStudent(
+                student_id=entry['student_id'],
+                name=entry['name'],
+                flags=[AtRiskFlag(**flag) for flag in entry['flags']],
+                risk_level=calculate_risk_level(entry['flags'])
+            )
+            for entry in result['students']
+        ]
+    )
+
+
+@router.post("/at-risk/sweep", status_code=status.HTTP_202_ACCEPTED)
+async def run_at_risk_sweep(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Re-evaluate every student and replace the stored at-risk flags (Admin only).
+    
+    Runs as a background analytics job in the worker process pool; poll
+    GET /api/admin/analytics/jobs/{job_id}, then read GET /at-risk/sweep.
+    Meant to run daily (see run_at_risk_sweep.py).
+    
+    Returns:
+        dict: The analytics job
+    """
+    return get_analytics_executor().submit('at_risk_sweep')
+
+
+@router.get("/at-risk/sweep", response_model=AtRiskSweepResponse, status_code=status.HTTP_200_OK)
+async def get_last_at_risk_sweep(
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Summary of the last finished at-risk sweep job (Admin only)."""
+    latest = get_analytics_executor().get_result(db, 'at_risk_sweep')
+    if latest is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No at-risk sweep has finished yet"
+        )
+    return AtRiskSweepResponse(**latest['result'])
+
+
 @router.get("/comparison", response_model=ComparisonResponse, status_code=status.HTTP_200_OK)
 async def get_comparison_to_alumni(
     student: Student = Depends(require_student),
@@ -329,6 +476,61 @@ async def get_comparison_to_alumni(
     )
 
 
+@router.get("/benchmarks", response_model=BenchmarkResponse, status_code=status.HTTP_200_OK)
+async def get_benchmarks(
+    student: Student = Depends(require_student),
+    db: Session = Depends(get_db)
+):
+    """
+    Percentile rank of the student's screen time, sleep, focus, study hours,
+    GPA and attendance within their major and semester.
+    
+    Served from the precomputed cohort tables; metrics whose semester cohort
+    is small are ranked within the whole major.
+    """
+    benchmarks = get_cohort_benchmark_service().get_student_percentiles(db, student.id)
+    if benchmarks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No cohort benchmarks for student yet"
+        )
+    
+    return BenchmarkResponse(
+        student_id=student.id,
+        major=benchmarks['major'],
+        semester=benchmarks['semester'],
+        metrics={metric: BenchmarkMetric(**values) for metric, values in benchmarks['metrics'].items()}
+    )
+
+
+@router.get("/benchmarks/cohort", response_model=CohortBenchmarkResponse, status_code=status.HTTP_200_OK)
+async def get_cohort_benchmarks(
+    major: str = Query(..., min_length=1),
+    semester: int = Query(ALL_SEMESTERS, ge=0, le=10),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Deciles of every metric of a cohort (Admin only). semester=0 is the
+    whole major.
+    """
+    cohort = get_cohort_benchmark_service().get_cohort(db, major, semester)
+    if not cohort:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No students in this cohort"
+        )
+    
+    return CohortBenchmarkResponse(
+        major=major,
+        semester=semester,
+        metrics={
+            metric: {'sample_size': len(sorted_values), 'deciles': deciles}
+            for metric, (sorted_values, deciles) in cohort.items()
+        }
+    )
+
+
 @router.get("/insights", response_model=InsightsResponse, status_code=status.HTTP_200_OK)
 async def get_behavioral_insights(
     student: Student = Depends(require_student),
@@ -342,11 +544,14 @@ async def get_behavioral_insights(
     - At-risk patterns
     - Comparison to successful alumni
     - Personalized recommendations
+    
+    The student's data is loaded once and shared by all analyses.
     """
     service = get_behavioral_analysis_service()
+    loader = BehavioralDataLoader(db, student, service)
     
     # Get correlations
-    correlations_data = service.calculate_correlations(db)
+    correlations_data = loader.correlations()
     interpretations = interpret_correlations(correlations_data)
     
     correlations = CorrelationResponse(
@@ -359,13 +564,14 @@ async def get_behavioral_insights(
     )
     
     # Get at-risk patterns
-    at_risk_flags = service.identify_at_risk_patterns(student, db)
+    at_risk_flags = service.identify_at_risk_patterns(student, db, loader=loader)
     
     # Get comparison
     comparison = service.compare_to_successful_alumni(
         student,
         db,
-        correlations_data['optimal_ranges']
+        correlations_data['optimal_ranges'],
+        loader=loader
     )
     
     # Generate recommendations
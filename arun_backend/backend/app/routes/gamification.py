@@ -4,6 +4,7 @@ from typing import List
 from pydantic import BaseModel
 from app.db import get_db
 from app.models import Badge, StudentBadge
+from app.pagination import PageParams, paginate
 from datetime import datetime
 
 router = APIRouter(prefix="/gamification", tags=["gamification"])
@@ -23,8 +24,8 @@ class GamificationFetchRequest(BaseModel):
     student_id: int
 
 @router.post("/fetch-badges", response_model=List[BadgeResponse])
-def get_all_badges(db: Session = Depends(get_db)):
-    return db.query(Badge).all()
+def get_all_badges(params: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db, Badge, BadgeResponse, ('id',), params)
 
 @router.post("/fetch-student-badges", response_model=List[StudentBadgeResponse])
 def get_student_badges(request: GamificationFetchRequest, db: Session = Depends(get_db)):
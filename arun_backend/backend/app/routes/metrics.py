@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from typing import List
-from pydantic import BaseModel
-from app.db import get_db
-from app.models import BehavioralMetric, DigitalWellbeingData as DigitalWellbeingDailyModel, DailyLog
+from pydantic import BaseModel, Field
+from app.db import SessionLocal, get_db
+from app.services.wellbeing_ingest_service import WellbeingIngestError, get_wellbeing_ingest_service
+from app.routes.student_profile import BehavioralDataCreate
+from app.services.vector_backfill_service import get_vector_backfill_service
+from app.models import BehavioralMetric, DigitalWellbeingData as DigitalWellbeingDailyModel, DailyLog, SkillAssessment, Student
+from app.pagination import PageParams, paginate
 from datetime import date, datetime
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
@@ -30,6 +35,17 @@ class DigitalWellbeingDaily(BaseModel):
     focus_score: float
     class Config: from_attributes = True
 
+# Device agent fields -> stored wellbeing columns (the agent's other fields are not stored)
+SYNC_COLUMNS = {
+    'total_screen_time': 'screen_time_hours',
+    'educational_time': 'educational_app_hours',
+    'social_time': 'social_media_hours',
+    'entertainment_time': 'entertainment_hours',
+    'productivity_time': 'productivity_hours',
+    'communication_time': 'communication_hours',
+    'sleep_hours': 'sleep_duration_hours',
+}
+
 class DailyLogSchema(BaseModel):
     date: date
     activity_description: str
@@ -47,6 +63,35 @@ class SkillAssessmentSchema(BaseModel):
 class MetricFetchRequest(BaseModel):
     student_id: int
 
+class WellbeingBulkEntry(BehavioralDataCreate):
+    student_id: int
+
+class WellbeingBulkSyncRequest(BaseModel):
+    entries: List[WellbeingBulkEntry] = Field(..., min_length=1, max_length=5000)
+
+class WellbeingBulkSyncResponse(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    students: int
+
+def regenerate_student_vectors(student_ids: List[int]):
+    """
+    Batched vector regeneration of the students of a bulk sync (runs after
+    the response is sent, in its own session). If Qdrant is unavailable, the
+    students' bumped updated_at lets the vector reconciler repair them.
+    """
+    db = SessionLocal()
+    try:
+        backfill = get_vector_backfill_service()
+        if backfill.qdrant.is_available:
+            backfill.index_records(db, "students", student_ids)
+    except Exception as e:
+        # Log error; the reconciler repairs the vectors
+        print(f"Warning: Vector regeneration failed for students {student_ids}: {e}")
+    finally:
+        db.close()
+
 @router.post("/fetch-behavioral", response_model=BehavioralMetricSchema)
 def get_behavioral_metrics(request: MetricFetchRequest, db: Session = Depends(get_db)):
     return db.query(BehavioralMetric).filter(BehavioralMetric.student_id == request.student_id).first()
@@ -57,31 +102,73 @@ def get_wellbeing_data(request: MetricFetchRequest, db: Session = Depends(get_db
 
 @router.post("/wellbeing/sync", response_model=DigitalWellbeingDaily)
 def sync_wellbeing(data: DigitalWellbeingDaily, student_id: int, db: Session = Depends(get_db)):
-    db_wellbeing = DigitalWellbeingDailyModel(
-        student_id=student_id,
-        date=data.date,
-        total_screen_time=data.total_screen_time,
-        educational_time=data.educational_time,
-        social_time=data.social_time,
-        entertainment_time=data.entertainment_time,
-        productivity_time=data.productivity_time,
-        communication_time=data.communication_time,
-        sleep_hours=data.sleep_hours,
-        sleep_schedule=data.sleep_schedule,
-        use_phone_while_studying=data.use_phone_while_studying,
-        distraction_level=data.distraction_level,
-        mental_exhaustion=data.mental_exhaustion,
-        focus_score=data.focus_score
+    """
+    Sync one wellbeing day from the device agent.
+    
+    Goes through the same upsert as the bulk sync, so syncing a day again
+    updates it (and its derived data) instead of counting it twice.
+    """
+    entry = {column: getattr(data, field) for field, column in SYNC_COLUMNS.items()}
+    try:
+        get_wellbeing_ingest_service().ingest(db, [dict(entry, student_id=student_id, date=data.date)])
+    except WellbeingIngestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=jsonable_encoder(e.errors)
+        )
+    
+    record = db.query(DigitalWellbeingDailyModel).filter(
+        DigitalWellbeingDailyModel.student_id == student_id,
+        DigitalWellbeingDailyModel.date == data.date
+    ).one()
+    return data.model_copy(update={'focus_score': float(record.focus_score)})
+
+@router.post("/wellbeing/sync/bulk", response_model=WellbeingBulkSyncResponse)
+async def sync_wellbeing_bulk(
+    request: WellbeingBulkSyncRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Upload many wellbeing days (one or many students) in one request.
+    
+    The batch is validated as a whole and written with one upsert; existing
+    days are updated. Derived data is refreshed once per batch; the
+    students' vectors are regenerated in batches after the response is
+    sent, so the counts are returned immediately.
+    """
+    try:
+        summary = get_wellbeing_ingest_service().ingest(
+            db, [entry.model_dump() for entry in request.entries]
+        )
+    except WellbeingIngestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=jsonable_encoder(e.errors)
+        )
+    
+    # Mark the profiles as changed first: if storing the vectors fails, the
+    # reconciler sees rows newer than their vectors and repairs them
+    db.query(Student).filter(Student.id.in_(summary['student_ids'])).update(
+        {Student.updated_at: datetime.utcnow()}, synchronize_session=False
     )
-    db.add(db_wellbeing)
     db.commit()
-    db.refresh(db_wellbeing)
-    return db_wellbeing
+    background_tasks.add_task(regenerate_student_vectors, summary['student_ids'])
+    
+    return WellbeingBulkSyncResponse(
+        received=summary['received'],
+        inserted=summary['inserted'],
+        updated=summary['updated'],
+        students=len(summary['student_ids'])
+    )
 
 @router.post("/fetch-skills", response_model=List[SkillAssessmentSchema])
-def get_skill_assessments(request: MetricFetchRequest, db: Session = Depends(get_db)):
-    from app.models import SkillAssessment
-    return db.query(SkillAssessment).filter(SkillAssessment.student_id == request.student_id).order_by(SkillAssessment.created_at.desc()).all()
+def get_skill_assessments(request: MetricFetchRequest, params: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Fetch a student's skill assessments, newest first, a page at a time."""
+    return paginate(
+        db, SkillAssessment, SkillAssessmentSchema, ('created_at', 'id'), params,
+        filters=[SkillAssessment.student_id == request.student_id], descending=True
+    )
 
 @router.post("/logs/add", response_model=DailyLogSchema)
 def add_daily_log(data: DailyLogSchema, student_id: int, db: Session = Depends(get_db)):
@@ -99,6 +186,9 @@ def add_daily_log(data: DailyLogSchema, student_id: int, db: Session = Depends(g
     return db_log
 
 @router.post("/logs/fetch", response_model=List[DailyLogSchema])
-def get_daily_logs(request: MetricFetchRequest, db: Session = Depends(get_db)):
-    """Fetch all activity logs for a specific student."""
-    return db.query(DailyLog).filter(DailyLog.student_id == request.student_id).order_by(DailyLog.date.desc()).all()
+def get_daily_logs(request: MetricFetchRequest, params: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Fetch the activity logs of a specific student, newest first, a page at a time."""
+    return paginate(
+        db, DailyLog, DailyLogSchema, ('date', 'id'), params,
+        filters=[DailyLog.student_id == request.student_id], descending=True
+    )
@@ -19,11 +19,14 @@ import logging
 
 from app.db import get_db
 from app.auth import get_current_user
-from app.models import User, Student, DigitalWellbeingData, Skill
-from app.services.vector_generation import generate_student_vector
+from app.models import User, Student, Skill
+from app.services.wellbeing_history import fill_missing, get_wellbeing_history
+from app.services.feature_store import get_feature_store
+from app.services.vector_schema import generate_student_vector_for_version
 from app.services.qdrant_service import QdrantService
+from app.services.alumni_snapshot import get_alumni_snapshot
 from app.services.similarity_service import find_similar_alumni
-from app.services.trajectory_service import calculate_trajectory_score
+from app.services.trajectory_service import calculate_trajectory_score, get_major_weights
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -281,23 +284,30 @@ async def predict_trajectory(
             'deployed': bool(getattr(student, 'deployed', False)),
             'internship': bool(getattr(student, 'internship', False)),
             'career_clarity': safe_float(getattr(student, 'career_clarity', None), 3.0),
-            'major': str(student.major) if student.major else 'default'
+            'major': str(student.major) if student.major else 'default',
+            # Full-history decayed wellbeing means (preferred over the raw rows below)
+            'wellbeing_features': get_feature_store().get_features(db, [student_id])[student_id]
         }
         
-        # Fetch digital wellbeing data (most recent 30 days)
-        wellbeing_records = db.query(DigitalWellbeingData).filter(
-            DigitalWellbeingData.student_id == student_id
-        ).order_by(DigitalWellbeingData.date.desc()).limit(30).all()
+        # Fetch digital wellbeing data (most recent 30 days) as columns
+        history = get_wellbeing_history().latest(
+            db, [student_id], 30,
+            metrics=('screen_time_hours', 'social_media_hours', 'sleep_duration_hours')
+        )
         
-        wellbeing = []
-        if wellbeing_records:
-            for record in wellbeing_records:
-                wellbeing.append({
-                    'screen_time_hours': safe_float(record.screen_time_hours, 6.0),
-                    'social_media_hours': safe_float(record.social_media_hours, 2.0),
-                    'distraction_level': safe_float(getattr(record, 'distraction_level', None), 3.0),
-                    'sleep_duration_hours': safe_float(record.sleep_duration_hours, 7.0)
-                })
+        wellbeing = [
+            {
+                'screen_time_hours': screen_time,
+                'social_media_hours': social_media,
+                'distraction_level': 3.0,  # Not collected by the app yet
+                'sleep_duration_hours': sleep
+            }
+            for screen_time, social_media, sleep in zip(
+                fill_missing(history['screen_time_hours'], 6.0).tolist(),
+                fill_missing(history['social_media_hours'], 2.0).tolist(),
+                fill_missing(history['sleep_duration_hours'], 7.0).tolist()
+            )
+        ]
         
         # Fetch skills data
         skills_records = db.query(Skill).filter(
@@ -313,26 +323,48 @@ async def predict_trajectory(
                     'market_weight': safe_float(skill.market_weight, 1.0)
                 })
         
-        # Generate student vector
-        logger.info("Generating student vector")
-        student_vector = generate_student_vector(student_profile, wellbeing)
+        # Memory-mapped alumni snapshot (only if ALUMNI_SNAPSHOT_PATH is set)
+        snapshot = get_alumni_snapshot()
         
-        # Check if Qdrant is available
-        if not qdrant.is_available:
+        # Check if Qdrant (or the snapshot) is available
+        if qdrant.is_available:
+            vector_version = qdrant.get_active_version("alumni")
+        elif snapshot is not None:
+            vector_version = snapshot.vector_version
+        else:
             logger.warning("Qdrant not available, using default score")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Vector database unavailable. Please try again later."
             )
         
-        # Find similar alumni
+        # Generate student vector in the schema version alumni reads are served from
+        logger.info(f"Generating student vector (v{vector_version})")
+        student_vector = generate_student_vector_for_version(vector_version, student_profile, wellbeing)
+        
+        # Find similar alumni (sub-vectors weighted per major if the schema has them)
         logger.info("Finding similar alumni")
-        similar_alumni = find_similar_alumni(
-            student_vector=student_vector,
-            qdrant_service=qdrant,
-            major=student_profile['major'],
-            top_k=5
-        )
+        major_weights = get_major_weights(student_profile['major'])
+        similar_alumni = []
+        if qdrant.is_available:
+            similar_alumni = find_similar_alumni(
+                student_vector=student_vector,
+                qdrant_service=qdrant,
+                major=student_profile['major'],
+                top_k=5,
+                version=vector_version,
+                weights=major_weights
+            )
+        
+        # Qdrant unreachable or empty: search the snapshot instead
+        if not similar_alumni and snapshot is not None and snapshot.vector_version == vector_version:
+            logger.info("Finding similar alumni in the alumni snapshot")
+            similar_alumni = snapshot.search(
+                student_vector,
+                major=student_profile['major'],
+                top_k=5,
+                weights=major_weights
+            )
         
         # Calculate trajectory score
         logger.info("Calculating trajectory score")
@@ -382,7 +414,7 @@ async def predict_trajectory(
                    f"confidence={result['confidence']:.2f}, tier={result['predicted_tier']}")
         
         return response
-        
+    
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
@@ -406,19 +438,33 @@ async def prediction_health():
     Returns:
     - status: "healthy" or "degraded"
     - qdrant_available: Boolean
+    - snapshot: Mapped alumni snapshot (count, vector_version) or None
     - message: Status message
     """
     qdrant_available = qdrant.is_available
+    snapshot = get_alumni_snapshot()
+    snapshot_info = None
+    if snapshot is not None:
+        snapshot_info = {"count": snapshot.count, "vector_version": snapshot.vector_version}
     
     if qdrant_available:
         return {
             "status": "healthy",
             "qdrant_available": True,
+            "snapshot": snapshot_info,
             "message": "Prediction service is fully operational"
         }
+    elif snapshot is not None:
+        return {
+            "status": "degraded",
+            "qdrant_available": False,
+            "snapshot": snapshot_info,
+            "message": "Vector database unavailable - serving similarity from alumni snapshot"
+        }
     else:
         return {
             "status": "degraded",
             "qdrant_available": False,
+            "snapshot": None,
             "message": "Vector database unavailable - predictions may be limited"
         }
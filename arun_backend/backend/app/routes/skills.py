@@ -16,8 +16,7 @@ from app.auth import get_current_user
 from app.models import User, Student, Skill
 from app.services.voice_evaluation_service import get_voice_evaluation_service
 from app.services.skill_demand_service import get_skill_demand_service
-from app.services.vector_generation import generate_student_vector
-from app.services.qdrant_service import QdrantService
+from app.services.student_vector_service import get_student_vector_service
 
 router = APIRouter(prefix="/api/skills", tags=["skills"])
 
@@ -147,17 +146,15 @@ def calculate_combined_score(quiz_score: Optional[float], voice_score: Optional[
 async def trigger_vector_regeneration(student: Student, db: Session):
     """Trigger vector regeneration after skill update."""
     try:
-        # Generate new vector
-        vector = generate_student_vector(student, db)
+        # Mark the profile as changed first, so the reconciler repairs the
+        # vector if storing it fails
+        student.updated_at = datetime.utcnow()
+        db.commit()
         
-        # Initialize Qdrant service
-        qdrant = QdrantService()
-        
-        # Update in Qdrant
-        if qdrant.is_available:
-            success = qdrant.update_student_vector(student.id, vector)
-            if not success:
-                print(f"Failed to update vector for student {student.id}")
+        # Generate and store vectors for every schema version being written
+        result = get_student_vector_service().process_student_record(student, db)
+        if not result['success']:
+            print(f"Failed to update vector for student {student.id}")
     except Exception as e:
         # Log error but don't fail the request
         print(f"Vector regeneration failed: {str(e)}")
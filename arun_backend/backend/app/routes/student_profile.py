@@ -20,8 +20,13 @@ from decimal import Decimal
 from app.db import get_db
 from app.models import User, Student, DigitalWellbeingData, Skill
 from app.auth import get_current_user
-from app.services.vector_generation import generate_student_vector
-from app.services.qdrant_service import QdrantService
+from app.services.student_vector_service import get_student_vector_service
+from app.services.behavioral_analysis_service import get_behavioral_analysis_service
+from app.services.wellbeing_history import get_wellbeing_history
+from app.services.feature_store import day_features, get_feature_store, record_columns
+from app.services.wellbeing_ingest_service import stored_focus_score
+from app.services.cohort_benchmark_service import get_cohort_benchmark_service
+from app.services.wellbeing_rollup_service import get_wellbeing_rollup_service, summarize_rollup, week_start
 
 router = APIRouter(prefix="/api/student", tags=["Student Profile"])
 
@@ -104,15 +109,7 @@ def calculate_focus_score(behavioral_data: BehavioralDataCreate) -> float:
     Focus Score = (Educational + Productivity) / (Social Media + Entertainment)
     Returns value between 0 and 1, or 0.5 if denominator is 0.
     """
-    productive = behavioral_data.educational_app_hours + behavioral_data.productivity_hours
-    distracting = behavioral_data.social_media_hours + behavioral_data.entertainment_hours
-    
-    if distracting == 0:
-        return 1.0 if productive > 0 else 0.5
-    
-    focus = productive / distracting
-    # Normalize to 0-1 range (cap at 2.0 for focus ratio)
-    return min(focus / 2.0, 1.0)
+    return stored_focus_score(behavioral_data.model_dump())
 
 
 async def trigger_vector_regeneration(db: Session, student: Student):
@@ -121,22 +118,15 @@ async def trigger_vector_regeneration(db: Session, student: Student):
     This ensures similarity matching uses latest data.
     """
     try:
-        # Generate new vector from updated profile
-        vector = generate_student_vector(student, db)
-        
-        # Initialize Qdrant service
-        qdrant_service = QdrantService()
-        
-        # Update in Qdrant
-        success = qdrant_service.update_student_vector(student.id, vector)
+        # Mark the profile as changed first: if storing the vector fails, the
+        # reconciler sees a row newer than its vector and repairs it
+        student.updated_at = datetime.utcnow()
+        db.commit()
         
-        if success:
-            # Update timestamp in PostgreSQL
-            student.updated_at = datetime.utcnow()
-            db.commit()
-            return True
+        # Generate and store vectors for every schema version being written
+        result = get_student_vector_service().process_student_record(student, db)
         
-        return False
+        return result['success']
     except Exception as e:
         # Log error but don't fail the request
         print(f"Warning: Vector regeneration failed for student {student.id}: {e}")
@@ -238,6 +228,20 @@ async def update_student_profile(
     db.commit()
     db.refresh(student)
     
+    # Keep cohort correlation statistics current (GPA is one of their inputs)
+    if 'gpa' in update_data:
+        get_behavioral_analysis_service().record_student_update(db, student.id)
+    
+    # Study hours feed the decayed study-hours feature
+    if update_data.get('study_hours_per_week') is not None:
+        get_feature_store().observe(
+            db, student.id, date.today(), {'study_hours': float(student.study_hours_per_week)}
+        )
+    
+    # Cohort percentile tables (cohort and benchmarked profile values)
+    if update_data.keys() & {'major', 'semester', 'gpa', 'attendance', 'study_hours_per_week'}:
+        get_cohort_benchmark_service().record_student_update(db, student.id)
+    
     # Trigger vector regeneration (async, don't wait)
     await trigger_vector_regeneration(db, student)
     
@@ -311,6 +315,9 @@ async def add_behavioral_data(
     ).first()
     
     if existing:
+        # Values of the day before the update (taken out of the features)
+        previous_features = day_features(record_columns(existing))
+        
         # Update existing record
         for field, value in behavioral_data.model_dump().items():
             if value is not None:
@@ -321,7 +328,10 @@ async def add_behavioral_data(
         
         message = "Behavioral data updated successfully"
         data_id = existing.id
+        record = existing
     else:
+        previous_features = None
+        
         # Create new record
         wellbeing_data = DigitalWellbeingData(
             student_id=student.id,
@@ -335,6 +345,17 @@ async def add_behavioral_data(
         
         message = "Behavioral data added successfully"
         data_id = wellbeing_data.id
+        record = wellbeing_data
+    
+    # Refresh derived wellbeing data: columnar history, decayed features,
+    # daily/weekly rollups, cohort correlation statistics and percentiles
+    get_wellbeing_history().invalidate(behavioral_data.date)
+    get_feature_store().observe(
+        db, student.id, behavioral_data.date, day_features(record_columns(record)), previous_features
+    )
+    get_wellbeing_rollup_service().update_student_day(db, student.id, behavioral_data.date)
+    get_behavioral_analysis_service().record_student_update(db, student.id)
+    get_cohort_benchmark_service().record_student_update(db, student.id)
     
     # Trigger vector regeneration
     await trigger_vector_regeneration(db, student)
@@ -502,7 +523,8 @@ async def get_behavioral_data(
     **Parameters**:
     - days: Number of days to retrieve (default: 30)
     
-    **Returns**: List of behavioral data entries
+    **Returns**: List of behavioral data entries and weekly rollups
+    (count/mean/min/max/decayed mean per metric) covering the same days
     """
     # Verify user is a student
     if current_user.role != "student":
@@ -523,6 +545,10 @@ async def get_behavioral_data(
         DigitalWellbeingData.date >= start_date
     ).order_by(DigitalWellbeingData.date.desc()).all()
     
+    weekly = get_wellbeing_rollup_service().get_rollups(
+        db, student.id, period='week', since=week_start(start_date)
+    )
+    
     return {
         "student_id": student.id,
         "days_requested": days,
@@ -542,5 +568,6 @@ async def get_behavioral_data(
                 "synced_at": entry.synced_at
             }
             for entry in behavioral_data
-        ]
+        ],
+        "weekly_summary": [summarize_rollup(rollup) for rollup in weekly]
     }
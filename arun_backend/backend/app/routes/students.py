@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.db import get_db
+from app.models import Student
+from app.pagination import PageParams, paginate
 from app.services import student_service
 
 router = APIRouter(tags=["students"])
@@ -50,9 +52,9 @@ def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     return student_service.create_student_profile(db, student.model_dump())
 
 @router.post("/list", response_model=List[StudentResponse])
-def list_students(db: Session = Depends(get_db)):
-    """Retrieve all students via POST for data integrity."""
-    return student_service.get_all_students(db)
+def list_students(params: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Retrieve students via POST, a page at a time (oldest first, keyset cursor in X-Next-Cursor)."""
+    return paginate(db, Student, StudentResponse, ('created_at', 'id'), params)
 
 @router.post("/subjects")
 def add_subjects(data: SubjectScoreCreate, db: Session = Depends(get_db)):
@@ -65,10 +67,3 @@ def add_subjects(data: SubjectScoreCreate, db: Session = Depends(get_db)):
 def get_full_profile(request: StudentFetchRequest, db: Session = Depends(get_db)):
     """Get student basic info, cumulative GPA, attendance, and all subject scores via POST."""
     return student_service.get_full_student_profile(db, request.student_id)
-
-@router.post("/debug-fetch")
-def debug_students(db: Session = Depends(get_db)):
-    """Raw debug endpoint to see what exactly is in the DB via POST."""
-    from sqlalchemy import text
-    result = db.execute(text("SELECT * FROM students")).fetchall()
-    return [dict(row._mapping) for row in result]
@@ -0,0 +1,385 @@
+"""
+Alumni Vector Snapshot for Trajectory Engine MVP
+
+A read-only, memory-mapped copy of the alumni vector space, so API workers
+can serve similarity searches without reaching Qdrant or PostgreSQL:
+- export_alumni_snapshot.py writes the file from Qdrant (or PostgreSQL)
+- Workers np.memmap it at startup (ALUMNI_SNAPSHOT_PATH); the OS page cache
+  shares one copy between all uvicorn workers
+- search() scores the same (alumni_id, vector, metadata) data that
+  find_similar_alumni_fallback uses, vectorized over the whole matrix
+
+File layout (little-endian, every section starts on a 64-byte boundary):
+    header      magic, format version, vector schema version, count, dim,
+                vocabulary length, created_at
+    vocabulary  JSON: {"majors": [...], "company_tiers": [...],
+                       "placement_statuses": [...]}
+    ids         int64[count]
+    vectors     float32[count, dim]
+    norms       float32[count]   (precomputed L2 norms)
+    major       uint16[count]    (index into vocabulary["majors"])
+    tier        uint8[count]     (index into vocabulary["company_tiers"])
+    placement   uint8[count]     (index into vocabulary["placement_statuses"])
+    grad_year   uint16[count]
+    outcome     float32[count]
+"""
+
+import json
+import logging
+import os
+import struct
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.similarity_service import (
+    cosine_similarity_batch,
+    ensemble_similarity_batch,
+    fused_similarity_batch
+)
+from app.services.vector_schema import get_vector_subspaces
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_MAGIC = b"TRJALUMV"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# magic, format version, vector version, count, dim, vocabulary bytes, created_at
+_HEADER = struct.Struct("<8sHHQIId")
+_ALIGNMENT = 64
+
+# Rows scored per step, bounds the float64 working set of a search
+SEARCH_CHUNK_ROWS = 65536
+
+
+def _aligned(offset: int) -> int:
+    """Round an offset up to the section alignment."""
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _section_layout(vocab_bytes: int, count: int, dim: int) -> List[Tuple[str, np.dtype, tuple, int]]:
+    """
+    Compute (name, dtype, shape, offset) of every array section.
+    
+    Shared by the writer and the reader so both always agree on offsets.
+    """
+    sections = [
+        ('ids', np.dtype('<i8'), (count,)),
+        ('vectors', np.dtype('<f4'), (count, dim)),
+        ('norms', np.dtype('<f4'), (count,)),
+        ('major', np.dtype('<u2'), (count,)),
+        ('tier', np.dtype('u1'), (count,)),
+        ('placement', np.dtype('u1'), (count,)),
+        ('graduation_year', np.dtype('<u2'), (count,)),
+        ('outcome_score', np.dtype('<f4'), (count,)),
+    ]
+    
+    layout = []
+    offset = _aligned(_HEADER.size + vocab_bytes)
+    for name, dtype, shape in sections:
+        layout.append((name, dtype, shape, offset))
+        offset = _aligned(offset + dtype.itemsize * int(np.prod(shape)))
+    
+    return layout
+
+
+def _encode_column(values: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Dictionary-encode a string column into (vocabulary, codes)."""
+    vocabulary = sorted(set(values))
+    index = {value: code for code, value in enumerate(vocabulary)}
+    return vocabulary, np.array([index[value] for value in values], dtype=np.int64)
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def write_alumni_snapshot(
+    path: str,
+    alumni_vectors: List[Tuple[int, np.ndarray, Dict]],
+    vector_version: int
+) -> Dict:
+    """
+    Write alumni vectors and compact metadata to a snapshot file.
+    
+    The file is written next to `path` and renamed into place, so workers
+    never map a half-written snapshot.
+    
+    Args:
+        path: Destination file path
+        alumni_vectors: List of (alumni_id, vector, metadata) tuples, the same
+                        format find_similar_alumni_fallback takes
+        vector_version: Vector schema version of the vectors
+    
+    Returns:
+        dict: Summary with keys: path, count, dim, vector_version, bytes
+    
+    Raises:
+        ValueError: If vectors have inconsistent dimensions
+    """
+    count = len(alumni_vectors)
+    dims = {len(vector) for _, vector, _ in alumni_vectors}
+    if len(dims) > 1:
+        raise ValueError(f"Inconsistent vector dimensions: {sorted(dims)}")
+    dim = dims.pop() if dims else 0
+    
+    ids = np.array([alumni_id for alumni_id, _, _ in alumni_vectors], dtype='<i8')
+    vectors = np.array(
+        [np.asarray(vector, dtype=np.float32) for _, vector, _ in alumni_vectors],
+        dtype='<f4'
+    ).reshape(count, dim)
+    metadata = [meta for _, _, meta in alumni_vectors]
+    
+    majors, major_codes = _encode_column([m.get('major') or '' for m in metadata])
+    tiers, tier_codes = _encode_column([m.get('company_tier') or '' for m in metadata])
+    statuses, status_codes = _encode_column([m.get('placement_status') or '' for m in metadata])
+    if len(majors) > np.iinfo(np.uint16).max or max(len(tiers), len(statuses)) > np.iinfo(np.uint8).max:
+        raise ValueError("Too many distinct metadata values for the snapshot format")
+    
+    columns = {
+        'ids': ids,
+        'vectors': vectors,
+        'norms': np.linalg.norm(vectors.astype(np.float64), axis=1).astype('<f4'),
+        'major': major_codes.astype('<u2'),
+        'tier': tier_codes.astype('u1'),
+        'placement': status_codes.astype('u1'),
+        'graduation_year': np.array(
+            [int(m.get('graduation_year') or 0) for m in metadata], dtype='<u2'
+        ),
+        'outcome_score': np.array(
+            [float(m.get('outcome_score') or 0.0) for m in metadata], dtype='<f4'
+        ),
+    }
+    
+    vocabulary = json.dumps({
+        'majors': majors,
+        'company_tiers': tiers,
+        'placement_statuses': statuses
+    }).encode('utf-8')
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.alumni_snapshot_', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, vector_version,
+                count, dim, len(vocabulary), time.time()
+            ))
+            f.write(vocabulary)
+            
+            for name, dtype, shape, offset in _section_layout(len(vocabulary), count, dim):
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+            
+            size = f.tell()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    
+    logger.info(f"Wrote alumni snapshot {path}: {count} vectors x {dim} dims (v{vector_version})")
+    
+    return {
+        'path': path,
+        'count': count,
+        'dim': dim,
+        'vector_version': vector_version,
+        'bytes': size
+    }
+
+
+# ============================================================================
+# MEMORY-MAPPED READER
+# ============================================================================
+
+class AlumniSnapshot:
+    """
+    Read-only, memory-mapped alumni snapshot.
+    
+    All arrays are views into a single np.memmap, so opening a snapshot only
+    reads the header and vocabulary; vector pages are loaded on first use
+    and shared between processes through the OS page cache.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+        
+        Args:
+            path: Snapshot file path
+        
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        self.path = path
+        
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path} is too small to be an alumni snapshot")
+            (magic, format_version, self.vector_version, self.count,
+             self.dim, vocab_bytes, self.created_at) = _HEADER.unpack(header)
+            
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not an alumni snapshot")
+            if format_version != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot format version: {format_version}")
+            
+            vocabulary = json.loads(f.read(vocab_bytes).decode('utf-8'))
+        
+        self.majors: List[str] = vocabulary['majors']
+        self.company_tiers: List[str] = vocabulary['company_tiers']
+        self.placement_statuses: List[str] = vocabulary['placement_statuses']
+        self._major_codes = {major: code for code, major in enumerate(self.majors)}
+        
+        layout = _section_layout(vocab_bytes, self.count, self.dim)
+        name, dtype, shape, offset = layout[-1]
+        expected_size = offset + dtype.itemsize * int(np.prod(shape))
+        if os.path.getsize(path) < expected_size:
+            raise ValueError(f"{path} is truncated")
+        
+        self._buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        for name, dtype, shape, offset in layout:
+            setattr(self, name, np.ndarray(shape, dtype=dtype, buffer=self._buffer, offset=offset))
+        
+        logger.info(f"Mapped alumni snapshot {path}: {self.count} vectors x {self.dim} dims "
+                   f"(v{self.vector_version})")
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def iter_records(self):
+        """Yield (alumni_id, vector, metadata) tuples, as used by the fallback search."""
+        for row in range(self.count):
+            yield int(self.ids[row]), np.asarray(self.vectors[row]), self._metadata(row)
+    
+    def _metadata(self, row: int) -> Dict:
+        """Build the result metadata for one row."""
+        return {
+            'name': '',
+            'major': self.majors[self.major[row]],
+            'graduation_year': int(self.graduation_year[row]),
+            'company_tier': self.company_tiers[self.tier[row]],
+            'salary_range': '',
+            'placement_status': self.placement_statuses[self.placement[row]],
+            'outcome_score': float(self.outcome_score[row])
+        }
+    
+    def search(
+        self,
+        student_vector: np.ndarray,
+        major: Optional[str] = None,
+        top_k: int = 5,
+        use_ensemble: bool = True,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[Dict]:
+        """
+        Find the most similar alumni in the snapshot.
+        
+        Same scores and ordering as find_similar_alumni_fallback over the
+        snapshot records; name and salary_range are not stored and come back
+        empty. With weights, and a snapshot version that has sub-vectors,
+        rows are ranked by fused_similarity_batch instead.
+        
+        Args:
+            student_vector: Student vector (must match the snapshot dimension)
+            major: Optional major filter
+            top_k: Number of results to return
+            use_ensemble: If True, use ensemble similarity (default: True)
+            weights: Optional subspace weights for fused similarity
+        
+        Returns:
+            List of similar alumni (same format as Qdrant search)
+        """
+        student_vector = np.asarray(student_vector, dtype=np.float64)
+        if student_vector.shape != (self.dim,):
+            logger.error(f"Invalid vector dimension: {student_vector.shape}, expected {self.dim}")
+            return []
+        
+        if major:
+            code = self._major_codes.get(major)
+            if code is None:
+                return []
+            candidates = np.flatnonzero(self.major == code)
+        else:
+            candidates = np.arange(self.count)
+        
+        if candidates.size == 0 or top_k <= 0:
+            return []
+        
+        subspaces = get_vector_subspaces(self.vector_version) if weights else None
+        
+        scores = np.empty(candidates.size)
+        for start in range(0, candidates.size, SEARCH_CHUNK_ROWS):
+            rows = candidates[start:start + SEARCH_CHUNK_ROWS]
+            if subspaces:
+                scores[start:start + rows.size] = fused_similarity_batch(
+                    student_vector, self.vectors[rows], weights, subspaces
+                )
+            elif use_ensemble:
+                scores[start:start + rows.size] = ensemble_similarity_batch(
+                    student_vector, self.vectors[rows], self.norms[rows]
+                )
+            else:
+                scores[start:start + rows.size] = cosine_similarity_batch(
+                    student_vector, self.vectors[rows], self.norms[rows]
+                )
+        
+        # Top K, ties kept in file order (like the stable sort of the fallback)
+        if top_k < candidates.size:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            threshold = scores[best].min()
+            best = np.flatnonzero(scores >= threshold)
+        else:
+            best = np.arange(candidates.size)
+        best = best[np.lexsort((best, -scores[best]))][:top_k]
+        
+        results = []
+        for position in best:
+            row = int(candidates[position])
+            result = {'alumni_id': int(self.ids[row]), 'similarity_score': float(scores[position])}
+            result.update(self._metadata(row))
+            results.append(result)
+        
+        return results
+
+
+# ============================================================================
+# PROCESS-WIDE SNAPSHOT
+# ============================================================================
+
+_alumni_snapshot: Optional[AlumniSnapshot] = None
+
+
+def load_alumni_snapshot(path: Optional[str] = None) -> Optional[AlumniSnapshot]:
+    """
+    Map the alumni snapshot for this process.
+    
+    Args:
+        path: Snapshot path (default: ALUMNI_SNAPSHOT_PATH environment variable)
+    
+    Returns:
+        AlumniSnapshot, or None if no path is configured or the file is unusable
+    """
+    global _alumni_snapshot
+    
+    path = path or os.getenv("ALUMNI_SNAPSHOT_PATH")
+    if not path:
+        return None
+    
+    try:
+        _alumni_snapshot = AlumniSnapshot(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Alumni snapshot unavailable: {e}")
+        _alumni_snapshot = None
+    
+    return _alumni_snapshot
+
+
+def get_alumni_snapshot() -> Optional[AlumniSnapshot]:
+    """Get the alumni snapshot mapped by this process, if any."""
+    return _alumni_snapshot
@@ -3,15 +3,15 @@ Alumni Vector Generation Service
 
 This service handles vector generation for imported alumni records.
 It integrates with:
-- Vector generation service (generate_alumni_vector)
+- Vector schema registry (generate_alumni_vector_for_version)
 - Qdrant service (store_alumni_vector)
 - PostgreSQL (update vector_id reference)
 
 Key responsibilities:
-1. Generate 15-dimensional vectors from alumni profiles
+1. Generate vectors from alumni profiles (one per schema version being written)
 2. Calculate outcome scores from placement data
-3. Store vectors in Qdrant with metadata
-4. Update PostgreSQL with vector references
+3. Store vectors in Qdrant with metadata (dual-write during re-indexing)
+4. Update PostgreSQL with versioned vector references
 5. Handle batch processing for CSV imports
 """
 
@@ -21,8 +21,13 @@ from sqlalchemy.orm import Session
 import numpy as np
 
 from app.models import Alumni, CompanyTierEnum, PlacementStatusEnum
-from app.services.vector_generation import generate_alumni_vector
 from app.services.qdrant_service import QdrantService
+from app.services.vector_schema import (
+    DEFAULT_VECTOR_VERSION,
+    format_vector_id,
+    generate_alumni_vector_for_version,
+    set_vector_references
+)
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +105,8 @@ class AlumniVectorService:
     def generate_vector_for_alumni(
         self,
         alumni: Alumni,
-        db: Session
+        db: Session,
+        version: int = DEFAULT_VECTOR_VERSION
     ) -> Optional[np.ndarray]:
         """
         Generate vector for a single alumni record.
@@ -108,9 +114,10 @@ class AlumniVectorService:
         Args:
             alumni: Alumni database model instance
             db: Database session
+            version: Vector schema version (default: 1, the 15-dimensional layout)
         
         Returns:
-            15-dimensional numpy array or None if generation fails
+            Numpy array or None if generation fails
         """
         try:
             # Build profile dict for vector generation
@@ -125,50 +132,59 @@ class AlumniVectorService:
             # For MVP, alumni don't have detailed skill data
             skills = None
             
-            # Generate vector using vector generation service
-            vector = generate_alumni_vector(profile, skills=skills)
+            # Generate vector using the generator of the requested schema version
+            vector = generate_alumni_vector_for_version(version, profile, skills=skills)
             
-            logger.info(f"Generated vector for alumni {alumni.id} ({alumni.name})")
+            logger.info(f"Generated v{version} vector for alumni {alumni.id} ({alumni.name})")
             return vector
         
         except Exception as e:
             logger.error(f"Error generating vector for alumni {alumni.id}: {e}")
             return None
     
+    def build_metadata(self, alumni: Alumni, outcome_score: float) -> Dict:
+        """Build the Qdrant metadata for an alumni record."""
+        return {
+            'name': alumni.name,
+            'major': alumni.major,
+            'graduation_year': alumni.graduation_year,
+            'company_tier': alumni.company_tier.value if alumni.company_tier else '',
+            'salary_range': alumni.salary_range or '',
+            'placement_status': alumni.placement_status.value,
+            'outcome_score': outcome_score,
+            # Row version the vector was built from (checked by the reconciler)
+            'source_updated_at': alumni.updated_at.isoformat() if alumni.updated_at else None
+        }
+    
     def store_alumni_vector_in_qdrant(
         self,
         alumni: Alumni,
         vector: np.ndarray,
-        outcome_score: float
+        outcome_score: float,
+        version: Optional[int] = None
     ) -> bool:
         """
         Store alumni vector in Qdrant with metadata.
         
         Args:
             alumni: Alumni database model instance
-            vector: 15-dimensional numpy array
+            vector: Numpy array matching the schema version
             outcome_score: Calculated outcome score (0-100)
+            version: Vector schema version (default: active version)
         
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             # Build metadata for Qdrant
-            metadata = {
-                'name': alumni.name,
-                'major': alumni.major,
-                'graduation_year': alumni.graduation_year,
-                'company_tier': alumni.company_tier.value if alumni.company_tier else '',
-                'salary_range': alumni.salary_range or '',
-                'placement_status': alumni.placement_status.value,
-                'outcome_score': outcome_score
-            }
+            metadata = self.build_metadata(alumni, outcome_score)
             
             # Store in Qdrant
             success = self.qdrant.store_alumni_vector(
                 alumni_id=alumni.id,
                 vector=vector,
-                metadata=metadata
+                metadata=metadata,
+                version=version
             )
             
             if success:
@@ -185,7 +201,8 @@ class AlumniVectorService:
     def update_alumni_vector_reference(
         self,
         alumni: Alumni,
-        db: Session
+        db: Session,
+        version: int = DEFAULT_VECTOR_VERSION
     ) -> bool:
         """
         Update alumni record in PostgreSQL with vector reference.
@@ -193,13 +210,18 @@ class AlumniVectorService:
         Args:
             alumni: Alumni database model instance
             db: Database session
+            version: Schema version of the stored vector
         
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Store vector ID reference (same as alumni ID)
-            alumni.vector_id = f"alumni_{alumni.id}"
+            # Store vector ID reference (alumni ID + schema version)
+            set_vector_references(
+                db, Alumni,
+                {alumni.id: format_vector_id("alumni", alumni.id, version)},
+                instances=[alumni]
+            )
             db.commit()
             
             logger.info(f"Updated vector reference for alumni {alumni.id}")
@@ -220,9 +242,10 @@ class AlumniVectorService:
         
         This method:
         1. Calculates outcome score
-        2. Generates vector
-        3. Stores in Qdrant
-        4. Updates PostgreSQL reference
+        2. Generates one vector per schema version being written
+           (active version plus any version being backfilled)
+        3. Stores them in Qdrant
+        4. Updates PostgreSQL reference (active version)
         
         Args:
             alumni: Alumni database model instance
@@ -256,27 +279,37 @@ class AlumniVectorService:
             logger.info(f"Alumni {alumni.id} ({alumni.name}): "
                        f"Outcome score = {outcome_score}")
             
-            # Step 2: Generate vector
-            vector = self.generate_vector_for_alumni(alumni, db)
+            # Step 2 + 3: Generate and store a vector for every write version
+            write_versions = self.qdrant.get_write_versions("alumni")
+            active_version = write_versions[0]
             
-            if vector is None:
-                result['error'] = "Vector generation failed"
-                return result
+            for version in write_versions:
+                vector = self.generate_vector_for_alumni(alumni, db, version)
+                
+                if vector is None:
+                    if version == active_version:
+                        result['error'] = "Vector generation failed"
+                        return result
+                    continue
+                
+                vector_stored = self.store_alumni_vector_in_qdrant(
+                    alumni,
+                    vector,
+                    outcome_score,
+                    version=version
+                )
+                if version == active_version:
+                    result['vector_stored'] = vector_stored
             
-            # Step 3: Store in Qdrant
-            vector_stored = self.store_alumni_vector_in_qdrant(
-                alumni,
-                vector,
-                outcome_score
-            )
-            result['vector_stored'] = vector_stored
-            
-            if not vector_stored:
+            if not result['vector_stored']:
+                # Leave vector_id unset so the reconciler stores it later
                 logger.warning(f"Qdrant storage failed for alumni {alumni.id}, "
-                             "but continuing (fallback available)")
+                             "but continuing (reconciler will retry)")
+                result['success'] = True
+                return result
             
             # Step 4: Update PostgreSQL reference
-            reference_updated = self.update_alumni_vector_reference(alumni, db)
+            reference_updated = self.update_alumni_vector_reference(alumni, db, active_version)
             
             if not reference_updated:
                 result['error'] = "Failed to update PostgreSQL reference"
@@ -0,0 +1,359 @@
+"""
+Analytics Executor for Trajectory Engine MVP
+
+Runs the heavy population-wide analyses outside request handlers:
+
+- correlations: rebuild of the streaming behavioral correlation statistics
+- at_risk_sweep: at-risk flags of every student (stored in at_risk_flags)
+- gap_aggregates: per-metric distribution of the stored gap analyses
+
+Each analysis is a job. A background thread loads the input columns from
+the database, places them in shared memory and hands the NumPy computation
+to a process pool, so the work neither blocks the event loop nor holds
+the GIL of the API process (the correlations job instead rebuilds the
+statistics that BehavioralAnalysisService.calculate_correlations reads,
+which is a single pass over the matrix). Finished results are stored in
+analytics_snapshots ("analytics:<kind>") with an increasing version and
+cached in memory; API handlers only read them (get_result).
+
+Jobs are kept in memory; each job dict has keys:
+    - job_id (str)
+    - kind (str)
+    - status (str): queued, running, completed, failed
+    - version (int, once completed)
+    - error (str, optional)
+    - submitted_at / finished_at (ISO timestamps)
+"""
+
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import AnalyticsSnapshot, GapAnalysis
+from app.services.behavioral_analysis_service import BehavioralAnalysisService, get_behavioral_analysis_service
+
+logger = logging.getLogger(__name__)
+
+
+ANALYSIS_KINDS = ('correlations', 'at_risk_sweep', 'gap_aggregates')
+
+# analytics_snapshots name of an analysis result
+SNAPSHOT_PREFIX = "analytics:"
+
+# (name, shape, dtype) of an array placed in shared memory
+ArrayDescriptor = Tuple[str, Tuple[int, ...], str]
+
+
+# ============================================================================
+# SHARED MEMORY
+# ============================================================================
+
+@contextmanager
+def shared_arrays(arrays: List[np.ndarray]):
+    """
+    Copy arrays into shared memory blocks for the duration of the block.
+    
+    Yields:
+        list: One ArrayDescriptor per array (picklable, see attach_array)
+    """
+    blocks = []
+    try:
+        descriptors = []
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            descriptors.append((block.name, array.shape, array.dtype.str))
+        yield descriptors
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+@contextmanager
+def attach_array(descriptor: ArrayDescriptor):
+    """Read-only view of an array shared by shared_arrays (in a worker process)."""
+    name, shape, dtype = descriptor
+    # Pool workers share the creating process's resource tracker, which
+    # unregisters the block when shared_arrays unlinks it
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        yield array
+        del array
+    finally:
+        block.close()
+
+
+# ============================================================================
+# WORKER FUNCTIONS (run in the process pool; module level so they pickle)
+# ============================================================================
+
+def _compute_at_risk_flags(metrics: ArrayDescriptor) -> List[List[Dict[str, Any]]]:
+    with attach_array(metrics) as data:
+        return BehavioralAnalysisService()._evaluate_at_risk_flags(data)
+
+
+def _compute_gap_aggregates(codes: ArrayDescriptor, gaps: ArrayDescriptor, names: List[str]) -> Dict[str, Any]:
+    with attach_array(codes) as metric_codes, attach_array(gaps) as values:
+        return gap_aggregates(metric_codes, values, names)
+
+
+def gap_aggregates(metric_codes: np.ndarray, gaps: np.ndarray, names: List[str]) -> Dict[str, Any]:
+    """
+    Distribution of the gap percentage of every gap metric.
+    
+    Args:
+        metric_codes: Index into names of each gap row
+        gaps: Gap percentage of each row (NaN when missing)
+        names: Metric names
+    
+    Returns:
+        dict: metric -> {'count', 'mean', 'median', 'p90'}
+    """
+    aggregates = {}
+    for code, name in enumerate(names):
+        values = gaps[(metric_codes == code) & np.isfinite(gaps)]
+        if not len(values):
+            continue
+        median, p90 = np.quantile(values, [0.5, 0.9])
+        aggregates[name] = {
+            'count': int(len(values)),
+            'mean': round(float(values.mean()), 2),
+            'median': round(float(median), 2),
+            'p90': round(float(p90), 2)
+        }
+    return aggregates
+
+
+# ============================================================================
+# EXECUTOR
+# ============================================================================
+
+class AnalyticsExecutor:
+    """Runs analysis jobs in a process pool and serves their latest results."""
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        cache_seconds: float = 60.0
+    ):
+        """
+        Initialize analytics executor.
+        
+        Args:
+            max_workers: Worker processes (default: number of CPUs)
+            session_factory: Callable returning a new database session
+            cache_seconds: How long a result read from the database is
+                           served from memory before checking for a newer
+                           version (results computed in this process are
+                           cached immediately)
+        """
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self.cache_seconds = cache_seconds
+        self.jobs: Dict[str, Dict] = {}
+        self._results: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: workers must not inherit the API process's DB
+                # connections and threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+    
+    def shutdown(self):
+        """Stop the worker processes (called on application shutdown)."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+    
+    def submit(self, kind: str) -> Dict:
+        """
+        Start an analysis in the background.
+        
+        A job of the same kind that is still queued or running is returned
+        instead of starting another one.
+        
+        Returns:
+            dict: The job (see module docstring)
+        
+        Raises:
+            ValueError: If the kind is unknown
+        """
+        if kind not in ANALYSIS_KINDS:
+            raise ValueError(f"Unknown analysis: {kind}")
+        
+        with self._lock:
+            for job in self.jobs.values():
+                if job['kind'] == kind and job['status'] in ('queued', 'running'):
+                    return job
+            
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'kind': kind,
+                'status': 'queued',
+                'version': None,
+                'submitted_at': datetime.utcnow().isoformat(),
+                'finished_at': None
+            }
+            self.jobs[job['job_id']] = job
+        
+        thread = threading.Thread(
+            target=self.run_job,
+            args=(job,),
+            name=f"analytics-{kind}-{job['job_id'][:8]}",
+            daemon=True
+        )
+        thread.start()
+        
+        logger.info(f"Submitted analytics job {job['job_id']} ({kind})")
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get an analytics job by ID."""
+        return self.jobs.get(job_id)
+    
+    def run_job(self, job: Dict) -> Dict:
+        """
+        Run an analytics job to completion (called in the background thread).
+        
+        Returns:
+            dict: The finished job
+        """
+        job['status'] = 'running'
+        db = self.session_factory()
+        
+        try:
+            result = getattr(self, f"_run_{job['kind']}")(db)
+            job['version'] = self._store_result(db, job['kind'], result)
+            job['status'] = 'completed'
+            logger.info(f"Analytics job {job['job_id']} ({job['kind']}) completed: v{job['version']}")
+        
+        except Exception as e:
+            logger.error(f"Analytics job {job['job_id']} ({job['kind']}) failed: {e}")
+            db.rollback()
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        
+        finally:
+            db.close()
+            job['finished_at'] = datetime.utcnow().isoformat()
+        
+        return job
+    
+    def _run_correlations(self, db: Session) -> Dict[str, Any]:
+        return get_behavioral_analysis_service().refresh_correlations(db)
+    
+    def _run_at_risk_sweep(self, db: Session) -> Dict[str, Any]:
+        service = get_behavioral_analysis_service()
+        swept_at = datetime.utcnow()
+        student_ids, metrics = service._load_at_risk_matrix(db)
+        with shared_arrays([metrics]) as (shared_metrics,):
+            student_flags = self._get_pool().submit(_compute_at_risk_flags, shared_metrics).result()
+        
+        summary = service.store_at_risk_flags(db, student_ids, student_flags, swept_at)
+        return {**summary, 'swept_at': swept_at.isoformat()}
+    
+    def _run_gap_aggregates(self, db: Session) -> Dict[str, Any]:
+        rows = db.query(GapAnalysis.metric_name, GapAnalysis.gap_percentage).all()
+        names = sorted({name for name, _ in rows if name})
+        codes = {name: code for code, name in enumerate(names)}
+        metric_codes = np.array([codes.get(name, -1) for name, _ in rows], dtype=np.int64)
+        gaps = np.array([np.nan if gap is None else gap for _, gap in rows], dtype=np.float64)
+        
+        with shared_arrays([metric_codes, gaps]) as (shared_codes, shared_gaps):
+            return self._get_pool().submit(_compute_gap_aggregates, shared_codes, shared_gaps, names).result()
+    
+    def _store_result(self, db: Session, kind: str, result: Dict[str, Any]) -> int:
+        """Save a result as the next version of its snapshot and cache it."""
+        name = SNAPSHOT_PREFIX + kind
+        snapshot = db.query(AnalyticsSnapshot).filter(AnalyticsSnapshot.name == name).with_for_update().first()
+        if snapshot is None:
+            snapshot = AnalyticsSnapshot(name=name, payload={})
+            db.add(snapshot)
+        
+        version = int((snapshot.payload or {}).get('version', 0)) + 1
+        snapshot.payload = {'version': version, 'result': result}
+        snapshot.sample_size = result.get('sample_size', result.get('students_evaluated', 0))
+        snapshot.computed_at = datetime.utcnow()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker stored the first version concurrently; store on top of it
+            db.rollback()
+            return self._store_result(db, kind, result)
+        
+        self._cache(kind, self._result_from_snapshot(kind, snapshot))
+        return version
+    
+    def _cache(self, kind: str, result: Dict[str, Any]):
+        with self._lock:
+            self._results[kind] = (datetime.utcnow().timestamp(), result)
+    
+    def _result_from_snapshot(self, kind: str, snapshot: AnalyticsSnapshot) -> Dict[str, Any]:
+        return {
+            'kind': kind,
+            'version': snapshot.payload['version'],
+            'computed_at': snapshot.computed_at,
+            'result': snapshot.payload['result']
+        }
+    
+    def get_result(self, db: Session, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        Latest finished result of an analysis (never computes).
+        
+        Returns:
+            dict: {'kind', 'version', 'computed_at', 'result'}, None if the
+            analysis has not run yet
+        
+        Raises:
+            ValueError: If the kind is unknown
+        """
+        if kind not in ANALYSIS_KINDS:
+            raise ValueError(f"Unknown analysis: {kind}")
+        
+        with self._lock:
+            cached = self._results.get(kind)
+        if cached is not None and datetime.utcnow().timestamp() - cached[0] < self.cache_seconds:
+            return cached[1]
+        
+        snapshot = db.query(AnalyticsSnapshot).filter(
+            AnalyticsSnapshot.name == SNAPSHOT_PREFIX + kind
+        ).first()
+        if snapshot is None:
+            return None
+        
+        result = self._result_from_snapshot(kind, snapshot)
+        self._cache(kind, result)
+        return result
+
+
+_analytics_executor: Optional[AnalyticsExecutor] = None
+
+def get_analytics_executor() -> AnalyticsExecutor:
+    global _analytics_executor
+    if _analytics_executor is None:
+        _analytics_executor = AnalyticsExecutor()
+    return _analytics_executor
@@ -2,31 +2,96 @@
 Behavioral Analysis Service - Task 22
 
 Analyzes digital wellbeing patterns to identify correlations with academic success.
-Uses statistical analysis (NumPy/Pandas) - NO LLM.
+Uses statistical analysis (NumPy) - NO LLM.
+
+Cohort-wide correlations are served from streaming statistics (running
+co-moments and quantile sketches, see behavioral_stats.py) updated on every
+wellbeing ingest, and rebuilt set-based (one SQL statement, vectorized NumPy)
+when missing or stale. The at-risk sweep evaluates every student's 7-day
+averages from one grouped query with vectorized threshold masks.
+
+Students without any wellbeing days yet enter both with their survey
+baseline (WellbeingBaseline) as a prior, replaced by their own averages
+once days arrive. The alumni comparison gets the same prior through the
+feature store, as do the cohort benchmarks.
 """
 
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from collections import Counter
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, case, exists, func, insert, select, union_all, update
+from sqlalchemy.exc import IntegrityError
 import numpy as np
-import pandas as pd
 
-from app.models import Student, DigitalWellbeingData, TrajectoryScore
+from app.models import (
+    Student,
+    DigitalWellbeingData,
+    TrajectoryScore,
+    AnalyticsSnapshot,
+    AtRiskFlagRecord,
+    BehavioralStatMember,
+    BehavioralStatCell,
+    WellbeingBaseline
+)
+from app.services.wellbeing_rollup_service import get_wellbeing_rollup_service
+from app.services.feature_store import get_feature_store
+from app.services.cohort_benchmark_service import get_cohort_benchmark_service
+from app.services.behavioral_stats import (
+    GPA_GRID,
+    SKETCH_GRIDS,
+    STAT_COLUMNS,
+    RunningMoments,
+    grid_value,
+    sketch_cells,
+    weighted_quantiles
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _has_no_days():
+    """Condition on WellbeingBaseline: the student has no wellbeing days yet (baseline is the prior)."""
+    return ~exists().where(DigitalWellbeingData.student_id == WellbeingBaseline.student_id)
+
+
 class BehavioralAnalysisService:
     """Analyze behavioral patterns and correlations."""
     
-    def __init__(self):
+    # Name of the streaming correlation statistics in analytics_snapshots
+    CORRELATION_SNAPSHOT = "behavioral_correlation_stats"
+    
+    # Column order of the correlation input matrix
+    CORRELATION_COLUMNS = ('student_id', 'gpa', 'attendance', 'screen_time', 'focus_score', 'sleep', 'trajectory_score')
+    
+    # Column order of the at-risk input matrix (7-day averages and trend)
+    AT_RISK_COLUMNS = ('screen_time', 'social_media', 'focus_score', 'sleep', 'gpa_trend')
+    
+    def __init__(self, snapshot_max_age_seconds: float = 86400.0):
+        """
+        Initialize behavioral analysis service.
+        
+        Args:
+            snapshot_max_age_seconds: Rebuild the streaming statistics from scratch
+                                      once they are this old (corrects drift from
+                                      writes that bypassed record_student_update)
+        """
+        self.snapshot_max_age = timedelta(seconds=snapshot_max_age_seconds)
+        self._refresh_lock = threading.Lock()
         logger.info("Behavioral analysis service initialized")
     
     def calculate_correlations(self, db: Session) -> Dict[str, Any]:
         """
-        Calculate correlations between behavioral metrics and academic performance.
+        Get correlations between behavioral metrics and academic performance.
+        
+        Read from the streaming statistics (running co-moments and quantile
+        sketches), which record_student_update keeps current on every
+        wellbeing ingest, so the cost does not grow with the population.
+        Never rebuilds them: that is the analytics executor's correlations
+        job (see needs_refresh). Until the first rebuild, returns the
+        defaults.
         
         Returns:
             dict: {
@@ -37,103 +102,400 @@ class BehavioralAnalysisService:
                 'optimal_ranges': dict
             }
         """
-        logger.info("Calculating behavioral correlations")
+        snapshot = self._get_stats(db)
+        if snapshot is None:
+            return self._get_default_correlations()
         
-        # Get all students with behavioral data
-        students_query = db.query(
-            Student.id,
-            Student.gpa,
-            Student.attendance,
-            func.avg(DigitalWellbeingData.screen_time_hours).label('avg_screen_time'),
-            func.avg(DigitalWellbeingData.focus_score).label('avg_focus_score'),
-            func.avg(DigitalWellbeingData.sleep_duration_hours).label('avg_sleep')
-        ).join(
-            DigitalWellbeingData,
-            Student.id == DigitalWellbeingData.student_id
-        ).group_by(
-            Student.id
-        ).all()
+        return self._correlations_from_stats(db, RunningMoments.from_dict(snapshot.payload))
+    
+    def needs_refresh(self, db: Session) -> bool:
+        """
+        Whether the streaming statistics are missing or older than
+        snapshot_max_age and should be rebuilt (refresh_correlations).
+        """
+        snapshot = self._get_stats(db)
+        return snapshot is None or datetime.utcnow() - snapshot.computed_at > self.snapshot_max_age
+    
+    def _get_stats(self, db: Session) -> Optional[AnalyticsSnapshot]:
+        """Load the statistics row (None before the first rebuild)."""
+        return db.query(AnalyticsSnapshot).filter(
+            AnalyticsSnapshot.name == self.CORRELATION_SNAPSHOT
+        ).first()
+    
+    def refresh_correlations(self, db: Session) -> Dict[str, Any]:
+        """
+        Rebuild the streaming statistics from the full population.
+        
+        Returns:
+            dict: Correlations (see calculate_correlations)
+        """
+        with self._refresh_lock:
+            snapshot = self._lock_stats(db)
+            if snapshot is None:
+                snapshot = AnalyticsSnapshot(name=self.CORRELATION_SNAPSHOT, payload={})
+                db.add(snapshot)
+            
+            data = self._load_correlation_matrix(db)
+            data = data[np.isfinite(data).all(axis=1)]
+            columns = [self.CORRELATION_COLUMNS.index(name) for name in STAT_COLUMNS]
+            moments = RunningMoments.from_matrix(data[:, columns])
+            
+            db.query(BehavioralStatMember).delete(synchronize_session=False)
+            db.query(BehavioralStatCell).delete(synchronize_session=False)
+            
+            members = [self._member_values(row) for row in data]
+            if members:
+                db.execute(insert(BehavioralStatMember), [
+                    {'student_id': student_id, **values} for student_id, values in members
+                ])
+                cells = Counter(cell for _, values in members for cell in sketch_cells(values))
+                db.execute(insert(BehavioralStatCell), [
+                    {'metric': metric, 'gpa_cell': gpa_cell, 'value_cell': value_cell, 'count': count}
+                    for (metric, gpa_cell, value_cell), count in cells.items()
+                ])
+            
+            snapshot.payload = moments.to_dict()
+            snapshot.sample_size = moments.count
+            snapshot.computed_at = datetime.utcnow()
+            
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker created the statistics first; theirs are as fresh
+                db.rollback()
+        
+        logger.info(f"Rebuilt behavioral statistics for {moments.count} students")
+        return self._correlations_from_stats(db, moments)
+    
+    def record_student_update(self, db: Session, student_id: int) -> bool:
+        """
+        Apply one student's new wellbeing data, GPA or trajectory score to the
+        streaming statistics.
+        
+        The student's previous contribution is removed and the current one
+        added, so the cost is one student's rows whatever the population
+        size. Never raises: a failed update is corrected by the next rebuild.
+        
+        Args:
+            db: Database session (committed by this method)
+            student_id: Student whose data changed
+        
+        Returns:
+            bool: True if the statistics were updated or already current
+        """
+        return self.record_students_update(db, [student_id])
+    
+    def record_students_update(self, db: Session, student_ids: List[int]) -> bool:
+        """
+        Same as record_student_update for several students (e.g. one import
+        chunk) in one transaction: the statistics row is locked, and the
+        changed students' rows loaded, once for all of them.
+        
+        Args:
+            db: Database session (committed by this method)
+            student_ids: Students whose data changed
+        
+        Returns:
+            bool: True if the statistics were updated or already current
+        """
+        if not student_ids:
+            return True
+        try:
+            snapshot = self._lock_stats(db)
+            if snapshot is None:
+                # Built from scratch by the next correlations job
+                db.rollback()
+                return True
+            
+            data = self._load_correlation_matrix(db, student_ids=student_ids)
+            data = data[np.isfinite(data).all(axis=1)]
+            current = dict(self._member_values(row) for row in data)
+            members = {
+                member.student_id: member
+                for member in db.query(BehavioralStatMember).filter(
+                    BehavioralStatMember.student_id.in_(student_ids)
+                )
+            }
+            
+            moments = None
+            cells = Counter()
+            for student_id in dict.fromkeys(student_ids):
+                member = members.get(student_id)
+                old = {name: getattr(member, name) for name in STAT_COLUMNS} if member else None
+                new = current.get(student_id)
+                if old == new:
+                    continue
+                
+                moments = moments or RunningMoments.from_dict(snapshot.payload)
+                if old is not None:
+                    moments.remove([old[name] for name in STAT_COLUMNS])
+                    cells.subtract(sketch_cells(old))
+                if new is not None:
+                    moments.add([new[name] for name in STAT_COLUMNS])
+                    cells.update(sketch_cells(new))
+                
+                if new is None:
+                    db.delete(member)
+                elif member is None:
+                    db.add(BehavioralStatMember(student_id=student_id, **new))
+                else:
+                    for name, value in new.items():
+                        setattr(member, name, value)
+            
+            if moments is None:
+                db.rollback()
+                return True
+            
+            self._update_cells(db, cells)
+            snapshot.payload = moments.to_dict()
+            snapshot.sample_size = moments.count
+            db.commit()
+            return True
         
-        if len(students_query) < 10:
-            logger.warning(f"Insufficient data for correlation analysis: {len(students_query)} students")
+        except Exception as e:
+            logger.error(f"Failed to update behavioral statistics for students {student_ids}: {e}")
+            db.rollback()
+            return False
+    
+    def _lock_stats(self, db: Session) -> Optional[AnalyticsSnapshot]:
+        """Load the statistics row, locked until commit so updates serialize."""
+        return db.query(AnalyticsSnapshot).filter(
+            AnalyticsSnapshot.name == self.CORRELATION_SNAPSHOT
+        ).with_for_update().first()
+    
+    def _member_values(self, row: np.ndarray):
+        """Split a correlation matrix row into (student_id, {STAT_COLUMNS name: value})."""
+        columns = self.CORRELATION_COLUMNS
+        return int(row[0]), {name: float(row[columns.index(name)]) for name in STAT_COLUMNS}
+    
+    def _update_cells(self, db: Session, deltas: Dict[tuple, int]):
+        """Add deltas to sketch cell counts, creating missing cells."""
+        for (metric, gpa_cell, value_cell), delta in sorted(deltas.items()):
+            if not delta:
+                continue
+            updated = db.execute(
+                update(BehavioralStatCell).where(
+                    BehavioralStatCell.metric == metric,
+                    BehavioralStatCell.gpa_cell == gpa_cell,
+                    BehavioralStatCell.value_cell == value_cell
+                ).values(count=BehavioralStatCell.count + delta)
+            ).rowcount
+            if not updated and delta > 0:
+                db.add(BehavioralStatCell(metric=metric, gpa_cell=gpa_cell,
+                                          value_cell=value_cell, count=delta))
+    
+    def _correlations_from_stats(self, db: Session, moments: RunningMoments) -> Dict[str, Any]:
+        """Build the correlation result from running moments and the quantile sketches."""
+        if moments.count < 10:
+            logger.warning(f"Insufficient complete data: {moments.count} students")
             return self._get_default_correlations()
         
-        # Convert to pandas DataFrame
-        data = []
-        for student in students_query:
-            # Get latest trajectory score
-            trajectory = db.query(TrajectoryScore).filter(
-                TrajectoryScore.student_id == student.id
-            ).order_by(TrajectoryScore.calculated_at.desc()).first()
+        def correlation(col1: str, col2: str) -> float:
+            corr = moments.correlation(STAT_COLUMNS.index(col1), STAT_COLUMNS.index(col2))
+            return round(corr, 3) if corr is not None else 0.0
+        
+        return {
+            'screen_time_vs_gpa': correlation('screen_time', 'gpa'),
+            'focus_score_vs_trajectory': correlation('focus_score', 'trajectory_score'),
+            'sleep_vs_academic': correlation('sleep', 'gpa'),
+            'sample_size': moments.count,
+            'optimal_ranges': self._optimal_ranges_from_sketch(db)
+        }
+    
+    def _optimal_ranges_from_sketch(self, db: Session) -> Dict[str, Dict[str, float]]:
+        """
+        Quartiles of each metric among top-GPA-quartile students, read from
+        the sketch cells (bounded by the grid size, not the population).
+        """
+        cells = np.array(
+            db.query(
+                BehavioralStatCell.gpa_cell,
+                BehavioralStatCell.value_cell,
+                BehavioralStatCell.count,
+                BehavioralStatCell.metric
+            ).filter(BehavioralStatCell.count > 0).all(),
+            dtype=object
+        ).reshape(-1, 4)
+        
+        metrics = [('screen_time', 1), ('focus_score', 2), ('sleep', 1)]
+        
+        # Every member has one cell per metric, so any metric gives the GPA distribution
+        reference = cells[cells[:, 3] == metrics[0][0]]
+        if len(reference) == 0:
+            return self._get_default_optimal_ranges()
+        
+        gpa_values = np.array([grid_value(cell, GPA_GRID) for cell in reference[:, 0]])
+        gpa_counts = reference[:, 2].astype(np.int64)
+        gpa_threshold = weighted_quantiles(gpa_values, gpa_counts, [0.75])[0]
+        
+        optimal_ranges = {}
+        for name, digits in metrics:
+            rows = cells[cells[:, 3] == name]
+            gpa = np.array([grid_value(cell, GPA_GRID) for cell in rows[:, 0]])
+            successful = rows[gpa >= gpa_threshold - 1e-9]
+            counts = successful[:, 2].astype(np.int64)
+            if counts.sum() < 5:
+                return self._get_default_optimal_ranges()
             
-            data.append({
-                'gpa': float(student.gpa) if student.gpa else None,
-                'attendance': float(student.attendance) if student.attendance else None,
-                'screen_time': float(student.avg_screen_time) if student.avg_screen_time else None,
-                'focus_score': float(student.avg_focus_score) if student.avg_focus_score else None,
-                'sleep': float(student.avg_sleep) if student.avg_sleep else None,
-                'trajectory_score': float(trajectory.score) if trajectory else None
-            })
+            values = np.array([grid_value(cell, SKETCH_GRIDS[name]) for cell in successful[:, 1]])
+            low, median, high = weighted_quantiles(values, counts, [0.25, 0.5, 0.75])
+            optimal_ranges[name] = {
+                'min': round(float(low), digits),
+                'max': round(float(high), digits),
+                'median': round(float(median), digits)
+            }
         
-        df = pd.DataFrame(data)
-        df = df.dropna()  # Remove rows with missing data
+        return optimal_ranges
+    
+    def compute_correlations(self, db: Session) -> Dict[str, Any]:
+        """
+        Calculate correlations between behavioral metrics and academic performance.
+        
+        One SQL statement returns, per student with wellbeing data, GPA,
+        attendance, average screen time/focus/sleep and the latest trajectory
+        score; everything else is vectorized NumPy.
+        
+        Returns:
+            dict: Correlations (see calculate_correlations)
+        """
+        logger.info("Calculating behavioral correlations")
+        return self.correlations_from_matrix(self._load_correlation_matrix(db))
+    
+    def correlations_from_matrix(self, data: np.ndarray) -> Dict[str, Any]:
+        """
+        Correlations and optimal ranges of a correlation input matrix
+        (CORRELATION_COLUMNS). Pure NumPy, so it can run in a worker process
+        (see analytics_executor).
+        
+        Returns:
+            dict: Correlations (see calculate_correlations)
+        """
+        if len(data) < 10:
+            logger.warning(f"Insufficient data for correlation analysis: {len(data)} students")
+            return self._get_default_correlations()
         
-        if len(df) < 10:
-            logger.warning(f"Insufficient complete data: {len(df)} students")
+        # Remove rows with missing data
+        data = data[np.isfinite(data).all(axis=1)]
+        
+        if len(data) < 10:
+            logger.warning(f"Insufficient complete data: {len(data)} students")
             return self._get_default_correlations()
         
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = np.corrcoef(data, rowvar=False)
+        
         # Calculate correlations
         correlations = {
-            'screen_time_vs_gpa': self._safe_correlation(df, 'screen_time', 'gpa'),
-            'focus_score_vs_trajectory': self._safe_correlation(df, 'focus_score', 'trajectory_score'),
-            'sleep_vs_academic': self._safe_correlation(df, 'sleep', 'gpa'),
-            'sample_size': len(df),
-            'optimal_ranges': self._identify_optimal_ranges(df)
+            'screen_time_vs_gpa': self._safe_correlation(matrix, 'screen_time', 'gpa'),
+            'focus_score_vs_trajectory': self._safe_correlation(matrix, 'focus_score', 'trajectory_score'),
+            'sleep_vs_academic': self._safe_correlation(matrix, 'sleep', 'gpa'),
+            'sample_size': len(data),
+            'optimal_ranges': self._identify_optimal_ranges(data)
         }
         
-        logger.info(f"Correlations calculated for {len(df)} students")
+        logger.info(f"Correlations calculated for {len(data)} students")
         return correlations
     
-    def _safe_correlation(self, df: pd.DataFrame, col1: str, col2: str) -> float:
-        """Calculate correlation safely, handling errors."""
-        try:
-            if col1 in df.columns and col2 in df.columns:
-                corr = df[col1].corr(df[col2])
-                return round(float(corr), 3) if not pd.isna(corr) else 0.0
-            return 0.0
-        except Exception as e:
-            logger.error(f"Correlation calculation failed: {str(e)}")
-            return 0.0
+    def _load_correlation_matrix(
+        self,
+        db: Session,
+        student_id: Optional[int] = None,
+        student_ids: Optional[List[int]] = None
+    ) -> np.ndarray:
+        """
+        Load one row per student with wellbeing data (or a baseline, if the
+        student has no days yet) as a float matrix.
+        
+        Columns follow CORRELATION_COLUMNS; missing values are NaN.
+        
+        Args:
+            student_id: Only load this student
+            student_ids: Only load these students (used by streaming updates)
+        """
+        if student_id is not None:
+            student_ids = [student_id]
+        wellbeing = select(
+            DigitalWellbeingData.student_id,
+            func.avg(DigitalWellbeingData.screen_time_hours).label('avg_screen_time'),
+            func.avg(DigitalWellbeingData.focus_score).label('avg_focus_score'),
+            func.avg(DigitalWellbeingData.sleep_duration_hours).label('avg_sleep')
+        ).group_by(DigitalWellbeingData.student_id)
+        baselines = select(
+            WellbeingBaseline.student_id,
+            WellbeingBaseline.screen_time_hours,
+            WellbeingBaseline.focus_score,
+            WellbeingBaseline.sleep_duration_hours
+        ).where(_has_no_days())
+        
+        # Latest trajectory score per student (window works on PostgreSQL and SQLite)
+        ranked = select(
+            TrajectoryScore.student_id,
+            TrajectoryScore.score,
+            func.row_number().over(
+                partition_by=TrajectoryScore.student_id,
+                order_by=(TrajectoryScore.calculated_at.desc(), TrajectoryScore.id.desc())
+            ).label('position')
+        )
+        
+        if student_ids is not None:
+            wellbeing = wellbeing.where(DigitalWellbeingData.student_id.in_(student_ids))
+            baselines = baselines.where(WellbeingBaseline.student_id.in_(student_ids))
+            ranked = ranked.where(TrajectoryScore.student_id.in_(student_ids))
+        wellbeing = union_all(wellbeing, baselines).subquery()
+        ranked = ranked.subquery()
+        
+        statement = select(
+            Student.id,
+            Student.gpa,
+            Student.attendance,
+            wellbeing.c.avg_screen_time,
+            wellbeing.c.avg_focus_score,
+            wellbeing.c.avg_sleep,
+            ranked.c.score
+        ).join(
+            wellbeing, wellbeing.c.student_id == Student.id
+        ).outerjoin(
+            ranked, and_(ranked.c.student_id == Student.id, ranked.c.position == 1)
+        )
+        
+        rows = db.execute(statement).all()
+        return np.array(rows, dtype=np.float64).reshape(len(rows), len(self.CORRELATION_COLUMNS))
+    
+    def _safe_correlation(self, matrix: np.ndarray, col1: str, col2: str) -> float:
+        """Read a correlation from the correlation matrix (0.0 if undefined)."""
+        corr = matrix[self.CORRELATION_COLUMNS.index(col1), self.CORRELATION_COLUMNS.index(col2)]
+        return round(float(corr), 3) if np.isfinite(corr) else 0.0
     
-    def _identify_optimal_ranges(self, df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    def _identify_optimal_ranges(self, data: np.ndarray) -> Dict[str, Dict[str, float]]:
         """
         Identify optimal ranges for each metric based on successful students.
-        Successful = top 25% by GPA or trajectory score.
+        Successful = top 25% by GPA.
         """
+        columns = self.CORRELATION_COLUMNS
+        
         # Define successful students (top 25% by GPA)
-        gpa_threshold = df['gpa'].quantile(0.75)
-        successful = df[df['gpa'] >= gpa_threshold]
+        gpa = data[:, columns.index('gpa')]
+        successful = data[gpa >= np.quantile(gpa, 0.75)]
         
         if len(successful) < 5:
             return self._get_default_optimal_ranges()
         
-        optimal_ranges = {
-            'screen_time': {
-                'min': round(float(successful['screen_time'].quantile(0.25)), 1),
-                'max': round(float(successful['screen_time'].quantile(0.75)), 1),
-                'median': round(float(successful['screen_time'].median()), 1)
-            },
-            'focus_score': {
-                'min': round(float(successful['focus_score'].quantile(0.25)), 2),
-                'max': round(float(successful['focus_score'].quantile(0.75)), 2),
-                'median': round(float(successful['focus_score'].median()), 2)
-            },
-            'sleep': {
-                'min': round(float(successful['sleep'].quantile(0.25)), 1),
-                'max': round(float(successful['sleep'].quantile(0.75)), 1),
-                'median': round(float(successful['sleep'].median()), 1)
+        # Quartiles and median of every metric in one pass
+        metrics = [('screen_time', 1), ('focus_score', 2), ('sleep', 1)]
+        quartiles = np.quantile(
+            successful[:, [columns.index(name) for name, _ in metrics]],
+            [0.25, 0.5, 0.75],
+            axis=0
+        )
+        
+        optimal_ranges = {}
+        for index, (name, digits) in enumerate(metrics):
+            low, median, high = quartiles[:, index]
+            optimal_ranges[name] = {
+                'min': round(float(low), digits),
+                'max': round(float(high), digits),
+                'median': round(float(median), digits)
             }
-        }
         
         return optimal_ranges
     
@@ -158,7 +520,8 @@ class BehavioralAnalysisService:
     def identify_at_risk_patterns(
         self,
         student: Student,
-        db: Session
+        db: Session,
+        loader: Optional["BehavioralDataLoader"] = None
     ) -> List[Dict[str, Any]]:
         """
         Identify at-risk behavioral patterns for a student.
@@ -169,6 +532,10 @@ class BehavioralAnalysisService:
         - Low focus score (<0.5)
         - Insufficient sleep (<6 hours)
         
+        Args:
+            loader: Request's BehavioralDataLoader, to share the student's
+                    data with the other analyses of the same request
+        
         Returns:
             list: [
                 {
@@ -182,38 +549,190 @@ class BehavioralAnalysisService:
         """
         logger.info(f"Identifying at-risk patterns for student {student.id}")
         
-        flags = []
+        loader = loader or BehavioralDataLoader(db, student, self)
+        metrics = loader.recent_metrics()
+        if metrics is None:
+            logger.warning(f"No behavioral data for student {student.id}")
+            return []
+        
+        flags = self._evaluate_at_risk_flags(metrics.reshape(1, -1))[0]
+        
+        logger.info(f"Identified {len(flags)} at-risk patterns for student {student.id}")
+        return flags
+    
+    def sweep_at_risk_students(self, db: Session) -> Dict[str, Any]:
+        """
+        Flag every student in one pass and store the flags in at_risk_flags.
+        
+        The 7-day averages and trajectory trends of all students come from a
+        single grouped query and the thresholds are evaluated as vectorized
+        masks. The previous sweep's flags are replaced in the same transaction.
+        
+        Returns:
+            dict: {'students_evaluated': int, 'students_flagged': int,
+                   'flags': int, 'swept_at': datetime}
+        """
+        swept_at = datetime.utcnow()
+        student_ids, metrics = self._load_at_risk_matrix(db)
+        return self.store_at_risk_flags(db, student_ids, self._evaluate_at_risk_flags(metrics), swept_at)
+    
+    def store_at_risk_flags(
+        self,
+        db: Session,
+        student_ids: np.ndarray,
+        student_flags: List[List[Dict[str, Any]]],
+        swept_at: datetime
+    ) -> Dict[str, Any]:
+        """
+        Replace the stored flags with a sweep's flags (one list per student id).
+        
+        Returns:
+            dict: Sweep summary (see sweep_at_risk_students)
+        """
+        records = [
+            {
+                'student_id': int(student_id),
+                'flag': flag['flag'],
+                'severity': flag['severity'],
+                'description': flag['description'],
+                'details': {key: value for key, value in flag.items()
+                            if key not in ('flag', 'severity', 'description')},
+                'swept_at': swept_at
+            }
+            for student_id, flags in zip(student_ids, student_flags)
+            for flag in flags
+        ]
+        
+        db.query(AtRiskFlagRecord).delete(synchronize_session=False)
+        if records:
+            db.execute(insert(AtRiskFlagRecord), records)
+        db.commit()
+        
+        summary = {
+            'students_evaluated': len(student_ids),
+            'students_flagged': sum(1 for flags in student_flags if flags),
+            'flags': len(records),
+            'swept_at': swept_at
+        }
+        logger.info(
+            f"At-risk sweep flagged {summary['students_flagged']} of "
+            f"{summary['students_evaluated']} students ({summary['flags']} flags)"
+        )
+        return summary
+    
+    def _load_at_risk_matrix(self, db: Session, student_id: Optional[int] = None):
+        """
+        Load 7-day behavioral averages and trajectory trend of every student
+        with recent wellbeing data, and the baseline of every student with
+        no wellbeing days at all.
+        
+        Zero and missing social media/focus/sleep values are left out of the
+        averages; a student with none has NaN, which never crosses a threshold.
+        
+        Returns:
+            tuple: (student ids, float matrix with columns AT_RISK_COLUMNS)
+        """
+        recent_date = (datetime.utcnow() - timedelta(days=7)).date()
         
-        # Get recent behavioral data (last 7 days)
-        recent_date = datetime.utcnow() - timedelta(days=7)
-        behavioral_data = db.query(DigitalWellbeingData).filter(
-            DigitalWellbeingData.student_id == student.id,
-            DigitalWellbeingData.date >= recent_date.date()
+        recent = select(
+            DigitalWellbeingData.student_id,
+            func.avg(DigitalWellbeingData.screen_time_hours).label('screen_time'),
+            func.avg(func.nullif(DigitalWellbeingData.social_media_hours, 0)).label('social_media'),
+            func.avg(func.nullif(DigitalWellbeingData.focus_score, 0)).label('focus_score'),
+            func.avg(func.nullif(DigitalWellbeingData.sleep_duration_hours, 0)).label('sleep')
+        ).where(
+            DigitalWellbeingData.date >= recent_date
+        ).group_by(DigitalWellbeingData.student_id)
+        baselines = select(
+            WellbeingBaseline.student_id,
+            WellbeingBaseline.screen_time_hours,
+            func.nullif(WellbeingBaseline.social_media_hours, 0),
+            func.nullif(WellbeingBaseline.focus_score, 0),
+            func.nullif(WellbeingBaseline.sleep_duration_hours, 0)
+        ).where(_has_no_days())
+        
+        # Six most recent trajectory scores per student
+        ranked = select(
+            TrajectoryScore.student_id,
+            TrajectoryScore.score,
+            func.row_number().over(
+                partition_by=TrajectoryScore.student_id,
+                order_by=(TrajectoryScore.calculated_at.desc(), TrajectoryScore.id.desc())
+            ).label('position')
+        )
+        
+        if student_id is not None:
+            recent = recent.where(DigitalWellbeingData.student_id == student_id)
+            baselines = baselines.where(WellbeingBaseline.student_id == student_id)
+            ranked = ranked.where(TrajectoryScore.student_id == student_id)
+        recent = union_all(recent, baselines).subquery()
+        ranked = ranked.subquery()
+        
+        trend = select(
+            ranked.c.student_id,
+            func.count().label('scores'),
+            func.avg(case((ranked.c.position <= 3, ranked.c.score))).label('recent_avg'),
+            func.avg(case((ranked.c.position > 3, ranked.c.score))).label('previous_avg')
+        ).where(ranked.c.position <= 6).group_by(ranked.c.student_id).subquery()
+        
+        rows = db.execute(
+            select(
+                recent.c.student_id,
+                recent.c.screen_time,
+                recent.c.social_media,
+                recent.c.focus_score,
+                recent.c.sleep,
+                trend.c.scores,
+                trend.c.recent_avg,
+                trend.c.previous_avg
+            ).outerjoin(
+                trend, trend.c.student_id == recent.c.student_id
+            ).order_by(recent.c.student_id)
         ).all()
         
-        if not behavioral_data:
-            logger.warning(f"No behavioral data for student {student.id}")
-            return flags
+        data = np.array(rows, dtype=np.float64).reshape(len(rows), 8)
+        
+        # Trend per week from the last three scores vs the three before
+        # (fewer than 3 scores: no trend)
+        gpa_trend = np.round((data[:, 6] - data[:, 7]) / 3, 2)
+        gpa_trend[~(data[:, 5] >= 3)] = 0.0
+        
+        # Drop float summation noise (SQLite averages in floating point) so an
+        # average exactly on a threshold compares like the decimal value
+        averages = np.round(data[:, 1:5], 9)
+        
+        return data[:, 0].astype(np.int64), np.column_stack([averages, gpa_trend])
+    
+    def _evaluate_at_risk_flags(self, metrics: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """
+        Evaluate the at-risk thresholds for every row of an at-risk matrix.
+        
+        Returns:
+            list: Flags of each row (see identify_at_risk_patterns)
+        """
+        columns = self.AT_RISK_COLUMNS
+        screen_time, social_media, focus_score, sleep, gpa_trend = (
+            metrics[:, columns.index(name)] for name in columns
+        )
         
-        # Calculate averages
-        avg_screen_time = np.mean([float(d.screen_time_hours) for d in behavioral_data])
-        avg_social_media = np.mean([float(d.social_media_hours) for d in behavioral_data if d.social_media_hours])
-        avg_focus_score = np.mean([float(d.focus_score) for d in behavioral_data if d.focus_score])
-        avg_sleep = np.mean([float(d.sleep_duration_hours) for d in behavioral_data if d.sleep_duration_hours])
+        with np.errstate(invalid='ignore'):
+            at_risk_pattern = (social_media > 4.0) & (sleep < 6.0) & (gpa_trend < -0.5)
+            excessive_screen_time = screen_time > 8.0
+            low_focus = focus_score < 0.5
+            insufficient_sleep = sleep < 6.0
         
-        # Get GPA trend
-        gpa_trend = self._calculate_gpa_trend(student, db)
+        student_flags = [[] for _ in range(len(metrics))]
         
         # Flag 1: High social media + low sleep + declining GPA
-        if avg_social_media > 4.0 and avg_sleep < 6.0 and gpa_trend < -0.5:
-            flags.append({
+        for row in np.flatnonzero(at_risk_pattern):
+            student_flags[row].append({
                 'flag': 'at_risk_pattern',
                 'severity': 'high',
                 'description': 'High social media usage, insufficient sleep, and declining GPA detected',
                 'metrics': {
-                    'social_media_hours': round(avg_social_media, 1),
-                    'sleep_hours': round(avg_sleep, 1),
-                    'gpa_trend': round(gpa_trend, 2)
+                    'social_media_hours': round(float(social_media[row]), 1),
+                    'sleep_hours': round(float(sleep[row]), 1),
+                    'gpa_trend': round(float(gpa_trend[row]), 2)
                 },
                 'thresholds': {
                     'social_media_max': 4.0,
@@ -223,87 +742,162 @@ class BehavioralAnalysisService:
             })
         
         # Flag 2: Excessive screen time
-        if avg_screen_time > 8.0:
-            flags.append({
+        for row in np.flatnonzero(excessive_screen_time):
+            value = float(screen_time[row])
+            student_flags[row].append({
                 'flag': 'excessive_screen_time',
-                'severity': 'high' if avg_screen_time > 10.0 else 'medium',
-                'description': f'Excessive screen time detected: {avg_screen_time:.1f} hours/day',
-                'metric_value': round(avg_screen_time, 1),
+                'severity': 'high' if value > 10.0 else 'medium',
+                'description': f'Excessive screen time detected: {value:.1f} hours/day',
+                'metric_value': round(value, 1),
                 'threshold': 8.0
             })
         
         # Flag 3: Low focus score
-        if avg_focus_score < 0.5:
-            flags.append({
+        for row in np.flatnonzero(low_focus):
+            value = float(focus_score[row])
+            student_flags[row].append({
                 'flag': 'low_focus_score',
                 'severity': 'medium',
-                'description': f'Low productivity focus score: {avg_focus_score:.2f}',
-                'metric_value': round(avg_focus_score, 2),
+                'description': f'Low productivity focus score: {value:.2f}',
+                'metric_value': round(value, 2),
                 'threshold': 0.5
             })
         
         # Flag 4: Insufficient sleep
-        if avg_sleep < 6.0:
-            flags.append({
+        for row in np.flatnonzero(insufficient_sleep):
+            value = float(sleep[row])
+            student_flags[row].append({
                 'flag': 'insufficient_sleep',
-                'severity': 'high' if avg_sleep < 5.0 else 'medium',
-                'description': f'Insufficient sleep detected: {avg_sleep:.1f} hours/night',
-                'metric_value': round(avg_sleep, 1),
+                'severity': 'high' if value < 5.0 else 'medium',
+                'description': f'Insufficient sleep detected: {value:.1f} hours/night',
+                'metric_value': round(value, 1),
                 'threshold': 6.0
             })
         
-        logger.info(f"Identified {len(flags)} at-risk patterns for student {student.id}")
-        return flags
+        return student_flags
     
-    def _calculate_gpa_trend(self, student: Student, db: Session) -> float:
+    def get_at_risk_page(
+        self,
+        db: Session,
+        page: int = 1,
+        page_size: int = 50,
+        severity: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Calculate GPA trend (change per semester).
-        Positive = improving, Negative = declining.
+        One page of the students flagged by the last sweep, most severe first
+        (most high-severity flags, then most flags, then student id).
+        
+        Args:
+            severity: Only students with at least one flag of this severity
+        
+        Returns:
+            dict: {'total': int, 'swept_at': datetime | None,
+                   'students': [{'student_id', 'name', 'flags'}]}
         """
-        # Get trajectory scores to estimate trend
-        scores = db.query(TrajectoryScore).filter(
-            TrajectoryScore.student_id == student.id
-        ).order_by(TrajectoryScore.calculated_at.desc()).limit(6).all()
+        high_flags = func.sum(case((AtRiskFlagRecord.severity == 'high', 1), else_=0))
+        ranked = db.query(
+            AtRiskFlagRecord.student_id,
+            high_flags.label('high_flags'),
+            func.count(AtRiskFlagRecord.id).label('flags')
+        ).group_by(AtRiskFlagRecord.student_id)
+        
+        if severity is not None:
+            ranked = ranked.having(
+                func.sum(case((AtRiskFlagRecord.severity == severity, 1), else_=0)) > 0
+            )
         
-        if len(scores) < 3:
-            return 0.0  # Not enough data
+        total = ranked.count()
+        page_rows = ranked.order_by(
+            high_flags.desc(),
+            func.count(AtRiskFlagRecord.id).desc(),
+            AtRiskFlagRecord.student_id
+        ).offset((page - 1) * page_size).limit(page_size).all()
         
-        # Calculate velocity (trend)
-        recent_avg = np.mean([float(s.score) for s in scores[:3]])
-        previous_avg = np.mean([float(s.score) for s in scores[3:6]])
+        student_ids = [row.student_id for row in page_rows]
+        names = dict(db.query(Student.id, Student.name).filter(Student.id.in_(student_ids)).all())
         
-        trend = (recent_avg - previous_avg) / 3  # Per week
-        return round(trend, 2)
+        flags_by_student = {student_id: [] for student_id in student_ids}
+        for record in db.query(AtRiskFlagRecord).filter(
+            AtRiskFlagRecord.student_id.in_(student_ids)
+        ).order_by(AtRiskFlagRecord.id):
+            flags_by_student[record.student_id].append({
+                'flag': record.flag,
+                'severity': record.severity,
+                'description': record.description,
+                **(record.details or {})
+            })
+        
+        return {
+            'total': total,
+            'swept_at': db.query(func.max(AtRiskFlagRecord.swept_at)).scalar(),
+            'students': [
+                {'student_id': student_id, 'name': names.get(student_id), 'flags': flags_by_student[student_id]}
+                for student_id in student_ids
+            ]
+        }
     
     def compare_to_successful_alumni(
         self,
         student: Student,
         db: Session,
-        optimal_ranges: Dict[str, Dict[str, float]]
+        optimal_ranges: Dict[str, Dict[str, float]],
+        loader: Optional["BehavioralDataLoader"] = None
     ) -> Dict[str, Any]:
         """
         Compare student's behavioral patterns to successful alumni.
         
+        The student's values are the time-decayed means (7-day half-life) of
+        their latest weekly rollup, which weight the last days most but
+        carry earlier weeks forward, rather than a plain 7-day average.
+        Without a rollup covering the last 7 days (no recent days, or only a
+        survey baseline), the feature store's decayed means are used, with
+        the baseline as a prior (see feature_store.get_features).
+        
+        Args:
+            loader: Request's BehavioralDataLoader (see identify_at_risk_patterns)
+        
         Returns:
             dict: {
-                'screen_time': {'student': float, 'optimal': float, 'status': str},
+                'screen_time': {'student': float, 'optimal': float, 'status': str,
+                                'percentile': float or None (rank in the cohort)},
                 'focus_score': {...},
                 'sleep': {...}
             }
         """
-        # Get student's recent averages
-        recent_date = datetime.utcnow() - timedelta(days=7)
-        behavioral_data = db.query(DigitalWellbeingData).filter(
-            DigitalWellbeingData.student_id == student.id,
-            DigitalWellbeingData.date >= recent_date.date()
-        ).all()
+        # Student's recent behavior: time-decayed means of the latest weekly rollup
+        loader = loader or BehavioralDataLoader(db, student, self)
+        rollup = loader.latest_week()
+        recent_date = (datetime.utcnow() - timedelta(days=7)).date()
         
-        if not behavioral_data:
+        values = {'screen_time': None, 'focus': None, 'sleep': None}
+        if rollup is not None and rollup.period_start + timedelta(days=6) >= recent_date:
+            values = {
+                'screen_time': rollup.screen_time_decayed,
+                'focus': rollup.focus_score_decayed,
+                'sleep': rollup.sleep_decayed
+            }
+        
+        # No recent rollup (or metric): whole-history features, or the baseline
+        if None in values.values():
+            features = loader.features()
+            values = {
+                metric: value if value is not None else features.get(metric)
+                for metric, value in values.items()
+            }
+        
+        if None in values.values():
             return {}
         
-        student_avg_screen_time = np.mean([float(d.screen_time_hours) for d in behavioral_data])
-        student_avg_focus = np.mean([float(d.focus_score) for d in behavioral_data if d.focus_score])
-        student_avg_sleep = np.mean([float(d.sleep_duration_hours) for d in behavioral_data if d.sleep_duration_hours])
+        student_avg_screen_time = values['screen_time']
+        student_avg_focus = values['focus']
+        student_avg_sleep = values['sleep']
+        
+        # Percentile rank within the student's major/semester cohort
+        benchmarks = loader.benchmarks()
+        cohort_metrics = benchmarks['metrics'] if benchmarks else {}
+        
+        def percentile(metric):
+            return cohort_metrics[metric]['percentile'] if metric in cohort_metrics else None
         
         comparison = {
             'screen_time': {
@@ -314,7 +908,8 @@ class BehavioralAnalysisService:
                     optimal_ranges['screen_time']['min'],
                     optimal_ranges['screen_time']['max'],
                     inverse=True  # Lower is better for screen time
-                )
+                ),
+                'percentile': percentile('screen_time')
             },
             'focus_score': {
                 'student': round(student_avg_focus, 2),
@@ -323,7 +918,8 @@ class BehavioralAnalysisService:
                     student_avg_focus,
                     optimal_ranges['focus_score']['min'],
                     optimal_ranges['focus_score']['max']
-                )
+                ),
+                'percentile': percentile('focus')
             },
             'sleep': {
                 'student': round(student_avg_sleep, 1),
@@ -332,7 +928,8 @@ class BehavioralAnalysisService:
                     student_avg_sleep,
                     optimal_ranges['sleep']['min'],
                     optimal_ranges['sleep']['max']
-                )
+                ),
+                'percentile': percentile('sleep')
             }
         }
         
@@ -367,6 +964,60 @@ class BehavioralAnalysisService:
                 return 'poor'
 
 
+class BehavioralDataLoader:
+    """
+    Per-request loader of the data the behavioral analyses read.
+    
+    Each piece (cohort correlations, the student's 7-day window with score
+    trend, the latest weekly rollup, feature store means, cohort percentiles)
+    is fetched on first use and shared by every analysis of the request, so
+    a request costs a constant number of queries.
+    """
+    
+    def __init__(self, db: Session, student: Student, service: Optional[BehavioralAnalysisService] = None):
+        self.db = db
+        self.student = student
+        self.service = service or get_behavioral_analysis_service()
+        self._loaded: Dict[str, Any] = {}
+    
+    def _load(self, key: str, fetch):
+        if key not in self._loaded:
+            self._loaded[key] = fetch()
+        return self._loaded[key]
+    
+    def correlations(self) -> Dict[str, Any]:
+        """Cohort correlations (served from the streaming statistics snapshot)."""
+        return self._load('correlations', lambda: self.service.calculate_correlations(self.db))
+    
+    def recent_metrics(self) -> Optional[np.ndarray]:
+        """Student's 7-day averages and score trend (AT_RISK_COLUMNS), None without recent data."""
+        def fetch():
+            student_ids, metrics = self.service._load_at_risk_matrix(self.db, student_id=self.student.id)
+            return metrics[0] if len(student_ids) else None
+        return self._load('recent_metrics', fetch)
+    
+    def latest_week(self):
+        """Student's most recent weekly wellbeing rollup."""
+        return self._load(
+            'latest_week',
+            lambda: get_wellbeing_rollup_service().get_latest_week(self.db, self.student.id)
+        )
+    
+    def features(self) -> Dict[str, float]:
+        """Student's feature store means (baseline prior without days)."""
+        return self._load(
+            'features',
+            lambda: get_feature_store().get_features(self.db, [self.student.id])[self.student.id]
+        )
+    
+    def benchmarks(self) -> Optional[Dict[str, Any]]:
+        """Student's percentile ranks within their cohort (see cohort_benchmark_service)."""
+        return self._load(
+            'benchmarks',
+            lambda: get_cohort_benchmark_service().get_student_percentiles(self.db, self.student.id)
+        )
+
+
 _behavioral_analysis_service: Optional[BehavioralAnalysisService] = None
 
 def get_behavioral_analysis_service() -> BehavioralAnalysisService:
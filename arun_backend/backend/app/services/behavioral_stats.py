@@ -0,0 +1,143 @@
+"""
+Streaming Behavioral Statistics for Trajectory Engine MVP
+
+Building blocks that let cohort correlations be updated one student at a
+time instead of being recomputed over the whole population:
+
+- RunningMoments: count, means and co-moments of a vector of metrics
+  (Welford-style), supporting removal so a student whose averages changed
+  can be taken out and added back with the new values
+- Quantile sketches: per-metric counts on a fixed grid, keyed by GPA cell,
+  from which the GPA top quartile and the metric quartiles of that group
+  are read without touching the individual students
+
+Both have a bounded size that does not grow with the population.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+# Order of the values tracked per student
+STAT_COLUMNS = ('gpa', 'screen_time', 'focus_score', 'sleep', 'trajectory_score')
+
+# Sketch grids: metric -> (min, max, cell width). Values are snapped to the
+# nearest grid point, so quantiles are exact up to half a cell.
+GPA_GRID = (0.0, 10.0, 0.05)
+SKETCH_GRIDS = {
+    'screen_time': (0.0, 24.0, 0.1),
+    'focus_score': (0.0, 1.0, 0.01),
+    'sleep': (0.0, 24.0, 0.1),
+}
+
+
+class RunningMoments:
+    """
+    Count, mean vector and co-moment matrix of a stream of vectors.
+    
+    comoment[i, j] = Σ (x_i - mean_i)(x_j - mean_j), so the Pearson
+    correlation of two columns is comoment[i, j] / sqrt(comoment[i, i] × comoment[j, j]).
+    """
+    
+    def __init__(self, size: int = len(STAT_COLUMNS)):
+        self.count = 0
+        self.mean = np.zeros(size)
+        self.comoment = np.zeros((size, size))
+    
+    @classmethod
+    def from_matrix(cls, data: np.ndarray) -> "RunningMoments":
+        """Build the moments of every row of a (n, size) matrix at once."""
+        moments = cls(data.shape[1])
+        moments.count = len(data)
+        if moments.count:
+            moments.mean = data.mean(axis=0)
+            centered = data - moments.mean
+            moments.comoment = centered.T @ centered
+        return moments
+    
+    def add(self, x: Sequence[float]):
+        """Add one vector."""
+        x = np.asarray(x, dtype=np.float64)
+        self.count += 1
+        delta = x - self.mean
+        self.mean = self.mean + delta / self.count
+        self.comoment = self.comoment + np.outer(delta, x - self.mean)
+    
+    def remove(self, x: Sequence[float]):
+        """Remove a vector that was previously added (inverse of add)."""
+        x = np.asarray(x, dtype=np.float64)
+        if self.count <= 1:
+            self.__init__(len(self.mean))
+            return
+        previous_mean = self.mean - (x - self.mean) / (self.count - 1)
+        self.comoment = self.comoment - np.outer(x - previous_mean, x - self.mean)
+        self.mean = previous_mean
+        self.count -= 1
+    
+    def correlation(self, i: int, j: int) -> Optional[float]:
+        """Pearson correlation of columns i and j (None if undefined)."""
+        denominator = np.sqrt(self.comoment[i, i] * self.comoment[j, j])
+        if self.count < 2 or not denominator > 0:
+            return None
+        return float(np.clip(self.comoment[i, j] / denominator, -1.0, 1.0))
+    
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.mean.tolist(),
+            'comoment': self.comoment.tolist()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RunningMoments":
+        moments = cls(len(data['mean']))
+        moments.count = int(data['count'])
+        moments.mean = np.asarray(data['mean'], dtype=np.float64)
+        moments.comoment = np.asarray(data['comoment'], dtype=np.float64)
+        return moments
+
+
+def grid_cell(value: float, grid: Tuple[float, float, float]) -> int:
+    """Snap a value to the index of its nearest grid point (clamped to the grid)."""
+    low, high, width = grid
+    value = min(max(float(value), low), high)
+    return int(round((value - low) / width))
+
+
+def grid_value(cell: int, grid: Tuple[float, float, float]) -> float:
+    """Value of a grid point."""
+    return grid[0] + cell * grid[2]
+
+
+def sketch_cells(values: Dict[str, float]) -> List[Tuple[str, int, int]]:
+    """
+    Sketch cells one student occupies: (metric, gpa cell, value cell).
+    
+    Args:
+        values: Student values keyed by STAT_COLUMNS names
+    """
+    gpa_cell = grid_cell(values['gpa'], GPA_GRID)
+    return [
+        (metric, gpa_cell, grid_cell(values[metric], grid))
+        for metric, grid in SKETCH_GRIDS.items()
+    ]
+
+
+def weighted_quantiles(values: np.ndarray, counts: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """
+    Quantiles of a multiset given as (value, count) pairs.
+    
+    Same linear interpolation as numpy.quantile / pandas quantile on the
+    expanded values.
+    """
+    order = np.argsort(values)
+    values = np.asarray(values, dtype=np.float64)[order]
+    cumulative = np.cumsum(np.asarray(counts)[order])
+    total = cumulative[-1]
+    
+    positions = np.asarray(quantiles, dtype=np.float64) * (total - 1)
+    lower = np.floor(positions)
+    upper = np.ceil(positions)
+    lower_values = values[np.searchsorted(cumulative, lower, side='right')]
+    upper_values = values[np.searchsorted(cumulative, upper, side='right')]
+    return lower_values + (upper_values - lower_values) * (positions - lower)
@@ -0,0 +1,449 @@
+"""
+Cohort Benchmark Service
+
+Precomputed per-cohort percentile tables for behavioral comparisons. A
+cohort is the students of one major and semester; semester 0 holds the
+whole major and is used when a semester cohort is too small.
+
+For every cohort and metric (screen time, sleep, focus, study hours, GPA,
+attendance) cohort_benchmarks stores the sorted values and their deciles.
+A student's percentile rank is a binary search (np.searchsorted) in the
+cached sorted array, so a comparison costs O(log n) and scans no other
+students.
+
+Tables are maintained lazily: when a student's data changes, only the
+values they contribute (cohort_members) are rewritten and their cohorts
+are marked stale. A stale cohort's sorted arrays are recomputed from its
+members once, on its next read (or by refresh_stale_cohorts, e.g. from a
+periodic job), however many of its students changed in between; writes
+never rewrite the arrays, so a bulk import costs O(students), not
+O(students x cohort size). rebuild recomputes everything.
+
+Student values:
+- screen_time, sleep, focus: decayed means from the feature store
+- study_hours, gpa, attendance: student profile
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import CohortBenchmark, CohortMember, Student
+from app.services.feature_store import get_feature_store
+
+logger = logging.getLogger(__name__)
+
+
+BENCHMARK_METRICS = ('screen_time', 'sleep', 'focus', 'study_hours', 'gpa', 'attendance')
+
+# Cohort key of a whole major
+ALL_SEMESTERS = 0
+
+# Semester cohorts smaller than this fall back to the whole major
+MIN_COHORT_SIZE = 5
+
+DECILES = np.linspace(0.0, 1.0, 11)
+
+
+def percentile_rank(sorted_values: np.ndarray, value: float) -> float:
+    """
+    Percentile rank (0-100) of value in a sorted array: the share of values
+    below it, counting ties as half.
+    """
+    n = len(sorted_values)
+    if not n:
+        return 50.0
+    below = np.searchsorted(sorted_values, value, side='left')
+    not_above = np.searchsorted(sorted_values, value, side='right')
+    return float((below + not_above) / 2.0 / n * 100.0)
+
+
+def compute_deciles(sorted_values: Sequence[float]) -> Optional[List[float]]:
+    """0th, 10th, ..., 100th percentile (None for an empty cohort)."""
+    if not len(sorted_values):
+        return None
+    return [round(float(value), 4) for value in np.quantile(np.asarray(sorted_values, dtype=np.float64), DECILES)]
+
+
+def cohort_keys(major: str, semester: int) -> List[Tuple[str, int]]:
+    """Cohorts a student belongs to: their semester and the whole major."""
+    if semester == ALL_SEMESTERS:
+        return [(major, ALL_SEMESTERS)]
+    return [(major, semester), (major, ALL_SEMESTERS)]
+
+
+def _value(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+class CohortBenchmarkService:
+    """Maintains and reads the cohort percentile tables."""
+    
+    def __init__(self, cache_seconds: float = 300.0):
+        """
+        Args:
+            cache_seconds: How long a cohort's sorted arrays are served from
+                           memory before being re-read (updates made through
+                           this process are applied immediately)
+        """
+        self.cache_seconds = cache_seconds
+        self._cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Tuple[np.ndarray, Optional[List[float]]]]]] = {}
+        self._cache_lock = threading.Lock()
+    
+    def member_values(self, db: Session, student_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Current cohort and metric values of the given students (two queries).
+        
+        Returns:
+            dict: student_id -> {'major', 'semester', <metric>: float or None}
+        """
+        if not student_ids:
+            return {}
+        
+        features = get_feature_store().get_features(db, student_ids)
+        members = {}
+        for student in db.query(
+            Student.id, Student.major, Student.semester, Student.study_hours_per_week,
+            Student.gpa, Student.attendance
+        ).filter(Student.id.in_(list(student_ids))):
+            student_features = features.get(student.id, {})
+            members[student.id] = {
+                'major': student.major,
+                'semester': student.semester or ALL_SEMESTERS,
+                'screen_time': student_features.get('screen_time'),
+                'sleep': student_features.get('sleep'),
+                'focus': student_features.get('focus'),
+                'study_hours': _value(student.study_hours_per_week),
+                'gpa': _value(student.gpa),
+                'attendance': _value(student.attendance),
+            }
+        return members
+    
+    def rebuild(self, db: Session, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Recompute every cohort table from the current student data.
+        
+        Returns:
+            dict: {'students': int, 'cohorts': int}
+        """
+        ids = [student_id for (student_id,) in db.query(Student.id).order_by(Student.id)]
+        
+        members = []
+        values: Dict[Tuple[str, int, str], List[float]] = {}
+        for offset in range(0, len(ids), batch_size):
+            for student_id, member in self.member_values(db, ids[offset:offset + batch_size]).items():
+                members.append({'student_id': student_id, **member})
+                for key in cohort_keys(member['major'], member['semester']):
+                    for metric in BENCHMARK_METRICS:
+                        if member[metric] is not None:
+                            values.setdefault((*key, metric), []).append(member[metric])
+        
+        cohorts = {key for member in members for key in cohort_keys(member['major'], member['semester'])}
+        benchmarks = []
+        for major, semester in sorted(cohorts):
+            for metric in BENCHMARK_METRICS:
+                cohort_values = sorted(values.get((major, semester, metric), []))
+                benchmarks.append({
+                    'major': major,
+                    'semester': semester,
+                    'metric': metric,
+                    'sample_size': len(cohort_values),
+                    'sorted_values': cohort_values,
+                    'deciles': compute_deciles(cohort_values),
+                    'stale': False
+                })
+        
+        db.query(CohortBenchmark).delete(synchronize_session=False)
+        db.query(CohortMember).delete(synchronize_session=False)
+        for offset in range(0, len(members), batch_size):
+            db.execute(insert(CohortMember), members[offset:offset + batch_size])
+        if benchmarks:
+            db.execute(insert(CohortBenchmark), benchmarks)
+        db.commit()
+        
+        with self._cache_lock:
+            self._cache.clear()
+        
+        logger.info(f"Rebuilt cohort benchmarks: {len(members)} students, {len(cohorts)} cohorts")
+        return {'students': len(members), 'cohorts': len(cohorts)}
+    
+    def record_student_update(self, db: Session, student_id: int) -> bool:
+        """
+        Move one student's contribution to the cohort tables to their current
+        values (and cohort, if their major or semester changed).
+        
+        Rewrites the student's cohort_members row and marks their old and
+        new cohorts stale; the sorted arrays are recomputed on the next read
+        (see get_cohort). Never raises: a failed update is corrected by the
+        next rebuild.
+        
+        Args:
+            db: Database session (committed by this method)
+            student_id: Student whose data changed
+        
+        Returns:
+            bool: True if the tables were updated or already current
+        """
+        return self.record_students_update(db, [student_id])
+    
+    def record_students_update(self, db: Session, student_ids: List[int]) -> bool:
+        """
+        Same as record_student_update for several students (e.g. one import
+        chunk) in one transaction, marking each affected cohort stale once.
+        
+        Only the students' own cohort_members rows are locked. Cohort rows
+        are written only when they are not stale yet, so concurrent writers
+        wait for each other at most once per cohort between two reads.
+        
+        Args:
+            db: Database session (committed by this method)
+            student_ids: Students whose data changed
+        
+        Returns:
+            bool: True if the tables were updated or already current
+        """
+        if not student_ids:
+            return True
+        try:
+            current = self.member_values(db, student_ids)
+            self._create_cohorts(db, {
+                key for values in current.values()
+                for key in cohort_keys(values['major'], values['semester'])
+            })
+            
+            members = {
+                member.student_id: member
+                for member in db.query(CohortMember).filter(
+                    CohortMember.student_id.in_(student_ids)
+                ).order_by(CohortMember.student_id).with_for_update()
+            }
+            
+            keys = set()
+            for student_id in dict.fromkeys(student_ids):
+                member = members.get(student_id)
+                values = current.get(student_id)
+                previous = None
+                if member is not None:
+                    previous = {'major': member.major, 'semester': member.semester,
+                                **{metric: getattr(member, metric) for metric in BENCHMARK_METRICS}}
+                if previous == values:
+                    continue
+                
+                for cohort in (previous, values):
+                    if cohort is not None:
+                        keys.update(cohort_keys(cohort['major'], cohort['semester']))
+                if values is None:
+                    db.delete(member)
+                elif member is None:
+                    db.add(CohortMember(student_id=student_id, **values))
+                else:
+                    for name, value in values.items():
+                        setattr(member, name, value)
+            
+            if not keys:
+                # Releases the member locks
+                db.rollback()
+                return True
+            
+            db.execute(
+                update(CohortBenchmark).where(
+                    tuple_(CohortBenchmark.major, CohortBenchmark.semester).in_(sorted(keys)),
+                    CohortBenchmark.stale.is_(False)
+                ).values(stale=True)
+            )
+            db.commit()
+            
+            with self._cache_lock:
+                for key in keys:
+                    self._cache.pop(key, None)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to update cohort benchmarks for students {student_ids}: {e}")
+            db.rollback()
+            return False
+    
+    def _create_cohorts(self, db: Session, keys: set):
+        """
+        Add the (stale, empty) rows of cohorts that have none yet, in their
+        own transaction, so a new cohort can be marked stale like the others.
+        """
+        if not keys:
+            return
+        existing = {
+            (major, semester)
+            for major, semester in db.query(CohortBenchmark.major, CohortBenchmark.semester).filter(
+                tuple_(CohortBenchmark.major, CohortBenchmark.semester).in_(sorted(keys))
+            ).distinct()
+        }
+        missing = sorted(keys - existing)
+        if not missing:
+            return
+        
+        db.execute(insert(CohortBenchmark), [
+            {'major': major, 'semester': semester, 'metric': metric, 'sample_size': 0,
+             'sorted_values': [], 'deciles': None, 'stale': True}
+            for major, semester in missing
+            for metric in BENCHMARK_METRICS
+        ])
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another writer created them first
+            db.rollback()
+    
+    def refresh_stale_cohorts(self, db: Session) -> int:
+        """
+        Recompute every stale cohort now instead of on its next read (e.g.
+        periodically, or after a bulk import).
+        
+        Returns:
+            int: Number of cohorts recomputed
+        """
+        keys = db.query(CohortBenchmark.major, CohortBenchmark.semester).filter(
+            CohortBenchmark.stale.is_(True)
+        ).distinct().all()
+        db.rollback()
+        for major, semester in keys:
+            self._refresh_cohort(db, major, semester)
+        return len(keys)
+    
+    def _refresh_cohort(self, db: Session, major: str, semester: int) -> Dict[str, Tuple[List[float], Optional[List[float]]]]:
+        """
+        Recompute a stale cohort's sorted arrays from its members.
+        
+        The cohort's rows stay locked until commit: writers that change a
+        member meanwhile wait to mark them stale again, so no change is lost.
+        
+        Returns:
+            dict: metric -> (sorted values, deciles) (metrics without values
+            omitted)
+        """
+        rows = {
+            row.metric: row
+            for row in db.query(CohortBenchmark).filter(
+                CohortBenchmark.major == major,
+                CohortBenchmark.semester == semester
+            ).populate_existing().with_for_update()
+        }
+        if not any(row.stale for row in rows.values()):
+            # Recomputed by another reader while this one waited
+            cohort = {metric: (row.sorted_values, row.deciles) for metric, row in rows.items() if row.sample_size}
+            db.commit()
+            return cohort
+        
+        query = db.query(*(getattr(CohortMember, metric) for metric in BENCHMARK_METRICS)).filter(
+            CohortMember.major == major
+        )
+        if semester != ALL_SEMESTERS:
+            query = query.filter(CohortMember.semester == semester)
+        columns = list(zip(*query.all())) or [()] * len(BENCHMARK_METRICS)
+        
+        cohort = {}
+        for metric, values in zip(BENCHMARK_METRICS, columns):
+            sorted_values = sorted(value for value in values if value is not None)
+            row = rows.get(metric)
+            if row is None:
+                row = rows[metric] = CohortBenchmark(major=major, semester=semester, metric=metric)
+                db.add(row)
+            row.sample_size = len(sorted_values)
+            row.sorted_values = sorted_values
+            row.deciles = compute_deciles(sorted_values)
+            row.stale = False
+            if sorted_values:
+                cohort[metric] = (sorted_values, row.deciles)
+        db.commit()
+        return cohort
+    
+    def get_cohort(self, db: Session, major: str, semester: int) -> Dict[str, Tuple[np.ndarray, Optional[List[float]]]]:
+        """
+        Sorted values and deciles of every metric of a cohort (cached).
+        
+        A stale cohort is recomputed from its members first.
+        
+        Returns:
+            dict: metric -> (sorted values array, deciles) (metrics without
+            values omitted)
+        """
+        key = (major, semester)
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < self.cache_seconds:
+            return cached[1]
+        
+        rows = db.query(CohortBenchmark).filter(
+            CohortBenchmark.major == major,
+            CohortBenchmark.semester == semester
+        ).all()
+        if any(row.stale for row in rows):
+            values = self._refresh_cohort(db, major, semester)
+        else:
+            values = {row.metric: (row.sorted_values, row.deciles) for row in rows if row.sample_size}
+        cohort = {
+            metric: (np.asarray(sorted_values, dtype=np.float64), deciles)
+            for metric, (sorted_values, deciles) in values.items()
+        }
+        with self._cache_lock:
+            self._cache[key] = (now, cohort)
+        return cohort
+    
+    def get_student_percentiles(self, db: Session, student_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Percentile rank of each of a student's values within their cohort.
+        
+        A metric whose semester cohort has fewer than MIN_COHORT_SIZE values
+        is ranked within the whole major.
+        
+        Returns:
+            dict: {'major', 'semester', 'metrics': {metric: {'value',
+            'percentile', 'median', 'deciles', 'sample_size', 'cohort'}}}
+            ('cohort' is 'semester' or 'major'), None if the student is not
+            in the tables yet
+        """
+        member = db.query(CohortMember).filter(CohortMember.student_id == student_id).first()
+        if member is None:
+            return None
+        
+        semester_cohort = self.get_cohort(db, member.major, member.semester)
+        major_cohort = (
+            self.get_cohort(db, member.major, ALL_SEMESTERS)
+            if member.semester != ALL_SEMESTERS else semester_cohort
+        )
+        
+        metrics = {}
+        for metric in BENCHMARK_METRICS:
+            value = getattr(member, metric)
+            if value is None:
+                continue
+            scope = 'semester'
+            sorted_values, deciles = semester_cohort.get(metric, (np.empty(0), None))
+            if len(sorted_values) < MIN_COHORT_SIZE or member.semester == ALL_SEMESTERS:
+                scope = 'major'
+                sorted_values, deciles = major_cohort.get(metric, (np.empty(0), None))
+            if not len(sorted_values):
+                continue
+            metrics[metric] = {
+                'value': round(value, 2),
+                'percentile': round(percentile_rank(sorted_values, value), 1),
+                'median': deciles[5] if deciles else None,
+                'deciles': deciles,
+                'sample_size': len(sorted_values),
+                'cohort': scope
+            }
+        
+        return {'major': member.major, 'semester': member.semester, 'metrics': metrics}
+
+
+_cohort_benchmark_service: Optional[CohortBenchmarkService] = None
+
+def get_cohort_benchmark_service() -> CohortBenchmarkService:
+    global _cohort_benchmark_service
+    if _cohort_benchmark_service is None:
+        _cohort_benchmark_service = CohortBenchmarkService()
+    return _cohort_benchmark_service
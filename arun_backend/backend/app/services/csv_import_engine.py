@@ -0,0 +1,1044 @@
+"""
+CSV Import Engine
+
+Bulk import of the student survey export (froms.csv / data.csv shape):
+one user, student profile, behavioral metrics, subject scores, skills and
+a wellbeing baseline per row. The survey's wellbeing answers are stored
+once (WellbeingBaseline), not as synthetic days: they are the student's
+prior until the app syncs real wellbeing days. Alumni CSVs in the admin template format
+are validated column by column with NumPy and loaded the same way.
+
+Imports are idempotent upserts keyed on natural keys: the email address
+(or USN, when the CSV has one) for students, name + graduation year for
+alumni. Each row carries a content hash (import_hash) of its parsed values:
+re-imports insert new records, update the changed ones and skip the
+unchanged ones, so only new and changed records need vectorizing.
+
+The import does a fixed number of statements per chunk of rows instead of
+several round trips and a commit per row:
+1. The CSV is parsed once into columns (csv.reader, header resolved once);
+   rows that cannot be parsed are reported, not imported
+2. Existing records are fetched by natural key with one IN query per chunk
+   and their stored hashes compared with the rows'
+3. Ids are allocated in bulk (one nextval() query per table on PostgreSQL,
+   INSERT ... RETURNING elsewhere), so child rows reference their parents
+   without flushing
+4. Each table is loaded with COPY (PostgreSQL with psycopg2) or multi-row
+   INSERTs, and each chunk is committed in its own transaction
+
+The chunks are pipelined: while chunk N is written, the passwords of
+chunk N+1 can be hashed in a process pool (password_hasher), since bcrypt
+would otherwise dominate the import time.
+
+A chunk that fails to load is rolled back and its rows are reported as
+errors; the other chunks are still imported.
+
+Summaries include the seconds spent per stage (IMPORT_STAGES) so the
+import can be profiled (see import_profiler).
+"""
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from sqlalchemy import delete, func, insert, select, text, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Alumni, BehavioralMetric, CompanyTierEnum, PlacementStatusEnum, Skill, Student,
+    StudentSubjectScore, User, WellbeingBaseline
+)
+from app.services.behavioral_analysis_service import get_behavioral_analysis_service
+from app.services.cohort_benchmark_service import get_cohort_benchmark_service
+from app.services.feature_store import get_feature_store
+from app.services.wellbeing_ingest_service import stored_focus_score
+
+logger = logging.getLogger(__name__)
+
+
+def parse_text(value: str) -> Optional[str]:
+    """Stripped text, None if blank."""
+    value = value.strip()
+    return value or None
+
+
+def parse_yes_no(value: str) -> bool:
+    """Convert Yes/No answers to boolean"""
+    return value.strip().lower() in ('yes', 'y', 'true', '1', 'always')
+
+
+def parse_float(value: str) -> Optional[float]:
+    """Float value (a trailing % is ignored), None if blank."""
+    value = value.strip().rstrip('%').strip()
+    return float(value) if value else None
+
+
+def parse_int(value: str) -> Optional[int]:
+    """Integer value (whole floats like "3.0" accepted), None if blank."""
+    value = value.strip()
+    if not value:
+        return None
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"not a whole number: {value!r}")
+    return int(number)
+
+
+# field -> (CSV headers, first one present is used; parser; default when blank)
+SURVEY_COLUMNS: Dict[str, Tuple[Tuple[str, ...], Callable[[str], Any], Any]] = {
+    'email': (('Email Address', 'Email address'), parse_text, None),
+    'usn': (('USN', 'University Seat Number'), parse_text, None),
+    'name': (('Full Name',), parse_text, 'Unknown'),
+    'age': (('Age',), parse_int, None),
+    'gender': (('Gender',), parse_text, None),
+    'major': (('Major / Branch',), parse_text, 'Unspecified'),
+    'semester': (('Current Semester',), parse_int, 7),
+    'college_name': (('College Name',), parse_text, None),
+    'role': (('Are you a Student or Alumni?',), parse_text, None),
+    'gpa': (('Current GPA (0–10)',), parse_float, 7.0),
+    'gpa_trend': (('GPA Trend Over Last Semesters',), parse_text, None),
+    'attendance': (('Average Attendance Percentage',), parse_float, 75.0),
+    'attend_lab_regularly': (('Do you attend lab sessions regularly?',), parse_yes_no, False),
+    'submit_assignments_on_time': (('Do you submit assignments on time?',), parse_yes_no, False),
+    'avg_internal_marks': (('Average Internal Marks (0–100)',), parse_float, None),
+    'backlogs': (('Number of Backlogs',), parse_int, 0),
+    'subject_1': (('Subject 1 Name(current semester)',), parse_text, None),
+    'subject_1_marks': (('Subject 1 Marks (0–100)',), parse_float, None),
+    'subject_2': (('Subject 2 Name (current semester)',), parse_text, None),
+    'subject_2_marks': (('Subject 2 Marks (0–100)',), parse_float, None),
+    'subject_3': (('Subject 3 Name (current semester)',), parse_text, None),
+    'subject_3_marks': (('Subject 3 Marks (0–100)',), parse_float, None),
+    'subject_4': (('Subject 4 Name',), parse_text, None),
+    'subject_4_marks': (('Subject 4 Marks (0–100)',), parse_float, None),
+    'subject_5': (('Subject 5 Name (current semester)',), parse_text, None),
+    'subject_5_marks': (('Subject 5 Marks (0–100)',), parse_float, None),
+    'programming_languages': (('Programming Languages Select all that apply)',), parse_text, None),
+    'strongest_skill': (('Strongest Technical Skill',), parse_text, None),
+    'problem_solving': (('Problem Solving Ability (1–5)',), parse_float, 3.0),
+    'communication': (('Communication Skill (1–5)',), parse_float, None),
+    'teamwork': (('Teamwork Ability (1–5)',), parse_float, None),
+    'consistency': (('Consistency Level (1–5)',), parse_float, None),
+    'project_count': (('Number of Projects Completed',), parse_int, 0),
+    'project_types': (('Project Types (Select all that apply)',), parse_text, None),
+    'deployed_project': (('Have you deployed a project?',), parse_yes_no, False),
+    'internship_exp': (('Internship experience?',), parse_yes_no, False),
+    'internship_duration': (('Internship duration in months',), parse_int, None),
+    'study_hours_per_day': (('Study hours per day',), parse_float, 3.0),
+    'practice_hours_per_day': (('Technical Knowledge practice hours per day',), parse_float, 1.0),
+    'follow_study_schedule': (('Do you follow a study schedule?',), parse_yes_no, False),
+    'concept_revision_frequency': (('Concept revision frequency',), parse_text, None),
+    'online_courses_count': (('Online courses completed (list/count)',), parse_text, None),
+    'screen_time': (('Average daily screen time (hours)',), parse_float, 6.0),
+    'social_media': (('Daily social media time (hours)',), parse_float, 2.0),
+    'learning': (('Daily learning app/video time (hours)',), parse_float, 2.0),
+    'entertainment': (('Daily entertainment time (hours)',), parse_float, 2.0),
+    'sleep': (('Average sleep hours',), parse_float, 7.0),
+    'career_clarity': (('Career clarity level (1–5)',), parse_float, None),
+    'chosen_career_path': (('Have you chosen a career path?',), parse_text, None),
+    'daily_placement_prep': (('Daily placement preparation?',), parse_yes_no, False),
+    'interview_fear': (('Interview fear level (1–5)',), parse_float, None),
+    'confidence_level': (('Confidence level (1–5)',), parse_float, None),
+    'placement_status': (('Placement status ', 'Placement status'), parse_text, 'Not Placed'),
+    'role_relevance': (('Role relevance to major (0–100%)',), parse_float, None),
+    'placement_attempts': (('Number of placement attempts',), parse_int, None),
+    'months_to_get_placed': (('Months taken to get placed',), parse_int, None),
+    'biggest_strength': (('Biggest strength',), parse_text, None),
+    'biggest_weakness': (('Biggest weakness',), parse_text, None),
+    'habit_to_improve': (('One habit you want to improve',), parse_text, None),
+    'what_holds_back': (('What holds you back the most',), parse_text, None),
+}
+
+# Student profile columns copied as parsed
+STUDENT_FIELDS = (
+    'usn', 'name', 'age', 'gender', 'major', 'semester', 'college_name', 'gpa', 'gpa_trend',
+    'attendance', 'backlogs', 'project_count', 'programming_languages', 'strongest_skill',
+    'placement_status', 'biggest_strength', 'biggest_weakness', 'habit_to_improve',
+    'what_holds_back', 'career_clarity', 'chosen_career_path', 'daily_placement_prep',
+    'interview_fear', 'confidence_level', 'role_relevance', 'placement_attempts',
+    'months_to_get_placed',
+)
+
+# Behavioral metric columns copied as parsed
+METRIC_FIELDS = (
+    'practice_hours_per_day', 'project_count', 'project_types', 'deployed_project',
+    'internship_exp', 'internship_duration', 'problem_solving', 'communication', 'teamwork',
+    'consistency', 'attend_lab_regularly', 'submit_assignments_on_time', 'avg_internal_marks',
+    'follow_study_schedule', 'concept_revision_frequency', 'online_courses_count',
+)
+
+SUBJECTS = 5
+
+# Skills created from the programming languages answer
+MAX_SKILLS = 5
+
+# Password hash of imported users when no hasher is given (cannot log in)
+UNUSABLE_PASSWORD_HASH = "placeholder"
+
+# Timed stages of an import (summary['stages'], seconds):
+#   parse: reading, parsing and validating rows; lookup: natural key queries;
+#   transform: building table rows; hash_wait: waiting for password hashes;
+#   write: INSERT/UPDATE/DELETE/COPY; commit; refresh: derived data
+IMPORT_STAGES = ('parse', 'lookup', 'transform', 'hash_wait', 'write', 'commit', 'refresh')
+
+
+def content_hash(values: Sequence[Any]) -> str:
+    """SHA-256 of a row's parsed values (stored as import_hash)."""
+    encoded = json.dumps(list(values), default=str, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def survey_positions(header: Sequence[str]) -> Dict[str, int]:
+    """
+    Column index of each survey field present in a header row.
+    
+    Raises:
+        ValueError: The header has no email address column
+    """
+    header = [name.strip() for name in header]
+    positions = {}
+    for field, (headers, _, _) in SURVEY_COLUMNS.items():
+        for name in headers:
+            if name.strip() in header:
+                positions[field] = header.index(name.strip())
+                break
+    if 'email' not in positions:
+        raise ValueError("CSV has no email address column")
+    return positions
+
+
+def iter_survey_csv(lines: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parse a survey CSV into columns, chunk by chunk, in one pass.
+    
+    Blank answers take the column default; answers that cannot be parsed,
+    missing emails and repeated emails or USNs (anywhere in the file) make
+    the row an error. Each valid row gets its content hash (column
+    'import_hash').
+    
+    Args:
+        lines: CSV text lines (an open file or any iterable of lines)
+        chunk_size: Valid rows per chunk (None: the whole file in one chunk)
+    
+    Yields:
+        dict: {'row_numbers': [int], 'columns': {field: [value]},
+        'errors': [{'row', 'email', 'error'}]} (row numbers count the header
+        as row 1); at least one chunk is yielded
+    """
+    reader = csv.reader(lines)
+    positions = survey_positions(next(reader, []))
+    
+    parsers = [
+        (field, positions.get(field), parser, default)
+        for field, (_, parser, default) in SURVEY_COLUMNS.items()
+    ]
+    seen = set()
+    seen_usns = set()
+    
+    def empty_chunk():
+        columns = {field: [] for field in SURVEY_COLUMNS}
+        columns['import_hash'] = []
+        return {'row_numbers': [], 'columns': columns, 'errors': []}
+    
+    chunk = empty_chunk()
+    for row_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        values = {}
+        problems = []
+        for field, position, parser, default in parsers:
+            cell = row[position] if position is not None and position < len(row) else ''
+            try:
+                value = parser(cell)
+            except ValueError:
+                problems.append(f"Invalid value for {SURVEY_COLUMNS[field][0][0].strip()}: {cell.strip()!r}")
+                value = None
+            values[field] = default if value is None else value
+        
+        email = values['email'].lower() if values['email'] else None
+        if email is None:
+            problems.append("Missing email address")
+        elif email in seen:
+            problems.append("Duplicate email address in file")
+        if values['usn'] is not None and values['usn'].upper() in seen_usns:
+            problems.append("Duplicate USN in file")
+        if problems:
+            chunk['errors'].append({'row': row_number, 'email': email, 'error': "; ".join(problems)})
+            continue
+        
+        seen.add(email)
+        values['email'] = email
+        if values['usn'] is not None:
+            values['usn'] = values['usn'].upper()
+            seen_usns.add(values['usn'])
+        values['import_hash'] = content_hash(values.values())
+        chunk['row_numbers'].append(row_number)
+        for field, value in values.items():
+            chunk['columns'][field].append(value)
+        
+        if chunk_size and len(chunk['row_numbers']) >= chunk_size:
+            yield chunk
+            chunk = empty_chunk()
+    
+    if chunk['row_numbers'] or chunk['errors'] or not seen:
+        yield chunk
+
+
+def parse_survey_csv(lines: Iterable[str]) -> Dict[str, Any]:
+    """Parse a whole survey CSV into columns (see iter_survey_csv)."""
+    return next(iter_survey_csv(lines))
+
+
+# ============================================================================
+# ALUMNI TEMPLATE (GET /api/admin/alumni-template)
+# ============================================================================
+
+ALUMNI_TEMPLATE_COLUMNS = (
+    'name', 'major', 'graduation_year', 'gpa', 'attendance', 'placement_status',
+    'company_tier', 'role_title', 'salary_range', 'role_to_major_match_score',
+    'study_hours_per_week', 'project_count',
+)
+
+ALUMNI_REQUIRED = ('name', 'major', 'graduation_year', 'gpa', 'attendance', 'placement_status')
+
+ALUMNI_REQUIRED_IF_PLACED = ('company_tier', 'role_title', 'salary_range', 'role_to_major_match_score')
+
+# column -> (minimum, maximum or None, whole number)
+ALUMNI_NUMBERS = {
+    'graduation_year': (1000, 9999, True),
+    'gpa': (0.0, 10.0, False),
+    'attendance': (0.0, 100.0, False),
+    'role_to_major_match_score': (0.0, 100.0, False),
+    'study_hours_per_week': (0.0, 40.0, False),
+    'project_count': (0, None, True),
+}
+
+ALUMNI_CHOICES = {'placement_status': PlacementStatusEnum, 'company_tier': CompanyTierEnum}
+
+
+def alumni_positions(header: Sequence[str]) -> Dict[str, Optional[int]]:
+    """
+    Column index of each template column in a header row (None if absent).
+    
+    Raises:
+        ValueError: A required column is missing
+    """
+    header = [name.strip().lower() for name in header]
+    missing = [column for column in ALUMNI_REQUIRED if column not in header]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+    return {
+        column: header.index(column) if column in header else None
+        for column in ALUMNI_TEMPLATE_COLUMNS
+    }
+
+
+def alumni_key(name: str, graduation_year: int) -> Tuple[str, int]:
+    """Natural key of an alumni record (case-insensitive name, graduation year)."""
+    return name.strip().lower(), int(graduation_year)
+
+
+def _to_numbers(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Floats of a text column (NaN where blank) and the mask of unparsable cells."""
+    values = np.char.rstrip(values, '%')
+    blank = values == ''
+    try:
+        return np.where(blank, 'nan', values).astype(np.float64), np.zeros(len(values), dtype=bool)
+    except ValueError:
+        numbers = np.full(len(values), np.nan)
+        invalid = np.zeros(len(values), dtype=bool)
+        for index in np.flatnonzero(~blank):
+            try:
+                numbers[index] = float(values[index])
+            except ValueError:
+                invalid[index] = True
+        return numbers, invalid
+
+
+def validate_alumni_rows(
+    rows: List[List[str]],
+    row_numbers: List[int],
+    positions: Dict[str, Optional[int]],
+    seen: Optional[set] = None
+) -> Dict[str, Any]:
+    """
+    Validate a chunk of alumni template rows column by column.
+    
+    Every rule is one NumPy operation over the chunk's column (required
+    values, allowed choices, number parsing, ranges, whole numbers), so the
+    cost per row is a few array element operations.
+    
+    Args:
+        seen: Natural keys of earlier valid rows of the file; rows repeating
+              one are errors (the set is updated)
+    
+    Returns:
+        dict: {'row_numbers', 'columns': {column: [value]} of the valid rows
+        (numbers, enums and None for blanks) plus their 'import_hash',
+        'errors': [{'row', 'name', 'error'}]}
+    """
+    count = len(rows)
+    table = np.array(
+        [[row[position].strip() if position is not None and position < len(row) else ''
+          for position in positions.values()] for row in rows],
+        dtype=str
+    ).reshape(count, len(positions))
+    text = {column: table[:, index] for index, column in enumerate(positions)}
+    problems: List[List[str]] = [[] for _ in range(count)]
+    
+    def flag(mask: np.ndarray, message: str):
+        for index in np.flatnonzero(mask):
+            problems[index].append(message)
+    
+    for column in ALUMNI_REQUIRED:
+        flag(text[column] == '', f"Missing {column}")
+    placed = text['placement_status'] == PlacementStatusEnum.PLACED.value
+    for column in ALUMNI_REQUIRED_IF_PLACED:
+        flag(placed & (text[column] == ''), f"Missing {column} (required if placed)")
+    for column, choices in ALUMNI_CHOICES.items():
+        allowed = [choice.value for choice in choices]
+        flag((text[column] != '') & ~np.isin(text[column], allowed),
+             f"{column} must be one of: {', '.join(allowed)}")
+    
+    numbers = {}
+    for column, (minimum, maximum, whole) in ALUMNI_NUMBERS.items():
+        values, invalid = _to_numbers(text[column])
+        flag(invalid, f"Invalid number for {column}")
+        out_of_range = values < minimum
+        if maximum is not None:
+            out_of_range |= values > maximum
+        flag(out_of_range, f"{column} must be between {minimum} and {maximum}" if maximum is not None
+             else f"{column} must be at least {minimum}")
+        if whole:
+            flag(np.isfinite(values) & (np.mod(values, 1) != 0), f"{column} must be a whole number")
+        numbers[column] = values
+    
+    if seen is not None:
+        for index in range(count):
+            if problems[index]:
+                continue
+            key = alumni_key(text['name'][index], numbers['graduation_year'][index])
+            if key in seen:
+                problems[index].append("Duplicate alumni (name, graduation_year) in file")
+            else:
+                seen.add(key)
+    
+    valid = [index for index in range(count) if not problems[index]]
+    columns: Dict[str, List[Any]] = {}
+    for column in ALUMNI_TEMPLATE_COLUMNS:
+        if column in ALUMNI_NUMBERS:
+            whole = ALUMNI_NUMBERS[column][2]
+            columns[column] = [
+                None if np.isnan(value) else (int(value) if whole else float(value))
+                for value in numbers[column][valid].tolist()
+            ]
+        elif column in ALUMNI_CHOICES:
+            columns[column] = [ALUMNI_CHOICES[column](value) if value else None for value in text[column][valid].tolist()]
+        else:
+            columns[column] = [value or None for value in text[column][valid].tolist()]
+    columns['import_hash'] = [
+        content_hash(values) for values in zip(*(columns[column] for column in ALUMNI_TEMPLATE_COLUMNS))
+    ]
+    
+    return {
+        'row_numbers': [row_numbers[index] for index in valid],
+        'columns': columns,
+        'errors': [
+            {'row': row_numbers[index], 'name': str(text['name'][index]) or None, 'error': "; ".join(problems[index])}
+            for index in range(count) if problems[index]
+        ]
+    }
+
+
+def iter_alumni_csv(lines: Iterable[str], chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Parse and validate an alumni template CSV chunk by chunk, in one pass.
+    
+    Yields:
+        dict: validate_alumni_rows result per chunk of chunk_size rows
+        (repeated natural keys are errors across the whole file)
+    
+    Raises:
+        ValueError: The header lacks a required column
+    """
+    reader = csv.reader(lines)
+    positions = alumni_positions(next(reader, []))
+    seen = set()
+    rows, row_numbers = [], []
+    for row_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        rows.append(row)
+        row_numbers.append(row_number)
+        if len(rows) >= chunk_size:
+            yield validate_alumni_rows(rows, row_numbers, positions, seen)
+            rows, row_numbers = [], []
+    if rows:
+        yield validate_alumni_rows(rows, row_numbers, positions, seen)
+
+
+def check_csv_header(kind: str, header_line: str):
+    """
+    Check the header row of an upload before importing it.
+    
+    Args:
+        kind: "students" (survey export) or "alumni" (alumni template)
+    
+    Raises:
+        ValueError: Unknown kind, or the header lacks a required column
+    """
+    header = next(csv.reader([header_line]), [])
+    if kind == 'students':
+        survey_positions(header)
+    elif kind == 'alumni':
+        alumni_positions(header)
+    else:
+        raise ValueError(f"Unknown import kind: {kind}")
+
+
+def _copy_value(value):
+    """Value as written in a COPY ... (FORMAT csv) stream."""
+    if value is None:
+        return None
+    if isinstance(value, (PlacementStatusEnum, CompanyTierEnum)):
+        return value.name
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _new_summary(ids_key: str) -> Dict[str, Any]:
+    return {
+        'rows': 0, 'imported': 0, 'updated': 0, 'skipped': 0, 'failed': 0,
+        ids_key: [], 'updated_ids': [], 'errors': [], 'seconds': 0.0, 'rows_per_second': 0.0,
+        'stages': {stage: 0.0 for stage in IMPORT_STAGES}
+    }
+
+
+@contextmanager
+def _stage(stages: Dict[str, float], name: str):
+    """Add the time spent in the block to stages[name]."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] += time.perf_counter() - started
+
+
+def _update_timing(summary: Dict[str, Any], started: float):
+    seconds = time.perf_counter() - started
+    done = summary['imported'] + summary['updated'] + summary['skipped'] + summary['failed']
+    summary['seconds'] = round(seconds, 3)
+    summary['rows_per_second'] = round(done / seconds, 1) if seconds > 0 else 0.0
+
+
+def _chunk_failed(summary: Dict[str, Any], chunk: Dict[str, Any], error: Exception, key: str):
+    """Report every row of a chunk that failed to load."""
+    logger.error(f"Import of rows {chunk['row_numbers'][0]}-{chunk['row_numbers'][-1]} failed: {error}")
+    summary['failed'] += len(chunk['row_numbers'])
+    summary['errors'].extend(
+        {'row': row, key: value, 'error': f"Chunk failed to load: {error}"}
+        for row, value in zip(chunk['row_numbers'], chunk['columns'][key])
+    )
+
+
+class CsvImportEngine:
+    """Chunked bulk import of survey CSVs."""
+    
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        hash_password: Optional[Callable[[int], Union[List[str], Future]]] = None,
+        refresh_derived: bool = True
+    ):
+        """
+        Args:
+            chunk_size: Rows per transaction
+            hash_password: Returns the password hashes of n new users, or a
+                           Future of them (e.g. BulkPasswordHasher.submit) so
+                           hashing overlaps with loading the previous chunk;
+                           None gives imported users an unusable password
+            refresh_derived: Refresh the derived data (behavioral statistics,
+                             cohort tables, study-hours features) of the
+                             imported students;
+                             turn off for very large loads and run the
+                             rebuild scripts afterwards
+        """
+        self.chunk_size = chunk_size
+        self.hash_password = hash_password or (lambda count: [UNUSABLE_PASSWORD_HASH] * count)
+        self.refresh_derived = refresh_derived
+    
+    def import_file(self, db: Session, path: str, **kwargs) -> Dict[str, Any]:
+        """Import a survey CSV file (see import_lines)."""
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            return self.import_lines(db, file, **kwargs)
+    
+    def import_lines(
+        self,
+        db: Session,
+        lines: Iterable[str],
+        today: Optional[date] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse and import a survey CSV.
+        
+        The import is pipelined: chunk N+1 is parsed, its existing users
+        looked up and its password hashing started before chunk N is
+        written, so asynchronous hashing runs while the database is busy.
+        
+        Args:
+            db: Database session (each chunk is committed by this method)
+            lines: CSV text lines
+            today: Day the survey baselines are reported on (default: today)
+            progress: Called with the running summary after each chunk
+        
+        Returns:
+            dict: {'rows', 'imported' (new students), 'updated' (changed),
+            'skipped' (unchanged), 'failed', 'student_ids' (new),
+            'updated_ids' (changed), 'errors': [{'row', 'email', 'error'}],
+            'seconds', 'rows_per_second', 'stages': {stage: seconds}}
+        """
+        started = time.perf_counter()
+        today = today or date.today()
+        summary = _new_summary('student_ids')
+        stages = summary['stages']
+        
+        def load(prepared):
+            if prepared.get('error') is not None:
+                _chunk_failed(summary, prepared, prepared['error'], 'email')
+            else:
+                try:
+                    imported, updated = self._load_chunk(db, prepared, today, stages)
+                except Exception as e:
+                    db.rollback()
+                    _chunk_failed(summary, prepared, e, 'email')
+                else:
+                    summary['imported'] += len(imported)
+                    summary['updated'] += len(updated)
+                    summary['student_ids'].extend(imported)
+                    summary['updated_ids'].extend(updated)
+            if progress:
+                _update_timing(summary, started)
+                progress(dict(summary))
+        
+        pending = None
+        chunks = iter_survey_csv(lines, self.chunk_size)
+        while True:
+            with _stage(stages, 'parse'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            summary['rows'] += len(chunk['row_numbers']) + len(chunk['errors'])
+            summary['failed'] += len(chunk['errors'])
+            summary['errors'].extend(chunk['errors'])
+            if not chunk['row_numbers']:
+                continue
+            
+            with _stage(stages, 'lookup'):
+                prepared = self._prepare_chunk(db, chunk)
+            summary['skipped'] += prepared['skipped']
+            summary['failed'] += len(prepared['errors'])
+            summary['errors'].extend(prepared['errors'])
+            if pending is not None:
+                load(pending)
+            pending = prepared if prepared['row_numbers'] else None
+        if pending is not None:
+            load(pending)
+        
+        summary['errors'].sort(key=lambda error: error['row'])
+        _update_timing(summary, started)
+        return summary
+    
+    def import_alumni_lines(
+        self,
+        db: Session,
+        lines: Iterable[str],
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate and upsert an alumni template CSV (one transaction per chunk).
+        
+        Rows are matched to existing alumni by name (case-insensitive) and
+        graduation year; changed rows update the record, unchanged rows are
+        skipped.
+        
+        Args:
+            db: Database session (each chunk is committed by this method)
+            lines: CSV text lines
+            progress: Called with the running summary after each chunk
+        
+        Returns:
+            dict: {'rows', 'imported' (new alumni), 'updated' (changed),
+            'skipped' (unchanged), 'failed', 'alumni_ids' (new),
+            'updated_ids' (changed), 'errors': [{'row', 'name', 'error'}],
+            'seconds', 'rows_per_second', 'stages': {stage: seconds}}
+        
+        Raises:
+            ValueError: The header lacks a required column
+        """
+        started = time.perf_counter()
+        summary = _new_summary('alumni_ids')
+        stages = summary['stages']
+        
+        chunks = iter_alumni_csv(lines, self.chunk_size)
+        while True:
+            with _stage(stages, 'parse'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            summary['rows'] += len(chunk['row_numbers']) + len(chunk['errors'])
+            summary['failed'] += len(chunk['errors'])
+            summary['errors'].extend(chunk['errors'])
+            
+            if chunk['row_numbers']:
+                try:
+                    alumni_ids, updated_ids, skipped = self._upsert_alumni(db, chunk['columns'], stages)
+                except Exception as e:
+                    db.rollback()
+                    _chunk_failed(summary, chunk, e, 'name')
+                else:
+                    summary['imported'] += len(alumni_ids)
+                    summary['updated'] += len(updated_ids)
+                    summary['skipped'] += skipped
+                    summary['alumni_ids'].extend(alumni_ids)
+                    summary['updated_ids'].extend(updated_ids)
+            
+            if progress:
+                _update_timing(summary, started)
+                progress(dict(summary))
+        
+        summary['errors'].sort(key=lambda error: error['row'])
+        _update_timing(summary, started)
+        return summary
+    
+    def _upsert_alumni(
+        self,
+        db: Session,
+        columns: Dict[str, List[Any]],
+        stages: Dict[str, float]
+    ) -> Tuple[List[int], List[int], int]:
+        """
+        Upsert one validated chunk of alumni rows in one transaction.
+        
+        Returns:
+            tuple: (new alumni ids, updated alumni ids, unchanged row count)
+        """
+        keys = [alumni_key(name, year) for name, year in zip(columns['name'], columns['graduation_year'])]
+        existing = {}
+        with _stage(stages, 'lookup'):
+            for alumni_id, name, year, import_hash in db.execute(
+                select(Alumni.id, Alumni.name, Alumni.graduation_year, Alumni.import_hash)
+                .where(Alumni.graduation_year.in_(sorted({year for _, year in keys})))
+                .where(func.lower(Alumni.name).in_(sorted({name for name, _ in keys})))
+                .order_by(Alumni.id)
+            ):
+                existing.setdefault(alumni_key(name, year), (alumni_id, import_hash))
+        
+        now = datetime.utcnow()
+        new_rows, changed_rows = [], []
+        with _stage(stages, 'transform'):
+            for index, key in enumerate(keys):
+                row = {column: columns[column][index] for column in ALUMNI_TEMPLATE_COLUMNS}
+                row.update(import_hash=columns['import_hash'][index], updated_at=now)
+                if key not in existing:
+                    new_rows.append(dict(row, created_at=now))
+                elif existing[key][1] != row['import_hash']:
+                    changed_rows.append(dict(row, id=existing[key][0]))
+        
+        with _stage(stages, 'write'):
+            alumni_ids = self._load(db, Alumni, new_rows)
+            if changed_rows:
+                db.execute(update(Alumni), changed_rows)
+        with _stage(stages, 'commit'):
+            db.commit()
+        return alumni_ids, [row['id'] for row in changed_rows], len(keys) - len(new_rows) - len(changed_rows)
+    
+    def _prepare_chunk(self, db: Session, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Match the chunk's rows to existing users and students by natural key
+        and start hashing the passwords of the new users (nothing is written).
+        
+        A row matches a student by email, or by USN when its email has none;
+        rows whose stored import_hash is unchanged are dropped.
+        
+        Returns:
+            dict: The chunk without unchanged rows, plus 'skipped',
+            'student_ids' (existing student per row, None for new ones),
+            'users' (email -> id of existing users), 'new_emails', 'hashes'
+            (list or Future) and 'error' (exception, if any)
+        """
+        columns = chunk['columns']
+        try:
+            users = {}
+            by_email = {}
+            for user_id, email, student_id, import_hash in db.execute(
+                select(User.id, User.email, Student.id, Student.import_hash)
+                .outerjoin(Student, Student.user_id == User.id)
+                .where(User.email.in_(columns['email']))
+            ):
+                users[email] = user_id
+                if student_id is not None:
+                    by_email[email] = (student_id, import_hash)
+            usns = [usn for usn in columns['usn'] if usn is not None]
+            by_usn = {
+                usn: (student_id, import_hash)
+                for student_id, usn, import_hash in db.execute(
+                    select(Student.id, Student.usn, Student.import_hash).where(Student.usn.in_(usns))
+                )
+            } if usns else {}
+            db.rollback()
+            
+            keep, student_ids, errors = [], [], []
+            for index, (email, usn) in enumerate(zip(columns['email'], columns['usn'])):
+                match = by_email.get(email)
+                usn_match = by_usn.get(usn)
+                if match is not None and usn_match is not None and usn_match[0] != match[0]:
+                    errors.append({'row': chunk['row_numbers'][index], 'email': email,
+                                   'error': f"USN {usn} belongs to another student"})
+                    continue
+                match = match or usn_match
+                if match is not None and match[1] == columns['import_hash'][index]:
+                    continue
+                keep.append(index)
+                student_ids.append(match[0] if match is not None else None)
+            
+            columns = {field: [values[index] for index in keep] for field, values in columns.items()}
+            # Users without a student profile (e.g. created at sign-up) get one
+            new_emails = [
+                email for email, student_id in zip(columns['email'], student_ids)
+                if student_id is None and email not in users
+            ]
+            return {
+                'row_numbers': [chunk['row_numbers'][index] for index in keep],
+                'columns': columns,
+                'skipped': len(chunk['row_numbers']) - len(keep) - len(errors),
+                'errors': errors,
+                'student_ids': student_ids,
+                'users': users,
+                'new_emails': new_emails,
+                'hashes': self.hash_password(len(new_emails)) if new_emails else []
+            }
+        except Exception as e:
+            db.rollback()
+            return dict(chunk, skipped=0, errors=[], error=e)
+    
+    def _load_chunk(
+        self,
+        db: Session,
+        chunk: Dict[str, Any],
+        today: date,
+        stages: Dict[str, float]
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Load one prepared chunk in one transaction.
+        
+        New students get every table, including the wellbeing baseline.
+        Changed students get their profile updated and their behavioral
+        metrics, subject scores, baseline and the skills named in the row
+        replaced; their wellbeing days are left to the app's own sync.
+        
+        Returns:
+            tuple: (new student ids, updated student ids)
+        """
+        columns = chunk['columns']
+        count = len(chunk['row_numbers'])
+        now = datetime.utcnow()
+        
+        hashes = chunk['hashes']
+        if isinstance(hashes, Future):
+            with _stage(stages, 'hash_wait'):
+                hashes = hashes.result()
+        users = dict(chunk['users'])
+        with _stage(stages, 'write'):
+            new_ids = self._load(db, User, [
+                {'email': email, 'password_hash': password_hash, 'role': 'student', 'created_at': now}
+                for email, password_hash in zip(chunk['new_emails'], hashes)
+            ])
+        users.update(zip(chunk['new_emails'], new_ids))
+        
+        with _stage(stages, 'transform'):
+            students, new_students, changed_students = [], [], []
+            for index in range(count):
+                student = {field: columns[field][index] for field in STUDENT_FIELDS}
+                student.update(
+                    is_alumni=(columns['role'][index] or '').lower() == 'alumni',
+                    study_hours_per_week=round(columns['study_hours_per_day'][index] * 7, 1),
+                    import_hash=columns['import_hash'][index],
+                    updated_at=now
+                )
+                students.append(student)
+                if chunk['student_ids'][index] is None:
+                    new_students.append(dict(student, user_id=users[columns['email'][index]], created_at=now))
+                else:
+                    changed = dict(student, id=chunk['student_ids'][index])
+                    if changed['usn'] is None:
+                        # A blank USN does not clear one set in the app
+                        del changed['usn']
+                    changed_students.append(changed)
+        
+        with _stage(stages, 'write'):
+            inserted_ids = self._load(db, Student, new_students)
+            previous_hours = {}
+            if changed_students:
+                previous_hours = dict(db.execute(
+                    select(Student.id, Student.study_hours_per_week)
+                    .where(Student.id.in_([student['id'] for student in changed_students]))
+                ).all())
+                db.execute(update(Student), changed_students)
+        inserted = iter(inserted_ids)
+        student_ids = [
+            next(inserted) if student_id is None else student_id
+            for student_id in chunk['student_ids']
+        ]
+        updated_ids = [student['id'] for student in changed_students]
+        
+        with _stage(stages, 'transform'):
+            metrics, subjects, skills, baselines = [], [], [], []
+            for index, student_id in enumerate(student_ids):
+                metric = {field: columns[field][index] for field in METRIC_FIELDS}
+                metric.update(
+                    student_id=student_id,
+                    study_hours_per_week=students[index]['study_hours_per_week'],
+                    skill_score=(columns['confidence_level'][index] or 3.0) * 2,
+                    updated_at=now
+                )
+                metrics.append(metric)
+                
+                for number in range(1, SUBJECTS + 1):
+                    name = columns[f'subject_{number}'][index]
+                    marks = columns[f'subject_{number}_marks'][index]
+                    if name and marks is not None:
+                        subjects.append({
+                            'student_id': student_id, 'student_name': students[index]['name'],
+                            'semester': students[index]['semester'], 'subject_name': name, 'marks': marks
+                        })
+                
+                names = []
+                for name in (columns['programming_languages'][index] or '').split(','):
+                    name = name.strip()
+                    if name and name not in names:
+                        names.append(name)
+                skills.extend(
+                    {
+                        'student_id': student_id, 'skill_name': name,
+                        'proficiency_score': columns['problem_solving'][index] * 20,
+                        'market_weight': 1.0, 'last_assessed_at': now,
+                        'created_at': now, 'updated_at': now
+                    }
+                    for name in names[:MAX_SKILLS]
+                )
+                
+                baseline = {
+                    'screen_time_hours': columns['screen_time'][index],
+                    'educational_app_hours': columns['learning'][index],
+                    'social_media_hours': columns['social_media'][index],
+                    'entertainment_hours': columns['entertainment'][index],
+                    'productivity_hours': columns['practice_hours_per_day'][index],
+                    'communication_hours': 0.5,
+                    'sleep_duration_hours': columns['sleep'][index],
+                }
+                baseline.update(
+                    student_id=student_id,
+                    source='survey',
+                    reported_on=today,
+                    focus_score=round(stored_focus_score(baseline), 2),
+                    updated_at=now
+                )
+                baselines.append(baseline)
+        
+        with _stage(stages, 'write'):
+            if updated_ids:
+                db.execute(delete(BehavioralMetric).where(BehavioralMetric.student_id.in_(updated_ids)))
+                db.execute(delete(StudentSubjectScore).where(StudentSubjectScore.student_id.in_(updated_ids)))
+                db.execute(delete(WellbeingBaseline).where(WellbeingBaseline.student_id.in_(updated_ids)))
+                updated = set(updated_ids)
+                replaced = [(row['student_id'], row['skill_name']) for row in skills if row['student_id'] in updated]
+                if replaced:
+                    db.execute(delete(Skill).where(tuple_(Skill.student_id, Skill.skill_name).in_(replaced)))
+            self._load(db, BehavioralMetric, metrics, ids=False)
+            self._load(db, StudentSubjectScore, subjects, ids=False)
+            self._load(db, Skill, skills, ids=False)
+            self._load(db, WellbeingBaseline, baselines, ids=False)
+        with _stage(stages, 'commit'):
+            db.commit()
+        
+        if self.refresh_derived:
+            with _stage(stages, 'refresh'):
+                # Changed study hours feed the decayed study-hours feature, as
+                # in a profile update (new students fall back to the profile)
+                get_feature_store().observe_students(db, {
+                    student['id']: [(today, {'study_hours': student['study_hours_per_week']}, None)]
+                    for student in changed_students
+                    if student['study_hours_per_week'] != previous_hours.get(student['id'])
+                })
+                # New baselines and profile changes (GPA, major, semester) move the
+                # population statistics; the features read baselines directly.
+                # One transaction per service for the whole chunk
+                get_behavioral_analysis_service().record_students_update(db, student_ids)
+                get_cohort_benchmark_service().record_students_update(db, student_ids)
+        return inserted_ids, updated_ids
+    
+    def _load(self, db: Session, model, rows: List[Dict[str, Any]], ids: bool = True) -> Optional[List[int]]:
+        """
+        Write rows to a table without the ORM.
+        
+        Returns:
+            list: Ids of the rows, in order (if ids is True)
+        """
+        allocated = None
+        if not rows:
+            return [] if ids else None
+        table = model.__table__
+        bind = db.get_bind()
+        
+        if bind.dialect.name == 'postgresql' and bind.dialect.driver == 'psycopg2':
+            if ids:
+                sequence = db.execute(
+                    text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': table.name}
+                ).scalar()
+                allocated = db.execute(
+                    select(func.nextval(sequence)).select_from(func.generate_series(1, len(rows)))
+                ).scalars().all()
+                rows = [dict(row, id=row_id) for row, row_id in zip(rows, allocated)]
+            self._copy(db, table, rows)
+            return allocated
+        
+        if ids:
+            # Multi-row INSERTs assign increasing ids in row order, so sorting
+            # the returned ids matches them to the rows
+            return sorted(db.execute(insert(table).returning(table.c.id), rows).scalars().all())
+        db.execute(insert(table), rows)
+        return None
+    
+    def _copy(self, db: Session, table, rows: Sequence[Dict[str, Any]]):
+        """COPY rows into a table on the session's connection (same transaction)."""
+        names = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(row[name]) for name in names])
+        buffer.seek(0)
+        
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+
+
+_csv_import_engine: Optional[CsvImportEngine] = None
+
+def get_csv_import_engine() -> CsvImportEngine:
+    global _csv_import_engine
+    if _csv_import_engine is None:
+        _csv_import_engine = CsvImportEngine()
+    return _csv_import_engine
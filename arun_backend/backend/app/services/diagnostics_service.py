@@ -0,0 +1,298 @@
+"""
+Diagnostics Service for Trajectory Engine MVP
+
+Database debugging information that never reads a whole table:
+
+- Table sizes: planner row estimates from pg_class (reltuples) with the
+  scan counters of pg_stat_user_tables on PostgreSQL; elsewhere the
+  highest id, read from the primary key index
+- Index usage: scans and size of every index (pg_stat_user_indexes), so
+  unused indexes stand out
+- Slow queries: the slowest statements of pg_stat_statements when the
+  extension is installed, plus recent samples of statements slower than
+  a threshold taken in this process (SlowQuerySampler, any database)
+- Row sampler: a page of a table's rows by primary key (keyset cursor,
+  at most MAX_SAMPLE_ROWS rows), sensitive columns left out
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Integer, event, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Base
+from app.pagination import keyset_page, select_fields
+
+logger = logging.getLogger(__name__)
+
+
+# Largest page of the row sampler
+MAX_SAMPLE_ROWS = 100
+
+# Columns the row sampler never returns
+SENSITIVE_COLUMNS = ('password_hash',)
+
+# Characters of a statement kept in a slow query sample
+MAX_STATEMENT_CHARS = 2000
+
+# Statements at least this slow are sampled by the application's sampler
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
+TABLE_STATS_SQL = text("""
+    SELECT c.relname AS table_name,
+           c.reltuples::bigint AS estimated_rows,
+           pg_total_relation_size(c.oid) AS total_bytes,
+           s.seq_scan, s.idx_scan, s.n_live_tup, s.n_dead_tup,
+           greatest(s.last_analyze, s.last_autoanalyze) AS last_analyzed
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.relkind IN ('r', 'p') AND n.nspname = current_schema()
+    ORDER BY c.reltuples DESC
+""")
+
+INDEX_USAGE_SQL = text("""
+    SELECT s.relname AS table_name, s.indexrelname AS index_name,
+           s.idx_scan, s.idx_tup_read, s.idx_tup_fetch,
+           pg_relation_size(s.indexrelid) AS bytes
+    FROM pg_stat_user_indexes s
+    WHERE s.schemaname = current_schema()
+    ORDER BY s.idx_scan, pg_relation_size(s.indexrelid) DESC
+""")
+
+# PostgreSQL 13+ column names (total_time/mean_time before)
+STATEMENTS_SQL = """
+    SELECT query, calls, rows, {total} AS total_ms, {mean} AS mean_ms
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY {mean} DESC
+    LIMIT :limit
+"""
+
+
+class SlowQuerySampler:
+    """Keeps the most recent statements of an engine slower than a threshold."""
+    
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, max_samples: int = 50):
+        """
+        Args:
+            threshold_ms: Statements taking at least this long are sampled
+            max_samples: Samples kept (oldest dropped first)
+        """
+        self.threshold_ms = threshold_ms
+        self._samples = deque(maxlen=max_samples)
+        self._engines = set()
+        self._lock = threading.Lock()
+    
+    def install(self, engine: Engine):
+        """Time every statement of an engine (once per engine)."""
+        with self._lock:
+            if engine in self._engines:
+                return
+            self._engines.add(engine)
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+    
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('statement_started', []).append(time.perf_counter())
+    
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('statement_started')
+        if not starts:
+            # Installed while the statement was running
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        if elapsed_ms >= self.threshold_ms:
+            # Statement text only: parameters may hold personal data
+            sample = {
+                'statement': statement[:MAX_STATEMENT_CHARS],
+                'ms': round(elapsed_ms, 1),
+                'executemany': executemany,
+                'at': datetime.utcnow().isoformat()
+            }
+            with self._lock:
+                self._samples.append(sample)
+    
+    def samples(self) -> List[Dict[str, Any]]:
+        """Sampled statements, slowest first."""
+        # Statements of other threads keep arriving while this sorts
+        with self._lock:
+            samples = list(self._samples)
+        return sorted(samples, key=lambda sample: sample['ms'], reverse=True)
+
+
+class DiagnosticsService:
+    """Bounded database diagnostics (no full-table reads)."""
+    
+    def __init__(self, sampler: Optional[SlowQuerySampler] = None):
+        """
+        Initialize diagnostics service.
+        
+        Args:
+            sampler: Slow query sampler of the application engine
+        """
+        self.sampler = sampler or SlowQuerySampler()
+    
+    def table_stats(self, db: Session) -> List[Dict[str, Any]]:
+        """
+        Estimated size of every table.
+        
+        Returns:
+            list: {'table', 'estimated_rows', 'source', ...} per table; on
+            PostgreSQL also total_bytes, seq_scan, idx_scan, n_live_tup,
+            n_dead_tup and last_analyzed (estimated_rows is None for tables
+            never analyzed)
+        """
+        if db.get_bind().dialect.name == 'postgresql':
+            return [
+                {
+                    'table': row.table_name,
+                    'estimated_rows': row.estimated_rows if row.estimated_rows >= 0 else None,
+                    'source': 'pg_class',
+                    **{key: row._mapping[key] for key in (
+                        'total_bytes', 'seq_scan', 'idx_scan', 'n_live_tup', 'n_dead_tup', 'last_analyzed'
+                    )}
+                }
+                for row in db.execute(TABLE_STATS_SQL)
+            ]
+        
+        existing = set(inspect(db.connection()).get_table_names())
+        stats = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            primary_key = list(table.primary_key.columns)
+            estimated_rows = None
+            if len(primary_key) == 1 and isinstance(primary_key[0].type, Integer):
+                estimated_rows = db.execute(select(func.max(primary_key[0]))).scalar() or 0
+            stats.append({'table': table.name, 'estimated_rows': estimated_rows, 'source': 'max_id'})
+        return stats
+    
+    def index_usage(self, db: Session) -> Optional[List[Dict[str, Any]]]:
+        """
+        Scans and size of every index, least used first (None where the
+        database keeps no index statistics).
+        """
+        if db.get_bind().dialect.name != 'postgresql':
+            return None
+        return [
+            {
+                'table': row.table_name,
+                'index': row.index_name,
+                'scans': row.idx_scan,
+                'tuples_read': row.idx_tup_read,
+                'tuples_fetched': row.idx_tup_fetch,
+                'bytes': row.bytes,
+                'unused': row.idx_scan == 0
+            }
+            for row in db.execute(INDEX_USAGE_SQL)
+        ]
+    
+    def slow_queries(self, db: Session, limit: int = 20) -> Dict[str, Any]:
+        """
+        Slowest statements by mean time.
+        
+        Returns:
+            dict: {'pg_stat_statements': list or None (extension missing or
+            not PostgreSQL), 'samples': recent slow statements of this process,
+            'threshold_ms': float}
+        """
+        statements = None
+        if db.get_bind().dialect.name == 'postgresql' and db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        ).first():
+            for total, mean in (('total_exec_time', 'mean_exec_time'), ('total_time', 'mean_time')):
+                try:
+                    rows = db.execute(text(STATEMENTS_SQL.format(total=total, mean=mean)), {'limit': limit})
+                except SQLAlchemyError:
+                    db.rollback()
+                    continue
+                statements = [
+                    {
+                        'statement': row.query[:MAX_STATEMENT_CHARS],
+                        'calls': row.calls,
+                        'rows': row.rows,
+                        'total_ms': round(row.total_ms, 1),
+                        'mean_ms': round(row.mean_ms, 1)
+                    }
+                    for row in rows
+                ]
+                break
+        
+        return {
+            'pg_stat_statements': statements,
+            'samples': self.sampler.samples()[:limit],
+            'threshold_ms': self.sampler.threshold_ms
+        }
+    
+    def sample_rows(
+        self,
+        db: Session,
+        table_name: str,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of a table's rows in primary key order.
+        
+        Args:
+            table_name: Table with a single-column primary key
+            cursor: next_cursor of the previous page
+            limit: Rows (at most MAX_SAMPLE_ROWS)
+            fields: Comma-separated columns (default: all but SENSITIVE_COLUMNS)
+        
+        Returns:
+            dict: {'table', 'rows', 'next_cursor'}
+        
+        Raises:
+            ValueError: Unknown table or column, invalid cursor, or a table
+                        that cannot be paged by primary key
+        """
+        model = next(
+            (mapper.class_ for mapper in Base.registry.mappers if mapper.local_table.name == table_name),
+            None
+        )
+        if model is None:
+            raise ValueError(f"Unknown table '{table_name}'")
+        primary_key = list(model.__table__.primary_key.columns)
+        if len(primary_key) != 1:
+            raise ValueError(f"Table '{table_name}' has a composite primary key and cannot be sampled")
+        
+        columns = [column.name for column in model.__table__.columns if column.name not in SENSITIVE_COLUMNS]
+        rows, next_cursor = keyset_page(
+            db, model, select_fields(fields, columns), (primary_key[0].name,),
+            cursor, min(limit, MAX_SAMPLE_ROWS)
+        )
+        return {'table': table_name, 'rows': rows, 'next_cursor': next_cursor}
+
+
+# ============================================================================
+# GLOBAL SERVICE INSTANCE (Singleton Pattern)
+# ============================================================================
+
+_diagnostics_service: Optional[DiagnosticsService] = None
+
+
+def get_diagnostics_service() -> DiagnosticsService:
+    """
+    Get or create the global diagnostics service instance.
+    
+    Returns:
+        DiagnosticsService: The global service instance
+    """
+    global _diagnostics_service
+    
+    if _diagnostics_service is None:
+        _diagnostics_service = DiagnosticsService()
+        logger.info("Created global diagnostics service instance")
+    
+    return _diagnostics_service
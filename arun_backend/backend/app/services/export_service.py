@@ -0,0 +1,290 @@
+"""
+Export Service for Trajectory Engine MVP
+
+Streams whole tables to the analytics team as CSV or Parquet in constant
+memory, instead of JSON responses built from ORM objects:
+
+1. Rows are read as plain tuples of the selected columns through a
+   server-side cursor (yield_per: a named cursor on PostgreSQL), batch_size
+   rows at a time
+2. CSV: every batch is encoded and sent as one chunk, after the header
+3. Parquet: every batch is written as one row group (zstd compressed) and
+   its bytes are sent as soon as they are written; the footer goes last
+
+Only one batch is held in memory whatever the table size.
+
+Datasets (EXPORT_DATASETS) can be narrowed to some columns and to a date
+range on their date column (since inclusive, until exclusive).
+"""
+
+import csv
+import decimal
+import enum
+import io
+import json
+import logging
+from datetime import date, datetime, time
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, Time, select
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import Alumni, Student, TrajectoryScore, WellbeingRollup
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+# Dataset -> (model, column of the since/until filters)
+EXPORT_DATASETS = {
+    'students': (Student, 'updated_at'),
+    'alumni': (Alumni, 'updated_at'),
+    'trajectory_scores': (TrajectoryScore, 'calculated_at'),
+    'wellbeing_rollups': (WellbeingRollup, 'period_start'),
+}
+
+# Internal bookkeeping columns that are never exported
+EXCLUDED_COLUMNS = ('import_hash',)
+
+MEDIA_TYPES = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+PARQUET_COMPRESSION = 'zstd'
+
+
+def export_value(value: Any) -> Any:
+    """Plain value of a column (enum value, float for decimals, JSON text)."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _arrow_type(column):
+    """Arrow type of a table column."""
+    import pyarrow as pa
+    
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Time):
+        return pa.time64('us')
+    return pa.string()
+
+
+class _ChunkSink:
+    """Write-only file object handing out the bytes written so far."""
+    
+    closed = False
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """Constant-memory CSV and Parquet exports of whole tables."""
+    
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, batch_size: int = 5000):
+        """
+        Initialize export service.
+        
+        Args:
+            session_factory: Callable returning a new database session (each
+                             export uses its own, closed when the stream ends)
+            batch_size: Rows fetched, encoded and sent per chunk (Parquet row group)
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+    
+    def columns(self, dataset: str, names: Optional[Sequence[str]] = None) -> List:
+        """
+        Table columns of a dataset export.
+        
+        Args:
+            dataset: EXPORT_DATASETS key
+            names: Columns to export, in order (default: all)
+        
+        Raises:
+            ValueError: Unknown dataset or column
+        """
+        if dataset not in EXPORT_DATASETS:
+            raise ValueError(f"Unknown dataset '{dataset}'. Available: {', '.join(EXPORT_DATASETS)}")
+        
+        table = EXPORT_DATASETS[dataset][0].__table__
+        available = [column for column in table.columns if column.name not in EXCLUDED_COLUMNS]
+        if not names:
+            return available
+        
+        by_name = {column.name: column for column in available}
+        unknown = [name for name in names if name not in by_name]
+        if unknown:
+            raise ValueError(
+                f"Unknown columns for {dataset}: {', '.join(unknown)}. "
+                f"Available: {', '.join(by_name)}"
+            )
+        return [by_name[name] for name in dict.fromkeys(names)]
+    
+    def export(
+        self,
+        dataset: str,
+        file_format: str = 'csv',
+        columns: Optional[Sequence[str]] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Iterator[bytes]:
+        """
+        Validate an export and return its byte stream (for StreamingResponse).
+        
+        Args:
+            dataset: EXPORT_DATASETS key
+            file_format: "csv" or "parquet"
+            columns: Columns to export (default: all)
+            since: Only rows whose date column is on or after this day
+            until: Only rows whose date column is before this day
+        
+        Raises:
+            ValueError: Unknown dataset, format or column, or empty date range
+            RuntimeError: Parquet requested but pyarrow is not installed
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown format '{file_format}'. Available: {', '.join(EXPORT_FORMATS)}")
+        if since and until and since >= until:
+            raise ValueError("since must be before until")
+        selected = self.columns(dataset, columns)
+        
+        if file_format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+            return self._iter_parquet(dataset, selected, since, until)
+        return self._iter_csv(dataset, selected, since, until)
+    
+    def iter_batches(
+        self,
+        dataset: str,
+        columns: List,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Iterator[List[tuple]]:
+        """
+        Rows of a dataset in primary key order, batch_size at a time, from a
+        server-side cursor on a session of its own.
+        """
+        model, date_name = EXPORT_DATASETS[dataset]
+        table = model.__table__
+        date_column = table.c[date_name]
+        as_datetime = isinstance(date_column.type, DateTime)
+        
+        statement = select(*columns).order_by(*table.primary_key.columns)
+        if since:
+            statement = statement.where(date_column >= (datetime.combine(since, time()) if as_datetime else since))
+        if until:
+            statement = statement.where(date_column < (datetime.combine(until, time()) if as_datetime else until))
+        
+        db = self.session_factory()
+        try:
+            result = db.execute(statement.execution_options(yield_per=self.batch_size))
+            for batch in result.partitions():
+                yield [tuple(export_value(value) for value in row) for row in batch]
+        finally:
+            db.close()
+    
+    def _iter_csv(self, dataset: str, columns: List, since, until) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.name for column in columns])
+        rows = 0
+        
+        def drain() -> bytes:
+            data = buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+            return data
+        
+        yield drain()
+        for batch in self.iter_batches(dataset, columns, since, until):
+            writer.writerows(batch)
+            rows += len(batch)
+            yield drain()
+        
+        logger.info(f"Exported {rows} {dataset} rows as CSV")
+    
+    def _iter_parquet(self, dataset: str, columns: List, since, until) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in columns])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+        rows = 0
+        try:
+            for batch in self.iter_batches(dataset, columns, since, until):
+                arrays = [
+                    pa.array([row[index] for row in batch], type=field.type)
+                    for index, field in enumerate(schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(batch)
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+        
+        logger.info(f"Exported {rows} {dataset} rows as Parquet")
+
+
+# ============================================================================
+# GLOBAL SERVICE INSTANCE (Singleton Pattern)
+# ============================================================================
+
+_export_service: Optional[ExportService] = None
+
+
+def get_export_service() -> ExportService:
+    """
+    Get or create the global export service instance.
+    
+    Returns:
+        ExportService: The global service instance
+    """
+    global _export_service
+    
+    if _export_service is None:
+        _export_service = ExportService()
+        logger.info("Created global export service instance")
+    
+    return _export_service
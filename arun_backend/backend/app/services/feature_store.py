@@ -0,0 +1,328 @@
+"""
+Wellbeing Feature Store for Trajectory Engine MVP
+
+Keeps, per student and metric, the time-weighted average that
+time_weighted_avg computes (weights exp(-DECAY_RATE x days_ago)) over the
+student's WHOLE history instead of the last 7 records:
+    
+    mean = decayed_sum / decayed_weight
+
+Both sums are stored relative to anchor_date (the latest observed day).
+A new day rescales them by exp(-DECAY_RATE x days since the anchor) and
+adds the value with weight 1, so an update is O(1) whatever the history
+length. A changed day is handled by removing its previous values first.
+
+Metrics:
+- screen_time, social_media, sleep: daily wellbeing values
+- focus: daily focus score from app usage (calculate_focus_score)
+- study_hours: profile study hours per week, observed when it changes
+
+A student without wellbeing days yet gets the daily metrics of their
+survey baseline (WellbeingBaseline, written once by the CSV import) as a
+prior: get_features returns them until the first day is observed.
+
+Vector generation and behavioral scoring read the means from the profile
+dict key 'wellbeing_features' (see get_features).
+"""
+
+import logging
+import math
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import Student, WellbeingBaseline, WellbeingFeature
+from app.services.vector_generation import calculate_focus_score
+from app.services.wellbeing_history import get_wellbeing_history
+
+logger = logging.getLogger(__name__)
+
+
+# Same decay as time_weighted_avg in vector generation
+DECAY_RATE = 0.1
+
+FEATURE_METRICS = ('screen_time', 'social_media', 'sleep', 'focus', 'study_hours')
+
+# Metrics observed from wellbeing days (all present once a day is observed)
+DAILY_METRICS = ('screen_time', 'social_media', 'sleep', 'focus')
+
+# Wellbeing columns behind the daily metrics, with the defaults vector
+# generation uses for NULL
+DAY_SOURCE_DEFAULTS = {
+    'screen_time_hours': 6.0,
+    'social_media_hours': 0.0,
+    'sleep_duration_hours': 7.0,
+    'educational_app_hours': 0.0,
+    'productivity_hours': 0.0,
+    'entertainment_hours': 0.0,
+}
+
+
+def day_features(record: Dict[str, Optional[float]]) -> Dict[str, float]:
+    """
+    Daily metric values of one wellbeing day.
+    
+    Args:
+        record: Wellbeing column values (DAY_SOURCE_DEFAULTS keys, None for NULL)
+    """
+    values = {
+        column: default if record.get(column) is None else float(record[column])
+        for column, default in DAY_SOURCE_DEFAULTS.items()
+    }
+    return {
+        'screen_time': values['screen_time_hours'],
+        'social_media': values['social_media_hours'],
+        'sleep': values['sleep_duration_hours'],
+        'focus': calculate_focus_score({
+            'educational_hours': values['educational_app_hours'],
+            'productivity_hours': values['productivity_hours'],
+            'social_media_hours': values['social_media_hours'],
+            'entertainment_hours': values['entertainment_hours']
+        })
+    }
+
+
+def record_columns(record) -> Dict[str, Optional[float]]:
+    """Wellbeing column values of a DigitalWellbeingData or WellbeingBaseline row (for day_features)."""
+    return {column: getattr(record, column) for column in DAY_SOURCE_DEFAULTS}
+
+
+def _apply(feature: WellbeingFeature, day: date, value: float, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) one observation."""
+    if not feature.observations:
+        feature.decayed_sum = 0.0
+        feature.decayed_weight = 0.0
+        feature.anchor_date = day
+    
+    if day > feature.anchor_date:
+        factor = math.exp(-DECAY_RATE * (day - feature.anchor_date).days)
+        feature.decayed_sum *= factor
+        feature.decayed_weight *= factor
+        feature.anchor_date = day
+    
+    weight = math.exp(-DECAY_RATE * (feature.anchor_date - day).days)
+    feature.decayed_sum += sign * weight * value
+    feature.decayed_weight += sign * weight
+    feature.observations += sign
+    
+    if not feature.observations:
+        feature.decayed_sum = 0.0
+        feature.decayed_weight = 0.0
+
+
+class FeatureStore:
+    """Incremental exponential-moving-average features per student and metric."""
+    
+    def observe(
+        self,
+        db: Session,
+        student_id: int,
+        day: date,
+        values: Dict[str, float],
+        previous: Optional[Dict[str, float]] = None
+    ) -> bool:
+        """
+        Record a student's metric values for a day.
+        
+        Never raises: a failed update is repaired by rebuild.
+        
+        Args:
+            db: Database session (committed by this method)
+            student_id: Student whose data changed
+            day: Day of the values
+            values: Metric -> value (FEATURE_METRICS keys)
+            previous: Values previously recorded for the same day, if the
+                      day was updated rather than added
+        
+        Returns:
+            bool: True if the features were updated
+        """
+        return self.observe_many(db, student_id, [(day, values, previous)])
+    
+    def observe_many(
+        self,
+        db: Session,
+        student_id: int,
+        observations: List[Tuple[date, Dict[str, float], Optional[Dict[str, float]]]]
+    ) -> bool:
+        """
+        Same as observe for several days of one student, in one transaction.
+        
+        Args:
+            observations: (day, values, previous) per written day
+        
+        Returns:
+            bool: True if the features were updated
+        """
+        return self.observe_students(db, {student_id: observations})
+    
+    def observe_students(
+        self,
+        db: Session,
+        observations: Dict[int, List[Tuple[date, Dict[str, float], Optional[Dict[str, float]]]]]
+    ) -> bool:
+        """
+        Same as observe_many for several students, in one transaction
+        (e.g. the students of one import chunk).
+        
+        Args:
+            observations: student_id -> (day, values, previous) per written day
+        
+        Returns:
+            bool: True if the features were updated
+        """
+        metrics = {
+            metric
+            for days in observations.values()
+            for _, values, _ in days
+            for metric in values
+        }
+        if not metrics:
+            return True
+        
+        try:
+            features = {
+                (feature.student_id, feature.metric): feature
+                for feature in db.query(WellbeingFeature).filter(
+                    WellbeingFeature.student_id.in_(sorted(observations)),
+                    WellbeingFeature.metric.in_(sorted(metrics))
+                ).order_by(WellbeingFeature.student_id, WellbeingFeature.metric).with_for_update()
+            }
+            
+            for student_id, days in observations.items():
+                for day, values, previous in days:
+                    for metric, value in values.items():
+                        feature = features.get((student_id, metric))
+                        if feature is None:
+                            feature = features[(student_id, metric)] = WellbeingFeature(
+                                student_id=student_id, metric=metric, decayed_sum=0.0,
+                                decayed_weight=0.0, anchor_date=day, observations=0
+                            )
+                            db.add(feature)
+                        elif previous and metric in previous:
+                            _apply(feature, day, previous[metric], sign=-1)
+                        _apply(feature, day, value)
+            
+            db.commit()
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to update wellbeing features for students {sorted(observations)}: {e}")
+            db.rollback()
+            return False
+    
+    def get_features(self, db: Session, student_ids: Sequence[int]) -> Dict[int, Dict[str, float]]:
+        """
+        Current decayed means of the given students.
+        
+        Students without observed days get their baseline's daily metrics
+        as a prior (one more query, only when some have none).
+        
+        Returns:
+            dict: student_id -> {metric: mean} (metrics without observations
+            or baseline omitted)
+        """
+        features: Dict[int, Dict[str, float]] = {student_id: {} for student_id in student_ids}
+        if not student_ids:
+            return features
+        
+        for feature in db.query(WellbeingFeature).filter(
+            WellbeingFeature.student_id.in_(list(student_ids))
+        ):
+            if feature.observations and feature.decayed_weight > 0:
+                features[feature.student_id][feature.metric] = feature.decayed_sum / feature.decayed_weight
+        
+        without_days = [student_id for student_id, values in features.items() if DAILY_METRICS[0] not in values]
+        if without_days:
+            for baseline in db.query(WellbeingBaseline).filter(
+                WellbeingBaseline.student_id.in_(without_days)
+            ):
+                features[baseline.student_id].update(day_features(record_columns(baseline)))
+        return features
+    
+    def rebuild(
+        self,
+        db: Session,
+        student_ids: Optional[List[int]] = None,
+        batch_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Recompute the features of every student (or the given students) from
+        the full wellbeing history and the current profile study hours.
+        
+        Returns:
+            dict: {'students': int, 'rows': int}
+        """
+        query = db.query(Student.id, Student.study_hours_per_week, Student.updated_at)
+        if student_ids is not None:
+            query = query.filter(Student.id.in_(student_ids))
+        students = query.order_by(Student.id).all()
+        
+        summary = {'students': 0, 'rows': 0}
+        for offset in range(0, len(students), batch_size):
+            batch = students[offset:offset + batch_size]
+            ids = [student.id for student in batch]
+            history = get_wellbeing_history().load(db, ids, metrics=tuple(DAY_SOURCE_DEFAULTS))
+            
+            features: Dict[tuple, WellbeingFeature] = {}
+            
+            def feature_for(student_id, metric, day):
+                key = (student_id, metric)
+                if key not in features:
+                    features[key] = WellbeingFeature(
+                        student_id=student_id, metric=metric, decayed_sum=0.0,
+                        decayed_weight=0.0, anchor_date=day, observations=0
+                    )
+                return features[key]
+            
+            columns = {column: history[column].tolist() for column in DAY_SOURCE_DEFAULTS}
+            for row, (student_id, day) in enumerate(zip(
+                history['student_id'].tolist(), history['date'].astype(object)
+            )):
+                record = {
+                    column: None if math.isnan(values[row]) else values[row]
+                    for column, values in columns.items()
+                }
+                for metric, value in day_features(record).items():
+                    _apply(feature_for(student_id, metric, day), day, value)
+            
+            for student in batch:
+                if student.study_hours_per_week is not None:
+                    day = student.updated_at.date() if student.updated_at else date.today()
+                    _apply(feature_for(student.id, 'study_hours', day), day, float(student.study_hours_per_week))
+            
+            rows = [
+                {
+                    'student_id': feature.student_id,
+                    'metric': feature.metric,
+                    'decayed_sum': feature.decayed_sum,
+                    'decayed_weight': feature.decayed_weight,
+                    'anchor_date': feature.anchor_date,
+                    'observations': feature.observations
+                }
+                for feature in features.values()
+            ]
+            
+            db.query(WellbeingFeature).filter(
+                WellbeingFeature.student_id.in_(ids)
+            ).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(WellbeingFeature), rows)
+            db.commit()
+            
+            summary['students'] += len(batch)
+            summary['rows'] += len(rows)
+            logger.info(f"Rebuilt wellbeing features for {summary['students']} students")
+        
+        return summary
+
+
+_feature_store: Optional[FeatureStore] = None
+
+def get_feature_store() -> FeatureStore:
+    global _feature_store
+    if _feature_store is None:
+        _feature_store = FeatureStore()
+    return _feature_store
@@ -0,0 +1,229 @@
+"""
+Import Job Service for Trajectory Engine MVP
+
+Runs CSV uploads from the admin API as background jobs:
+
+1. The upload is copied to a temporary file in fixed-size blocks (never
+   held in memory as a whole) and its header checked before the job starts
+2. A background thread streams the file through the CSV import engine
+   chunk by chunk (students: survey export, alumni: admin template); new
+   users get DEFAULT_IMPORT_PASSWORD, hashed by a process pool that lives
+   as long as the job (see password_hasher)
+3. The new and changed records (imports are upserts, see csv_import_engine)
+   are vectorized in batches for every vector version being written
+   (VectorBackfillService.index_records); unchanged records are not
+
+Jobs are kept in memory; each job dict has keys:
+    - job_id (str)
+    - kind (str): students or alumni
+    - filename (str)
+    - status (str): queued, running, vectorizing, completed, failed
+    - progress (dict): rows, imported, updated, skipped, failed, seconds, rows_per_second
+    - errors (list): First MAX_REPORTED_ERRORS row errors {'row', 'error', ...}
+    - vectors (dict, once vectorized): processed, stored, failed
+    - error (str, optional)
+    - started_at / finished_at (ISO timestamps)
+"""
+
+import copy
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.services.csv_import_engine import CsvImportEngine, check_csv_header
+from app.services.password_hasher import DEFAULT_IMPORT_PASSWORD, BulkPasswordHasher
+from app.services.vector_backfill_service import VectorBackfillService, get_vector_backfill_service
+
+logger = logging.getLogger(__name__)
+
+
+IMPORT_KINDS = ('students', 'alumni')
+
+# Row errors kept on a job (the count is always exact)
+MAX_REPORTED_ERRORS = 100
+
+# Bytes copied per read when spooling an upload to disk
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+class ImportJobService:
+    """Background CSV imports started from the admin API."""
+    
+    def __init__(
+        self,
+        engine: Optional[CsvImportEngine] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        backfill_service: Optional[VectorBackfillService] = None,
+        hasher_factory: Callable[[], BulkPasswordHasher] = BulkPasswordHasher,
+        default_password: str = DEFAULT_IMPORT_PASSWORD
+    ):
+        """
+        Initialize import job service.
+        
+        Args:
+            engine: CSV import engine (default: 1000-row chunks)
+            session_factory: Callable returning a new database session
+            backfill_service: Vector backfill service used to vectorize the
+                              imported records (uses global if None)
+            hasher_factory: Creates the password hasher of a student import
+                            job (shut down when the job ends)
+            default_password: Initial password of imported users
+        """
+        self.engine = engine or CsvImportEngine()
+        self.session_factory = session_factory
+        self._backfill_service = backfill_service
+        self.hasher_factory = hasher_factory
+        self.default_password = default_password
+        self.jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def start_import(self, kind: str, source: BinaryIO, filename: str = "upload.csv") -> Dict:
+        """
+        Spool an uploaded CSV to disk and import it in the background.
+        
+        Args:
+            kind: "students" or "alumni"
+            source: Binary file object of the upload
+            filename: Name of the uploaded file (reported on the job)
+        
+        Returns:
+            dict: The new job (see module docstring)
+        
+        Raises:
+            ValueError: Unknown kind or invalid header (no job is started)
+        """
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        
+        handle, path = tempfile.mkstemp(prefix=f"import-{kind}-", suffix=".csv")
+        try:
+            with os.fdopen(handle, 'wb') as spool:
+                shutil.copyfileobj(source, spool, COPY_BLOCK_SIZE)
+            with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+                check_csv_header(kind, file.readline())
+        except (ValueError, UnicodeDecodeError) as e:
+            os.unlink(path)
+            raise ValueError(f"Invalid {kind} CSV: {e}")
+        
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'kind': kind,
+            'filename': filename,
+            'status': 'queued',
+            'progress': {
+                'rows': 0, 'imported': 0, 'updated': 0, 'skipped': 0, 'failed': 0,
+                'seconds': 0.0, 'rows_per_second': 0.0
+            },
+            'errors': [],
+            'vectors': None,
+            'started_at': datetime.utcnow().isoformat(),
+            'finished_at': None
+        }
+        with self._lock:
+            self.jobs[job['job_id']] = job
+        
+        thread = threading.Thread(
+            target=self.run_import,
+            args=(job, path),
+            name=f"csv-import-{job['job_id'][:8]}",
+            daemon=True
+        )
+        thread.start()
+        
+        logger.info(f"Started {kind} import {job['job_id']} ({filename})")
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get an import job by ID."""
+        return self.jobs.get(job_id)
+    
+    def run_import(self, job: Dict, path: str) -> Dict:
+        """
+        Run an import job to completion (called in the background thread).
+        
+        Args:
+            job: Job dict created by start_import
+            path: Spooled CSV file (deleted when the job ends)
+        
+        Returns:
+            dict: The finished job
+        """
+        job['status'] = 'running'
+        db = self.session_factory()
+        hasher = None
+        
+        def report(summary):
+            job['progress'] = {key: summary[key] for key in job['progress']}
+            job['errors'] = summary['errors'][:MAX_REPORTED_ERRORS]
+        
+        try:
+            with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+                if job['kind'] == 'students':
+                    # Per-job engine: jobs can run concurrently, each with its own pool
+                    hasher = self.hasher_factory()
+                    engine = copy.copy(self.engine)
+                    engine.hash_password = lambda count: hasher.submit([self.default_password] * count)
+                    summary = engine.import_lines(db, file, progress=report)
+                    ids = summary['student_ids'] + summary['updated_ids']
+                else:
+                    summary = self.engine.import_alumni_lines(db, file, progress=report)
+                    ids = summary['alumni_ids'] + summary['updated_ids']
+            report(summary)
+            
+            # Batched vectorization of the new and changed records
+            job['status'] = 'vectorizing'
+            backfill = self._backfill_service or get_vector_backfill_service()
+            if ids and backfill.qdrant.is_available:
+                job['vectors'] = backfill.index_records(db, job['kind'], ids)
+            elif ids:
+                job['error'] = "Vector database unavailable; run the vector backfill to index the imported records"
+            
+            job['status'] = 'completed'
+            logger.info(f"Import {job['job_id']} completed: {summary['imported']} imported, "
+                       f"{summary['updated']} updated, {summary['failed']} failed")
+        
+        except Exception as e:
+            logger.error(f"Import {job['job_id']} failed: {e}")
+            db.rollback()
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        
+        finally:
+            if hasher is not None:
+                hasher.shutdown()
+            db.close()
+            os.unlink(path)
+            job['finished_at'] = datetime.utcnow().isoformat()
+        
+        return job
+
+
+# ============================================================================
+# GLOBAL SERVICE INSTANCE (Singleton Pattern)
+# ============================================================================
+
+_import_job_service: Optional[ImportJobService] = None
+
+
+def get_import_job_service() -> ImportJobService:
+    """
+    Get or create the global import job service instance.
+    
+    Returns:
+        ImportJobService: The global service instance
+    """
+    global _import_job_service
+    
+    if _import_job_service is None:
+        _import_job_service = ImportJobService()
+        logger.info("Created global import job service instance")
+    
+    return _import_job_service
@@ -0,0 +1,192 @@
+"""
+Import Profiler
+
+Dry runs and profiles of the CSV import pipeline, to predict how long a
+cohort import takes and where the time goes.
+
+A dry run executes the whole pipeline (parsing, password hashing, every
+table write, derived data refresh, vectorization) and leaves nothing
+behind:
+- database writes happen inside one outer transaction; the importer's
+  per-chunk commits only release savepoints and the outer transaction is
+  rolled back at the end
+- vectors are stored in an in-memory Qdrant stand-in, since Qdrant writes
+  cannot be rolled back
+
+The profile reports the seconds and share of each stage (the engine's
+IMPORT_STAGES plus vectorize), rows/s and the peak resident memory of the
+process. Password hashing runs in worker processes; its cost on the
+import shows up as hash_wait, plus the hasher's own stats.
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from qdrant_client import QdrantClient
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models import Base
+from app.services.alumni_vector_service import AlumniVectorService
+from app.services.csv_import_engine import CsvImportEngine
+from app.services.qdrant_service import QdrantService
+from app.services.student_vector_service import StudentVectorService
+from app.services.vector_backfill_service import VectorBackfillService
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+@contextmanager
+def dry_run_session(bind: Engine) -> Iterator[Session]:
+    """
+    Session whose commits only release savepoints; everything it wrote is
+    rolled back when the block exits.
+    """
+    connection = bind.connect()
+    driver_connection = connection.connection.driver_connection
+    sqlite = connection.dialect.name == 'sqlite'
+    if sqlite:
+        # pysqlite defers BEGIN to the first write, which breaks savepoints
+        isolation_level = driver_connection.isolation_level
+        driver_connection.isolation_level = None
+    transaction = connection.begin()
+    if sqlite:
+        connection.exec_driver_sql("BEGIN")
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        if sqlite:
+            driver_connection.isolation_level = isolation_level
+        connection.close()
+
+
+def stand_in_engine(url: str = "sqlite://") -> Engine:
+    """SQLite database with the application tables (those it can represent)."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[
+        table for table in Base.metadata.sorted_tables
+        if not any(isinstance(column.type, ARRAY) for column in table.columns)
+    ])
+    return engine
+
+
+def in_memory_backfill_service() -> VectorBackfillService:
+    """Vector backfill service writing to an in-memory Qdrant stand-in."""
+    qdrant = QdrantService()
+    qdrant.client = QdrantClient(":memory:")
+    qdrant.is_available = True
+    qdrant.create_collections()
+    return VectorBackfillService(
+        alumni_service=AlumniVectorService(qdrant),
+        student_service=StudentVectorService(qdrant),
+        settle_seconds=0
+    )
+
+
+def profile_import(
+    db: Session,
+    lines: Iterable[str],
+    kind: str = "students",
+    engine: Optional[CsvImportEngine] = None,
+    backfill_service: Optional[VectorBackfillService] = None,
+    progress=None
+) -> Dict[str, Any]:
+    """
+    Import a CSV and vectorize the new and changed records, timing every stage.
+    
+    Args:
+        db: Database session (a dry_run_session for dry runs)
+        lines: CSV text lines
+        kind: "students" (survey export) or "alumni" (alumni template)
+        engine: CSV import engine (default: 1000-row chunks)
+        backfill_service: Vectorizes the records (None: not vectorized)
+        progress: Called with the running import summary after each chunk
+    
+    Returns:
+        dict: Profile (see profile_report) plus 'errors' of the import
+    """
+    engine = engine or CsvImportEngine()
+    if kind == "students":
+        summary = engine.import_lines(db, lines, progress=progress)
+        ids = summary['student_ids'] + summary['updated_ids']
+    else:
+        summary = engine.import_alumni_lines(db, lines, progress=progress)
+        ids = summary['alumni_ids'] + summary['updated_ids']
+    
+    vectors = None
+    vector_seconds = 0.0
+    if backfill_service is not None and ids:
+        started = time.perf_counter()
+        vectors = backfill_service.index_records(db, kind, ids)
+        vector_seconds = time.perf_counter() - started
+    
+    report = profile_report(summary, vector_seconds, vectors)
+    report['errors'] = summary['errors']
+    return report
+
+
+def profile_report(
+    summary: Dict[str, Any],
+    vector_seconds: float = 0.0,
+    vectors: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """
+    Profile of an import from its summary.
+    
+    Returns:
+        dict: {'rows', 'imported', 'updated', 'skipped', 'failed', 'seconds',
+        'rows_per_second', 'stages': {stage: {'seconds', 'share'}} (share of
+        the total, 'other' is the untimed rest), 'vectors', 'peak_rss_mb'}
+    """
+    seconds = summary['seconds'] + vector_seconds
+    stages = dict(summary['stages'], vectorize=vector_seconds)
+    stages['other'] = max(seconds - sum(stages.values()), 0.0)
+    return {
+        **{key: summary[key] for key in ('rows', 'imported', 'updated', 'skipped', 'failed')},
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(summary['rows'] / seconds, 1) if seconds > 0 else 0.0,
+        'stages': {
+            stage: {
+                'seconds': round(stage_seconds, 3),
+                'share': round(stage_seconds / seconds, 3) if seconds > 0 else 0.0
+            }
+            for stage, stage_seconds in stages.items()
+        },
+        'vectors': vectors,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def format_profile(report: Dict[str, Any]) -> List[str]:
+    """Lines of a printable profile table."""
+    lines = [
+        f"{report['rows']:,} rows in {report['seconds']:.2f}s ({report['rows_per_second']:,.0f} rows/s): "
+        f"{report['imported']} imported, {report['updated']} updated, "
+        f"{report['skipped']} unchanged, {report['failed']} failed"
+    ]
+    for stage, timing in report['stages'].items():
+        lines.append(f"   {stage:<10} {timing['seconds']:>9.3f}s  {timing['share'] * 100:5.1f}%")
+    if report.get('hashing'):
+        lines.append(f"   bcrypt     {report['hashing']['hashes_per_second']:,.0f} hashes/s in the pool")
+    if report['peak_rss_mb'] is not None:
+        lines.append(f"   peak memory {report['peak_rss_mb']:,.1f} MB")
+    return lines
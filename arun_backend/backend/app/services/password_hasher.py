@@ -0,0 +1,164 @@
+"""
+Bulk Password Hasher
+
+bcrypt hashing of initial passwords for bulk user provisioning (CSV
+imports). One bcrypt hash costs tens to hundreds of milliseconds of CPU
+and only partially releases the GIL, so hashing a cohort on the import
+thread dominates the import time.
+
+Passwords are hashed in batches by a process pool. submit() returns a
+Future right away, so the importer keeps parsing and writing earlier
+chunks while the hashes of the next chunk are computed.
+
+The bcrypt cost of these initial passwords is set by
+TEMP_PASSWORD_BCRYPT_ROUNDS (default 10); passwords set by users at
+registration keep the application's default cost.
+
+This module is imported by the worker processes, so it must stay free of
+database and application imports.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+
+# bcrypt cost (log2 rounds, 4-31) of initial passwords of imported users
+TEMP_PASSWORD_ROUNDS = int(os.getenv("TEMP_PASSWORD_BCRYPT_ROUNDS", "10"))
+
+# Initial password of users created by student imports
+DEFAULT_IMPORT_PASSWORD = os.getenv("IMPORT_DEFAULT_PASSWORD", "password123")
+
+
+def hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+    """
+    bcrypt hashes of passwords, one salt each (runs in a worker process).
+    
+    Uses the bcrypt library directly; the $2b$ hashes are the ones
+    app.auth.verify_password (passlib) checks.
+    """
+    return [
+        bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('ascii')
+        for password in passwords
+    ]
+
+
+class BulkPasswordHasher:
+    """Hashes batches of passwords in a process pool."""
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        rounds: int = TEMP_PASSWORD_ROUNDS,
+        batch_size: int = 32
+    ):
+        """
+        Initialize bulk password hasher.
+        
+        Args:
+            max_workers: Worker processes (default: number of CPUs)
+            rounds: bcrypt cost of the hashes
+            batch_size: Passwords per worker task
+        """
+        self.max_workers = max_workers
+        self.rounds = rounds
+        self.batch_size = batch_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._hashed = 0
+        self._failed = 0
+        self._started: Optional[float] = None
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+    
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.shutdown()
+    
+    def submit(self, passwords: List[str]) -> Future:
+        """
+        Start hashing passwords in the pool.
+        
+        Returns:
+            Future: Resolves to the hashes, in the order of passwords
+        """
+        combined: Future = Future()
+        if not passwords:
+            combined.set_result([])
+            return combined
+        
+        pool = self._get_pool()
+        with self._lock:
+            if self._started is None:
+                self._started = time.perf_counter()
+            self._submitted += len(passwords)
+        
+        batches = [
+            pool.submit(hash_passwords, passwords[offset:offset + self.batch_size], self.rounds)
+            for offset in range(0, len(passwords), self.batch_size)
+        ]
+        remaining = [len(batches)]
+        
+        def batch_done(batch: Future):
+            with self._lock:
+                if not batch.cancelled() and batch.exception() is None:
+                    self._hashed += len(batch.result())
+                else:
+                    self._failed += 1
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if not finished:
+                return
+            try:
+                combined.set_result([password_hash for batch in batches for password_hash in batch.result()])
+            except BaseException as e:
+                combined.set_exception(e)
+        
+        for batch in batches:
+            batch.add_done_callback(batch_done)
+        return combined
+    
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash passwords in the pool and wait for the result."""
+        return self.submit(passwords).result()
+    
+    def stats(self) -> Dict:
+        """
+        Throughput of the hasher since its first submission.
+        
+        Returns:
+            dict: {'submitted', 'hashed', 'failed_batches', 'hashes_per_second'}
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+            return {
+                'submitted': self._submitted,
+                'hashed': self._hashed,
+                'failed_batches': self._failed,
+                'hashes_per_second': round(self._hashed / elapsed, 1) if elapsed > 0 else 0.0
+            }
@@ -9,10 +9,18 @@ This module handles all interactions with Qdrant vector database:
 
 Qdrant is used for fast similarity search using HNSW index.
 PostgreSQL is the source of truth for profile data.
+
+Vector schemas are versioned (see vector_schema.py): each version has its own
+collection and reads go through the "<collection>_active" alias, so a new
+version can be backfilled while predictions keep reading the old one.
+
+Versions with named sub-vectors (academic, behavioral, skills) also support a
+fused search that scores each sub-vector separately and combines the scores
+with per-major weights inside a single Qdrant query.
 """
 
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
@@ -21,12 +29,29 @@ from qdrant_client.models import (
     Filter,
     FieldCondition,
     MatchValue,
-    SearchParams
+    SearchParams,
+    Prefetch,
+    FormulaQuery,
+    SumExpression,
+    MultExpression
 )
 from qdrant_client.http import models
 import logging
+import time
 from datetime import datetime
 
+from app.services.vector_schema import (
+    DEFAULT_VECTOR_VERSION,
+    FULL_VECTOR_NAME,
+    VECTOR_SCHEMAS,
+    active_alias_name,
+    get_vector_dimension,
+    get_vector_subspaces,
+    parse_collection_version,
+    split_vector,
+    versioned_collection_name
+)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -40,8 +65,20 @@ class QdrantService:
     - alumni: Historical alumni vectors (15 dimensions)
     
     Both collections use cosine similarity for matching.
+    
+    Each vector schema version is stored in its own collection
+    (version 1 = 'students'/'alumni', version N = 'students_vN'/'alumni_vN').
     """
     
+    # How long alias/collection lookups are cached (seconds)
+    VERSION_CACHE_TTL = 30.0
+    
+    # Candidates scored per sub-vector by the fused search
+    FUSED_CANDIDATES = 200
+    
+    # How long a reachability probe result is trusted (seconds)
+    AVAILABILITY_TTL = 30.0
+    
     def __init__(self, host: str = "localhost", port: int = 6333):
         """
         Initialize Qdrant client.
@@ -50,14 +87,67 @@ class QdrantService:
             host: Qdrant server host (default: localhost)
             port: Qdrant server port (default: 6333)
         """
+        self._version_cache: Dict[str, Tuple[float, object]] = {}
+        self._available = False
+        self._available_checked_at = 0.0
+        
         try:
             self.client = QdrantClient(host=host, port=port)
-            self.is_available = True
-            logger.info(f"Connected to Qdrant at {host}:{port}")
         except Exception as e:
             self.client = None
-            self.is_available = False
             logger.warning(f"Qdrant unavailable: {e}. Will use PostgreSQL fallback.")
+            return
+        
+        # QdrantClient connects lazily, so ask the server before trusting it
+        if self.check_availability():
+            logger.info(f"Connected to Qdrant at {host}:{port}")
+    
+    @property
+    def is_available(self) -> bool:
+        """
+        Whether the Qdrant server is reachable.
+        
+        The last probe is trusted for AVAILABILITY_TTL seconds; after that the
+        server is asked again, so a Qdrant that goes down (or comes back) is
+        noticed without restarting the API.
+        """
+        if self.client is None:
+            return False
+        if time.monotonic() - self._available_checked_at < self.AVAILABILITY_TTL:
+            return self._available
+        return self.check_availability()
+    
+    @is_available.setter
+    def is_available(self, value: bool):
+        self._available = bool(value)
+        self._available_checked_at = time.monotonic()
+    
+    def check_availability(self) -> bool:
+        """
+        Probe the Qdrant server and cache the result.
+        
+        Returns:
+            bool: True if the server answered, False otherwise
+        """
+        if self.client is None:
+            self.is_available = False
+            return False
+        
+        first_probe = self._available_checked_at == 0.0
+        was_available = self._available
+        try:
+            self.client.get_collections()
+            self.is_available = True
+        except Exception as e:
+            self.is_available = False
+            # Log state changes only; the probe reruns every AVAILABILITY_TTL
+            if first_probe or was_available:
+                logger.warning(f"Qdrant unavailable: {e}. Will use PostgreSQL fallback.")
+            return False
+        
+        if not first_probe and not was_available:
+            logger.info("Qdrant reachable again")
+        return True
     
     def create_collections(self, vector_size: int = 15):
         """
@@ -102,18 +192,207 @@ class QdrantService:
             logger.error(f"Error creating collections: {e}")
             return False
     
+    def create_version_collections(self, version: int) -> bool:
+        """
+        Create the students and alumni collections for a vector schema version.
+        
+        Args:
+            version: Vector schema version (see vector_schema.VECTOR_SCHEMAS)
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_available:
+            logger.warning("Qdrant unavailable. Cannot create versioned collections.")
+            return False
+        
+        try:
+            vectors_config = self._vectors_config(version)
+            
+            for base in ("students", "alumni"):
+                collection_name = versioned_collection_name(base, version)
+                if not self.client.collection_exists(collection_name):
+                    self.client.create_collection(
+                        collection_name=collection_name,
+                        vectors_config=vectors_config
+                    )
+                    logger.info(f"Created '{collection_name}' collection (v{version})")
+            
+            self._version_cache.clear()
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error creating collections for v{version}: {e}")
+            return False
+    
+    def _vectors_config(self, version: int):
+        """
+        Build the Qdrant vectors config for a schema version.
+        
+        Versions with sub-vectors get one named cosine vector per subspace
+        plus the full vector; others get a single unnamed vector.
+        """
+        dimension = get_vector_dimension(version)
+        subspaces = get_vector_subspaces(version)
+        if not subspaces:
+            return VectorParams(size=dimension, distance=Distance.COSINE)
+        
+        config = {FULL_VECTOR_NAME: VectorParams(size=dimension, distance=Distance.COSINE)}
+        for name, (start, end) in subspaces.items():
+            config[name] = VectorParams(size=end - start, distance=Distance.COSINE)
+        return config
+    
+    # ========================================================================
+    # VECTOR VERSIONS (read alias + dual-write targets)
+    # ========================================================================
+    
+    def _cached(self, key: str, loader):
+        """Return a cached lookup result, reloading it after VERSION_CACHE_TTL."""
+        cached = self._version_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < self.VERSION_CACHE_TTL:
+            return cached[1]
+        value = loader()
+        self._version_cache[key] = (now, value)
+        return value
+    
+    def get_active_version(self, base: str) -> int:
+        """
+        Get the vector schema version that reads are routed to.
+        
+        Resolved from the "<base>_active" alias. Without an alias, the legacy
+        collection (version 1) is active.
+        
+        Args:
+            base: Base collection name ("students" or "alumni")
+        
+        Returns:
+            int: Active schema version
+        """
+        if not self.is_available:
+            return DEFAULT_VECTOR_VERSION
+        
+        def load():
+            try:
+                alias = active_alias_name(base)
+                for description in self.client.get_aliases().aliases:
+                    if description.alias_name == alias:
+                        version = parse_collection_version(base, description.collection_name)
+                        if version is not None:
+                            return version
+            except Exception as e:
+                logger.error(f"Error resolving active version for '{base}': {e}")
+            return DEFAULT_VECTOR_VERSION
+        
+        return self._cached(f"active:{base}", load)
+    
+    def get_write_versions(self, base: str) -> List[int]:
+        """
+        Get every schema version that writes must go to.
+        
+        This is the active version plus any other registered version whose
+        collection exists (i.e. a backfill is in progress or just finished).
+        Writing to all of them keeps a new version complete while it is built.
+        
+        Args:
+            base: Base collection name ("students" or "alumni")
+        
+        Returns:
+            list: Schema versions, active version first
+        """
+        active = self.get_active_version(base)
+        if not self.is_available:
+            return [active]
+        
+        def load():
+            versions = []
+            try:
+                for collection in self.client.get_collections().collections:
+                    version = parse_collection_version(base, collection.name)
+                    if version is not None and version in VECTOR_SCHEMAS:
+                        versions.append(version)
+            except Exception as e:
+                logger.error(f"Error listing collections for '{base}': {e}")
+            return sorted(versions)
+        
+        existing = self._cached(f"collections:{base}", load)
+        return [active] + [v for v in existing if v != active]
+    
+    def activate_version(self, base: str, version: int) -> bool:
+        """
+        Atomically route reads of a collection to a schema version.
+        
+        The alias is deleted and re-created in a single Qdrant request, so
+        queries never see a missing alias.
+        
+        Args:
+            base: Base collection name ("students" or "alumni")
+            version: Schema version to activate
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_available:
+            return False
+        
+        try:
+            alias = active_alias_name(base)
+            collection_name = versioned_collection_name(base, version)
+            
+            operations = []
+            for description in self.client.get_aliases().aliases:
+                if description.alias_name == alias:
+                    operations.append(models.DeleteAliasOperation(
+                        delete_alias=models.DeleteAlias(alias_name=alias)
+                    ))
+            operations.append(models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=collection_name,
+                    alias_name=alias
+                )
+            ))
+            
+            self.client.update_collection_aliases(change_aliases_operations=operations)
+            self._version_cache.clear()
+            
+            logger.info(f"Reads for '{base}' now use '{collection_name}' (v{version})")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error activating v{version} for '{base}': {e}")
+            return False
+    
+    def _read_collection(self, base: str, version: Optional[int] = None) -> str:
+        """Get the collection to query: an explicit version, or the active one."""
+        if version is None:
+            version = self.get_active_version(base)
+        return versioned_collection_name(base, version)
+    
+    def _write_collection(self, base: str, version: Optional[int]) -> Tuple[str, int]:
+        """Get (collection name, version) for a write, creating it if needed."""
+        if version is None:
+            version = self.get_active_version(base)
+        collection_name = versioned_collection_name(base, version)
+        if not self.client.collection_exists(collection_name):
+            if version == 1:
+                self.create_collections()
+            else:
+                self.create_version_collections(version)
+        return collection_name, version
+    
     def store_student_vector(
         self,
         student_id: int,
         vector: np.ndarray,
-        metadata: Dict
+        metadata: Dict,
+        version: Optional[int] = None
     ) -> bool:
         """
         Store student vector in Qdrant.
         
         Args:
             student_id: Unique student ID
-            vector: 15-dimensional numpy array
+            vector: Vector matching the schema version (15 dimensions for v1)
             metadata: Dictionary with student info:
                 - name (str)
                 - major (str)
@@ -121,6 +400,7 @@ class QdrantService:
                 - gpa (float)
                 - attendance (float)
                 - trajectory_score (float, optional)
+            version: Vector schema version (default: active version)
         
         Returns:
             bool: True if successful, False otherwise
@@ -131,35 +411,22 @@ class QdrantService:
         
         try:
             # Ensure collection exists
-            if not self.client.collection_exists("students"):
-                self.create_collections()
+            collection_name, version = self._write_collection("students", version)
             
-            # Convert numpy array to list
-            vector_list = vector.tolist() if isinstance(vector, np.ndarray) else vector
-            
-            # Create point with metadata
+            # Create point with metadata (named sub-vectors if the version has them)
             point = PointStruct(
                 id=student_id,
-                vector=vector_list,
-                payload={
-                    "student_id": student_id,
-                    "name": metadata.get("name", ""),
-                    "major": metadata.get("major", ""),
-                    "semester": metadata.get("semester", 0),
-                    "gpa": float(metadata.get("gpa", 0.0)),
-                    "attendance": float(metadata.get("attendance", 0.0)),
-                    "trajectory_score": float(metadata.get("trajectory_score", 0.0)),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
+                vector=split_vector(vector, version),
+                payload=self._student_payload(student_id, metadata, version)
             )
             
             # Upsert point (insert or update)
             self.client.upsert(
-                collection_name="students",
+                collection_name=collection_name,
                 points=[point]
             )
             
-            logger.info(f"Stored vector for student {student_id}")
+            logger.info(f"Stored vector for student {student_id} (v{version})")
             return True
         
         except Exception as e:
@@ -170,14 +437,15 @@ class QdrantService:
         self,
         alumni_id: int,
         vector: np.ndarray,
-        metadata: Dict
+        metadata: Dict,
+        version: Optional[int] = None
     ) -> bool:
         """
         Store alumni vector in Qdrant.
         
         Args:
             alumni_id: Unique alumni ID
-            vector: 15-dimensional numpy array
+            vector: Vector matching the schema version (15 dimensions for v1)
             metadata: Dictionary with alumni info:
                 - name (str)
                 - major (str)
@@ -186,6 +454,7 @@ class QdrantService:
                 - salary_range (str)
                 - placement_status (str): Placed, Not Placed
                 - outcome_score (float): 0-100
+            version: Vector schema version (default: active version)
         
         Returns:
             bool: True if successful, False otherwise
@@ -196,52 +465,124 @@ class QdrantService:
         
         try:
             # Ensure collection exists
-            if not self.client.collection_exists("alumni"):
-                self.create_collections()
-            
-            # Convert numpy array to list
-            vector_list = vector.tolist() if isinstance(vector, np.ndarray) else vector
+            collection_name, version = self._write_collection("alumni", version)
             
-            # Create point with metadata
+            # Create point with metadata (named sub-vectors if the version has them)
             point = PointStruct(
                 id=alumni_id,
-                vector=vector_list,
-                payload={
-                    "alumni_id": alumni_id,
-                    "name": metadata.get("name", ""),
-                    "major": metadata.get("major", ""),
-                    "graduation_year": metadata.get("graduation_year", 0),
-                    "company_tier": metadata.get("company_tier", ""),
-                    "salary_range": metadata.get("salary_range", ""),
-                    "placement_status": metadata.get("placement_status", ""),
-                    "outcome_score": float(metadata.get("outcome_score", 0.0))
-                }
+                vector=split_vector(vector, version),
+                payload=self._alumni_payload(alumni_id, metadata, version)
             )
             
             # Upsert point (insert or update)
             self.client.upsert(
-                collection_name="alumni",
+                collection_name=collection_name,
                 points=[point]
             )
             
-            logger.info(f"Stored vector for alumni {alumni_id}")
+            logger.info(f"Stored vector for alumni {alumni_id} (v{version})")
             return True
         
         except Exception as e:
             logger.error(f"Error storing alumni vector: {e}")
             return False
     
+    def store_vectors_batch(
+        self,
+        base: str,
+        records: List[Tuple[int, np.ndarray, Dict]],
+        version: Optional[int] = None
+    ) -> bool:
+        """
+        Store many student or alumni vectors in a single upsert.
+        
+        Used by backfills and batch jobs where one request per point would
+        dominate the run time.
+        
+        Args:
+            base: "students" or "alumni"
+            records: List of (id, vector, metadata) tuples
+            version: Vector schema version (default: active version)
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_available:
+            logger.warning(f"Qdrant unavailable. Cannot store {base} batch.")
+            return False
+        
+        if not records:
+            return True
+        
+        try:
+            collection_name, version = self._write_collection(base, version)
+            build_payload = self._student_payload if base == "students" else self._alumni_payload
+            
+            points = [
+                PointStruct(
+                    id=record_id,
+                    vector=split_vector(vector, version),
+                    payload=build_payload(record_id, metadata, version)
+                )
+                for record_id, vector, metadata in records
+            ]
+            
+            self.client.upsert(
+                collection_name=collection_name,
+                points=points
+            )
+            
+            logger.info(f"Stored {len(points)} {base} vectors (v{version})")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error storing {base} batch: {e}")
+            return False
+    
+    def _student_payload(self, student_id: int, metadata: Dict, version: int) -> Dict:
+        """Build the Qdrant payload for a student point."""
+        return {
+            "student_id": student_id,
+            "name": metadata.get("name", ""),
+            "major": metadata.get("major", ""),
+            "semester": metadata.get("semester", 0),
+            "gpa": float(metadata.get("gpa", 0.0)),
+            "attendance": float(metadata.get("attendance", 0.0)),
+            "trajectory_score": float(metadata.get("trajectory_score", 0.0)),
+            "vector_version": version,
+            "source_updated_at": metadata.get("source_updated_at"),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+    
+    def _alumni_payload(self, alumni_id: int, metadata: Dict, version: int) -> Dict:
+        """Build the Qdrant payload for an alumni point."""
+        return {
+            "alumni_id": alumni_id,
+            "name": metadata.get("name", ""),
+            "major": metadata.get("major", ""),
+            "graduation_year": metadata.get("graduation_year", 0),
+            "company_tier": metadata.get("company_tier", ""),
+            "salary_range": metadata.get("salary_range", ""),
+            "placement_status": metadata.get("placement_status", ""),
+            "outcome_score": float(metadata.get("outcome_score", 0.0)),
+            "vector_version": version,
+            "source_updated_at": metadata.get("source_updated_at"),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+    
     def update_student_vector(
         self,
         student_id: int,
-        vector: np.ndarray
+        vector: np.ndarray,
+        version: Optional[int] = None
     ) -> bool:
         """
         Update existing student vector in Qdrant.
         
         Args:
             student_id: Unique student ID
-            vector: Updated 15-dimensional numpy array
+            vector: Updated vector matching the schema version
+            version: Vector schema version (default: active version)
         
         Returns:
             bool: True if successful, False otherwise
@@ -251,9 +592,13 @@ class QdrantService:
             return False
         
         try:
+            if version is None:
+                version = self.get_active_version("students")
+            collection_name = versioned_collection_name("students", version)
+            
             # Get existing point to preserve metadata
             existing = self.client.retrieve(
-                collection_name="students",
+                collection_name=collection_name,
                 ids=[student_id]
             )
             
@@ -262,23 +607,22 @@ class QdrantService:
                 return False
             
             # Update vector while preserving metadata
-            vector_list = vector.tolist() if isinstance(vector, np.ndarray) else vector
-            
             point = PointStruct(
                 id=student_id,
-                vector=vector_list,
+                vector=split_vector(vector, version),
                 payload={
                     **existing[0].payload,
+                    "vector_version": version,
                     "updated_at": datetime.utcnow().isoformat()
                 }
             )
             
             self.client.upsert(
-                collection_name="students",
+                collection_name=collection_name,
                 points=[point]
             )
             
-            logger.info(f"Updated vector for student {student_id}")
+            logger.info(f"Updated vector for student {student_id} (v{version})")
             return True
         
         except Exception as e:
@@ -289,15 +633,17 @@ class QdrantService:
         self,
         student_vector: np.ndarray,
         major: Optional[str] = None,
-        top_k: int = 5
+        top_k: int = 5,
+        version: Optional[int] = None
     ) -> List[Dict]:
         """
         Find top K most similar alumni using cosine similarity.
         
         Args:
-            student_vector: 15-dimensional student vector
+            student_vector: Student vector matching the schema version
             major: Optional major filter (e.g., "Computer Science")
             top_k: Number of results to return (default: 5)
+            version: Vector schema version to search (default: active version)
         
         Returns:
             List of dicts with keys:
@@ -316,44 +662,24 @@ class QdrantService:
             return []
         
         try:
+            if version is None:
+                version = self.get_active_version("alumni")
+            
             # Convert numpy array to list
             vector_list = student_vector.tolist() if isinstance(student_vector, np.ndarray) else student_vector
             
-            # Build filter for major if specified
-            query_filter = None
-            if major:
-                query_filter = Filter(
-                    must=[
-                        FieldCondition(
-                            key="major",
-                            match=MatchValue(value=major)
-                        )
-                    ]
-                )
-            
-            # Search for similar alumni
+            # Search for similar alumni (the full vector if the version has sub-vectors)
             search_result = self.client.query_points(
-                collection_name="alumni",
+                collection_name=versioned_collection_name("alumni", version),
                 query=vector_list,
-                query_filter=query_filter,
+                using=FULL_VECTOR_NAME if get_vector_subspaces(version) else None,
+                query_filter=self._major_filter(major),
                 limit=top_k,
                 with_payload=True
             ).points
             
             # Format results
-            results = []
-            for hit in search_result:
-                results.append({
-                    "alumni_id": hit.payload.get("alumni_id"),
-                    "similarity_score": hit.score,  # Cosine similarity (0-1)
-                    "name": hit.payload.get("name", ""),
-                    "major": hit.payload.get("major", ""),
-                    "graduation_year": hit.payload.get("graduation_year", 0),
-                    "company_tier": hit.payload.get("company_tier", ""),
-                    "salary_range": hit.payload.get("salary_range", ""),
-                    "placement_status": hit.payload.get("placement_status", ""),
-                    "outcome_score": hit.payload.get("outcome_score", 0.0)
-                })
+            results = [self._alumni_result(hit) for hit in search_result]
             
             logger.info(f"Found {len(results)} similar alumni")
             return results
@@ -362,9 +688,236 @@ class QdrantService:
             logger.error(f"Error finding similar alumni: {e}")
             return []
     
+    def find_similar_alumni_fused(
+        self,
+        student_vector: np.ndarray,
+        weights: Dict[str, float],
+        major: Optional[str] = None,
+        top_k: int = 5,
+        version: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Find similar alumni by a weighted sum of per-subspace cosine scores.
+        
+        Runs as one Qdrant request: the FUSED_CANDIDATES nearest alumni by
+        the full vector are re-scored against each named sub-vector
+        (academic, behavioral, skills) in nested prefetches, and a formula
+        query combines the three scores with the given weights:
+            
+            score = Σ weights[name] × cosine(student[name], alumni[name])
+        
+        Args:
+            student_vector: Full student vector of the schema version
+            weights: Subspace name -> weight (e.g. MAJOR_WEIGHTS[major])
+            major: Optional major filter
+            top_k: Number of results to return (default: 5)
+            version: Vector schema version to search (default: active version)
+        
+        Returns:
+            List of dicts in the find_similar_alumni format, similarity_score
+            being the fused score. Falls back to find_similar_alumni if the
+            version has no sub-vectors.
+        """
+        if not self.is_available:
+            logger.warning("Qdrant unavailable. Returning empty results.")
+            return []
+        
+        if version is None:
+            version = self.get_active_version("alumni")
+        subspaces = get_vector_subspaces(version)
+        if not subspaces:
+            return self.find_similar_alumni(student_vector, major=major, top_k=top_k, version=version)
+        
+        try:
+            named = split_vector(student_vector, version)
+            query_filter = self._major_filter(major)
+            limit = max(top_k, self.FUSED_CANDIDATES)
+            
+            # Every subspace re-scores the same full-vector candidates, so
+            # each candidate has all the scores the formula needs
+            candidates = Prefetch(
+                query=named[FULL_VECTOR_NAME],
+                using=FULL_VECTOR_NAME,
+                filter=query_filter,
+                limit=limit
+            )
+            names = list(subspaces)
+            prefetch = [
+                Prefetch(prefetch=candidates, query=named[name], using=name, limit=limit)
+                for name in names
+            ]
+            formula = FormulaQuery(formula=SumExpression(sum=[
+                MultExpression(mult=[float(weights.get(name, 0.0)), f"$score[{index}]"])
+                for index, name in enumerate(names)
+            ]))
+            
+            search_result = self.client.query_points(
+                collection_name=versioned_collection_name("alumni", version),
+                prefetch=prefetch,
+                query=formula,
+                query_filter=query_filter,
+                limit=top_k,
+                with_payload=True
+            ).points
+            
+            results = [self._alumni_result(hit) for hit in search_result]
+            
+            logger.info(f"Found {len(results)} similar alumni (fused, v{version})")
+            return results
+        
+        except Exception as e:
+            logger.error(f"Error in fused alumni search: {e}")
+            return []
+    
+    def _major_filter(self, major: Optional[str]) -> Optional[Filter]:
+        """Build the payload filter for an optional major."""
+        if not major:
+            return None
+        return Filter(
+            must=[
+                FieldCondition(
+                    key="major",
+                    match=MatchValue(value=major)
+                )
+            ]
+        )
+    
+    def _alumni_result(self, hit) -> Dict:
+        """Format an alumni search hit."""
+        return {
+            "alumni_id": hit.payload.get("alumni_id"),
+            "similarity_score": hit.score,  # Cosine similarity (0-1)
+            "name": hit.payload.get("name", ""),
+            "major": hit.payload.get("major", ""),
+            "graduation_year": hit.payload.get("graduation_year", 0),
+            "company_tier": hit.payload.get("company_tier", ""),
+            "salary_range": hit.payload.get("salary_range", ""),
+            "placement_status": hit.payload.get("placement_status", ""),
+            "outcome_score": hit.payload.get("outcome_score", 0.0)
+        }
+    
+    def get_all_alumni_vectors(
+        self,
+        version: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> List[Tuple[int, np.ndarray, Dict]]:
+        """
+        Read every alumni point (vector + payload) with paginated scrolls.
+        
+        Args:
+            version: Vector schema version (default: active version)
+            batch_size: Points per scroll request
+        
+        Returns:
+            List of (alumni_id, vector, metadata) tuples, the format used by
+            find_similar_alumni_fallback
+        """
+        if not self.is_available:
+            logger.warning("Qdrant unavailable. Cannot read alumni vectors.")
+            return []
+        
+        collection_name = self._read_collection("alumni", version)
+        records = []
+        offset = None
+        
+        try:
+            while True:
+                points, offset = self.client.scroll(
+                    collection_name=collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True
+                )
+                for point in points:
+                    vector = point.vector
+                    if isinstance(vector, dict):
+                        vector = vector[FULL_VECTOR_NAME]
+                    records.append((
+                        int(point.id),
+                        np.asarray(vector, dtype=np.float32),
+                        point.payload
+                    ))
+                if offset is None:
+                    break
+        
+        except Exception as e:
+            logger.error(f"Error reading alumni vectors: {e}")
+            return []
+        
+        return records
+    
+    def scroll_point_payloads(
+        self,
+        base: str,
+        version: Optional[int] = None,
+        payload_fields: Optional[List[str]] = None,
+        page_size: int = 500
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Stream (point_id, payload) for a collection in ascending id order.
+        
+        Vectors are not fetched, so this is cheap enough to walk a whole
+        collection page by page (used by the reconciler).
+        
+        Args:
+            base: "students" or "alumni"
+            version: Vector schema version (default: active version)
+            payload_fields: Payload keys to return (default: all)
+            page_size: Points per scroll request
+        
+        Yields:
+            (point_id, payload) tuples
+        """
+        collection_name = self._read_collection(base, version)
+        offset = None
+        
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=payload_fields if payload_fields is not None else True,
+                with_vectors=False
+            )
+            for point in points:
+                yield int(point.id), point.payload or {}
+            if offset is None:
+                break
+    
+    def delete_points(self, base: str, point_ids: List[int], version: Optional[int] = None) -> bool:
+        """
+        Delete many points from one version of a collection in a single request.
+        
+        Args:
+            base: "students" or "alumni"
+            point_ids: Point IDs (student or alumni IDs)
+            version: Vector schema version (default: active version)
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_available:
+            return False
+        
+        if not point_ids:
+            return True
+        
+        try:
+            self.client.delete(
+                collection_name=self._read_collection(base, version),
+                points_selector=models.PointIdsList(points=list(point_ids))
+            )
+            logger.info(f"Deleted {len(point_ids)} {base} vectors")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error deleting {base} vectors: {e}")
+            return False
+    
     def delete_student_vector(self, student_id: int) -> bool:
         """
-        Delete student vector from Qdrant.
+        Delete student vector from Qdrant (from every version being written).
         
         Args:
             student_id: Unique student ID
@@ -376,12 +929,13 @@ class QdrantService:
             return False
         
         try:
-            self.client.delete(
-                collection_name="students",
-                points_selector=models.PointIdsList(
-                    points=[student_id]
+            for version in self.get_write_versions("students"):
+                self.client.delete(
+                    collection_name=versioned_collection_name("students", version),
+                    points_selector=models.PointIdsList(
+                        points=[student_id]
+                    )
                 )
-            )
             logger.info(f"Deleted vector for student {student_id}")
             return True
         
@@ -391,7 +945,7 @@ class QdrantService:
     
     def delete_alumni_vector(self, alumni_id: int) -> bool:
         """
-        Delete alumni vector from Qdrant.
+        Delete alumni vector from Qdrant (from every version being written).
         
         Args:
             alumni_id: Unique alumni ID
@@ -403,12 +957,13 @@ class QdrantService:
             return False
         
         try:
-            self.client.delete(
-                collection_name="alumni",
-                points_selector=models.PointIdsList(
-                    points=[alumni_id]
+            for version in self.get_write_versions("alumni"):
+                self.client.delete(
+                    collection_name=versioned_collection_name("alumni", version),
+                    points_selector=models.PointIdsList(
+                        points=[alumni_id]
+                    )
                 )
-            )
             logger.info(f"Deleted vector for alumni {alumni_id}")
             return True
         
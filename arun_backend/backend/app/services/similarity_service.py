@@ -8,6 +8,8 @@ Similarity Metrics:
 1. Cosine Similarity (70% weight) - Measures angle between vectors
 2. Euclidean Similarity (30% weight) - Measures distance between vectors
 3. Ensemble Similarity - Weighted combination of both
+4. Fused Similarity - Per-major weighted cosine of the academic, behavioral
+   and skill sub-vectors (schema versions with sub-vectors)
 
 All similarity scores are in [0, 1] range where 1 = identical, 0 = completely different.
 """
@@ -16,6 +18,8 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple
 import logging
 
+from app.services.vector_schema import get_vector_dimension, get_vector_subspaces
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -180,6 +184,119 @@ def ensemble_similarity(vec_a: np.ndarray, vec_b: np.ndarray) -> float:
     return float(ensemble)
 
 
+# ============================================================================
+# BATCH SIMILARITY (one query vector against a matrix of vectors)
+# ============================================================================
+
+def cosine_similarity_batch(
+    query: np.ndarray,
+    matrix: np.ndarray,
+    norms: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Cosine similarity of one vector against every row of a matrix.
+    
+    Vectorized equivalent of cosine_similarity: same [0, 1] normalization,
+    and rows with zero norm score 0.0.
+    
+    Args:
+        query: Vector of shape (d,)
+        matrix: Matrix of shape (n, d)
+        norms: Optional precomputed row norms of shape (n,)
+    
+    Returns:
+        Array of n similarity scores in [0, 1]
+    """
+    query = np.asarray(query, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if norms is None:
+        norms = np.linalg.norm(matrix, axis=1)
+    norms = np.asarray(norms, dtype=np.float64)
+    
+    query_norm = np.linalg.norm(query)
+    if query_norm == 0 or matrix.shape[0] == 0:
+        return np.zeros(matrix.shape[0])
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_sim = (matrix @ query) / (norms * query_norm)
+    normalized = np.clip((cos_sim + 1.0) / 2.0, 0.0, 1.0)
+    
+    return np.where(norms == 0, 0.0, normalized)
+
+
+def euclidean_similarity_batch(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Euclidean similarity (1 / (1 + distance)) of one vector against every row.
+    
+    Args:
+        query: Vector of shape (d,)
+        matrix: Matrix of shape (n, d)
+    
+    Returns:
+        Array of n similarity scores in [0, 1]
+    """
+    query = np.asarray(query, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    distances = np.linalg.norm(matrix - query, axis=1)
+    return 1.0 / (1.0 + distances)
+
+
+def ensemble_similarity_batch(
+    query: np.ndarray,
+    matrix: np.ndarray,
+    norms: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Ensemble similarity (70% cosine, 30% Euclidean) against every row.
+    
+    Vectorized equivalent of ensemble_similarity.
+    
+    Args:
+        query: Vector of shape (d,)
+        matrix: Matrix of shape (n, d)
+        norms: Optional precomputed row norms of shape (n,)
+    
+    Returns:
+        Array of n similarity scores in [0, 1]
+    """
+    cos_sim = cosine_similarity_batch(query, matrix, norms)
+    euc_sim = euclidean_similarity_batch(query, matrix)
+    return (cos_sim * 0.70) + (euc_sim * 0.30)
+
+
+def fused_similarity_batch(
+    query: np.ndarray,
+    matrix: np.ndarray,
+    weights: Dict[str, float],
+    subspaces: Dict[str, Tuple[int, int]]
+) -> np.ndarray:
+    """
+    Weighted sum of per-subspace cosine similarities against every row.
+    
+    In-process equivalent of QdrantService.find_similar_alumni_fused: each
+    subspace (e.g. academic = dims 0-1) is compared on its own, so GPA does
+    not share one angle with screen time and skill slots.
+    
+    Args:
+        query: Vector of shape (d,)
+        matrix: Matrix of shape (n, d)
+        weights: Subspace name -> weight (e.g. MAJOR_WEIGHTS[major])
+        subspaces: Subspace name -> (start, end) dimension range
+    
+    Returns:
+        Array of n similarity scores in [0, 1] (weights summing to 1)
+    """
+    query = np.asarray(query, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    
+    scores = np.zeros(matrix.shape[0])
+    for name, (start, end) in subspaces.items():
+        weight = weights.get(name, 0.0)
+        if weight:
+            scores += weight * cosine_similarity_batch(query[start:end], matrix[:, start:end])
+    return scores
+
+
 # ============================================================================
 # QDRANT-BASED SIMILARITY SEARCH (Task 7.3)
 # ============================================================================
@@ -189,20 +306,27 @@ def find_similar_alumni(
     qdrant_service,
     major: Optional[str] = None,
     top_k: int = 5,
-    use_ensemble: bool = False
+    use_ensemble: bool = False,
+    version: Optional[int] = None,
+    weights: Optional[Dict[str, float]] = None
 ) -> List[Dict]:
     """
     Find similar alumni using Qdrant vector database.
     
     This function queries Qdrant for the top K most similar alumni vectors
     using cosine similarity (default) or ensemble similarity (optional).
+    If weights are given and the schema version has sub-vectors, the
+    academic, behavioral and skill sub-vectors are scored separately and
+    fused with the weights in one Qdrant request.
     
     Args:
-        student_vector: 15-dimensional student vector
+        student_vector: Student vector (15 dimensions for schema v1)
         qdrant_service: QdrantService instance
         major: Optional major filter (e.g., "Computer Science")
         top_k: Number of results to return (default: 5)
         use_ensemble: If True, recalculate with ensemble similarity (default: False)
+        version: Vector schema version to query (default: active alumni version)
+        weights: Optional subspace weights (see trajectory_service.get_major_weights)
     
     Returns:
         List of dicts with keys:
@@ -231,16 +355,31 @@ def find_similar_alumni(
         logger.error("Empty student vector provided")
         return []
     
-    if student_vector.shape[0] != 15:
-        logger.error(f"Invalid vector dimension: {student_vector.shape[0]}, expected 15")
+    if version is None:
+        version = qdrant_service.get_active_version("alumni")
+    expected_dim = get_vector_dimension(version)
+    
+    if student_vector.shape[0] != expected_dim:
+        logger.error(f"Invalid vector dimension: {student_vector.shape[0]}, "
+                     f"expected {expected_dim} (v{version})")
         return []
     
     # Query Qdrant for similar alumni
-    results = qdrant_service.find_similar_alumni(
-        student_vector=student_vector,
-        major=major,
-        top_k=top_k
-    )
+    if weights and get_vector_subspaces(version):
+        results = qdrant_service.find_similar_alumni_fused(
+            student_vector=student_vector,
+            weights=weights,
+            major=major,
+            top_k=top_k,
+            version=version
+        )
+    else:
+        results = qdrant_service.find_similar_alumni(
+            student_vector=student_vector,
+            major=major,
+            top_k=top_k,
+            version=version
+        )
     
     # If Qdrant returned empty results, return empty list
     if not results:
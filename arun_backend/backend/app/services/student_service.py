@@ -27,9 +27,6 @@ def create_student_profile(db: Session, student_data: dict):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-def get_all_students(db: Session):
-    return db.query(Student).all()
-
 def add_subject_scores(db: Session, student_id: int, scores: list):
     # Check if student exists
     student = db.query(Student).filter(Student.id == student_id).first()
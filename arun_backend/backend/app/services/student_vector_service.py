@@ -0,0 +1,292 @@
+"""
+Student Vector Generation Service
+
+This service handles vector generation for student profiles.
+It integrates with:
+- Vector schema registry (generate_student_vector_for_version)
+- Qdrant service (store_student_vector)
+- PostgreSQL (update vector_id reference)
+
+Key responsibilities:
+1. Build vector inputs (profile, wellbeing, skills) from the database
+2. Generate vectors for every schema version currently being written
+3. Store vectors in Qdrant with metadata (dual-write during re-indexing)
+4. Update PostgreSQL with a versioned vector reference
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import numpy as np
+
+from app.models import Student, Skill
+from app.services.qdrant_service import QdrantService
+from app.services.wellbeing_history import fill_missing, get_wellbeing_history
+from app.services.feature_store import get_feature_store
+from app.services.vector_schema import (
+    format_vector_id,
+    generate_student_vector_for_version,
+    set_vector_references
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Wellbeing columns used for vector generation and their defaults for NULL
+VECTOR_WELLBEING_DEFAULTS = {
+    'screen_time_hours': 6.0,
+    'educational_app_hours': 0.0,
+    'productivity_hours': 0.0,
+    'social_media_hours': 0.0,
+    'entertainment_hours': 0.0,
+    'sleep_duration_hours': 7.0,
+}
+
+
+def _to_float(value, default: float) -> float:
+    """Convert Decimal/None database values to float."""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _as_datetime(value):
+    """Convert a date to a datetime at midnight (datetimes pass through)."""
+    if isinstance(value, datetime) or not isinstance(value, date):
+        return value
+    return datetime(value.year, value.month, value.day)
+
+
+class StudentVectorService:
+    """
+    Service for generating and storing student vectors.
+    
+    Called after profile, behavioral or skill updates to:
+    1. Generate vectors from the student's current data
+    2. Store in Qdrant (every version being written)
+    3. Update the PostgreSQL reference
+    """
+    
+    def __init__(self, qdrant_service: Optional[QdrantService] = None):
+        """
+        Initialize student vector service.
+        
+        Args:
+            qdrant_service: Optional Qdrant service instance (creates new if None)
+        """
+        self.qdrant = qdrant_service or QdrantService()
+        logger.info("Student vector service initialized")
+    
+    def build_vector_inputs(
+        self,
+        student: Student,
+        db: Session
+    ) -> Tuple[Dict, List[Dict], List[Dict]]:
+        """
+        Load the profile, wellbeing and skills used for vector generation.
+        
+        Args:
+            student: Student database model instance
+            db: Database session
+        
+        Returns:
+            Tuple (profile, wellbeing, skills) in the format expected by
+            generate_student_vector
+        """
+        return self.build_vector_inputs_batch([student], db)[student.id]
+    
+    def build_vector_inputs_batch(
+        self,
+        students: List[Student],
+        db: Session
+    ) -> Dict[int, Tuple[Dict, List[Dict], List[Dict]]]:
+        """
+        Load vector inputs for many students with two queries in total.
+        
+        The 7 most recent wellbeing days per student come from the columnar
+        wellbeing history (one ROW_NUMBER query without a store), so batch
+        jobs (backfills) don't issue one query per student.
+        
+        Args:
+            students: Student database model instances
+            db: Database session
+        
+        Returns:
+            dict: student_id -> (profile, wellbeing, skills)
+        """
+        student_ids = [student.id for student in students]
+        wellbeing_by_student: Dict[int, List[Dict]] = {sid: [] for sid in student_ids}
+        skills_by_student: Dict[int, List[Dict]] = {sid: [] for sid in student_ids}
+        features_by_student = get_feature_store().get_features(db, student_ids)
+        
+        if student_ids:
+            history = get_wellbeing_history().latest(
+                db, student_ids, 7, metrics=tuple(VECTOR_WELLBEING_DEFAULTS)
+            )
+            columns = {
+                metric: fill_missing(history[metric], default).tolist()
+                for metric, default in VECTOR_WELLBEING_DEFAULTS.items()
+            }
+            
+            for row, (student_id, day) in enumerate(zip(
+                history['student_id'].tolist(), history['date'].astype(object)
+            )):
+                wellbeing_by_student[student_id].append({
+                    'date': day,
+                    **{metric: values[row] for metric, values in columns.items()}
+                })
+            
+            for skill in db.query(Skill).filter(Skill.student_id.in_(student_ids)).all():
+                skills_by_student[skill.student_id].append({
+                    'skill_name': skill.skill_name,
+                    'proficiency_score': _to_float(skill.proficiency_score, 50.0),
+                    'market_weight': _to_float(skill.market_weight, 1.0)
+                })
+        
+        return {
+            student.id: (
+                {
+                    'gpa': _to_float(student.gpa, 5.0),
+                    'attendance': _to_float(student.attendance, 75.0),
+                    'study_hours_per_week': _to_float(student.study_hours_per_week, 15.0),
+                    'project_count': student.project_count or 0,
+                    'wellbeing_features': features_by_student[student.id]
+                },
+                wellbeing_by_student[student.id],
+                skills_by_student[student.id]
+            )
+            for student in students
+        }
+    
+    def build_metadata(self, student: Student) -> Dict:
+        """Build the Qdrant metadata for a student."""
+        return {
+            'name': student.name,
+            'major': student.major,
+            'semester': student.semester or 0,
+            'gpa': _to_float(student.gpa, 0.0),
+            'attendance': _to_float(student.attendance, 0.0),
+            # Row version the vector was built from (checked by the reconciler)
+            'source_updated_at': student.updated_at.isoformat() if student.updated_at else None
+        }
+    
+    def generate_vector_for_student(
+        self,
+        student: Student,
+        db: Session,
+        version: int,
+        inputs: Optional[Tuple[Dict, List[Dict], List[Dict]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Generate a vector for a single student using a schema version.
+        
+        Args:
+            student: Student database model instance
+            db: Database session
+            version: Vector schema version
+            inputs: Optional (profile, wellbeing, skills) from build_vector_inputs,
+                    so several versions can be generated from one fetch
+        
+        Returns:
+            Numpy array or None if generation fails
+        """
+        try:
+            profile, wellbeing, skills = inputs or self.build_vector_inputs(student, db)
+            wellbeing = [dict(record) for record in wellbeing]
+            # Convert dates to datetimes for time-weighted averaging
+            for record in wellbeing:
+                record['date'] = _as_datetime(record['date'])
+            return generate_student_vector_for_version(version, profile, wellbeing, skills)
+        
+        except Exception as e:
+            logger.error(f"Error generating v{version} vector for student {student.id}: {e}")
+            return None
+    
+    def process_student_record(
+        self,
+        student: Student,
+        db: Session
+    ) -> Dict:
+        """
+        Complete vector pipeline for a single student.
+        
+        Generates and stores one vector per schema version being written
+        (active version plus any version being backfilled), then records the
+        active version in Student.vector_id.
+        
+        Args:
+            student: Student database model instance
+            db: Database session
+        
+        Returns:
+            dict: Result with keys:
+                - success (bool)
+                - student_id (int)
+                - versions_stored (list of int)
+                - error (str, optional)
+        """
+        result = {
+            'success': False,
+            'student_id': student.id,
+            'versions_stored': []
+        }
+        
+        try:
+            metadata = self.build_metadata(student)
+            inputs = self.build_vector_inputs(student, db)
+            write_versions = self.qdrant.get_write_versions("students")
+            
+            for version in write_versions:
+                vector = self.generate_vector_for_student(student, db, version, inputs)
+                if vector is None:
+                    continue
+                if self.qdrant.store_student_vector(student.id, vector, metadata, version=version):
+                    result['versions_stored'].append(version)
+            
+            active_version = write_versions[0]
+            if active_version not in result['versions_stored']:
+                result['error'] = f"Failed to store v{active_version} vector in Qdrant"
+                return result
+            
+            set_vector_references(
+                db, Student,
+                {student.id: format_vector_id("student", student.id, active_version)},
+                instances=[student]
+            )
+            db.commit()
+            
+            result['success'] = True
+            return result
+        
+        except Exception as e:
+            logger.error(f"Error processing student {student.id}: {e}")
+            db.rollback()
+            result['error'] = str(e)
+            return result
+
+
+# ============================================================================
+# GLOBAL SERVICE INSTANCE (Singleton Pattern)
+# ============================================================================
+
+_student_vector_service: Optional[StudentVectorService] = None
+
+
+def get_student_vector_service() -> StudentVectorService:
+    """
+    Get or create the global student vector service instance.
+    
+    Returns:
+        StudentVectorService: The global service instance
+    """
+    global _student_vector_service
+    
+    if _student_vector_service is None:
+        _student_vector_service = StudentVectorService()
+        logger.info("Created global student vector service instance")
+    
+    return _student_vector_service
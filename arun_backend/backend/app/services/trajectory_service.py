@@ -182,6 +182,10 @@ def calculate_behavioral_score(
             - project_count (int): Number of projects (for grit)
             - consistency (int): Consistency level 1-5 (for grit, optional default 3)
             - problem_solving (int): Problem-solving 1-5 (for grit, optional default 3)
+            - wellbeing_features (dict, optional): Full-history decayed means
+              (screen_time, social_media, sleep, study_hours) from the
+              feature store, or the survey baseline before the first
+              wellbeing day; preferred over the most recent wellbeing day
         
         wellbeing: Optional list of digital wellbeing data dicts:
             - screen_time_hours (float)
@@ -192,8 +196,10 @@ def calculate_behavioral_score(
     Returns:
         Behavioral score in [0, 1] range (NOT 0-100)
     """
+    features = profile.get('wellbeing_features') or {}
+    
     # Study hours (convert weekly to daily, 0-8 hours/day)
-    study_hours_weekly = profile.get('study_hours_per_week', 15.0)
+    study_hours_weekly = features.get('study_hours', profile.get('study_hours_per_week', 15.0))
     study_hours_daily = study_hours_weekly / 7.0
     study_norm = min(study_hours_daily / 8.0, 1.0)
     
@@ -202,15 +208,15 @@ def calculate_behavioral_score(
     practice_norm = min(practice_hours / 6.0, 1.0)
     
     # Digital wellbeing metrics (if available)
-    if wellbeing and len(wellbeing) > 0:
-        recent = wellbeing[0]  # Most recent data
+    if features.get('screen_time') is not None or (wellbeing and len(wellbeing) > 0):
+        recent = wellbeing[0] if wellbeing else {}  # Most recent data
         
         # Screen time (inverse - lower is better, 0-12 hours)
-        screen_time = recent.get('screen_time_hours', 6.0)
+        screen_time = features.get('screen_time', recent.get('screen_time_hours', 6.0))
         screen_inverse = 1.0 - min(screen_time / 12.0, 1.0)
         
         # Social media (inverse - lower is better, 0-6 hours)
-        social_media = recent.get('social_media_hours', 2.0)
+        social_media = features.get('social_media', recent.get('social_media_hours', 2.0))
         social_media_inverse = 1.0 - min(social_media / 6.0, 1.0)
         
         # Distraction level (inverse - lower is better, 1-5 scale)
@@ -218,7 +224,7 @@ def calculate_behavioral_score(
         distraction_inverse = 1.0 - ((distraction - 1) / (5 - 1))
         
         # Sleep quality (optimal: 7-8 hours)
-        sleep_hours = recent.get('sleep_duration_hours', 7.0)
+        sleep_hours = features.get('sleep', recent.get('sleep_duration_hours', 7.0))
         sleep_quality = 1.0 - abs(sleep_hours - 7.5) / 7.5
         sleep_quality = max(0.0, min(1.0, sleep_quality))
     else:
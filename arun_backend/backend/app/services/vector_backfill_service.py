@@ -0,0 +1,380 @@
+"""
+Vector Backfill Service for Trajectory Engine MVP
+
+Re-embeds every student and alumni record into a new vector schema version
+without taking predictions offline:
+
+1. Create the versioned collections (students_vN, alumni_vN). From this
+   point on, every write path dual-writes to the active version and vN.
+2. Wait for the write-version caches of other workers to expire, so no
+   write can slip past the scan below.
+3. Scan PostgreSQL in batches and upsert the vN vectors in bulk.
+4. Atomically flip the "<base>_active" aliases to vN (one Qdrant request
+   per collection), then update the vector references in PostgreSQL.
+
+Reads keep using the old version until step 4, so a full re-index never
+blocks prediction traffic. Jobs run in a background thread and their
+progress can be polled by job ID.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import String, cast, literal
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import Alumni, Student
+from app.services.alumni_vector_service import AlumniVectorService, get_alumni_vector_service
+from app.services.student_vector_service import StudentVectorService, get_student_vector_service
+from app.services.vector_schema import (
+    VECTOR_COLLECTIONS,
+    VECTOR_SCHEMAS,
+    versioned_collection_name
+)
+
+logger = logging.getLogger(__name__)
+
+
+class VectorBackfillService:
+    """
+    Background re-indexing of student and alumni vectors.
+    
+    Jobs are kept in memory; each job dict has keys:
+        - job_id (str)
+        - target_version (int)
+        - status (str): queued, running, completed, failed
+        - activate (bool): Flip reads to the new version when done
+        - activated (bool)
+        - progress (dict): Per collection {processed, stored, failed}
+        - error (str, optional)
+        - started_at / finished_at (ISO timestamps)
+    """
+    
+    BATCH_SIZE = 256
+    REFERENCE_CHUNK_SIZE = 1000
+    
+    def __init__(
+        self,
+        alumni_service: Optional[AlumniVectorService] = None,
+        student_service: Optional[StudentVectorService] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        settle_seconds: Optional[float] = None
+    ):
+        """
+        Initialize vector backfill service.
+        
+        Args:
+            alumni_service: Optional alumni vector service (uses global if None)
+            student_service: Optional student vector service (uses global if None)
+            session_factory: Callable returning a new database session
+            settle_seconds: Wait between creating the new collections and
+                            scanning (default: QdrantService.VERSION_CACHE_TTL)
+        """
+        self.alumni_service = alumni_service or get_alumni_vector_service()
+        self.student_service = student_service or get_student_vector_service()
+        self.qdrant = self.alumni_service.qdrant
+        self.session_factory = session_factory
+        self.settle_seconds = (
+            settle_seconds if settle_seconds is not None else self.qdrant.VERSION_CACHE_TTL
+        )
+        self.jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        logger.info("Vector backfill service initialized")
+    
+    def start_backfill(self, target_version: int, activate: bool = True) -> Dict:
+        """
+        Start a background backfill into a schema version.
+        
+        Args:
+            target_version: Schema version to build (must be registered)
+            activate: Flip reads to the new version once it is complete
+        
+        Returns:
+            dict: The new job (see class docstring)
+        
+        Raises:
+            ValueError: If the version is unknown or a backfill is already running
+        """
+        if target_version not in VECTOR_SCHEMAS:
+            raise ValueError(f"Unknown vector schema version: {target_version}")
+        
+        with self._lock:
+            for job in self.jobs.values():
+                if job['status'] in ('queued', 'running'):
+                    raise ValueError(f"Backfill {job['job_id']} is already running")
+            
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'target_version': target_version,
+                'status': 'queued',
+                'activate': activate,
+                'activated': False,
+                'progress': {
+                    base: {'processed': 0, 'stored': 0, 'failed': 0}
+                    for base in VECTOR_COLLECTIONS
+                },
+                'started_at': datetime.utcnow().isoformat(),
+                'finished_at': None
+            }
+            self.jobs[job['job_id']] = job
+        
+        thread = threading.Thread(
+            target=self.run_backfill,
+            args=(job,),
+            name=f"vector-backfill-{job['job_id'][:8]}",
+            daemon=True
+        )
+        thread.start()
+        
+        logger.info(f"Started backfill {job['job_id']} to v{target_version}")
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a backfill job by ID."""
+        return self.jobs.get(job_id)
+    
+    def run_backfill(self, job: Dict) -> Dict:
+        """
+        Run a backfill job to completion (called in the background thread).
+        
+        Args:
+            job: Job dict created by start_backfill
+        
+        Returns:
+            dict: The finished job
+        """
+        version = job['target_version']
+        job['status'] = 'running'
+        db = self.session_factory()
+        
+        try:
+            # Step 1: New collections exist -> every write path dual-writes
+            if not self.qdrant.create_version_collections(version):
+                raise RuntimeError(f"Could not create collections for v{version}")
+            
+            # Step 2: Let other workers pick up the new write version
+            if self.settle_seconds > 0:
+                time.sleep(self.settle_seconds)
+            
+            # Step 3: Scan PostgreSQL and bulk upsert
+            alumni_ids = self._backfill_alumni(db, version, job['progress']['alumni'])
+            student_ids = self._backfill_students(db, version, job['progress']['students'])
+            
+            # Step 4: Flip reads, then the PostgreSQL references
+            failed = sum(progress['failed'] for progress in job['progress'].values())
+            if job['activate'] and failed == 0:
+                for base in VECTOR_COLLECTIONS:
+                    if not self.qdrant.activate_version(base, version):
+                        raise RuntimeError(f"Could not activate v{version} for '{base}'")
+                job['activated'] = True
+                
+                self._update_references(db, Alumni, "alumni", alumni_ids, version)
+                self._update_references(db, Student, "student", student_ids, version)
+            elif job['activate']:
+                job['error'] = f"{failed} records failed; reads were not switched to v{version}"
+            
+            job['status'] = 'completed'
+            logger.info(f"Backfill {job['job_id']} to v{version} completed "
+                       f"(activated={job['activated']})")
+        
+        except Exception as e:
+            logger.error(f"Backfill {job['job_id']} to v{version} failed: {e}")
+            db.rollback()
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        
+        finally:
+            db.close()
+            job['finished_at'] = datetime.utcnow().isoformat()
+        
+        return job
+    
+    def _backfill_alumni(self, db: Session, version: int, progress: Dict) -> List[int]:
+        """Generate and store every alumni vector for a version."""
+        stored_ids = []
+        batch = []
+        
+        query = db.query(Alumni).order_by(Alumni.id).yield_per(self.BATCH_SIZE)
+        for alumni in query:
+            batch.extend(self._alumni_entries(db, [alumni], version, progress))
+            if len(batch) >= self.BATCH_SIZE:
+                stored_ids.extend(self._store_batch("alumni", batch, version, progress))
+                batch = []
+        
+        stored_ids.extend(self._store_batch("alumni", batch, version, progress))
+        return stored_ids
+    
+    def _backfill_students(self, db: Session, version: int, progress: Dict) -> List[int]:
+        """Generate and store every student vector for a version."""
+        stored_ids = []
+        last_id = 0
+        
+        while True:
+            students = db.query(Student).filter(
+                Student.id > last_id
+            ).order_by(Student.id).limit(self.BATCH_SIZE).all()
+            if not students:
+                break
+            last_id = students[-1].id
+            
+            batch = self._student_entries(db, students, version, progress)
+            stored_ids.extend(self._store_batch("students", batch, version, progress))
+            db.expunge_all()
+        
+        return stored_ids
+    
+    def _alumni_entries(self, db: Session, alumni_records: List[Alumni], version: int, progress: Dict) -> List:
+        """(id, vector, metadata) of alumni records for a version."""
+        entries = []
+        for alumni in alumni_records:
+            progress['processed'] += 1
+            vector = self.alumni_service.generate_vector_for_alumni(alumni, db, version)
+            if vector is None:
+                progress['failed'] += 1
+                continue
+            
+            outcome_score = self.alumni_service.calculate_outcome_score(
+                alumni.placement_status,
+                alumni.company_tier
+            )
+            entries.append((alumni.id, vector, self.alumni_service.build_metadata(alumni, outcome_score)))
+        return entries
+    
+    def _student_entries(
+        self,
+        db: Session,
+        students: List[Student],
+        version: int,
+        progress: Dict,
+        inputs: Optional[Dict] = None
+    ) -> List:
+        """(id, vector, metadata) of students for a version (inputs loaded in one batch)."""
+        inputs = inputs or self.student_service.build_vector_inputs_batch(students, db)
+        entries = []
+        for student in students:
+            progress['processed'] += 1
+            vector = self.student_service.generate_vector_for_student(
+                student, db, version, inputs[student.id]
+            )
+            if vector is None:
+                progress['failed'] += 1
+                continue
+            entries.append((student.id, vector, self.student_service.build_metadata(student)))
+        return entries
+    
+    def index_records(self, db: Session, base: str, ids: List[int]) -> Dict:
+        """
+        Generate and store the vectors of specific records (e.g. rows just
+        imported) in batches, for every version being written, and point
+        their vector_id at the active version.
+        
+        Args:
+            db: Database session
+            base: "students" or "alumni"
+            ids: Record ids
+        
+        Returns:
+            dict: {'processed', 'stored', 'failed'} for the active version
+        """
+        model, kind = (Student, "student") if base == "students" else (Alumni, "alumni")
+        write_versions = self.qdrant.get_write_versions(base)
+        progress = {'processed': 0, 'stored': 0, 'failed': 0}
+        
+        for start in range(0, len(ids), self.BATCH_SIZE):
+            records = db.query(model).filter(
+                model.id.in_(ids[start:start + self.BATCH_SIZE])
+            ).order_by(model.id).all()
+            inputs = (
+                self.student_service.build_vector_inputs_batch(records, db)
+                if base == "students" else None
+            )
+            
+            for version in write_versions:
+                # Counters of the active version are the ones reported
+                counters = progress if version == write_versions[0] else {'processed': 0, 'stored': 0, 'failed': 0}
+                if base == "students":
+                    batch = self._student_entries(db, records, version, counters, inputs)
+                else:
+                    batch = self._alumni_entries(db, records, version, counters)
+                stored_ids = self._store_batch(base, batch, version, counters)
+                if version == write_versions[0]:
+                    self._update_references(db, model, kind, stored_ids, version)
+            db.expunge_all()
+        
+        return progress
+    
+    def _store_batch(self, base: str, batch: List, version: int, progress: Dict) -> List[int]:
+        """Upsert one batch and update progress counters."""
+        if not batch:
+            return []
+        
+        if self.qdrant.store_vectors_batch(base, batch, version=version):
+            progress['stored'] += len(batch)
+            return [record_id for record_id, _, _ in batch]
+        
+        progress['failed'] += len(batch)
+        return []
+    
+    def _update_references(self, db: Session, model, kind: str, ids: List[int], version: int):
+        """Point vector_id of the backfilled rows at the new version ("alumni_12@v2")."""
+        reference = literal(f"{kind}_") + cast(model.id, String) + literal(f"@v{version}")
+        
+        for start in range(0, len(ids), self.REFERENCE_CHUNK_SIZE):
+            chunk = ids[start:start + self.REFERENCE_CHUNK_SIZE]
+            # updated_at is kept as is: the data did not change, only its vector
+            db.query(model).filter(model.id.in_(chunk)).update(
+                {model.vector_id: reference, model.updated_at: model.updated_at},
+                synchronize_session=False
+            )
+            db.commit()
+    
+    def get_version_status(self) -> Dict:
+        """
+        Describe the vector versions of every managed collection.
+        
+        Returns:
+            dict: base -> {active_version, write_versions, collections}
+        """
+        status = {}
+        for base in VECTOR_COLLECTIONS:
+            write_versions = self.qdrant.get_write_versions(base)
+            collections = {}
+            for version in write_versions:
+                name = versioned_collection_name(base, version)
+                collections[version] = self.qdrant.get_collection_info(name)
+            
+            status[base] = {
+                'active_version': write_versions[0],
+                'write_versions': write_versions,
+                'collections': collections
+            }
+        
+        return status
+
+
+# ============================================================================
+# GLOBAL SERVICE INSTANCE (Singleton Pattern)
+# ============================================================================
+
+_vector_backfill_service: Optional[VectorBackfillService] = None
+
+
+def get_vector_backfill_service() -> VectorBackfillService:
+    """
+    Get or create the global vector backfill service instance.
+    
+    Returns:
+        VectorBackfillService: The global service instance
+    """
+    global _vector_backfill_service
+    
+    if _vector_backfill_service is None:
+        _vector_backfill_service = VectorBackfillService()
+        logger.info("Created global vector backfill service instance")
+    
+    return _vector_backfill_service
@@ -14,6 +14,11 @@ Vector Components (15 dimensions):
 7. time_weighted_avg(sleep)
 8-15. sigmoid_normalize(skill_scores) - up to 8 skills
 
+Time-weighted averages come from the feature store (whole history, see
+feature_store.py) when the profile carries 'wellbeing_features', otherwise
+from the last 7 wellbeing records. Until a student's first wellbeing day,
+the features hold their survey baseline as a prior.
+
 All vector components are normalized to [0, 1] range.
 """
 
@@ -221,6 +226,9 @@ def generate_student_vector(
             - attendance (float): 0-100 percentage
             - study_hours_per_week (float): Hours per week
             - project_count (int): Number of projects
+            - wellbeing_features (dict, optional): Full-history decayed means
+              from the feature store (screen_time, sleep, focus, study_hours);
+              used instead of the wellbeing records where present
         
         wellbeing: List of digital wellbeing data dicts (most recent first):
             - date (datetime): Date of record
@@ -266,9 +274,10 @@ def generate_student_vector(
     # ========================================================================
     # COMPONENT 3: Study Hours (time-weighted average)
     # ========================================================================
-    study_hours = profile.get('study_hours_per_week', 15.0)  # Default to 15 hours
-    # For MVP, use current value (no historical data yet)
-    # In production, this would use time_weighted_avg with historical data
+    # Full-history decayed means, when the caller loaded them
+    features = profile.get('wellbeing_features') or {}
+    
+    study_hours = features.get('study_hours', profile.get('study_hours_per_week', 15.0))  # Default to 15 hours
     study_hours_normalized = standard_normalize(study_hours, 0, 40)
     vector.append(study_hours_normalized)
     
@@ -282,7 +291,12 @@ def generate_student_vector(
     # ========================================================================
     # COMPONENTS 5-7: Digital Wellbeing (if available)
     # ========================================================================
-    if wellbeing and len(wellbeing) > 0:
+    if all(metric in features for metric in ('screen_time', 'focus', 'sleep')):
+        # Time-weighted averages over the whole history (same decay as below)
+        vector.append(inverse_normalize(features['screen_time'], 0, 12))
+        vector.append(features['focus'])
+        vector.append(standard_normalize(features['sleep'], 4, 10))
+    elif wellbeing and len(wellbeing) > 0:
         # Calculate time-weighted averages for recent data
         today = datetime.now()
         
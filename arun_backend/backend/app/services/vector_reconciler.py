@@ -0,0 +1,392 @@
+"""
+PostgreSQL / Qdrant Vector Reconciler for Trajectory Engine MVP
+
+PostgreSQL is the source of truth; Qdrant can drift from it when a vector
+store fails or a write path skips it. The reconciler finds and repairs the
+drift for every collection version being written:
+
+1. Stream (id, updated_at) from PostgreSQL and (point_id, payload) from
+   Qdrant, both in ascending id order, page by page
+2. Merge the two sorted streams in one pass (O(n + m), constant memory):
+   - missing:  row without a point
+   - stale:    point built from an older row (payload source_updated_at
+               older than updated_at) or from another schema version
+   - orphaned: point without a row
+3. Re-embed missing/stale rows with batched upserts, delete orphaned
+   points with batched deletes
+
+A dry run only reports. A points-per-second rate limit keeps continuous
+runs from competing with prediction traffic.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import Alumni, Student
+from app.services.alumni_vector_service import AlumniVectorService, get_alumni_vector_service
+from app.services.student_vector_service import StudentVectorService, get_student_vector_service
+from app.services.vector_schema import (
+    VECTOR_COLLECTIONS,
+    format_vector_id,
+    set_vector_references
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Payload keys needed to decide whether a point is stale
+RECONCILE_PAYLOAD_FIELDS = ["vector_version", "source_updated_at"]
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how many points are written per second.
+    
+    A rate of None disables limiting.
+    """
+    
+    def __init__(
+        self,
+        rate: Optional[float],
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = rate
+        self.clock = clock
+        self.sleep = sleep
+        self._allowance = rate or 0.0
+        self._last = clock()
+    
+    def acquire(self, amount: int) -> float:
+        """
+        Wait until `amount` points may be written.
+        
+        Returns:
+            float: Seconds slept
+        """
+        if not self.rate:
+            return 0.0
+        
+        now = self.clock()
+        self._allowance = min(self.rate, self._allowance + (now - self._last) * self.rate)
+        self._last = now
+        
+        self._allowance -= amount
+        if self._allowance >= 0:
+            return 0.0
+        
+        # Sleep off the deficit; a batch larger than the bucket just waits longer
+        wait = -self._allowance / self.rate
+        self.sleep(wait)
+        self._allowance = 0.0
+        self._last = self.clock()
+        return wait
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO timestamp from a payload (None if absent or malformed)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_point_stale(updated_at: Optional[datetime], payload: Dict, version: int) -> bool:
+    """
+    Decide whether a Qdrant point is out of date with its PostgreSQL row.
+    
+    Args:
+        updated_at: Row updated_at from PostgreSQL
+        payload: Point payload (vector_version, source_updated_at)
+        version: Schema version of the collection being reconciled
+    
+    Returns:
+        bool: True if the point must be re-embedded
+    """
+    if payload.get("vector_version") != version:
+        return True
+    
+    if updated_at is None:
+        return False
+    
+    source_updated_at = _parse_timestamp(payload.get("source_updated_at"))
+    return source_updated_at is None or updated_at > source_updated_at
+
+
+def diff_sorted_streams(
+    rows: Iterable[Tuple[int, Optional[datetime]]],
+    points: Iterable[Tuple[int, Dict]],
+    version: int
+) -> Iterator[Tuple[str, int]]:
+    """
+    Merge two id-sorted streams and yield the differences.
+    
+    Args:
+        rows: (id, updated_at) from PostgreSQL, ascending id
+        points: (point_id, payload) from Qdrant, ascending id
+        version: Schema version of the collection
+    
+    Yields:
+        (kind, id) with kind in "missing", "stale", "orphaned"
+    """
+    rows = iter(rows)
+    points = iter(points)
+    row = next(rows, None)
+    point = next(points, None)
+    
+    while row is not None or point is not None:
+        if point is None or (row is not None and row[0] < point[0]):
+            yield "missing", row[0]
+            row = next(rows, None)
+        elif row is None or point[0] < row[0]:
+            yield "orphaned", point[0]
+            point = next(points, None)
+        else:
+            if is_point_stale(row[1], point[1], version):
+                yield "stale", row[0]
+            row = next(rows, None)
+            point = next(points, None)
+
+
+class VectorReconciler:
+    """
+    Detects and repairs drift between PostgreSQL rows and Qdrant points.
+    """
+    
+    PAGE_SIZE = 1000
+    BATCH_SIZE = 256
+    SAMPLE_SIZE = 20
+    
+    def __init__(
+        self,
+        alumni_service: Optional[AlumniVectorService] = None,
+        student_service: Optional[StudentVectorService] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_points_per_second: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Initialize vector reconciler.
+        
+        Args:
+            alumni_service: Optional alumni vector service (uses global if None)
+            student_service: Optional student vector service (uses global if None)
+            session_factory: Callable returning a new database session
+            max_points_per_second: Repair rate limit (None = unlimited)
+            batch_size: Points per upsert/delete request
+        """
+        self.alumni_service = alumni_service or get_alumni_vector_service()
+        self.student_service = student_service or get_student_vector_service()
+        self.qdrant = self.alumni_service.qdrant
+        self.session_factory = session_factory
+        self.rate_limiter = RateLimiter(max_points_per_second)
+        self.batch_size = batch_size or self.BATCH_SIZE
+    
+    def reconcile(self, dry_run: bool = True, collections: Iterable[str] = VECTOR_COLLECTIONS) -> Dict:
+        """
+        Reconcile every version being written of the given collections.
+        
+        Args:
+            dry_run: Only report differences, change nothing
+            collections: Base collection names ("students", "alumni")
+        
+        Returns:
+            dict: Report with keys dry_run, started_at, finished_at and
+                  collections ("<base>@v<version>" -> counts and samples)
+        """
+        report = {
+            'dry_run': dry_run,
+            'started_at': datetime.utcnow().isoformat(),
+            'collections': {}
+        }
+        
+        if not self.qdrant.is_available:
+            report['error'] = "Qdrant unavailable"
+            report['finished_at'] = datetime.utcnow().isoformat()
+            return report
+        
+        for base in collections:
+            active_version = self.qdrant.get_active_version(base)
+            for version in self.qdrant.get_write_versions(base):
+                key = f"{base}@v{version}"
+                try:
+                    report['collections'][key] = self.reconcile_collection(
+                        base, version, dry_run, update_references=(version == active_version)
+                    )
+                except Exception as e:
+                    logger.error(f"Error reconciling {key}: {e}")
+                    report['collections'][key] = {'error': str(e)}
+        
+        report['finished_at'] = datetime.utcnow().isoformat()
+        return report
+    
+    def reconcile_collection(
+        self,
+        base: str,
+        version: int,
+        dry_run: bool = True,
+        update_references: bool = True
+    ) -> Dict:
+        """
+        Reconcile one version of one collection.
+        
+        Args:
+            base: "students" or "alumni"
+            version: Vector schema version
+            dry_run: Only report differences
+            update_references: Write vector_id for repaired rows (active version)
+        
+        Returns:
+            dict: Counts (postgres_rows, qdrant_points, missing, stale, orphaned,
+                  repaired, deleted, failed) and id samples per kind
+        """
+        model = Student if base == "students" else Alumni
+        stats = {
+            'postgres_rows': 0,
+            'qdrant_points': 0,
+            'missing': 0,
+            'stale': 0,
+            'orphaned': 0,
+            'repaired': 0,
+            'deleted': 0,
+            'failed': 0,
+            'samples': {'missing': [], 'stale': [], 'orphaned': []}
+        }
+        
+        scan_db = self.session_factory()
+        repair_db = self.session_factory()
+        to_repair: List[int] = []
+        to_delete: List[int] = []
+        
+        def counted(iterable, key):
+            for item in iterable:
+                stats[key] += 1
+                yield item
+        
+        try:
+            rows = counted(
+                scan_db.query(model.id, model.updated_at).order_by(model.id).yield_per(self.PAGE_SIZE),
+                'postgres_rows'
+            )
+            points = counted(
+                self.qdrant.scroll_point_payloads(
+                    base, version, RECONCILE_PAYLOAD_FIELDS, page_size=self.PAGE_SIZE
+                ),
+                'qdrant_points'
+            )
+            
+            for kind, record_id in diff_sorted_streams(rows, points, version):
+                stats[kind] += 1
+                if len(stats['samples'][kind]) < self.SAMPLE_SIZE:
+                    stats['samples'][kind].append(record_id)
+                if dry_run:
+                    continue
+                
+                if kind == "orphaned":
+                    to_delete.append(record_id)
+                    if len(to_delete) >= self.batch_size:
+                        self._delete(base, version, to_delete, stats)
+                        to_delete = []
+                else:
+                    to_repair.append(record_id)
+                    if len(to_repair) >= self.batch_size:
+                        self._repair(repair_db, base, version, to_repair, stats, update_references)
+                        to_repair = []
+            
+            if not dry_run:
+                self._repair(repair_db, base, version, to_repair, stats, update_references)
+                self._delete(base, version, to_delete, stats)
+        
+        finally:
+            scan_db.close()
+            repair_db.close()
+        
+        logger.info(f"Reconciled {base}@v{version} (dry_run={dry_run}): "
+                   f"{stats['missing']} missing, {stats['stale']} stale, "
+                   f"{stats['orphaned']} orphaned")
+        return stats
+    
+    def _delete(self, base: str, version: int, point_ids: List[int], stats: Dict):
+        """Delete orphaned points in one request."""
+        if not point_ids:
+            return
+        self.rate_limiter.acquire(len(point_ids))
+        if self.qdrant.delete_points(base, point_ids, version):
+            stats['deleted'] += len(point_ids)
+        else:
+            stats['failed'] += len(point_ids)
+    
+    def _repair(
+        self,
+        db: Session,
+        base: str,
+        version: int,
+        record_ids: List[int],
+        stats: Dict,
+        update_references: bool
+    ):
+        """Re-embed missing/stale rows and upsert them in one request."""
+        if not record_ids:
+            return
+        
+        if base == "students":
+            records = self._student_records(db, record_ids, version)
+            kind = "student"
+        else:
+            records = self._alumni_records(db, record_ids, version)
+            kind = "alumni"
+        stats['failed'] += len(record_ids) - len(records)
+        
+        if not records:
+            return
+        
+        self.rate_limiter.acquire(len(records))
+        if not self.qdrant.store_vectors_batch(base, records, version=version):
+            stats['failed'] += len(records)
+            return
+        stats['repaired'] += len(records)
+        
+        if update_references:
+            model = Student if base == "students" else Alumni
+            set_vector_references(db, model, {
+                record_id: format_vector_id(kind, record_id, version)
+                for record_id, _, _ in records
+            })
+            db.commit()
+        db.expunge_all()
+    
+    def _alumni_records(self, db: Session, alumni_ids: List[int], version: int) -> List[Tuple]:
+        """Build (id, vector, metadata) for alumni rows."""
+        records = []
+        for alumni in db.query(Alumni).filter(Alumni.id.in_(alumni_ids)).order_by(Alumni.id):
+            vector = self.alumni_service.generate_vector_for_alumni(alumni, db, version)
+            if vector is None:
+                continue
+            outcome_score = self.alumni_service.calculate_outcome_score(
+                alumni.placement_status,
+                alumni.company_tier
+            )
+            records.append((alumni.id, vector, self.alumni_service.build_metadata(alumni, outcome_score)))
+        return records
+    
+    def _student_records(self, db: Session, student_ids: List[int], version: int) -> List[Tuple]:
+        """Build (id, vector, metadata) for student rows."""
+        students = db.query(Student).filter(Student.id.in_(student_ids)).order_by(Student.id).all()
+        inputs = self.student_service.build_vector_inputs_batch(students, db)
+        
+        records = []
+        for student in students:
+            vector = self.student_service.generate_vector_for_student(
+                student, db, version, inputs[student.id]
+            )
+            if vector is None:
+                continue
+            records.append((student.id, vector, self.student_service.build_metadata(student)))
+        return records
@@ -0,0 +1,288 @@
+"""
+Vector Schema Registry for Trajectory Engine MVP
+
+This module versions the layout of student/alumni vectors so the formula can
+change without wiping Qdrant:
+- Every schema version has its own generator functions and dimension
+- Every version lives in its own Qdrant collection (students_v2, alumni_v2, ...)
+- Version 1 is the original 15-dimensional layout stored in the legacy
+  'students' and 'alumni' collections
+- Vector references in PostgreSQL record the version ("alumni_12@v1")
+- A version may split its vector into named sub-vectors (academic,
+  behavioral, skills) that Qdrant indexes separately for fused search
+
+Reads go through a per-collection alias ("alumni_active") that the backfill
+flips atomically once a new version is fully populated.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.services.vector_generation import generate_student_vector, generate_alumni_vector
+
+
+# ============================================================================
+# SCHEMA REGISTRY
+# ============================================================================
+
+# Version 1: the original 15-dimensional layout (see vector_generation.py)
+VECTOR_SCHEMAS = {
+    1: {
+        'dimension': 15,
+        'description': 'GPA, attendance, study hours, projects, screen time, '
+                       'focus, sleep and 8 market-weighted skill slots',
+        'student_generator': generate_student_vector,
+        'alumni_generator': generate_alumni_vector,
+    },
+    # Version 2: same 15 values, also stored as named sub-vectors so each
+    # component is matched on its own and weighted per major at query time
+    2: {
+        'dimension': 15,
+        'description': 'Version 1 layout with academic (GPA, attendance), '
+                       'behavioral (study hours, projects, screen time, focus, sleep) '
+                       'and skills (8 slots) sub-vectors',
+        'student_generator': generate_student_vector,
+        'alumni_generator': generate_alumni_vector,
+        'subspaces': {
+            'academic': (0, 2),
+            'behavioral': (2, 7),
+            'skills': (7, 15),
+        },
+    },
+}
+
+# Version used for new writes when nothing else is configured
+DEFAULT_VECTOR_VERSION = 1
+
+# Base collection names managed by the registry
+VECTOR_COLLECTIONS = ("students", "alumni")
+
+# Name of the whole vector in collections that also store sub-vectors
+FULL_VECTOR_NAME = "full"
+
+
+def get_vector_schema(version: int) -> Dict:
+    """
+    Get the schema definition for a vector version.
+    
+    Args:
+        version: Schema version number
+    
+    Returns:
+        Schema dict with keys: dimension, description, student_generator, alumni_generator
+    
+    Raises:
+        ValueError: If the version is not registered
+    """
+    schema = VECTOR_SCHEMAS.get(version)
+    if schema is None:
+        raise ValueError(f"Unknown vector schema version: {version}")
+    return schema
+
+
+def get_vector_dimension(version: int) -> int:
+    """Get the vector dimension for a schema version."""
+    return get_vector_schema(version)['dimension']
+
+
+def get_vector_subspaces(version: int) -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    Get the named sub-vectors of a schema version.
+    
+    Returns:
+        Dict of name -> (start, end) dimension range, or None if the version
+        stores a single unnamed vector
+    """
+    return get_vector_schema(version).get('subspaces')
+
+
+def split_vector(vector: np.ndarray, version: int):
+    """
+    Convert a vector into what Qdrant stores for a schema version.
+    
+    Args:
+        vector: Full vector of the schema version
+        version: Schema version number
+    
+    Returns:
+        A list of floats, or for versions with sub-vectors a dict of
+        name -> list of floats that includes the full vector
+    
+    Examples:
+        >>> sorted(split_vector(np.zeros(15), 2))
+        ['academic', 'behavioral', 'full', 'skills']
+        >>> split_vector(np.zeros(15), 2)['academic']
+        [0.0, 0.0]
+    """
+    values = vector.tolist() if isinstance(vector, np.ndarray) else list(vector)
+    subspaces = get_vector_subspaces(version)
+    if not subspaces:
+        return values
+    
+    named = {FULL_VECTOR_NAME: values}
+    for name, (start, end) in subspaces.items():
+        named[name] = values[start:end]
+    return named
+
+
+def generate_student_vector_for_version(
+    version: int,
+    profile: Dict,
+    wellbeing: Optional[List[Dict]] = None,
+    skills: Optional[List[Dict]] = None
+) -> np.ndarray:
+    """
+    Generate a student vector using the generator of a specific schema version.
+    
+    Args:
+        version: Schema version number
+        profile: Student profile dict (see generate_student_vector)
+        wellbeing: Optional digital wellbeing records (most recent first)
+        skills: Optional skill dicts
+    
+    Returns:
+        Numpy array with the dimension of the requested version
+    """
+    generator = get_vector_schema(version)['student_generator']
+    return generator(profile, wellbeing, skills)
+
+
+def generate_alumni_vector_for_version(
+    version: int,
+    profile: Dict,
+    skills: Optional[List[Dict]] = None
+) -> np.ndarray:
+    """
+    Generate an alumni vector using the generator of a specific schema version.
+    
+    Args:
+        version: Schema version number
+        profile: Alumni profile dict (see generate_alumni_vector)
+        skills: Optional skill dicts
+    
+    Returns:
+        Numpy array with the dimension of the requested version
+    """
+    generator = get_vector_schema(version)['alumni_generator']
+    return generator(profile, skills=skills)
+
+
+# ============================================================================
+# COLLECTION AND REFERENCE NAMING
+# ============================================================================
+
+def versioned_collection_name(base: str, version: int) -> str:
+    """
+    Get the Qdrant collection name that stores a schema version.
+    
+    Version 1 keeps the legacy collection names so existing data stays valid.
+    
+    Examples:
+        >>> versioned_collection_name("alumni", 1)
+        'alumni'
+        >>> versioned_collection_name("alumni", 2)
+        'alumni_v2'
+    """
+    if version == 1:
+        return base
+    return f"{base}_v{version}"
+
+
+def parse_collection_version(base: str, collection_name: str) -> Optional[int]:
+    """
+    Extract the schema version from a collection name.
+    
+    Returns:
+        Version number, or None if the collection does not belong to `base`
+    
+    Examples:
+        >>> parse_collection_version("alumni", "alumni")
+        1
+        >>> parse_collection_version("alumni", "alumni_v3")
+        3
+        >>> parse_collection_version("alumni", "students_v3") is None
+        True
+    """
+    if collection_name == base:
+        return 1
+    prefix = f"{base}_v"
+    if collection_name.startswith(prefix) and collection_name[len(prefix):].isdigit():
+        return int(collection_name[len(prefix):])
+    return None
+
+
+def active_alias_name(base: str) -> str:
+    """Get the alias that routes reads to the active version of a collection."""
+    return f"{base}_active"
+
+
+def format_vector_id(kind: str, record_id: int, version: int) -> str:
+    """
+    Build the vector reference stored in Student.vector_id / Alumni.vector_id.
+    
+    Examples:
+        >>> format_vector_id("alumni", 12, 2)
+        'alumni_12@v2'
+    """
+    return f"{kind}_{record_id}@v{version}"
+
+
+def parse_vector_id(vector_id: Optional[str]) -> Optional[Tuple[str, int, int]]:
+    """
+    Parse a vector reference into (kind, record_id, version).
+    
+    References written before versioning ("alumni_12") are version 1.
+    
+    Returns:
+        Tuple (kind, record_id, version) or None if the reference is malformed
+    """
+    if not vector_id:
+        return None
+    
+    reference, _, version_part = vector_id.partition("@v")
+    if version_part and not version_part.isdigit():
+        return None
+    version = int(version_part) if version_part else 1
+    
+    kind, _, record_id = reference.rpartition("_")
+    if not kind or not record_id.isdigit():
+        return None
+    
+    return kind, int(record_id), version
+
+
+def set_vector_references(db: Session, model, references: Dict[int, str], instances=()) -> None:
+    """
+    Write vector_id for many rows without bumping updated_at.
+    
+    updated_at is what the reconciler compares against the source_updated_at
+    stored in Qdrant payloads, so recording where a vector lives must not
+    make the row look newer than its vector. The caller commits.
+    
+    Args:
+        db: Database session
+        model: Student or Alumni
+        references: record_id -> vector_id
+        instances: Loaded ORM objects to keep in sync with the new vector_id
+    """
+    if not references:
+        return
+    
+    table = model.__table__
+    statement = update(table).where(
+        table.c.id == bindparam('record_id')
+    ).values(
+        vector_id=bindparam('reference'),
+        updated_at=table.c.updated_at
+    )
+    db.execute(statement, [
+        {'record_id': record_id, 'reference': reference}
+        for record_id, reference in references.items()
+    ])
+    
+    for instance in instances:
+        if instance.id in references:
+            set_committed_value(instance, 'vector_id', references[instance.id])
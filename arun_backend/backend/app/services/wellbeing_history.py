@@ -0,0 +1,437 @@
+"""
+Columnar Wellbeing History for Trajectory Engine MVP
+
+Reads digital wellbeing history as NumPy arrays instead of one ORM object
+(and one Decimal -> float conversion) per student per day.
+
+Two backends behind one reader API (WellbeingHistory.load / latest):
+- SQL: selects only the requested columns and converts them column-wise
+- Columnar store (optional, WELLBEING_HISTORY_DIR): month partitions of
+  memory-mapped .npy columns written by export_wellbeing_history.py.
+  Months that were never exported, or that received writes since their
+  export (dirty marker set by invalidate()), are read from SQL instead, so
+  results always match the database.
+
+Store layout:
+    <root>/<YYYY-MM>/student_id.npy     int64, sorted by (student_id, date)
+    <root>/<YYYY-MM>/date.npy           datetime64[D]
+    <root>/<YYYY-MM>/<metric>.npy       float64 (NaN where NULL)
+    <root>/dirty/<YYYY-MM>              marker: month changed since export
+
+Every reader returns a dict of equally long arrays: 'student_id', 'date'
+and one float64 array per requested metric.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import DigitalWellbeingData
+
+logger = logging.getLogger(__name__)
+
+
+# Metrics available from the history (DigitalWellbeingData column names)
+HISTORY_METRICS = (
+    'screen_time_hours',
+    'educational_app_hours',
+    'social_media_hours',
+    'entertainment_hours',
+    'productivity_hours',
+    'communication_hours',
+    'focus_score',
+    'sleep_duration_hours',
+)
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    """First day of the month after the one containing day."""
+    return (month_start(day) + timedelta(days=32)).replace(day=1)
+
+
+def month_key(day: date) -> str:
+    return day.strftime('%Y-%m')
+
+
+def iter_months(start: date, end: date) -> List[date]:
+    """First days of every month from start's to end's (inclusive)."""
+    months = []
+    current = month_start(start)
+    while current <= end:
+        months.append(current)
+        current = next_month(current)
+    return months
+
+
+def empty_history(metrics: Sequence[str]) -> Dict[str, np.ndarray]:
+    history = {
+        'student_id': np.empty(0, dtype=np.int64),
+        'date': np.empty(0, dtype='datetime64[D]')
+    }
+    for metric in metrics:
+        history[metric] = np.empty(0, dtype=np.float64)
+    return history
+
+
+def concat_history(parts: List[Dict[str, np.ndarray]], metrics: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Concatenate history parts and sort by (student_id, date)."""
+    parts = [part for part in parts if len(part['student_id'])]
+    if not parts:
+        return empty_history(metrics)
+    
+    history = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    order = np.lexsort((history['date'], history['student_id']))
+    return {key: values[order] for key, values in history.items()}
+
+
+def fill_missing(values: np.ndarray, default: float) -> np.ndarray:
+    """Replace NaN (NULL in the database) with a default."""
+    return np.where(np.isnan(values), default, values)
+
+
+def _check_metrics(metrics: Sequence[str]):
+    unknown = set(metrics) - set(HISTORY_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown wellbeing metrics: {sorted(unknown)}")
+
+
+def load_history_sql(
+    db: Session,
+    student_ids: Optional[Sequence[int]],
+    start: Optional[date],
+    end: Optional[date],
+    metrics: Sequence[str]
+) -> Dict[str, np.ndarray]:
+    """Load history with one column-only SELECT (no ORM objects)."""
+    columns = [getattr(DigitalWellbeingData, metric) for metric in metrics]
+    statement = select(DigitalWellbeingData.student_id, DigitalWellbeingData.date, *columns)
+    
+    if student_ids is not None:
+        statement = statement.where(DigitalWellbeingData.student_id.in_(list(student_ids)))
+    if start is not None:
+        statement = statement.where(DigitalWellbeingData.date >= start)
+    if end is not None:
+        statement = statement.where(DigitalWellbeingData.date <= end)
+    
+    rows = db.execute(
+        statement.order_by(DigitalWellbeingData.student_id, DigitalWellbeingData.date)
+    ).all()
+    if not rows:
+        return empty_history(metrics)
+    
+    values = list(zip(*rows))
+    history = {
+        'student_id': np.array(values[0], dtype=np.int64),
+        'date': np.array(values[1], dtype='datetime64[D]')
+    }
+    for metric, column in zip(metrics, values[2:]):
+        # Decimal -> float and NULL -> NaN for the whole column at once
+        history[metric] = np.array(column, dtype=np.float64)
+    return history
+
+
+class ColumnarHistoryStore:
+    """Month-partitioned .npy history files (see module docstring)."""
+    
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, 'dirty'), exist_ok=True)
+    
+    def _partition_dir(self, month: date) -> str:
+        return os.path.join(self.root, month_key(month))
+    
+    def _dirty_marker(self, month: date) -> str:
+        return os.path.join(self.root, 'dirty', month_key(month))
+    
+    def is_current(self, month: date) -> bool:
+        """True if the month's partition exists and has no writes since its export."""
+        return (
+            os.path.isdir(self._partition_dir(month))
+            and not os.path.exists(self._dirty_marker(month))
+        )
+    
+    def invalidate(self, day: date):
+        """Mark the month containing day as changed since its export."""
+        with open(self._dirty_marker(day), 'a'):
+            pass
+    
+    def dirty_months(self) -> List[date]:
+        """Months marked dirty since their export."""
+        return sorted(
+            datetime.strptime(name, '%Y-%m').date()
+            for name in os.listdir(os.path.join(self.root, 'dirty'))
+        )
+    
+    def clear_invalidation(self, month: date):
+        """Remove the month's dirty marker."""
+        marker = self._dirty_marker(month)
+        if os.path.exists(marker):
+            os.unlink(marker)
+    
+    def read_month(
+        self,
+        month: date,
+        student_ids: Optional[np.ndarray],
+        start: date,
+        end: date,
+        metrics: Sequence[str]
+    ) -> Dict[str, np.ndarray]:
+        """Read the selected rows of one partition."""
+        directory = self._partition_dir(month)
+        
+        def column(name):
+            return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+        
+        ids = column('student_id')
+        dates = column('date')
+        mask = (dates >= np.datetime64(start, 'D')) & (dates <= np.datetime64(end, 'D'))
+        if student_ids is not None:
+            mask &= np.isin(ids, student_ids)
+        
+        history = {'student_id': np.asarray(ids[mask]), 'date': np.asarray(dates[mask])}
+        for metric in metrics:
+            history[metric] = np.asarray(column(metric)[mask])
+        return history
+    
+    def write_month(self, month: date, history: Dict[str, np.ndarray]):
+        """Replace one partition atomically."""
+        directory = self._partition_dir(month)
+        staging = tempfile.mkdtemp(prefix=f'.{month_key(month)}_', dir=self.root)
+        try:
+            for name, values in history.items():
+                np.save(os.path.join(staging, f'{name}.npy'), values)
+            
+            retired = None
+            if os.path.isdir(directory):
+                retired = staging + '.old'
+                os.rename(directory, retired)
+            os.rename(staging, directory)
+            if retired:
+                shutil.rmtree(retired, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+
+class WellbeingHistory:
+    """
+    Wellbeing history reader.
+    
+    Uses the columnar store for exported, unchanged months when one is
+    configured and SQL for everything else.
+    """
+    
+    def __init__(self, store: Optional[ColumnarHistoryStore] = None):
+        self.store = store
+    
+    def load(
+        self,
+        db: Session,
+        student_ids: Optional[Sequence[int]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        metrics: Sequence[str] = HISTORY_METRICS
+    ) -> Dict[str, np.ndarray]:
+        """
+        History of the given students (default: all) between start and end
+        (inclusive, default: unbounded), sorted by (student_id, date).
+        """
+        _check_metrics(metrics)
+        if self.store is None:
+            return load_history_sql(db, student_ids, start, end, metrics)
+        
+        if start is None or end is None:
+            first, last = self._date_bounds(db, student_ids)
+            if first is None:
+                return empty_history(metrics)
+            start = start or first
+            end = end or last
+        
+        ids = None if student_ids is None else np.asarray(list(student_ids), dtype=np.int64)
+        parts = []
+        sql_ranges: List[Tuple[date, date]] = []
+        
+        for month in iter_months(start, end):
+            month_first = max(month, start)
+            month_last = min(next_month(month) - timedelta(days=1), end)
+            
+            if self.store.is_current(month):
+                parts.append(self.store.read_month(month, ids, month_first, month_last, metrics))
+            elif sql_ranges and sql_ranges[-1][1] + timedelta(days=1) == month_first:
+                # Extend the previous SQL range over consecutive months
+                sql_ranges[-1] = (sql_ranges[-1][0], month_last)
+            else:
+                sql_ranges.append((month_first, month_last))
+        
+        for range_start, range_end in sql_ranges:
+            parts.append(load_history_sql(db, student_ids, range_start, range_end, metrics))
+        
+        return concat_history(parts, metrics)
+    
+    def latest(
+        self,
+        db: Session,
+        student_ids: Sequence[int],
+        count: int,
+        metrics: Sequence[str] = HISTORY_METRICS
+    ) -> Dict[str, np.ndarray]:
+        """
+        The `count` most recent days of each student, sorted by student_id
+        and then most recent first.
+        """
+        _check_metrics(metrics)
+        if not student_ids:
+            return empty_history(metrics)
+        
+        if self.store is None:
+            return self._latest_sql(db, student_ids, count, metrics)
+        
+        first, last = self._date_bounds(db, student_ids)
+        if first is None:
+            return empty_history(metrics)
+        
+        # Walk back a month at a time until every student has enough days
+        parts = []
+        counts = Counter()
+        needed = list(student_ids)
+        month = month_start(last)
+        while needed and month >= month_start(first):
+            part = self.load(db, needed, month, next_month(month) - timedelta(days=1), metrics)
+            parts.append(part)
+            counts.update(part['student_id'].tolist())
+            needed = [student_id for student_id in needed if counts[student_id] < count]
+            month = month_start(month - timedelta(days=1))
+        
+        history = concat_history(parts, metrics)
+        return _most_recent(history, count)
+    
+    def _latest_sql(
+        self,
+        db: Session,
+        student_ids: Sequence[int],
+        count: int,
+        metrics: Sequence[str]
+    ) -> Dict[str, np.ndarray]:
+        """Most recent days per student with one ROW_NUMBER query."""
+        columns = [getattr(DigitalWellbeingData, metric) for metric in metrics]
+        ranked = select(
+            DigitalWellbeingData.student_id,
+            DigitalWellbeingData.date,
+            *columns,
+            func.row_number().over(
+                partition_by=DigitalWellbeingData.student_id,
+                order_by=DigitalWellbeingData.date.desc()
+            ).label('position')
+        ).where(DigitalWellbeingData.student_id.in_(list(student_ids))).subquery()
+        
+        rows = db.execute(
+            select(*[ranked.c[name] for name in ('student_id', 'date', *metrics)])
+            .where(ranked.c.position <= count)
+            .order_by(ranked.c.student_id, ranked.c.date.desc())
+        ).all()
+        if not rows:
+            return empty_history(metrics)
+        
+        values = list(zip(*rows))
+        history = {
+            'student_id': np.array(values[0], dtype=np.int64),
+            'date': np.array(values[1], dtype='datetime64[D]')
+        }
+        for metric, column in zip(metrics, values[2:]):
+            history[metric] = np.array(column, dtype=np.float64)
+        return history
+    
+    def _date_bounds(self, db: Session, student_ids: Optional[Sequence[int]]):
+        """(first, last) date with data for the students."""
+        query = db.query(func.min(DigitalWellbeingData.date), func.max(DigitalWellbeingData.date))
+        if student_ids is not None:
+            query = query.filter(DigitalWellbeingData.student_id.in_(list(student_ids)))
+        return query.one()
+    
+    def invalidate(self, day: date):
+        """Record that the day's data changed (no-op without a store)."""
+        if self.store is not None:
+            try:
+                self.store.invalidate(day)
+            except OSError as e:
+                logger.error(f"Failed to mark wellbeing history month {month_key(day)} dirty: {e}")
+    
+    def export(self, db: Session, months: Optional[List[date]] = None) -> Dict[str, int]:
+        """
+        Write store partitions from the database.
+        
+        Args:
+            months: First days of the months to export (default: every month
+                    with data)
+        
+        Returns:
+            dict: month key -> rows written
+        """
+        if self.store is None:
+            raise ValueError("No columnar wellbeing history store configured")
+        
+        if months is None:
+            first, last = self._date_bounds(db, None)
+            months = iter_months(first, last) if first else []
+        
+        written = {}
+        for month in months:
+            # Clear the marker before reading: a write that lands during the
+            # export sets it again and keeps the month on SQL
+            self.store.clear_invalidation(month)
+            
+            history = load_history_sql(
+                db, None, month, next_month(month) - timedelta(days=1), HISTORY_METRICS
+            )
+            self.store.write_month(month, history)
+            written[month_key(month)] = len(history['student_id'])
+            logger.info(f"Exported {written[month_key(month)]} wellbeing rows for {month_key(month)}")
+        
+        return written
+
+
+def _most_recent(history: Dict[str, np.ndarray], count: int) -> Dict[str, np.ndarray]:
+    """Keep the `count` most recent rows of each student, most recent first."""
+    order = np.lexsort((-history['date'].astype(np.int64), history['student_id']))
+    history = {key: values[order] for key, values in history.items()}
+    
+    ids = history['student_id']
+    if len(ids) == 0:
+        return history
+    group_start = np.r_[0, np.flatnonzero(ids[1:] != ids[:-1]) + 1]
+    rank = np.arange(len(ids)) - np.repeat(group_start, np.diff(np.r_[group_start, len(ids)]))
+    keep = rank < count
+    return {key: values[keep] for key, values in history.items()}
+
+
+_wellbeing_history: Optional[WellbeingHistory] = None
+
+def get_wellbeing_history() -> WellbeingHistory:
+    """
+    Get the process-wide history reader (columnar store when
+    WELLBEING_HISTORY_DIR is set).
+    """
+    global _wellbeing_history
+    if _wellbeing_history is None:
+        root = os.getenv("WELLBEING_HISTORY_DIR")
+        store = None
+        if root:
+            try:
+                store = ColumnarHistoryStore(root)
+            except OSError as e:
+                logger.warning(f"Columnar wellbeing history unavailable: {e}")
+        _wellbeing_history = WellbeingHistory(store)
+    return _wellbeing_history
@@ -0,0 +1,263 @@
+"""
+Wellbeing Ingest Service
+
+Bulk ingestion of digital wellbeing days, for device agents that collect a
+week or more offline and upload it in one request.
+
+A batch of (student, date, metrics) entries is:
+1. Validated in one pass (unknown students, future dates, duplicate days),
+   all problems reported together and nothing written if any is found
+2. Written with a single INSERT ... ON CONFLICT (student_id, date) DO UPDATE
+3. Followed by ONE refresh of the derived data per student (columnar
+   history, decayed features, rollups, cohort statistics and percentiles)
+   covering all of the student's days, instead of one refresh per day
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import DigitalWellbeingData, SleepQualityEnum, Student
+from app.services.behavioral_analysis_service import get_behavioral_analysis_service
+from app.services.cohort_benchmark_service import get_cohort_benchmark_service
+from app.services.feature_store import day_features, get_feature_store, record_columns
+from app.services.wellbeing_history import get_wellbeing_history, month_start
+from app.services.wellbeing_rollup_service import get_wellbeing_rollup_service
+
+logger = logging.getLogger(__name__)
+
+
+# Columns an entry may set (besides student_id and date)
+INGEST_COLUMNS = (
+    'screen_time_hours', 'educational_app_hours', 'social_media_hours',
+    'entertainment_hours', 'productivity_hours', 'communication_hours',
+    'sleep_duration_hours', 'sleep_bedtime', 'sleep_wake_time', 'sleep_quality',
+)
+
+# (student_id, date) pairs per lookup query (bounded bind parameters)
+LOAD_CHUNK = 1000
+
+
+class WellbeingIngestError(ValueError):
+    """A batch failed validation; errors lists every problem found."""
+    
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(f"{len(errors)} invalid wellbeing entries")
+        self.errors = errors
+
+
+def stored_focus_score(values: Dict[str, Any]) -> float:
+    """
+    Focus score stored with a wellbeing day.
+    Focus Score = (Educational + Productivity) / (Social Media + Entertainment)
+    Returns value between 0 and 1, or 0.5 if denominator is 0.
+    """
+    productive = (values.get('educational_app_hours') or 0.0) + (values.get('productivity_hours') or 0.0)
+    distracting = (values.get('social_media_hours') or 0.0) + (values.get('entertainment_hours') or 0.0)
+    
+    if distracting == 0:
+        return 1.0 if productive > 0 else 0.5
+    
+    focus = productive / distracting
+    # Normalize to 0-1 range (cap at 2.0 for focus ratio)
+    return min(focus / 2.0, 1.0)
+
+
+def _insert_for(db: Session):
+    """Dialect-specific insert construct (the ones supporting ON CONFLICT)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Bulk wellbeing upsert is not supported on {dialect}")
+    return insert
+
+
+class WellbeingIngestService:
+    """Validates and upserts batches of wellbeing days."""
+    
+    def validate(
+        self,
+        db: Session,
+        entries: List[Dict[str, Any]],
+        today: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Check a batch in one pass (one query for the student ids).
+        
+        Args:
+            entries: Dicts with student_id, date and INGEST_COLUMNS values
+            today: Latest allowed date (default: today)
+        
+        Returns:
+            list: {'index', 'student_id', 'date', 'error'} per problem (empty if valid)
+        """
+        today = today or date.today()
+        student_ids = {entry['student_id'] for entry in entries}
+        known = {
+            student_id
+            for (student_id,) in db.query(Student.id).filter(Student.id.in_(student_ids))
+        } if student_ids else set()
+        
+        errors = []
+        seen = set()
+        for index, entry in enumerate(entries):
+            key = (entry['student_id'], entry['date'])
+            
+            def error(message):
+                errors.append({'index': index, 'student_id': key[0], 'date': key[1], 'error': message})
+            
+            if key[0] not in known:
+                error("Unknown student")
+            if key[1] > today:
+                error("Cannot add behavioral data for future dates")
+            if key in seen:
+                error("Duplicate entry for this student and date")
+            seen.add(key)
+        return errors
+    
+    def ingest(
+        self,
+        db: Session,
+        entries: List[Dict[str, Any]],
+        today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate and write a batch, then refresh each student's derived data once.
+        
+        Args:
+            db: Database session (committed by this method)
+            entries: Dicts with student_id, date and INGEST_COLUMNS values;
+                     None leaves an existing value unchanged
+            today: Latest allowed date (default: today)
+        
+        Returns:
+            dict: {'received', 'inserted', 'updated', 'student_ids'}
+        
+        Raises:
+            WellbeingIngestError: The batch is invalid (nothing was written)
+        """
+        errors = self.validate(db, entries, today)
+        if errors:
+            raise WellbeingIngestError(errors)
+        if not entries:
+            return {'received': 0, 'inserted': 0, 'updated': 0, 'student_ids': []}
+        
+        keys = [(entry['student_id'], entry['date']) for entry in entries]
+        previous = {
+            (record.student_id, record.date): day_features(record_columns(record))
+            for record in self._load_days(db, keys)
+        }
+        
+        synced_at = datetime.utcnow()
+        rows = []
+        for entry in entries:
+            row = {column: entry.get(column) for column in INGEST_COLUMNS}
+            if row['sleep_quality'] is not None:
+                row['sleep_quality'] = SleepQualityEnum(row['sleep_quality'])
+            row.update(
+                student_id=entry['student_id'],
+                date=entry['date'],
+                focus_score=round(stored_focus_score(row), 2),
+                synced_at=synced_at
+            )
+            rows.append(row)
+        
+        insert = _insert_for(db)
+        table = DigitalWellbeingData.__table__
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=['student_id', 'date'],
+            set_={
+                # Same as a single-day update: missing values keep the stored ones
+                **{column: func.coalesce(statement.excluded[column], table.c[column])
+                   for column in INGEST_COLUMNS},
+                'focus_score': statement.excluded.focus_score,
+                'synced_at': statement.excluded.synced_at,
+            }
+        )
+        db.execute(statement, rows)
+        db.commit()
+        
+        student_ids = self.refresh_days(db, keys, previous)
+        
+        return {
+            'received': len(entries),
+            'inserted': len(entries) - len(previous),
+            'updated': len(previous),
+            'student_ids': student_ids
+        }
+    
+    def _load_days(self, db: Session, keys: List[Tuple[int, date]]) -> List[DigitalWellbeingData]:
+        """Stored rows of the given (student_id, date) pairs (one query per LOAD_CHUNK pairs)."""
+        records = []
+        for offset in range(0, len(keys), LOAD_CHUNK):
+            records.extend(db.query(DigitalWellbeingData).filter(
+                tuple_(DigitalWellbeingData.student_id, DigitalWellbeingData.date).in_(
+                    keys[offset:offset + LOAD_CHUNK]
+                )
+            ))
+        return records
+    
+    def refresh_days(
+        self,
+        db: Session,
+        keys: List[Tuple[int, date]],
+        previous: Optional[Dict[Tuple[int, date], Dict[str, float]]] = None
+    ) -> List[int]:
+        """
+        One refresh of the derived wellbeing data for days that were just
+        written (also used by bulk loads that insert days directly): each
+        derived store is updated once, in one transaction, for all students.
+        
+        Args:
+            db: Database session (committed by this method)
+            keys: (student_id, date) of the written days
+            previous: Features of overwritten days before the write
+        
+        Returns:
+            list: Refreshed student ids
+        """
+        previous = previous or {}
+        days_by_student: Dict[int, List[date]] = {}
+        for student_id, day in keys:
+            days_by_student.setdefault(student_id, []).append(day)
+        
+        history = get_wellbeing_history()
+        for month in sorted({month_start(day) for _, day in keys}):
+            history.invalidate(month)
+        
+        written = {
+            (record.student_id, record.date): day_features(record_columns(record))
+            for record in self._load_days(db, keys)
+        }
+        feature_store = get_feature_store()
+        rollups = get_wellbeing_rollup_service()
+        behavioral = get_behavioral_analysis_service()
+        benchmarks = get_cohort_benchmark_service()
+        student_ids = sorted(days_by_student)
+        feature_store.observe_students(db, {
+            student_id: [
+                (day, written[(student_id, day)], previous.get((student_id, day)))
+                for day in sorted(days)
+            ]
+            for student_id, days in days_by_student.items()
+        })
+        rollups.update_students_days(db, days_by_student)
+        behavioral.record_students_update(db, student_ids)
+        benchmarks.record_students_update(db, student_ids)
+        return student_ids
+
+
+_wellbeing_ingest_service: Optional[WellbeingIngestService] = None
+
+def get_wellbeing_ingest_service() -> WellbeingIngestService:
+    global _wellbeing_ingest_service
+    if _wellbeing_ingest_service is None:
+        _wellbeing_ingest_service = WellbeingIngestService()
+    return _wellbeing_ingest_service
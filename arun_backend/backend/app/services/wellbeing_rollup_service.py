@@ -0,0 +1,505 @@
+"""
+Wellbeing Rollup Service
+
+Maintains per-student daily and weekly aggregates of digital wellbeing data
+(wellbeing_rollups) so readers fetch one row instead of re-averaging 7-30
+raw DigitalWellbeingData rows.
+
+For each metric a rollup holds the number of recorded values, mean, min,
+max and a time-decayed mean (half-life HALF_LIFE_DAYS) of the student's
+whole history up to the end of the period, so the latest week row alone
+describes current behavior.
+
+Key responsibilities:
+1. Update the day and week rows of a student when one day is written
+   (bounded: one raw row, at most 7 day rows per week)
+2. Backfill every rollup from the raw data
+3. Check stored rollups against the raw data
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import DigitalWellbeingData, WellbeingRollup
+from app.services.wellbeing_history import get_wellbeing_history
+
+logger = logging.getLogger(__name__)
+
+
+# Rollup metric -> DigitalWellbeingData column
+ROLLUP_METRICS = {
+    'screen_time': 'screen_time_hours',
+    'social_media': 'social_media_hours',
+    'focus_score': 'focus_score',
+    'sleep': 'sleep_duration_hours',
+}
+
+# Metrics whose zero value means "not recorded" (column defaults), as the
+# behavioral analysis has always treated them
+OPTIONAL_METRICS = ('social_media', 'focus_score', 'sleep')
+
+HALF_LIFE_DAYS = 7.0
+
+# Columns computed for every metric
+ROLLUP_FIELDS = ('count', 'mean', 'min', 'max', 'decayed', 'decayed_weight')
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+def raw_values(record: DigitalWellbeingData) -> Dict[str, Optional[float]]:
+    """Recorded metric values of one raw row (None when not recorded)."""
+    values = {}
+    for metric, column in ROLLUP_METRICS.items():
+        value = getattr(record, column)
+        if value is None or (metric in OPTIONAL_METRICS and not value):
+            values[metric] = None
+        else:
+            values[metric] = float(value)
+    return values
+
+
+def day_rollup(values: Dict[str, Optional[float]]) -> Dict[str, Any]:
+    """Rollup columns of a single day."""
+    columns = {}
+    for metric, value in values.items():
+        recorded = value is not None
+        columns.update({
+            f'{metric}_count': int(recorded),
+            f'{metric}_mean': value,
+            f'{metric}_min': value,
+            f'{metric}_max': value,
+            f'{metric}_decayed': value,
+            f'{metric}_decayed_weight': 1.0 if recorded else 0.0
+        })
+    return columns
+
+
+def week_rollup(
+    start: date,
+    days: List[Tuple[date, Dict[str, Optional[float]]]],
+    previous: Optional[Tuple[date, Dict[str, Any]]] = None,
+    half_life_days: float = HALF_LIFE_DAYS
+) -> Dict[str, Any]:
+    """
+    Rollup columns of one week.
+    
+    Args:
+        start: Monday of the week
+        days: (day, values) of the days with data in the week
+        previous: (start, columns) of the student's previous week rollup,
+                  whose decayed mean is carried into this one
+        half_life_days: Half-life of the decayed mean
+    """
+    end = start + timedelta(days=6)
+    columns = {}
+    for metric in ROLLUP_METRICS:
+        recorded = [(day, values[metric]) for day, values in days if values[metric] is not None]
+        values = [value for _, value in recorded]
+        
+        # Weights halve every half_life_days before the end of the week
+        weights = [0.5 ** ((end - day).days / half_life_days) for day, _ in recorded]
+        decayed_sum = sum(w * v for w, v in zip(weights, values))
+        decayed_weight = sum(weights)
+        
+        if previous is not None and previous[1][f'{metric}_decayed_weight']:
+            previous_end = previous[0] + timedelta(days=6)
+            carry = 0.5 ** ((end - previous_end).days / half_life_days)
+            decayed_sum += previous[1][f'{metric}_decayed'] * previous[1][f'{metric}_decayed_weight'] * carry
+            decayed_weight += previous[1][f'{metric}_decayed_weight'] * carry
+        
+        columns.update({
+            f'{metric}_count': len(values),
+            f'{metric}_mean': sum(values) / len(values) if values else None,
+            f'{metric}_min': min(values) if values else None,
+            f'{metric}_max': max(values) if values else None,
+            f'{metric}_decayed': decayed_sum / decayed_weight if decayed_weight else None,
+            f'{metric}_decayed_weight': decayed_weight
+        })
+    return columns
+
+
+def build_student_rollups(
+    days: Iterable[Tuple[date, Dict[str, Optional[float]]]],
+    half_life_days: float = HALF_LIFE_DAYS
+) -> List[Dict[str, Any]]:
+    """
+    All day and week rollups of one student from their raw values.
+    
+    Returns:
+        list: {'period', 'period_start', **columns}
+    """
+    days = sorted(days, key=lambda item: item[0])
+    rollups = [{'period': 'day', 'period_start': day, **day_rollup(values)} for day, values in days]
+    
+    weeks: Dict[date, List] = {}
+    for day, values in days:
+        weeks.setdefault(week_start(day), []).append((day, values))
+    
+    previous = None
+    for start in sorted(weeks):
+        columns = week_rollup(start, weeks[start], previous, half_life_days)
+        rollups.append({'period': 'week', 'period_start': start, **columns})
+        previous = (start, columns)
+    
+    return rollups
+
+
+def rollup_columns(row: WellbeingRollup) -> Dict[str, Any]:
+    """Metric columns of a stored rollup row."""
+    return {
+        f'{metric}_{field}': getattr(row, f'{metric}_{field}')
+        for metric in ROLLUP_METRICS for field in ROLLUP_FIELDS
+    }
+
+
+def summarize_rollup(row: WellbeingRollup) -> Dict[str, Any]:
+    """API representation of a rollup row."""
+    summary = {'period': row.period, 'period_start': row.period_start}
+    for metric in ROLLUP_METRICS:
+        summary[metric] = {
+            'count': getattr(row, f'{metric}_count'),
+            'mean': getattr(row, f'{metric}_mean'),
+            'min': getattr(row, f'{metric}_min'),
+            'max': getattr(row, f'{metric}_max'),
+            'decayed_mean': getattr(row, f'{metric}_decayed')
+        }
+    return summary
+
+
+class WellbeingRollupService:
+    """
+    Service maintaining wellbeing_rollups.
+    
+    Called after every wellbeing insert/update with the day written.
+    """
+    
+    def __init__(self, half_life_days: float = HALF_LIFE_DAYS):
+        """
+        Initialize rollup service.
+        
+        Args:
+            half_life_days: Half-life of the time-decayed means
+        """
+        self.half_life_days = half_life_days
+    
+    def update_student_day(self, db: Session, student_id: int, day: date) -> bool:
+        """
+        Bring the rollups of one student up to date after a day was written
+        (inserted, updated or deleted).
+        
+        Never raises: a failed update is repaired by backfill.
+        
+        Args:
+            db: Database session (committed by this method)
+            student_id: Student whose data changed
+            day: Day that was written
+        
+        Returns:
+            bool: True if the rollups were updated
+        """
+        return self.update_student_days(db, student_id, [day])
+    
+    def update_student_days(self, db: Session, student_id: int, days: List[date]) -> bool:
+        """
+        Same as update_student_day for several written days at once: the day
+        rows are rewritten, then the weeks are refreshed once from the
+        earliest changed week.
+        
+        Never raises: a failed update is repaired by backfill.
+        
+        Returns:
+            bool: True if the rollups were updated
+        """
+        return self.update_students_days(db, {student_id: days})
+    
+    def update_students_days(self, db: Session, days_by_student: Dict[int, List[date]]) -> bool:
+        """
+        Same as update_student_days for several students (e.g. one sync
+        batch) in one transaction: the written days and their day rows are
+        loaded once for all of them.
+        
+        Never raises: a failed update is repaired by backfill.
+        
+        Args:
+            db: Database session (committed by this method)
+            days_by_student: student_id -> days that were written
+        
+        Returns:
+            bool: True if the rollups were updated
+        """
+        days_by_student = {
+            student_id: sorted(set(days))
+            for student_id, days in days_by_student.items() if days
+        }
+        if not days_by_student:
+            return True
+        
+        student_ids = sorted(days_by_student)
+        all_days = sorted({day for days in days_by_student.values() for day in days})
+        try:
+            records = {
+                (record.student_id, record.date): record
+                for record in db.query(DigitalWellbeingData).filter(
+                    DigitalWellbeingData.student_id.in_(student_ids),
+                    DigitalWellbeingData.date.in_(all_days)
+                )
+            }
+            rows = {
+                (row.student_id, row.period_start): row
+                for row in db.query(WellbeingRollup).filter(
+                    WellbeingRollup.student_id.in_(student_ids),
+                    WellbeingRollup.period == 'day',
+                    WellbeingRollup.period_start.in_(all_days)
+                )
+            }
+            
+            for student_id, days in days_by_student.items():
+                for day in days:
+                    record, row = records.get((student_id, day)), rows.get((student_id, day))
+                    if record is None:
+                        if row is not None:
+                            db.delete(row)
+                    else:
+                        self._write_row(db, row, student_id, 'day', day, day_rollup(raw_values(record)))
+            db.flush()
+            
+            for student_id, days in days_by_student.items():
+                self._refresh_weeks(db, student_id, week_start(days[0]))
+            db.commit()
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to update wellbeing rollups for students {student_ids} on {all_days[0]}..{all_days[-1]}: {e}")
+            db.rollback()
+            return False
+    
+    def _refresh_weeks(self, db: Session, student_id: int, first_week: date):
+        """
+        Recompute the week rollup of first_week from its day rows, then the
+        later weeks whose decayed means carry it forward.
+        """
+        previous_row = db.query(WellbeingRollup).filter(
+            WellbeingRollup.student_id == student_id,
+            WellbeingRollup.period == 'week',
+            WellbeingRollup.period_start < first_week
+        ).order_by(WellbeingRollup.period_start.desc()).first()
+        previous = (previous_row.period_start, rollup_columns(previous_row)) if previous_row else None
+        
+        rows = db.query(WellbeingRollup).filter(
+            WellbeingRollup.student_id == student_id,
+            WellbeingRollup.period_start >= first_week
+        ).all()
+        
+        week_rows = {row.period_start: row for row in rows if row.period == 'week'}
+        days_by_week: Dict[date, List] = {}
+        for row in rows:
+            if row.period == 'day':
+                values = {metric: getattr(row, f'{metric}_mean') for metric in ROLLUP_METRICS}
+                days_by_week.setdefault(week_start(row.period_start), []).append((row.period_start, values))
+        
+        for start in sorted(set(week_rows) | set(days_by_week) | {first_week}):
+            days = days_by_week.get(start)
+            if not days:
+                if start in week_rows:
+                    db.delete(week_rows[start])
+                continue
+            
+            columns = week_rollup(start, days, previous, self.half_life_days)
+            self._write_row(db, week_rows.get(start), student_id, 'week', start, columns)
+            previous = (start, columns)
+    
+    def _write_row(
+        self,
+        db: Session,
+        row: Optional[WellbeingRollup],
+        student_id: int,
+        period: str,
+        start: date,
+        columns: Dict[str, Any]
+    ):
+        """Insert or update one rollup row."""
+        if row is None:
+            db.add(WellbeingRollup(student_id=student_id, period=period, period_start=start, **columns))
+        else:
+            for name, value in columns.items():
+                setattr(row, name, value)
+    
+    def _load_student_days(self, db: Session, student_ids: List[int]) -> Dict[int, List]:
+        """Raw (day, values) of the given students, read as columns."""
+        history = get_wellbeing_history().load(db, student_ids, metrics=tuple(ROLLUP_METRICS.values()))
+        
+        columns = {}
+        for metric, column in ROLLUP_METRICS.items():
+            values = history[column]
+            missing = np.isnan(values)
+            if metric in OPTIONAL_METRICS:
+                missing |= values == 0
+            columns[metric] = [
+                None if is_missing else value
+                for value, is_missing in zip(values.tolist(), missing.tolist())
+            ]
+        
+        days: Dict[int, List] = {student_id: [] for student_id in student_ids}
+        for row, (student_id, day) in enumerate(zip(
+            history['student_id'].tolist(), history['date'].astype(object)
+        )):
+            days[student_id].append((day, {metric: values[row] for metric, values in columns.items()}))
+        return days
+    
+    def _student_batches(self, db: Session, student_ids: Optional[List[int]], batch_size: int):
+        """Batches of the students with wellbeing data (optionally restricted)."""
+        query = db.query(DigitalWellbeingData.student_id).distinct()
+        if student_ids is not None:
+            query = query.filter(DigitalWellbeingData.student_id.in_(student_ids))
+        ids = sorted(student_id for (student_id,) in query.all())
+        for offset in range(0, len(ids), batch_size):
+            yield ids[offset:offset + batch_size]
+    
+    def backfill(
+        self,
+        db: Session,
+        student_ids: Optional[List[int]] = None,
+        batch_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Rebuild the rollups of every student (or the given students) from the
+        raw data, one committed batch of students at a time.
+        
+        Returns:
+            dict: {'students': int, 'rows': int}
+        """
+        summary = {'students': 0, 'rows': 0}
+        
+        if student_ids is not None:
+            # Students without raw data left keep no rollups
+            db.query(WellbeingRollup).filter(
+                WellbeingRollup.student_id.in_(student_ids)
+            ).delete(synchronize_session=False)
+        
+        for batch in self._student_batches(db, student_ids, batch_size):
+            rows = [
+                {'student_id': student_id, **rollup}
+                for student_id, days in self._load_student_days(db, batch).items()
+                for rollup in build_student_rollups(days, self.half_life_days)
+            ]
+            
+            db.query(WellbeingRollup).filter(
+                WellbeingRollup.student_id.in_(batch)
+            ).delete(synchronize_session=False)
+            if rows:
+                db.execute(insert(WellbeingRollup), rows)
+            db.commit()
+            
+            summary['students'] += len(batch)
+            summary['rows'] += len(rows)
+            logger.info(f"Backfilled wellbeing rollups for {summary['students']} students")
+        
+        db.commit()
+        return summary
+    
+    def check_consistency(
+        self,
+        db: Session,
+        student_ids: Optional[List[int]] = None,
+        batch_size: int = 500,
+        tolerance: float = 1e-6,
+        max_mismatches: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Compare stored rollups with rollups recomputed from the raw data.
+        
+        Returns:
+            dict: {
+                'students_checked': int,
+                'rows_checked': int,
+                'mismatch_count': int,
+                'mismatches': [{'student_id', 'period', 'period_start', 'problem'}],
+                'consistent': bool
+            }
+        """
+        report = {'students_checked': 0, 'rows_checked': 0, 'mismatch_count': 0, 'mismatches': []}
+        
+        def mismatch(student_id, period, start, problem):
+            report['mismatch_count'] += 1
+            if len(report['mismatches']) < max_mismatches:
+                report['mismatches'].append({
+                    'student_id': student_id,
+                    'period': period,
+                    'period_start': start,
+                    'problem': problem
+                })
+        
+        for batch in self._student_batches(db, student_ids, batch_size):
+            stored = {
+                (row.student_id, row.period, row.period_start): rollup_columns(row)
+                for row in db.query(WellbeingRollup).filter(WellbeingRollup.student_id.in_(batch))
+            }
+            
+            for student_id, days in self._load_student_days(db, batch).items():
+                for rollup in build_student_rollups(days, self.half_life_days):
+                    key = (student_id, rollup['period'], rollup['period_start'])
+                    report['rows_checked'] += 1
+                    columns = stored.pop(key, None)
+                    if columns is None:
+                        mismatch(*key, 'missing')
+                        continue
+                    
+                    differing = [
+                        name for name, value in columns.items()
+                        if not _close(value, rollup[name], tolerance)
+                    ]
+                    if differing:
+                        mismatch(*key, f"differs: {', '.join(differing)}")
+            
+            for key in stored:
+                mismatch(*key, 'no raw data')
+            
+            report['students_checked'] += len(batch)
+        
+        report['consistent'] = report['mismatch_count'] == 0
+        return report
+    
+    def get_latest_week(self, db: Session, student_id: int) -> Optional[WellbeingRollup]:
+        """Most recent week rollup of a student."""
+        return db.query(WellbeingRollup).filter(
+            WellbeingRollup.student_id == student_id,
+            WellbeingRollup.period == 'week'
+        ).order_by(WellbeingRollup.period_start.desc()).first()
+    
+    def get_rollups(
+        self,
+        db: Session,
+        student_id: int,
+        period: str = 'week',
+        since: Optional[date] = None
+    ) -> List[WellbeingRollup]:
+        """Rollups of a student, most recent first."""
+        query = db.query(WellbeingRollup).filter(
+            WellbeingRollup.student_id == student_id,
+            WellbeingRollup.period == period
+        )
+        if since is not None:
+            query = query.filter(WellbeingRollup.period_start >= since)
+        return query.order_by(WellbeingRollup.period_start.desc()).all()
+
+
+def _close(stored: Optional[float], expected: Optional[float], tolerance: float) -> bool:
+    if stored is None or expected is None:
+        return stored is None and expected is None
+    return abs(stored - expected) <= tolerance * max(1.0, abs(expected))
+
+
+_wellbeing_rollup_service: Optional[WellbeingRollupService] = None
+
+def get_wellbeing_rollup_service() -> WellbeingRollupService:
+    global _wellbeing_rollup_service
+    if _wellbeing_rollup_service is None:
+        _wellbeing_rollup_service = WellbeingRollupService()
+    return _wellbeing_rollup_service
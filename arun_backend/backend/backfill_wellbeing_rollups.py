@@ -0,0 +1,55 @@
+"""
+Backfill and check wellbeing rollups
+
+This script:
+1. Rebuilds the daily/weekly wellbeing rollups of every student (or the
+   given students) from the raw digital_wellbeing_data rows
+2. With --check, only compares the stored rollups with the raw data and
+   reports missing, differing and orphaned rows
+
+Usage:
+    python backfill_wellbeing_rollups.py
+    python backfill_wellbeing_rollups.py --students 12 31
+    python backfill_wellbeing_rollups.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import SessionLocal
+from app.services.wellbeing_rollup_service import get_wellbeing_rollup_service
+
+
+def print_check_report(report):
+    """Print a human-readable consistency report."""
+    status = "✅ consistent" if report['consistent'] else f"❌ {report['mismatch_count']} mismatches"
+    print(f"📊 Checked {report['rows_checked']} rollups of {report['students_checked']} students: {status}")
+    for mismatch in report['mismatches']:
+        print(f"   student {mismatch['student_id']} {mismatch['period']} "
+              f"{mismatch['period_start']}: {mismatch['problem']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill or check wellbeing rollups")
+    parser.add_argument("--check", action="store_true", help="Only compare rollups with the raw data")
+    parser.add_argument("--students", type=int, nargs="+", default=None,
+                        help="Student ids (default: every student)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Students per batch")
+    args = parser.parse_args()
+    
+    service = get_wellbeing_rollup_service()
+    db = SessionLocal()
+    try:
+        if args.check:
+            report = service.check_consistency(db, student_ids=args.students, batch_size=args.batch_size)
+            print_check_report(report)
+            sys.exit(0 if report['consistent'] else 1)
+        
+        summary = service.backfill(db, student_ids=args.students, batch_size=args.batch_size)
+        print(f"✅ Backfilled {summary['rows']} rollups for {summary['students']} students")
+    finally:
+        db.close()
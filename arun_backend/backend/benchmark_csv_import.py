@@ -0,0 +1,328 @@
+"""
+Benchmark the CSV import pipeline on synthetic cohorts
+
+This script:
+1. Generates synthetic CSVs of any size (default 1k/10k/100k rows) in the
+   survey export shape (froms.csv and data.csv share the same 67 columns)
+   or the alumni template shape
+2. Dry-runs the full import on each one (parsing, bcrypt in the process
+   pool, every table write, derived data, vectorization) inside a
+   transaction that is rolled back
+3. Reports per-stage timing, rows/s, hashes/s and peak memory, and writes
+   the results as JSON so runs can be compared across releases
+
+Without --database-url the import runs against a temporary SQLite
+stand-in; with one (e.g. a staging PostgreSQL) it runs there and rolls
+back. Vectors always go to an in-memory Qdrant stand-in.
+
+Usage:
+    python benchmark_csv_import.py --sizes 1000 10000 --output bench.json
+    python benchmark_csv_import.py --database-url postgresql://... --sizes 100000 --rounds 10
+    python benchmark_csv_import.py --write synthetic.csv --rows 1000000
+"""
+
+import argparse
+import csv
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine
+
+from app.services.csv_import_engine import ALUMNI_TEMPLATE_COLUMNS, CsvImportEngine
+from app.services.import_profiler import (
+    dry_run_session, format_profile, in_memory_backfill_service, profile_import, stand_in_engine
+)
+from app.services.password_hasher import TEMP_PASSWORD_ROUNDS, BulkPasswordHasher
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Header of the Google Forms survey export (froms.csv / data.csv)
+SURVEY_HEADER = [
+    'Timestamp', 'Email address', 'Untitled Question', 'Full Name', 'Email Address', 'Age', 'Gender',
+    'Major / Branch', 'Current Semester', 'College Name', 'Are you a Student or Alumni?',
+    'Current GPA (0–10)', 'GPA Trend Over Last Semesters', 'Average Attendance Percentage',
+    'Do you attend lab sessions regularly?', 'Do you submit assignments on time?',
+    'Average Internal Marks (0–100)', 'Number of Backlogs',
+    'Subject 1 Name(current semester)', 'Subject 1 Marks (0–100)',
+    'Subject 2 Name (current semester)', 'Subject 2 Marks (0–100)',
+    'Subject 3 Name (current semester)', 'Subject 3 Marks (0–100)',
+    'Subject 4 Name', 'Subject 4 Marks (0–100)',
+    'Subject 5 Name (current semester)', 'Subject 5 Marks (0–100)',
+    'Programming Languages Select all that apply)', 'Other Skills (If not listed above, please type them)',
+    'Strongest Technical Skill', 'Problem Solving Ability (1–5)', 'Communication Skill (1–5)',
+    'Teamwork Ability (1–5)', 'Consistency Level (1–5)', 'Number of Projects Completed',
+    'Project Types (Select all that apply)', 'Have you deployed a project?', 'Internship experience?',
+    'Internship duration in months', 'Study hours per day', 'Technical Knowledge practice hours per day',
+    'Do you follow a study schedule?', 'Concept revision frequency', 'Online courses completed (list/count)',
+    'Average daily screen time (hours)', 'Daily social media time (hours)',
+    'Daily learning app/video time (hours)', 'Daily entertainment time (hours)', 'Average sleep hours',
+    'Sleep schedule', 'Do you use phone while studying?', 'Distraction level while studying (1–5)',
+    'Mental exhaustion often?', 'Career clarity level (1–5)', 'Have you chosen a career path?',
+    'Daily placement preparation?', 'Interview fear level (1–5)', 'Confidence level (1–5)',
+    'Placement status ', 'Role relevance to major (0–100%)', 'Number of placement attempts',
+    'Months taken to get placed', 'Biggest strength', 'Biggest weakness', 'One habit you want to improve',
+    'What holds you back the most',
+]
+
+MAJORS = ["Computer Science", "Mechanical Engineering", "Business Administration",
+          "Electrical Engineering", "Civil Engineering"]
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Sneha", "Vikram", "Ananya", "Arjun", "Kavya", "Rohan", "Diya"]
+LAST_NAMES = ["Sharma", "Patil", "Reddy", "Kumar", "Iyer", "Nair", "Gupta", "Rao", "Das", "Joshi"]
+SUBJECTS = ["DBMS", "Operating Systems", "Computer Networks", "NLP", "Cryptography", "Deep Learning",
+            "Thermodynamics", "Marketing", "Power Systems", "Structural Analysis"]
+LANGUAGES = ["Python", "Java", "C", "C++", "JavaScript", "HTML/CSS", "SQL", "Machine Learning"]
+PROJECT_TYPES = ["Academic", "Personal", "Hackathon", "Open Source", "Freelance"]
+ROLES = ["Software Engineer", "Data Analyst", "Design Engineer", "Business Analyst", "Site Engineer"]
+
+
+def _hours(rng: random.Random, low: float, high: float) -> str:
+    return f"{rng.uniform(low, high):.1f}"
+
+
+def survey_row(index: int, rng: random.Random, invalid: bool = False) -> list:
+    """One survey answer row (index makes the email unique)."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"student{index:07d}@example.edu"
+    placed = rng.random() < 0.3
+    subjects = rng.sample(SUBJECTS, 5)
+    answers = {
+        'Timestamp': (datetime(2026, 2, 1) + timedelta(minutes=index)).strftime("%d/%m/%Y %H:%M:%S"),
+        'Email address': email,
+        'Full Name': name,
+        'Email Address': email,
+        'Age': str(rng.randint(18, 25)),
+        'Gender': rng.choice(["Male", "Female"]),
+        'Major / Branch': rng.choice(MAJORS),
+        'Current Semester': str(rng.randint(1, 8)),
+        'College Name': "synthetic college of engineering",
+        'Are you a Student or Alumni?': "Student",
+        # An unparsable GPA makes the row an import error
+        'Current GPA (0–10)': "n/a" if invalid else f"{rng.uniform(5.0, 10.0):.1f}",
+        'GPA Trend Over Last Semesters': rng.choice(["Stable", "Increasing", "Decreasing"]),
+        'Average Attendance Percentage': str(rng.randint(50, 100)),
+        'Do you attend lab sessions regularly?': rng.choice(["Yes", "No"]),
+        'Do you submit assignments on time?': rng.choice(["Always", "Sometimes", "Rarely"]),
+        'Average Internal Marks (0–100)': str(rng.randint(40, 100)),
+        'Number of Backlogs': str(rng.choice([0, 0, 0, 1, 2, 3])),
+        'Programming Languages Select all that apply)': ", ".join(rng.sample(LANGUAGES, rng.randint(1, 5))),
+        'Strongest Technical Skill': rng.choice(LANGUAGES),
+        'Number of Projects Completed': str(rng.randint(0, 8)),
+        'Project Types (Select all that apply)': ", ".join(rng.sample(PROJECT_TYPES, rng.randint(1, 3))),
+        'Have you deployed a project?': rng.choice(["Yes", "No"]),
+        'Internship experience?': rng.choice(["Yes", "No"]),
+        'Internship duration in months': str(rng.randint(0, 6)),
+        'Study hours per day': _hours(rng, 0.5, 8),
+        'Technical Knowledge practice hours per day': _hours(rng, 0, 4),
+        'Do you follow a study schedule?': rng.choice(["Yes", "No"]),
+        'Concept revision frequency': rng.choice(["Daily", "Weekly", "Monthly", "Before exams"]),
+        'Online courses completed (list/count)': str(rng.randint(0, 6)),
+        'Average daily screen time (hours)': _hours(rng, 2, 12),
+        'Daily social media time (hours)': _hours(rng, 0, 6),
+        'Daily learning app/video time (hours)': _hours(rng, 0, 4),
+        'Daily entertainment time (hours)': _hours(rng, 0, 5),
+        'Average sleep hours': _hours(rng, 4, 9),
+        'Sleep schedule': rng.choice(["Regular", "Irregular"]),
+        'Do you use phone while studying?': rng.choice(["Yes", "No"]),
+        'Mental exhaustion often?': rng.choice(["Yes", "No"]),
+        'Have you chosen a career path?': rng.choice(["Yes", "No", "Not sure"]),
+        'Daily placement preparation?': rng.choice(["Yes", "No"]),
+        'Placement status ': "Placed" if placed else "Not Placed",
+        'Role relevance to major (0–100%)': str(rng.randint(40, 100)) if placed else "",
+        'Number of placement attempts': str(rng.randint(0, 10)),
+        'Months taken to get placed': str(rng.randint(1, 12)) if placed else "",
+        'Biggest strength': "quick learner",
+        'Biggest weakness': "time management",
+        'One habit you want to improve': "consistency",
+        'What holds you back the most': "distractions",
+    }
+    for number, subject in enumerate(subjects, start=1):
+        answers[SURVEY_HEADER[16 + 2 * number]] = subject
+        answers[SURVEY_HEADER[17 + 2 * number]] = str(rng.randint(35, 100))
+    for question in ('Problem Solving Ability (1–5)', 'Communication Skill (1–5)', 'Teamwork Ability (1–5)',
+                     'Consistency Level (1–5)', 'Distraction level while studying (1–5)',
+                     'Career clarity level (1–5)', 'Interview fear level (1–5)', 'Confidence level (1–5)'):
+        answers[question] = str(rng.randint(1, 5))
+    return [answers.get(column, '') for column in SURVEY_HEADER]
+
+
+def alumni_row(index: int, rng: random.Random, invalid: bool = False) -> list:
+    """One alumni template row (index makes the name unique)."""
+    placed = rng.random() < 0.7
+    answers = {
+        'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}",
+        'major': rng.choice(MAJORS),
+        'graduation_year': str(rng.randint(2015, 2025)),
+        # An out-of-range GPA makes the row an import error
+        'gpa': "12.5" if invalid else f"{rng.uniform(5.0, 10.0):.2f}",
+        'attendance': str(rng.randint(50, 100)),
+        'placement_status': "Placed" if placed else "Not Placed",
+        'company_tier': rng.choice(["Tier1", "Tier2", "Tier3"]) if placed else "",
+        'role_title': rng.choice(ROLES) if placed else "",
+        'salary_range': rng.choice(["3-5 LPA", "5-8 LPA", "8-12 LPA", "15-20 LPA"]) if placed else "",
+        'role_to_major_match_score': str(rng.randint(40, 100)) if placed else "",
+        'study_hours_per_week': str(rng.randint(5, 40)),
+        'project_count': str(rng.randint(0, 8)),
+    }
+    return [answers[column] for column in ALUMNI_TEMPLATE_COLUMNS]
+
+
+def write_synthetic_csv(file, rows: int, kind: str = "students", seed: int = 42, invalid_rate: float = 0.0):
+    """
+    Write a synthetic CSV row by row (constant memory at any size).
+    
+    Args:
+        file: Text file opened with newline=''
+        rows: Data rows to write
+        kind: "students" (survey export) or "alumni" (alumni template)
+        seed: Random seed (same seed, same file)
+        invalid_rate: Fraction of rows with an invalid value
+    """
+    rng = random.Random(seed)
+    writer = csv.writer(file)
+    if kind == "students":
+        writer.writerow(SURVEY_HEADER)
+        make_row = survey_row
+    else:
+        writer.writerow(ALUMNI_TEMPLATE_COLUMNS)
+        make_row = alumni_row
+    for index in range(rows):
+        writer.writerow(make_row(index, rng, rng.random() < invalid_rate))
+
+
+def run_benchmark(
+    sizes=DEFAULT_SIZES,
+    kind: str = "students",
+    database_url=None,
+    chunk_size: int = 1000,
+    rounds: int = TEMP_PASSWORD_ROUNDS,
+    workers=None,
+    refresh_derived: bool = True,
+    vectorize: bool = True,
+    invalid_rate: float = 0.0,
+    seed: int = 42,
+    log=print
+) -> dict:
+    """
+    Dry-run the import of a synthetic CSV of every size.
+    
+    Returns:
+        dict: Report with environment info and one profile per size
+    """
+    report = {
+        'started_at': datetime.utcnow().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'sqlalchemy': package_version("sqlalchemy"),
+            'database': create_engine(database_url).dialect.name if database_url else "sqlite stand-in",
+            'platform': platform.platform()
+        },
+        'parameters': {
+            'sizes': list(sizes),
+            'kind': kind,
+            'chunk_size': chunk_size,
+            'bcrypt_rounds': rounds,
+            'workers': workers,
+            'refresh_derived': refresh_derived,
+            'vectorize': vectorize,
+            'invalid_rate': invalid_rate,
+            'seed': seed
+        },
+        'results': []
+    }
+    
+    with tempfile.TemporaryDirectory() as directory:
+        bind = create_engine(database_url) if database_url else stand_in_engine(f"sqlite:///{directory}/stand-in.db")
+        for size in sizes:
+            path = Path(directory) / f"{kind}-{size}.csv"
+            start = time.perf_counter()
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                write_synthetic_csv(file, size, kind, seed, invalid_rate)
+            log(f"\n📊 {size:,} {kind} rows ({path.stat().st_size / (1024 * 1024):.1f} MB), "
+                f"generated in {time.perf_counter() - start:.2f}s")
+            
+            with BulkPasswordHasher(max_workers=workers, rounds=rounds) as hasher:
+                engine = CsvImportEngine(
+                    chunk_size=chunk_size,
+                    hash_password=lambda count: hasher.submit(["synthetic-password"] * count),
+                    refresh_derived=refresh_derived
+                )
+                with dry_run_session(bind) as db, open(path, 'r', encoding='utf-8', newline='') as file:
+                    result = profile_import(
+                        db, file, kind, engine,
+                        backfill_service=in_memory_backfill_service() if vectorize else None
+                    )
+                result['hashing'] = hasher.stats()
+            
+            result['size'] = size
+            result['errors'] = len(result['errors'])
+            report['results'].append(result)
+            for line in format_profile(result):
+                log(f"   {line}")
+        bind.dispose()
+    
+    report['finished_at'] = datetime.utcnow().isoformat()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CSV import pipeline on synthetic cohorts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Rows per synthetic CSV (default: 1k 10k 100k)")
+    parser.add_argument("--kind", choices=["students", "alumni"], default="students",
+                        help="Survey export or alumni template shape")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to dry-run against (default: temporary SQLite stand-in)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument("--rounds", type=int, default=TEMP_PASSWORD_ROUNDS,
+                        help="bcrypt cost of the initial passwords")
+    parser.add_argument("--workers", type=int, default=None, help="Password hashing processes")
+    parser.add_argument("--no-refresh", action="store_true", help="Skip the derived data refresh (behavioral statistics, cohort tables)")
+    parser.add_argument("--no-vectors", action="store_true", help="Skip vectorization")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="Fraction of invalid rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--write", default=None, metavar="CSV_PATH",
+                        help="Only write a synthetic CSV of --rows rows to this file")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows written with --write")
+    args = parser.parse_args()
+    
+    if args.write:
+        with open(args.write, 'w', encoding='utf-8', newline='') as f:
+            write_synthetic_csv(f, args.rows, args.kind, args.seed, args.invalid_rate)
+        print(f"✅ Wrote {args.rows:,} synthetic {args.kind} rows to {args.write}")
+        sys.exit(0)
+    
+    print("=" * 60)
+    print("⏱️  CSV Import Benchmark (dry run)")
+    print("=" * 60)
+    
+    report = run_benchmark(
+        sizes=args.sizes,
+        kind=args.kind,
+        database_url=args.database_url,
+        chunk_size=args.chunk_size,
+        rounds=args.rounds,
+        workers=args.workers,
+        refresh_derived=not args.no_refresh,
+        vectorize=not args.no_vectors,
+        invalid_rate=args.invalid_rate,
+        seed=args.seed
+    )
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Wrote results to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,403 @@
+"""
+Benchmark approximate (Qdrant HNSW) vs exact alumni similarity search
+
+This script:
+1. Synthesizes alumni populations (default 1k/10k/100k/1M 15-d vectors in
+   [0, 1], clustered around archetypes like real profiles) and a set of
+   student queries
+2. Computes the exact top K for every query with NumPy brute force, the
+   ranking find_similar_alumni_fallback(use_ensemble=False) returns
+3. Runs the queries against every index configuration (HNSW parameters,
+   exact Qdrant search, the memory-mapped alumni snapshot) and reports
+   recall@k, p50/p99 latency, QPS, build time and memory
+4. Writes the results as JSON so runs can be diffed for regressions
+
+Without --qdrant-url an in-memory Qdrant stand-in is used. It searches by
+brute force in Python, so HNSW parameters only change the numbers against
+a real server, and the default sizes stop at 10k.
+
+Usage:
+    python benchmark_similarity.py --sizes 1000 10000 --output bench.json
+    python benchmark_similarity.py --qdrant-url http://localhost:6333 --filter-major
+    python benchmark_similarity.py --configs hnsw_m16_ef64 snapshot --queries 500
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.services.alumni_snapshot import AlumniSnapshot, write_alumni_snapshot
+from app.services.similarity_service import cosine_similarity_batch
+
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+IN_MEMORY_SIZES = [1000, 10000]
+DIMENSION = 15
+MAJORS = ["Computer Science", "Mechanical Engineering", "Business Administration",
+          "Electrical Engineering", "Civil Engineering"]
+
+# name -> index configuration. Qdrant configs sharing m/ef_construct share
+# one collection; hnsw_ef and exact are query-time parameters.
+INDEX_CONFIGS = {
+    "exact": {"kind": "qdrant", "m": 16, "ef_construct": 100, "exact": True},
+    "hnsw_m16_ef64": {"kind": "qdrant", "m": 16, "ef_construct": 100, "hnsw_ef": 64},
+    "hnsw_m16_ef128": {"kind": "qdrant", "m": 16, "ef_construct": 100, "hnsw_ef": 128},
+    "hnsw_m32_ef256": {"kind": "qdrant", "m": 32, "ef_construct": 200, "hnsw_ef": 256},
+    "snapshot": {"kind": "snapshot"},
+}
+
+UPSERT_BATCH = 1000
+WARMUP_QUERIES = 5
+
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def synthesize_vectors(count: int, rng: np.random.Generator, archetypes: np.ndarray) -> np.ndarray:
+    """Draw float32 vectors in [0, 1] around random archetypes."""
+    centers = archetypes[rng.integers(0, len(archetypes), size=count)]
+    noise = rng.normal(0.0, 0.12, size=(count, DIMENSION))
+    return np.clip(centers + noise, 0.0, 1.0).astype(np.float32)
+
+
+def synthesize_population(size: int, query_count: int, seed: int):
+    """
+    Build an alumni population and student queries.
+    
+    Returns:
+        dict with ids, vectors, majors (codes), queries, query_majors (codes)
+    """
+    rng = np.random.default_rng(seed + size)
+    archetypes = rng.random((32, DIMENSION))
+    return {
+        'ids': np.arange(1, size + 1, dtype=np.int64),
+        'vectors': synthesize_vectors(size, rng, archetypes),
+        'majors': rng.integers(0, len(MAJORS), size=size),
+        'queries': synthesize_vectors(query_count, rng, archetypes),
+        'query_majors': rng.integers(0, len(MAJORS), size=query_count),
+    }
+
+
+# ============================================================================
+# EXACT REFERENCE AND METRICS
+# ============================================================================
+
+def exact_top_k(data: dict, top_k: int, filter_major: bool) -> list:
+    """
+    Exact cosine top K of every query (NumPy brute force).
+    
+    Returns:
+        List of alumni id arrays, best first
+    """
+    vectors = data['vectors']
+    norms = np.linalg.norm(vectors, axis=1)
+    results = []
+    for query, major in zip(data['queries'], data['query_majors']):
+        rows = np.flatnonzero(data['majors'] == major) if filter_major else np.arange(len(vectors))
+        scores = cosine_similarity_batch(query, vectors[rows], norms[rows])
+        k = min(top_k, rows.size)
+        best = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        best = best[np.argsort(-scores[best], kind='stable')]
+        results.append(data['ids'][rows[best]])
+    return results
+
+
+def recall_at_k(approximate: list, exact: list) -> float:
+    """Mean fraction of the exact top K found by the approximate search."""
+    recalls = []
+    for found, expected in zip(approximate, exact):
+        if len(expected) == 0:
+            continue
+        recalls.append(len(set(found) & set(expected.tolist())) / len(expected))
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+def latency_summary(latencies: list) -> dict:
+    """p50/p99/mean latency in milliseconds and sequential QPS."""
+    values = np.asarray(latencies) * 1000.0
+    total = float(np.sum(latencies))
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'mean_ms': round(float(values.mean()), 3),
+        'qps': round(len(latencies) / total, 1) if total > 0 else None
+    }
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def time_queries(search, data: dict, top_k: int, filter_major: bool):
+    """Run every query through `search`, returning (results, latencies)."""
+    queries = data['queries']
+    majors = [MAJORS[code] if filter_major else None for code in data['query_majors']]
+    
+    for query, major in list(zip(queries, majors))[:WARMUP_QUERIES]:
+        search(query, major, top_k)
+    
+    results, latencies = [], []
+    for query, major in zip(queries, majors):
+        start = time.perf_counter()
+        ids = search(query, major, top_k)
+        latencies.append(time.perf_counter() - start)
+        results.append(ids)
+    return results, latencies
+
+
+# ============================================================================
+# INDEX TARGETS
+# ============================================================================
+
+class QdrantTarget:
+    """Benchmark collections in a Qdrant server or in-memory client."""
+    
+    def __init__(self, url=None):
+        self.url = url
+        self.client = QdrantClient(url=url) if url else QdrantClient(":memory:")
+        self.collections = {}
+    
+    def build(self, data: dict, m: int, ef_construct: int) -> dict:
+        """Create and fill a collection for one (m, ef_construct) pair."""
+        key = (m, ef_construct)
+        if key in self.collections:
+            return self.collections[key]['build']
+        
+        name = f"bench_alumni_{len(data['ids'])}_m{m}_ef{ef_construct}"
+        if self.client.collection_exists(name):
+            self.client.delete_collection(name)
+        
+        start = time.perf_counter()
+        self.client.create_collection(
+            collection_name=name,
+            vectors_config=models.VectorParams(size=DIMENSION, distance=models.Distance.COSINE),
+            hnsw_config=models.HnswConfigDiff(m=m, ef_construct=ef_construct)
+        )
+        self.client.create_payload_index(name, "major", models.PayloadSchemaType.KEYWORD)
+        
+        for offset in range(0, len(data['ids']), UPSERT_BATCH):
+            rows = slice(offset, offset + UPSERT_BATCH)
+            self.client.upsert(
+                collection_name=name,
+                points=models.Batch(
+                    ids=data['ids'][rows].tolist(),
+                    vectors=data['vectors'][rows].tolist(),
+                    payloads=[{'major': MAJORS[code]} for code in data['majors'][rows]]
+                ),
+                wait=True
+            )
+        self._wait_for_index(name)
+        
+        build = {
+            'collection': name,
+            'build_seconds': round(time.perf_counter() - start, 3),
+            'process_peak_rss_mb': peak_rss_mb()
+        }
+        self.collections[key] = {'name': name, 'build': build}
+        return build
+    
+    def _wait_for_index(self, name: str, timeout: float = 3600.0):
+        """Wait until the server has finished optimizing (building HNSW)."""
+        if not self.url:
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.client.get_collection(name).status == models.CollectionStatus.GREEN:
+                return
+            time.sleep(1.0)
+    
+    def searcher(self, config: dict):
+        """Build search(query, major, top_k) -> ids for a query configuration."""
+        name = self.collections[(config['m'], config['ef_construct'])]['name']
+        params = models.SearchParams(exact=config.get('exact', False), hnsw_ef=config.get('hnsw_ef'))
+        
+        def search(query, major, top_k):
+            query_filter = None
+            if major:
+                query_filter = models.Filter(must=[
+                    models.FieldCondition(key="major", match=models.MatchValue(value=major))
+                ])
+            points = self.client.query_points(
+                collection_name=name,
+                query=query.tolist(),
+                query_filter=query_filter,
+                search_params=params,
+                limit=top_k
+            ).points
+            return [int(point.id) for point in points]
+        
+        return search
+    
+    def cleanup(self):
+        for entry in self.collections.values():
+            self.client.delete_collection(entry['name'])
+        self.collections = {}
+
+
+class SnapshotTarget:
+    """Memory-mapped alumni snapshot searched in process with NumPy."""
+    
+    def __init__(self, data: dict, directory: str):
+        self.path = os.path.join(directory, f"bench_alumni_{len(data['ids'])}.snapshot")
+        start = time.perf_counter()
+        write_alumni_snapshot(self.path, [
+            (int(alumni_id), vector, {'major': MAJORS[code]})
+            for alumni_id, vector, code in zip(data['ids'], data['vectors'], data['majors'])
+        ], vector_version=1)
+        self.snapshot = AlumniSnapshot(self.path)
+        self.build = {
+            'build_seconds': round(time.perf_counter() - start, 3),
+            'file_mb': round(os.path.getsize(self.path) / (1024 * 1024), 2),
+            'process_peak_rss_mb': peak_rss_mb()
+        }
+    
+    def search(self, query, major, top_k):
+        results = self.snapshot.search(query, major=major, top_k=top_k, use_ensemble=False)
+        return [result['alumni_id'] for result in results]
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run_benchmark(
+    sizes=DEFAULT_SIZES,
+    query_count: int = 200,
+    top_k: int = 5,
+    config_names=tuple(INDEX_CONFIGS),
+    qdrant_url=None,
+    filter_major: bool = False,
+    seed: int = 42,
+    log=print
+) -> dict:
+    """
+    Run every index configuration at every population size.
+    
+    Returns:
+        dict: Report with environment info and one result per
+              (size, configuration): recall_at_k, latency, build and memory
+    """
+    report = {
+        'started_at': datetime.utcnow().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'qdrant_client': package_version("qdrant-client"),
+            'qdrant': qdrant_url or "in-memory",
+            'platform': platform.platform()
+        },
+        'parameters': {
+            'sizes': list(sizes),
+            'queries': query_count,
+            'top_k': top_k,
+            'dimension': DIMENSION,
+            'filter_major': filter_major,
+            'seed': seed
+        },
+        'results': []
+    }
+    
+    qdrant = None
+    if any(INDEX_CONFIGS[name]['kind'] == "qdrant" for name in config_names):
+        qdrant = QdrantTarget(qdrant_url)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            data = synthesize_population(size, query_count, seed)
+            start = time.perf_counter()
+            exact = exact_top_k(data, top_k, filter_major)
+            log(f"\n📊 {size:,} alumni ({data['vectors'].nbytes / (1024 * 1024):.1f} MB of vectors), "
+                f"exact reference in {time.perf_counter() - start:.2f}s")
+            
+            for name in config_names:
+                config = INDEX_CONFIGS[name]
+                if config['kind'] == "snapshot":
+                    target = SnapshotTarget(data, directory)
+                    build, search = target.build, target.search
+                else:
+                    build = qdrant.build(data, config['m'], config['ef_construct'])
+                    search = qdrant.searcher(config)
+                
+                found, latencies = time_queries(search, data, top_k, filter_major)
+                result = {
+                    'size': size,
+                    'config': name,
+                    'index': {key: value for key, value in config.items() if key != 'kind'},
+                    'recall_at_k': round(recall_at_k(found, exact), 4),
+                    'latency': latency_summary(latencies),
+                    'build': build,
+                    'vector_mb': round(data['vectors'].nbytes / (1024 * 1024), 2)
+                }
+                report['results'].append(result)
+                log(f"   {name:<16} recall@{top_k}={result['recall_at_k']:.4f}  "
+                    f"p50={result['latency']['p50_ms']:.2f}ms  p99={result['latency']['p99_ms']:.2f}ms  "
+                    f"qps={result['latency']['qps']}")
+            
+            if qdrant is not None:
+                qdrant.cleanup()
+    
+    report['finished_at'] = datetime.utcnow().isoformat()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark approximate vs exact alumni similarity search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None,
+                        help="Alumni population sizes (default: 1k 10k 100k 1M, "
+                             "1k 10k in memory)")
+    parser.add_argument("--queries", type=int, default=200, help="Student queries per size")
+    parser.add_argument("--top-k", type=int, default=5, help="K for recall@k (default: 5)")
+    parser.add_argument("--configs", nargs="+", choices=list(INDEX_CONFIGS),
+                        default=list(INDEX_CONFIGS), help="Index configurations to run")
+    parser.add_argument("--qdrant-url", default=None,
+                        help="Qdrant server URL (default: in-memory stand-in)")
+    parser.add_argument("--filter-major", action="store_true",
+                        help="Filter every query by a major, like predictions do")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("⏱️  Alumni Similarity Benchmark")
+    print("=" * 60)
+    
+    report = run_benchmark(
+        sizes=args.sizes or (DEFAULT_SIZES if args.qdrant_url else IN_MEMORY_SIZES),
+        query_count=args.queries,
+        top_k=args.top_k,
+        config_names=args.configs,
+        qdrant_url=args.qdrant_url,
+        filter_major=args.filter_major,
+        seed=args.seed
+    )
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Wrote results to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
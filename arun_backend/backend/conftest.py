@@ -0,0 +1,47 @@
+"""
+Shared pytest fixtures.
+
+Service tests run against an in-memory SQLite database holding every
+application table SQLite can represent (all but those with ARRAY columns).
+The database is a single connection (StaticPool), so every session of a
+test, including those opened by worker threads, sees the same data.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with the application tables."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[
+        table for table in Base.metadata.sorted_tables
+        if not any(isinstance(column.type, ARRAY) for column in table.columns)
+    ])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory of the test database."""
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    """Session of the test database."""
+    session = session_factory()
+    yield session
+    session.close()
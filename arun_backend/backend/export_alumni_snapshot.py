@@ -0,0 +1,102 @@
+"""
+Export the alumni vector space to a memory-mapped snapshot file
+
+This script:
+1. Reads every alumni vector + payload from Qdrant (active version)
+2. Falls back to regenerating vectors from PostgreSQL if Qdrant is down
+3. Writes ids, float32 vectors and compact metadata columns to one file
+
+API workers map the file at startup when ALUMNI_SNAPSHOT_PATH points to it.
+
+Usage:
+    python export_alumni_snapshot.py alumni_snapshot.bin
+    python export_alumni_snapshot.py alumni_snapshot.bin --version 2 --source postgres
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import SessionLocal
+from app.models import Alumni
+from app.services.alumni_snapshot import write_alumni_snapshot, AlumniSnapshot
+from app.services.alumni_vector_service import AlumniVectorService
+from app.services.qdrant_service import QdrantService
+
+
+def collect_from_postgres(qdrant: QdrantService, version: int):
+    """Regenerate every alumni vector from PostgreSQL."""
+    alumni_service = AlumniVectorService(qdrant_service=qdrant)
+    db = SessionLocal()
+    records = []
+    
+    try:
+        for alumni in db.query(Alumni).order_by(Alumni.id).yield_per(1000):
+            vector = alumni_service.generate_vector_for_alumni(alumni, db, version)
+            if vector is None:
+                continue
+            outcome_score = alumni_service.calculate_outcome_score(
+                alumni.placement_status,
+                alumni.company_tier
+            )
+            records.append((alumni.id, vector, alumni_service.build_metadata(alumni, outcome_score)))
+    finally:
+        db.close()
+    
+    return records
+
+
+def export_snapshot(path: str, version=None, source: str = "auto"):
+    """Export the alumni snapshot and print a summary."""
+    qdrant = QdrantService(host="localhost", port=6333)
+    if version is None:
+        version = qdrant.get_active_version("alumni")
+    
+    print("=" * 60)
+    print(f"📦 Alumni Snapshot Export (vector v{version})")
+    print("=" * 60)
+    
+    start = time.perf_counter()
+    records = []
+    
+    if source in ("auto", "qdrant"):
+        records = qdrant.get_all_alumni_vectors(version=version)
+        print(f"\n📊 Read {len(records)} alumni vectors from Qdrant")
+    
+    if not records and source in ("auto", "postgres"):
+        records = collect_from_postgres(qdrant, version)
+        print(f"\n📊 Generated {len(records)} alumni vectors from PostgreSQL")
+    
+    if not records:
+        print("⚠️  No alumni vectors found, nothing exported")
+        return None
+    
+    summary = write_alumni_snapshot(path, records, version)
+    
+    # Re-open the file to validate it before workers pick it up
+    snapshot = AlumniSnapshot(path)
+    
+    print(f"\n✅ Wrote {summary['count']} vectors x {summary['dim']} dims "
+          f"({summary['bytes'] / 1024:.1f} KB) to {path}")
+    print(f"   Majors: {len(snapshot.majors)}, tiers: {len(snapshot.company_tiers)}")
+    print(f"   Took {time.perf_counter() - start:.2f}s")
+    print(f"\nStart the API with ALUMNI_SNAPSHOT_PATH={path} to use it.")
+    
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export alumni vectors to a snapshot file")
+    parser.add_argument("path", help="Output file path")
+    parser.add_argument("--version", type=int, default=None,
+                        help="Vector schema version (default: active alumni version)")
+    parser.add_argument("--source", choices=["auto", "qdrant", "postgres"], default="auto",
+                        help="Where to read vectors from (default: Qdrant, then PostgreSQL)")
+    args = parser.parse_args()
+    
+    if export_snapshot(args.path, args.version, args.source) is None:
+        sys.exit(1)
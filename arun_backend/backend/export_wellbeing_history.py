@@ -0,0 +1,60 @@
+"""
+Export wellbeing history to the columnar store
+
+This script:
+1. Reads digital_wellbeing_data month by month as columns
+2. Writes one partition of memory-mapped .npy files per month into
+   WELLBEING_HISTORY_DIR (or --dir), replacing it atomically
+3. Clears the month's dirty marker, so readers use the files again
+
+Run it periodically (e.g. nightly) for the months marked dirty, or for
+everything after a bulk import.
+
+Usage:
+    python export_wellbeing_history.py
+    python export_wellbeing_history.py --dirty
+    python export_wellbeing_history.py --months 2026-02 2026-03 --dir /var/lib/trajectory/history
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import SessionLocal
+from app.services.wellbeing_history import ColumnarHistoryStore, WellbeingHistory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export wellbeing history to the columnar store")
+    parser.add_argument("--dir", default=os.getenv("WELLBEING_HISTORY_DIR"),
+                        help="Store directory (default: WELLBEING_HISTORY_DIR)")
+    parser.add_argument("--months", nargs="+", default=None, help="Months to export (YYYY-MM)")
+    parser.add_argument("--dirty", action="store_true", help="Only export months marked dirty")
+    args = parser.parse_args()
+    
+    if not args.dir:
+        parser.error("--dir or WELLBEING_HISTORY_DIR is required")
+    
+    store = ColumnarHistoryStore(args.dir)
+    history = WellbeingHistory(store)
+    
+    months = None
+    if args.months:
+        months = [datetime.strptime(month, "%Y-%m").date() for month in args.months]
+    elif args.dirty:
+        months = store.dirty_months()
+    
+    db = SessionLocal()
+    try:
+        written = history.export(db, months)
+    finally:
+        db.close()
+    
+    for month, rows in written.items():
+        print(f"✅ {month}: {rows} rows")
+    print(f"📦 Exported {len(written)} months to {args.dir}")
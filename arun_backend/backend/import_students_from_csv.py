@@ -6,284 +6,116 @@ This script:
 2. Creates user accounts for each student
 3. Creates student profiles with all data
 4. Generates vectors and stores them in Qdrant
+
+Rows are loaded in chunks by the CSV import engine (one transaction per
+chunk); rows that cannot be imported are listed at the end. Re-running the
+script is safe: students are matched by email (or USN), unchanged rows are
+skipped and only new and changed students are re-vectorized.
+
+Passwords of new users are hashed in a process pool while earlier chunks
+are written; --rounds sets their bcrypt cost.
+
+--dry-run runs the whole pipeline in a transaction that is rolled back
+(vectors go to an in-memory Qdrant stand-in); --profile prints the time
+spent per stage, rows/s and peak memory (see app/services/import_profiler).
+
+Usage:
+    python import_students_from_csv.py [csv_path] [--chunk-size 1000]
+        [--rounds 10] [--workers N] [--dry-run] [--profile]
 """
 
-import csv
+import argparse
 import sys
+from contextlib import closing
 from pathlib import Path
-from datetime import datetime, date
-from decimal import Decimal
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy.orm import Session
-from app.db import SessionLocal, engine
-from app.models import User, Student, DigitalWellbeingData, Skill, SleepQualityEnum
-from app.services.vector_generation import generate_student_vector
-from app.services.qdrant_service import QdrantService
-from passlib.context import CryptContext
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def parse_yes_no(value: str) -> bool:
-    """Convert Yes/No to boolean"""
-    if not value:
-        return False
-    return value.strip().lower() in ['yes', 'y', 'true']
-
-
-def parse_float(value: str, default: float = 0.0) -> float:
-    """Safely parse float value"""
-    if not value or value.strip() == '':
-        return default
-    try:
-        return float(value.strip())
-    except ValueError:
-        return default
-
-
-def parse_int(value: str, default: int = 0) -> int:
-    """Safely parse int value"""
-    if not value or value.strip() == '':
-        return default
-    try:
-        return int(value.strip())
-    except ValueError:
-        return default
-
-
-def calculate_focus_score(social_media: float, learning: float, entertainment: float) -> float:
-    """Calculate focus score from app usage"""
-    productive = learning
-    distracting = social_media + entertainment
+from app.db import SessionLocal, engine as db_engine
+from app.services.csv_import_engine import CsvImportEngine
+from app.services.import_profiler import (
+    dry_run_session, format_profile, in_memory_backfill_service, profile_import
+)
+from app.services.password_hasher import DEFAULT_IMPORT_PASSWORD, TEMP_PASSWORD_ROUNDS, BulkPasswordHasher
+from app.services.vector_backfill_service import get_vector_backfill_service
+
+
+def import_students_from_csv(
+    csv_path: str,
+    chunk_size: int = 1000,
+    rounds: int = TEMP_PASSWORD_ROUNDS,
+    workers: int = None,
+    dry_run: bool = False,
+    profile: bool = False
+):
+    """Import students from CSV file (dry_run: roll everything back)"""
+    if profile:
+        # Logging every statement would dominate the profile
+        db_engine.echo = False
+    session = dry_run_session(db_engine) if dry_run else closing(SessionLocal())
+    backfill = in_memory_backfill_service() if dry_run else get_vector_backfill_service()
+    hasher = BulkPasswordHasher(max_workers=workers, rounds=rounds)
+    # Default password of new users, hashed in the pool (one salt each)
+    engine = CsvImportEngine(
+        chunk_size=chunk_size,
+        hash_password=lambda count: hasher.submit([DEFAULT_IMPORT_PASSWORD] * count)
+    )
     
-    if distracting == 0:
-        return 1.0 if productive > 0 else 0.5
-    
-    focus = productive / distracting
-    return min(focus / 2.0, 1.0)
-
-
-def import_students_from_csv(csv_path: str):
-    """Import students from CSV file"""
-    db = SessionLocal()
-    qdrant = QdrantService(host="localhost", port=6333)
+    def report(summary):
+        hashing = hasher.stats()
+        print(f"   … {summary['imported']} imported, {summary['updated']} updated, "
+              f"{summary['skipped']} unchanged, {summary['failed']} failed ("
+              f"{summary['rows_per_second']:.0f} rows/s, "
+              f"{hashing['hashes_per_second']:.0f} hashes/s)")
     
     try:
-        print(f"📂 Reading CSV file: {csv_path}")
+        with session as db, open(csv_path, 'r', encoding='utf-8-sig', newline='') as file:
+            print(f"📂 Reading CSV file: {csv_path}")
+            # Vectors of the new and changed students are generated in batches
+            result = profile_import(
+                db, file, engine=engine,
+                backfill_service=backfill if backfill.qdrant.is_available else None,
+                progress=report
+            )
+            result['hashing'] = hasher.stats()
         
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            students_imported = 0
-            
-            for row in reader:
-                try:
-                    email = row['Email Address'].strip().lower()
-                    full_name = row['Full Name'].strip()
-                    
-                    print(f"\n👤 Processing: {full_name} ({email})")
-                    
-                    # Check if user already exists
-                    existing_user = db.query(User).filter(User.email == email).first()
-                    if existing_user:
-                        print(f"   ⚠️  User already exists, skipping...")
-                        continue
-                    
-                    # Create user account
-                    user = User(
-                        email=email,
-                        password_hash=hash_password("password123"),  # Default password
-                        role="student",
-                        created_at=datetime.utcnow()
-                    )
-                    db.add(user)
-                    db.flush()
-                    print(f"   ✅ Created user account (ID: {user.id})")
-                    
-                    # Parse student data
-                    major = row['Major / Branch'].strip()
-                    semester = parse_int(row['Current Semester'], 7)
-                    gpa = parse_float(row['Current GPA (0–10)'], 7.0)
-                    attendance = parse_float(row['Average Attendance Percentage'].replace('%', ''), 75.0)
-                    internal_marks = parse_float(row['Average Internal Marks (0–100)'], 75.0)
-                    backlogs = parse_int(row['Number of Backlogs'], 0)
-                    
-                    # Study habits
-                    study_hours_per_day = parse_float(row['Study hours per day'], 3.0)
-                    study_hours_per_week = study_hours_per_day * 7
-                    practice_hours = parse_float(row['Technical Knowledge practice hours per day'], 1.0)
-                    
-                    # Skills and projects
-                    project_count = parse_int(row['Number of Projects Completed'], 0)
-                    problem_solving = parse_int(row['Problem Solving Ability (1–5)'], 3)
-                    communication = parse_int(row['Communication Skill (1–5)'], 3)
-                    teamwork = parse_int(row['Teamwork Ability (1–5)'], 3)
-                    consistency = parse_int(row['Consistency Level (1–5)'], 3)
-                    career_clarity = parse_int(row['Career clarity level (1–5)'], 3)
-                    
-                    # Boolean fields
-                    deployed = parse_yes_no(row['Have you deployed a project?'])
-                    internship = parse_yes_no(row['Internship experience?'])
-                    
-                    # Programming languages
-                    languages = row['Programming Languages Select all that apply)'].strip()
-                    
-                    # Create student profile
-                    student = Student(
-                        user_id=user.id,
-                        name=full_name,
-                        major=major,
-                        semester=semester,
-                        gpa=Decimal(str(gpa)),
-                        attendance=Decimal(str(attendance)),
-                        study_hours_per_week=Decimal(str(study_hours_per_week)),
-                        project_count=project_count,
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    db.add(student)
-                    db.flush()
-                    print(f"   ✅ Created student profile (ID: {student.id})")
-                    
-                    # Add digital wellbeing data
-                    screen_time = parse_float(row['Average daily screen time (hours)'], 6.0)
-                    social_media = parse_float(row['Daily social media time (hours)'], 2.0)
-                    learning_time = parse_float(row['Daily learning app/video time (hours)'], 2.0)
-                    entertainment = parse_float(row['Daily entertainment time (hours)'], 2.0)
-                    sleep_hours = parse_float(row['Average sleep hours'], 7.0)
-                    distraction_level = parse_int(row['Distraction level while studying (1–5)'], 3)
-                    
-                    focus_score = calculate_focus_score(social_media, learning_time, entertainment)
-                    
-                    # Add behavioral data for last 7 days
-                    for days_ago in range(7):
-                        behavioral_date = date.today() - __import__('datetime').timedelta(days=days_ago)
-                        
-                        # Determine sleep quality based on hours
-                        if sleep_hours >= 7:
-                            sleep_quality = SleepQualityEnum.GOOD
-                        elif sleep_hours >= 5:
-                            sleep_quality = SleepQualityEnum.FAIR
-                        else:
-                            sleep_quality = SleepQualityEnum.POOR
-                        
-                        wellbeing = DigitalWellbeingData(
-                            student_id=student.id,
-                            date=behavioral_date,
-                            screen_time_hours=Decimal(str(screen_time)),
-                            educational_app_hours=Decimal(str(learning_time)),
-                            social_media_hours=Decimal(str(social_media)),
-                            entertainment_hours=Decimal(str(entertainment)),
-                            productivity_hours=Decimal(str(practice_hours)),
-                            communication_hours=Decimal("0.5"),
-                            focus_score=Decimal(str(focus_score)),
-                            sleep_duration_hours=Decimal(str(sleep_hours)),
-                            sleep_quality=sleep_quality,
-                            synced_at=datetime.utcnow()
-                        )
-                        db.add(wellbeing)
-                    
-                    print(f"   ✅ Added 7 days of behavioral data")
-                    
-                    # Add skills
-                    skills_list = languages.split(',')
-                    for skill_name in skills_list[:5]:  # Limit to 5 skills
-                        skill_name = skill_name.strip()
-                        if skill_name:
-                            skill = Skill(
-                                student_id=student.id,
-                                skill_name=skill_name,
-                                proficiency_score=Decimal(str(problem_solving * 20)),  # Convert 1-5 to 0-100
-                                quiz_score=None,
-                                voice_score=None,
-                                market_weight=Decimal("1.0"),
-                                last_assessed_at=datetime.utcnow(),
-                                created_at=datetime.utcnow(),
-                                updated_at=datetime.utcnow()
-                            )
-                            db.add(skill)
-                    
-                    print(f"   ✅ Added {len(skills_list[:5])} skills")
-                    
-                    # Commit to database
-                    db.commit()
-                    db.refresh(student)
-                    
-                    # Generate vector and store in Qdrant
-                    print(f"   🔄 Generating vector...")
-                    student_profile = {
-                        'gpa': float(gpa),
-                        'attendance': float(attendance),
-                        'internal_marks': float(internal_marks),
-                        'backlogs': backlogs,
-                        'study_hours_per_week': float(study_hours_per_week),
-                        'practice_hours': float(practice_hours),
-                        'project_count': project_count,
-                        'consistency': consistency,
-                        'problem_solving': problem_solving,
-                        'languages': languages,
-                        'communication': communication,
-                        'teamwork': teamwork,
-                        'deployed': deployed,
-                        'internship': internship,
-                        'career_clarity': career_clarity,
-                        'major': major
-                    }
-                    
-                    wellbeing_data = [{
-                        'screen_time_hours': screen_time,
-                        'social_media_hours': social_media,
-                        'distraction_level': distraction_level,
-                        'sleep_duration_hours': sleep_hours
-                    }]
-                    
-                    vector = generate_student_vector(student_profile, wellbeing_data)
-                    
-                    # Store in Qdrant
-                    success = qdrant.store_student_vector(
-                        student_id=student.id,
-                        vector=vector,
-                        metadata={
-                            'student_id': student.id,
-                            'major': major,
-                            'gpa': float(gpa),
-                            'name': full_name
-                        }
-                    )
-                    
-                    if success:
-                        print(f"   ✅ Vector stored in Qdrant")
-                        students_imported += 1
-                    else:
-                        print(f"   ⚠️  Failed to store vector in Qdrant")
-                    
-                    print(f"   ✨ Successfully imported {full_name}!")
-                    
-                except Exception as e:
-                    print(f"   ❌ Error importing student: {str(e)}")
-                    db.rollback()
-                    continue
+        for error in result['errors']:
+            print(f"   ❌ Row {error['row']} ({error['email'] or 'no email'}): {error['error']}")
         
         print(f"\n{'='*60}")
-        print(f"✅ Import complete!")
-        print(f"📊 Total students imported: {students_imported}")
+        print(f"✅ Dry run complete (rolled back)" if dry_run else f"✅ Import complete!")
+        print(f"📊 Students imported: {result['imported']}, updated: {result['updated']}, "
+              f"unchanged: {result['skipped']}")
+        if result['vectors'] is not None:
+            print(f"🔍 Vectors stored in Qdrant{' (in-memory)' if dry_run else ''}: {result['vectors']['stored']}")
+        elif result['imported'] or result['updated']:
+            print(f"⚠️  Qdrant unavailable; run the vector backfill to index the students")
+        if profile:
+            print(f"⏱️  Profile:")
+            for line in format_profile(result):
+                print(f"   {line}")
         print(f"{'='*60}")
-        
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
-        db.rollback()
     finally:
-        db.close()
+        hasher.shutdown()
 
 
 if __name__ == "__main__":
-    csv_path = Path(__file__).parent.parent / "froms.csv"
+    parser = argparse.ArgumentParser(description="Import students from a survey CSV")
+    parser.add_argument("csv_path", nargs="?", default=str(Path(__file__).parent.parent / "froms.csv"))
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument("--rounds", type=int, default=TEMP_PASSWORD_ROUNDS,
+                        help="bcrypt cost of the initial passwords")
+    parser.add_argument("--workers", type=int, default=None, help="Password hashing processes")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Run the whole import and roll it back (vectors go to an in-memory Qdrant)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-stage timing, rows/s and peak memory")
+    args = parser.parse_args()
+    csv_path = Path(args.csv_path)
     
     if not csv_path.exists():
         print(f"❌ CSV file not found: {csv_path}")
@@ -293,8 +125,11 @@ if __name__ == "__main__":
     print("🚀 Student Data Import Script")
     print("="*60)
     print(f"📁 CSV File: {csv_path}")
-    print(f"🗄️  Database: PostgreSQL")
-    print(f"🔍 Vector DB: Qdrant")
+    print(f"🗄️  Database: PostgreSQL{' (dry run, rolled back)' if args.dry_run else ''}")
+    print(f"🔍 Vector DB: {'in-memory stand-in' if args.dry_run else 'Qdrant'}")
     print("="*60)
     
-    import_students_from_csv(str(csv_path))
+    import_students_from_csv(
+        str(csv_path), chunk_size=args.chunk_size, rounds=args.rounds, workers=args.workers,
+        dry_run=args.dry_run, profile=args.profile
+    )
@@ -0,0 +1,42 @@
+"""
+Rebuild cohort benchmarks
+
+This script recomputes the per-major, per-semester percentile tables
+(cohort_members, cohort_benchmarks) from the current student profiles and
+wellbeing features. Run it after bulk imports or rebuild_wellbeing_features.py,
+or to correct drift from failed incremental updates.
+
+With --stale-only it only recomputes the cohorts whose members changed since
+they were last read (cheap enough to schedule, e.g. every few minutes).
+
+Usage:
+    python rebuild_cohort_benchmarks.py [--stale-only]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import SessionLocal
+from app.services.cohort_benchmark_service import get_cohort_benchmark_service
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild cohort percentile tables")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Students per batch")
+    parser.add_argument("--stale-only", action="store_true", help="Only recompute cohorts whose members changed")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        if args.stale_only:
+            cohorts = get_cohort_benchmark_service().refresh_stale_cohorts(db)
+            print(f"✅ Recomputed {cohorts} stale cohorts")
+            sys.exit(0)
+        summary = get_cohort_benchmark_service().rebuild(db, batch_size=args.batch_size)
+        print(f"✅ Rebuilt benchmarks of {summary['cohorts']} cohorts from {summary['students']} students")
+    finally:
+        db.close()
@@ -0,0 +1,37 @@
+"""
+Rebuild decayed wellbeing features
+
+This script recomputes the feature store (wellbeing_features) of every
+student, or the given students, from the full wellbeing history and the
+current profile study hours. Run it after bulk imports or to repair
+features whose incremental update failed.
+
+Usage:
+    python rebuild_wellbeing_features.py
+    python rebuild_wellbeing_features.py --students 12 31
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import SessionLocal
+from app.services.feature_store import get_feature_store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild decayed wellbeing features")
+    parser.add_argument("--students", type=int, nargs="+", default=None,
+                        help="Student ids (default: every student)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Students per batch")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        summary = get_feature_store().rebuild(db, student_ids=args.students, batch_size=args.batch_size)
+        print(f"✅ Rebuilt {summary['rows']} features for {summary['students']} students")
+    finally:
+        db.close()
@@ -0,0 +1,83 @@
+"""
+Reconcile PostgreSQL rows with Qdrant vectors
+
+This script:
+1. Diffs every student/alumni row against the Qdrant points of each
+   collection version being written (missing, stale and orphaned points)
+2. Re-embeds missing/stale rows and deletes orphaned points in batches
+3. Prints a report (or only the report with --dry-run)
+
+Usage:
+    python reconcile_vectors.py --dry-run
+    python reconcile_vectors.py --rate 200
+    python reconcile_vectors.py --loop --interval 600 --rate 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.vector_reconciler import VectorReconciler
+from app.services.vector_schema import VECTOR_COLLECTIONS
+
+
+def print_report(report):
+    """Print a human-readable reconcile report."""
+    mode = "DRY RUN" if report['dry_run'] else "REPAIR"
+    print("=" * 60)
+    print(f"🔄 Vector Reconcile ({mode}) - {report['started_at']}")
+    print("=" * 60)
+    
+    if report.get('error'):
+        print(f"❌ {report['error']}")
+        return
+    
+    for key, stats in report['collections'].items():
+        print(f"\n📊 {key}")
+        if stats.get('error'):
+            print(f"   ❌ {stats['error']}")
+            continue
+        print(f"   PostgreSQL rows: {stats['postgres_rows']}, Qdrant points: {stats['qdrant_points']}")
+        print(f"   Missing: {stats['missing']}, stale: {stats['stale']}, orphaned: {stats['orphaned']}")
+        if not report['dry_run']:
+            print(f"   Repaired: {stats['repaired']}, deleted: {stats['deleted']}, failed: {stats['failed']}")
+        for kind, ids in stats['samples'].items():
+            if ids:
+                print(f"   {kind} ids (sample): {ids}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile PostgreSQL rows with Qdrant vectors")
+    parser.add_argument("--dry-run", action="store_true", help="Only report differences")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Maximum points written per second (default: unlimited)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Points per upsert/delete request")
+    parser.add_argument("--collections", nargs="+", choices=VECTOR_COLLECTIONS,
+                        default=list(VECTOR_COLLECTIONS), help="Collections to reconcile")
+    parser.add_argument("--loop", action="store_true", help="Run continuously")
+    parser.add_argument("--interval", type=float, default=600.0,
+                        help="Seconds between runs with --loop (default: 600)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    reconciler = VectorReconciler(
+        max_points_per_second=args.rate,
+        batch_size=args.batch_size
+    )
+    
+    while True:
+        report = reconciler.reconcile(dry_run=args.dry_run, collections=args.collections)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        
+        if not args.loop:
+            break
+        time.sleep(args.interval)
@@ -0,0 +1,52 @@
+"""
+Population-wide at-risk sweep
+
+This script:
+1. Computes every student's 7-day behavioral averages and trajectory trend
+2. Flags at-risk students and replaces the stored flags (at_risk_flags)
+3. Prints a summary
+
+Advisors read the result from GET /api/behavioral/at-risk/all.
+
+Usage:
+    python run_at_risk_sweep.py
+    python run_at_risk_sweep.py --loop --interval 86400
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import SessionLocal
+from app.services.behavioral_analysis_service import get_behavioral_analysis_service
+
+
+def run_sweep():
+    """Run one sweep and print its summary."""
+    db = SessionLocal()
+    try:
+        summary = get_behavioral_analysis_service().sweep_at_risk_students(db)
+    finally:
+        db.close()
+    
+    print(f"🔍 At-risk sweep - {summary['swept_at']}")
+    print(f"   Students evaluated: {summary['students_evaluated']}")
+    print(f"   Students flagged: {summary['students_flagged']} ({summary['flags']} flags)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flag at-risk students")
+    parser.add_argument("--loop", action="store_true", help="Run continuously")
+    parser.add_argument("--interval", type=float, default=86400.0,
+                        help="Seconds between runs with --loop (default: 86400)")
+    args = parser.parse_args()
+    
+    while True:
+        run_sweep()
+        if not args.loop:
+            break
+        time.sleep(args.interval)
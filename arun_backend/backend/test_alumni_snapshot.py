@@ -0,0 +1,156 @@
+"""
+Tests for the memory-mapped alumni snapshot.
+
+The snapshot search must return the same alumni, in the same order and with
+the same scores, as find_similar_alumni_fallback over the same records.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.services import alumni_snapshot
+from app.services.alumni_snapshot import AlumniSnapshot, write_alumni_snapshot, load_alumni_snapshot
+from app.services.similarity_service import (
+    find_similar_alumni_fallback,
+    cosine_similarity,
+    ensemble_similarity,
+    cosine_similarity_batch,
+    ensemble_similarity_batch
+)
+
+
+def _records(count=300, dim=15, seed=7):
+    """Random alumni records in the fallback (id, vector, metadata) format."""
+    rng = np.random.default_rng(seed)
+    majors = ["Computer Science", "Mechanical", "Electronics"]
+    tiers = ["Tier1", "Tier2", "Tier3", ""]
+    records = []
+    for i in range(count):
+        records.append((
+            1000 + i,
+            rng.random(dim).astype(np.float32),
+            {
+                'major': majors[i % 3],
+                'company_tier': tiers[i % 4],
+                'placement_status': 'Not Placed' if tiers[i % 4] == '' else 'Placed',
+                'graduation_year': 2018 + i % 6,
+                'outcome_score': float(20 + i % 80)
+            }
+        ))
+    # Duplicate vector (tie) and zero vector edge cases
+    records.append((5000, records[0][1].copy(), dict(records[0][2])))
+    records.append((5001, np.zeros(dim, dtype=np.float32), dict(records[1][2])))
+    return records
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "alumni.snapshot")
+    write_alumni_snapshot(path, _records(), vector_version=1)
+    return path
+
+
+def test_batch_similarity_matches_scalar():
+    """Vectorized similarities equal the per-pair functions."""
+    rng = np.random.default_rng(1)
+    query = rng.random(15)
+    matrix = rng.random((50, 15))
+    matrix[3] = 0.0
+    
+    expected_cos = [cosine_similarity(query, row) for row in matrix]
+    expected_ens = [ensemble_similarity(query, row) for row in matrix]
+    
+    assert np.allclose(cosine_similarity_batch(query, matrix), expected_cos)
+    assert np.allclose(ensemble_similarity_batch(query, matrix), expected_ens)
+
+
+def test_round_trip_header_and_columns(snapshot_path):
+    """Written columns are read back unchanged through the memmap."""
+    records = _records()
+    snapshot = AlumniSnapshot(snapshot_path)
+    
+    assert len(snapshot) == len(records)
+    assert snapshot.dim == 15
+    assert snapshot.vector_version == 1
+    assert isinstance(snapshot.vectors.base, np.memmap) or isinstance(snapshot.vectors, np.memmap)
+    assert snapshot.vectors.ctypes.data % 64 == 0
+    
+    for (alumni_id, vector, metadata), (read_id, read_vector, read_meta) in zip(records, snapshot.iter_records()):
+        assert alumni_id == read_id
+        assert np.array_equal(vector, read_vector)
+        assert read_meta['major'] == metadata['major']
+        assert read_meta['company_tier'] == metadata['company_tier']
+        assert read_meta['placement_status'] == metadata['placement_status']
+        assert read_meta['graduation_year'] == metadata['graduation_year']
+        assert read_meta['outcome_score'] == pytest.approx(metadata['outcome_score'])
+
+
+@pytest.mark.parametrize("major", [None, "Computer Science", "Electronics", "Unknown Major"])
+@pytest.mark.parametrize("use_ensemble", [True, False])
+def test_search_matches_fallback(snapshot_path, major, use_ensemble):
+    """Snapshot search == find_similar_alumni_fallback on the same data."""
+    snapshot = AlumniSnapshot(snapshot_path)
+    query = np.random.default_rng(3).random(15)
+    
+    expected = find_similar_alumni_fallback(
+        query, list(snapshot.iter_records()), major=major, top_k=10, use_ensemble=use_ensemble
+    )
+    results = snapshot.search(query, major=major, top_k=10, use_ensemble=use_ensemble)
+    
+    assert [r['alumni_id'] for r in results] == [r['alumni_id'] for r in expected]
+    assert np.allclose(
+        [r['similarity_score'] for r in results],
+        [r['similarity_score'] for r in expected]
+    )
+
+
+def test_search_keeps_ties_in_file_order(snapshot_path):
+    """Identical vectors rank in file order, like the fallback's stable sort."""
+    snapshot = AlumniSnapshot(snapshot_path)
+    query = snapshot.vectors[0].astype(np.float64)
+    results = snapshot.search(query, top_k=2)
+    assert [r['alumni_id'] for r in results] == [1000, 5000]
+
+
+def test_search_rejects_wrong_dimension(snapshot_path):
+    snapshot = AlumniSnapshot(snapshot_path)
+    assert snapshot.search(np.ones(30)) == []
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snapshot")
+    write_alumni_snapshot(path, [], vector_version=1)
+    snapshot = AlumniSnapshot(path)
+    assert len(snapshot) == 0
+    assert snapshot.search(np.ones(0)) == []
+
+
+def test_invalid_files_rejected(tmp_path, snapshot_path):
+    """Wrong magic and truncated files raise ValueError."""
+    bad = tmp_path / "bad.snapshot"
+    bad.write_bytes(b"not a snapshot at all, just some bytes.........")
+    with pytest.raises(ValueError):
+        AlumniSnapshot(str(bad))
+    
+    truncated = tmp_path / "truncated.snapshot"
+    truncated.write_bytes(Path(snapshot_path).read_bytes()[:-100])
+    with pytest.raises(ValueError):
+        AlumniSnapshot(str(truncated))
+
+
+def test_load_from_environment(monkeypatch, snapshot_path, tmp_path):
+    """ALUMNI_SNAPSHOT_PATH is mapped at startup; a missing file is not fatal."""
+    monkeypatch.setattr(alumni_snapshot, "_alumni_snapshot", None)
+    
+    monkeypatch.setenv("ALUMNI_SNAPSHOT_PATH", snapshot_path)
+    assert load_alumni_snapshot() is not None
+    assert alumni_snapshot.get_alumni_snapshot().count == len(_records())
+    
+    monkeypatch.setenv("ALUMNI_SNAPSHOT_PATH", str(tmp_path / "missing.snapshot"))
+    assert load_alumni_snapshot() is None
+    assert alumni_snapshot.get_alumni_snapshot() is None
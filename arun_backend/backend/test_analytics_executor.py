@@ -0,0 +1,114 @@
+"""
+Tests for the analytics executor.
+
+Analyses run in the worker process pool (inputs passed through shared
+memory) must produce the same results as running them in-process, and
+their results must be stored with increasing versions. Uses an in-memory
+SQLite database shared with the job threads.
+"""
+
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.models import Student, DigitalWellbeingData, TrajectoryScore, AtRiskFlagRecord, GapAnalysis
+from app.services.analytics_executor import AnalyticsExecutor, gap_aggregates
+from app.services.behavioral_analysis_service import BehavioralAnalysisService
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    rng = np.random.default_rng(12)
+    db = session_factory()
+    today = date.today()
+    for i in range(40):
+        gpa = round(float(rng.uniform(5.0, 9.8)), 2)
+        student = Student(name=f"Student {i}", major="Computer Science", gpa=gpa, attendance=80.0)
+        db.add(student)
+        db.flush()
+        for day in range(5):
+            db.add(DigitalWellbeingData(
+                student_id=student.id,
+                date=today - timedelta(days=day),
+                screen_time_hours=round(float(12 - gpa + rng.normal(0, 1.5)), 2),
+                social_media_hours=round(float(rng.uniform(0, 6)), 2),
+                focus_score=round(float(rng.uniform(0.2, 0.95)), 2),
+                sleep_duration_hours=round(float(rng.uniform(4.5, 9)), 1)
+            ))
+        db.add(TrajectoryScore(student_id=student.id, score=gpa * 9, confidence=0.8,
+                               calculated_at=datetime(2026, 1, 10)))
+        for metric in ("GPA", "Attendance"):
+            db.add(GapAnalysis(student_id=student.id, metric_name=metric,
+                               gap_percentage=round(float(rng.uniform(0, 40)), 1)))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+@pytest.fixture
+def executor(session_factory):
+    executor = AnalyticsExecutor(max_workers=1, session_factory=session_factory)
+    yield executor
+    executor.shutdown()
+
+
+def _wait(job, timeout=60):
+    deadline = time.monotonic() + timeout
+    while job['status'] in ('queued', 'running'):
+        assert time.monotonic() < deadline, "analytics job did not finish"
+        time.sleep(0.05)
+    assert job['status'] == 'completed', job.get('error')
+    return job
+
+
+def test_jobs_match_in_process_results(executor, session_factory):
+    correlations = _wait(executor.submit('correlations'))
+    sweep = _wait(executor.submit('at_risk_sweep'))
+    
+    db = session_factory()
+    service = BehavioralAnalysisService()
+    # The correlations job rebuilds the statistics the routes read
+    assert executor.get_result(db, 'correlations')['result'] == service.calculate_correlations(db)
+    assert not service.needs_refresh(db)
+    assert correlations['version'] == sweep['version'] == 1
+    
+    stored = sorted((row.student_id, row.flag) for row in db.query(AtRiskFlagRecord))
+    summary = executor.get_result(db, 'at_risk_sweep')['result']
+    service.sweep_at_risk_students(db)
+    assert stored == sorted((row.student_id, row.flag) for row in db.query(AtRiskFlagRecord))
+    assert summary['flags'] == len(stored) > 0
+    db.close()
+
+
+def test_results_are_versioned_and_served_without_computing(executor, session_factory):
+    _wait(executor.submit('gap_aggregates'))
+    second = _wait(executor.submit('gap_aggregates'))
+    assert second['version'] == 2
+    
+    # A fresh executor (another API worker) reads the stored result
+    db = session_factory()
+    reader = AnalyticsExecutor(session_factory=session_factory)
+    result = reader.get_result(db, 'gap_aggregates')
+    assert result['version'] == 2
+    assert set(result['result']) == {'GPA', 'Attendance'}
+    assert result['result']['GPA']['count'] == 40
+    assert reader.get_result(db, 'correlations') is None
+    assert reader._pool is None
+    db.close()
+    
+    with pytest.raises(ValueError):
+        executor.submit('unknown')
+
+
+def test_gap_aggregates_skip_missing_values():
+    codes = np.array([0, 0, 1, 1, 0])
+    gaps = np.array([10.0, np.nan, 5.0, 15.0, 30.0])
+    result = gap_aggregates(codes, gaps, ['GPA', 'Skills'])
+    assert result['GPA'] == {'count': 2, 'mean': 20.0, 'median': 20.0, 'p90': 28.0}
+    assert result['Skills']['mean'] == 10.0
@@ -0,0 +1,148 @@
+"""
+Tests for the population-wide at-risk sweep.
+
+The grouped query and vectorized thresholds must flag exactly what the
+original per-student implementation flagged. Uses an in-memory SQLite database.
+"""
+
+import sys
+import warnings
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.models import Student, DigitalWellbeingData, TrajectoryScore, AtRiskFlagRecord
+from app.services.behavioral_analysis_service import BehavioralAnalysisService
+
+
+def _seed(db, count=60, seed=9):
+    """Students with 10 days of varied wellbeing data and 0-6 trajectory scores."""
+    rng = np.random.default_rng(seed)
+    today = date.today()
+    for i in range(count):
+        student = Student(name=f"Student {i}", major="Computer Science", gpa=7.0, attendance=85.0)
+        db.add(student)
+        db.flush()
+        for day in range(10):
+            db.add(DigitalWellbeingData(
+                student_id=student.id,
+                date=today - timedelta(days=day),
+                screen_time_hours=round(float(rng.uniform(3, 12)), 2),
+                social_media_hours=round(float(rng.choice([0, rng.uniform(1, 7)])), 2),
+                focus_score=round(float(rng.uniform(0.2, 0.9)), 2) if day % 3 else None,
+                sleep_duration_hours=round(float(rng.uniform(4, 8.5)), 1)
+            ))
+        for attempt in range(i % 7):
+            db.add(TrajectoryScore(
+                student_id=student.id,
+                score=round(float(80 + 2 * attempt * (i % 2) + rng.normal(0, 1)), 2),
+                confidence=0.8,
+                calculated_at=datetime(2026, 1, 1) + timedelta(days=7 * (6 - attempt))
+            ))
+    db.commit()
+
+
+def _reference_flags(db, student):
+    """Thresholds of the original per-student implementation."""
+    recent_date = datetime.utcnow() - timedelta(days=7)
+    data = db.query(DigitalWellbeingData).filter(
+        DigitalWellbeingData.student_id == student.id,
+        DigitalWellbeingData.date >= recent_date.date()
+    ).all()
+    
+    # Means of empty lists are NaN, as in the original
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        screen = np.mean([float(d.screen_time_hours) for d in data])
+        social = np.mean([float(d.social_media_hours) for d in data if d.social_media_hours])
+        focus = np.mean([float(d.focus_score) for d in data if d.focus_score])
+        sleep = np.mean([float(d.sleep_duration_hours) for d in data if d.sleep_duration_hours])
+        
+        scores = db.query(TrajectoryScore).filter(
+            TrajectoryScore.student_id == student.id
+        ).order_by(TrajectoryScore.calculated_at.desc()).limit(6).all()
+        trend = 0.0
+        if len(scores) >= 3:
+            trend = round((np.mean([float(s.score) for s in scores[:3]])
+                           - np.mean([float(s.score) for s in scores[3:6]])) / 3, 2)
+    
+    flags = []
+    if social > 4.0 and sleep < 6.0 and trend < -0.5:
+        flags.append('at_risk_pattern')
+    if screen > 8.0:
+        flags.append('excessive_screen_time')
+    if focus < 0.5:
+        flags.append('low_focus_score')
+    if sleep < 6.0:
+        flags.append('insufficient_sleep')
+    return flags
+
+
+def test_sweep_matches_per_student_reference(db):
+    _seed(db)
+    service = BehavioralAnalysisService()
+    
+    summary = service.sweep_at_risk_students(db)
+    assert summary['students_evaluated'] == 60
+    
+    stored = {}
+    for record in db.query(AtRiskFlagRecord).order_by(AtRiskFlagRecord.id):
+        stored.setdefault(record.student_id, []).append(record.flag)
+    
+    expected = {}
+    for student in db.query(Student).all():
+        flags = _reference_flags(db, student)
+        if flags:
+            expected[student.id] = flags
+    
+    assert stored == expected
+    assert summary['students_flagged'] == len(expected)
+    assert summary['flags'] == sum(len(flags) for flags in expected.values())
+    assert any('at_risk_pattern' in flags for flags in expected.values())
+
+
+def test_single_student_uses_same_evaluation(db):
+    _seed(db, count=12)
+    service = BehavioralAnalysisService()
+    
+    for student in db.query(Student).all():
+        flags = service.identify_at_risk_patterns(student, db)
+        assert [f['flag'] for f in flags] == _reference_flags(db, student)
+        for flag in flags:
+            if 'metric_value' in flag:
+                assert isinstance(flag['metric_value'], float)
+
+
+def test_sweep_replaces_previous_flags(db):
+    _seed(db, count=10)
+    service = BehavioralAnalysisService()
+    service.sweep_at_risk_students(db)
+    first = db.query(AtRiskFlagRecord).count()
+    
+    service.sweep_at_risk_students(db)
+    assert db.query(AtRiskFlagRecord).count() == first
+    assert len({r.swept_at for r in db.query(AtRiskFlagRecord)}) == 1
+
+
+def test_at_risk_page_orders_by_severity(db):
+    _seed(db)
+    service = BehavioralAnalysisService()
+    service.sweep_at_risk_students(db)
+    
+    first = service.get_at_risk_page(db, page=1, page_size=10)
+    second = service.get_at_risk_page(db, page=2, page_size=10)
+    assert first['total'] == second['total'] == db.query(AtRiskFlagRecord.student_id).distinct().count()
+    assert not {s['student_id'] for s in first['students']} & {s['student_id'] for s in second['students']}
+    
+    high_counts = [
+        sum(1 for f in s['flags'] if f['severity'] == 'high')
+        for s in first['students'] + second['students']
+    ]
+    assert high_counts == sorted(high_counts, reverse=True)
+    assert 'threshold' in first['students'][0]['flags'][0] or 'thresholds' in first['students'][0]['flags'][0]
+    
+    high_only = service.get_at_risk_page(db, severity='high', page_size=500)
+    assert all(any(f['severity'] == 'high' for f in s['flags']) for s in high_only['students'])
@@ -0,0 +1,251 @@
+"""
+Tests for the set-based behavioral correlation engine and its streaming
+statistics.
+
+The vectorized computation must match the original per-student pandas
+implementation, and per-student streaming updates must agree with it.
+Uses an in-memory SQLite database.
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import func
+
+from app.models import (
+    Student, DigitalWellbeingData, TrajectoryScore, AnalyticsSnapshot, BehavioralStatMember, BehavioralStatCell
+)
+from app.services.behavioral_analysis_service import BehavioralAnalysisService
+from app.services.behavioral_stats import SKETCH_GRIDS, RunningMoments, weighted_quantiles
+
+
+def _seed(db, count=40, seed=5):
+    """Students with 5 days of wellbeing data and up to 3 trajectory scores."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        gpa = round(float(rng.uniform(5.0, 9.8)), 2)
+        student = Student(name=f"Student {i}", major="Computer Science", gpa=gpa,
+                          attendance=round(float(rng.uniform(60, 99)), 2))
+        db.add(student)
+        db.flush()
+        for day in range(5):
+            db.add(DigitalWellbeingData(
+                student_id=student.id,
+                date=date(2026, 1, 1) + timedelta(days=day),
+                screen_time_hours=round(float(12 - gpa + rng.normal(0, 1)), 2),
+                focus_score=round(float(np.clip(gpa / 10 + rng.normal(0, 0.1), 0, 0.99)), 2),
+                sleep_duration_hours=round(float(rng.uniform(5, 9)), 1)
+            ))
+        # Every 4th student has no trajectory score yet
+        for attempt in range(i % 4):
+            db.add(TrajectoryScore(
+                student_id=student.id,
+                score=round(float(gpa * 9 + attempt + rng.normal(0, 3)), 2),
+                confidence=0.8,
+                calculated_at=datetime(2026, 1, 10) + timedelta(days=attempt)
+            ))
+    db.commit()
+
+
+def _reference_correlations(db):
+    """The original N+1 pandas implementation."""
+    from sqlalchemy import func
+    
+    rows = db.query(
+        Student.id, Student.gpa, Student.attendance,
+        func.avg(DigitalWellbeingData.screen_time_hours).label('avg_screen_time'),
+        func.avg(DigitalWellbeingData.focus_score).label('avg_focus_score'),
+        func.avg(DigitalWellbeingData.sleep_duration_hours).label('avg_sleep')
+    ).join(DigitalWellbeingData, Student.id == DigitalWellbeingData.student_id).group_by(Student.id).all()
+    
+    data = []
+    for student in rows:
+        trajectory = db.query(TrajectoryScore).filter(
+            TrajectoryScore.student_id == student.id
+        ).order_by(TrajectoryScore.calculated_at.desc()).first()
+        data.append({
+            'gpa': float(student.gpa),
+            'attendance': float(student.attendance),
+            'screen_time': float(student.avg_screen_time),
+            'focus_score': float(student.avg_focus_score),
+            'sleep': float(student.avg_sleep),
+            'trajectory_score': float(trajectory.score) if trajectory else None
+        })
+    df = pd.DataFrame(data).dropna()
+    
+    successful = df[df['gpa'] >= df['gpa'].quantile(0.75)]
+    ranges = {
+        name: {
+            'min': round(float(successful[name].quantile(0.25)), digits),
+            'max': round(float(successful[name].quantile(0.75)), digits),
+            'median': round(float(successful[name].median()), digits)
+        }
+        for name, digits in (('screen_time', 1), ('focus_score', 2), ('sleep', 1))
+    }
+    return {
+        'screen_time_vs_gpa': round(float(df['screen_time'].corr(df['gpa'])), 3),
+        'focus_score_vs_trajectory': round(float(df['focus_score'].corr(df['trajectory_score'])), 3),
+        'sleep_vs_academic': round(float(df['sleep'].corr(df['gpa'])), 3),
+        'sample_size': len(df),
+        'optimal_ranges': ranges
+    }
+
+
+def test_compute_correlations_matches_reference(db):
+    _seed(db)
+    result = BehavioralAnalysisService().compute_correlations(db)
+    
+    assert result == _reference_correlations(db)
+    assert result['sample_size'] == 30
+    assert result['screen_time_vs_gpa'] < -0.5
+
+
+def test_latest_trajectory_score_is_used(db):
+    """Only the most recent score of each student enters the matrix."""
+    _seed(db)
+    data = BehavioralAnalysisService()._load_correlation_matrix(db)
+    assert data.shape == (40, 7)
+    
+    student = db.query(Student).filter(Student.name == "Student 3").one()
+    latest = db.query(TrajectoryScore).filter(
+        TrajectoryScore.student_id == student.id
+    ).order_by(TrajectoryScore.calculated_at.desc()).first()
+    assert float(latest.score) in data[:, 6]
+    assert np.isnan(data[:, 6]).sum() == 10
+
+
+def test_insufficient_data_returns_defaults(db):
+    _seed(db, count=8)
+    result = BehavioralAnalysisService().compute_correlations(db)
+    assert result['sample_size'] == 0
+    assert result['optimal_ranges']['sleep'] == {'min': 7.0, 'max': 8.5, 'median': 7.5}
+
+
+def test_running_moments_add_remove_match_numpy():
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(50, 5)) * [1, 3, 0.1, 2, 10]
+    
+    moments = RunningMoments()
+    for row in data:
+        moments.add(row)
+    for row in data[:20]:
+        moments.remove(row)
+    
+    rest = data[20:]
+    assert moments.count == 30
+    assert moments.mean == pytest.approx(rest.mean(axis=0))
+    assert moments.correlation(0, 3) == pytest.approx(np.corrcoef(rest, rowvar=False)[0, 3])
+    
+    restored = RunningMoments.from_dict(moments.to_dict())
+    assert restored.comoment == pytest.approx(RunningMoments.from_matrix(rest).comoment)
+
+
+def test_weighted_quantiles_match_numpy():
+    rng = np.random.default_rng(2)
+    values = rng.integers(0, 20, size=200).astype(float)
+    unique, counts = np.unique(values, return_counts=True)
+    
+    quantiles = [0.0, 0.25, 0.5, 0.75, 0.9, 1.0]
+    assert weighted_quantiles(unique, counts, quantiles) == pytest.approx(np.quantile(values, quantiles))
+
+
+def test_streaming_updates_track_exact_computation(db):
+    """Ingests applied one student at a time agree with a full recomputation."""
+    _seed(db)
+    service = BehavioralAnalysisService()
+    service.refresh_correlations(db)
+    
+    students = db.query(Student).order_by(Student.id).limit(6).all()
+    for offset, student in enumerate(students):
+        db.add(DigitalWellbeingData(
+            student_id=student.id,
+            date=date(2026, 1, 20),
+            screen_time_hours=2.0 + offset,
+            focus_score=0.9,
+            sleep_duration_hours=8.0
+        ))
+        if offset % 2:
+            student.gpa = 9.9
+        db.commit()
+        assert service.record_student_update(db, student.id)
+    
+    # Student without a trajectory score gains one and enters the statistics
+    db.add(TrajectoryScore(student_id=students[4].id, score=88.0, confidence=0.7,
+                           calculated_at=datetime(2026, 2, 1)))
+    db.commit()
+    assert service.record_student_update(db, students[4].id)
+    
+    streamed = service.calculate_correlations(db)
+    exact = service.compute_correlations(db)
+    
+    assert streamed['sample_size'] == exact['sample_size'] == 31
+    for key in ('screen_time_vs_gpa', 'focus_score_vs_trajectory', 'sleep_vs_academic'):
+        assert streamed[key] == pytest.approx(exact[key], abs=1e-3)
+    # Sketch cells are one rounding step wide, so quantiles agree to within it
+    for name, digits in (('screen_time', 1), ('focus_score', 2), ('sleep', 1)):
+        for bound in ('min', 'max', 'median'):
+            assert streamed['optimal_ranges'][name][bound] == pytest.approx(
+                exact['optimal_ranges'][name][bound], abs=1.5 * 10 ** -digits
+            )
+    
+    members = db.query(BehavioralStatMember).count()
+    assert members == db.query(AnalyticsSnapshot).one().sample_size == 31
+
+
+def test_batch_update_matches_exact_computation(db):
+    """Ingests of several students applied in one call agree with a full recomputation."""
+    _seed(db)
+    service = BehavioralAnalysisService()
+    service.refresh_correlations(db)
+    
+    students = db.query(Student).order_by(Student.id).limit(6).all()
+    for offset, student in enumerate(students):
+        db.add(DigitalWellbeingData(
+            student_id=student.id,
+            date=date(2026, 1, 20),
+            screen_time_hours=2.0 + offset,
+            focus_score=0.9,
+            sleep_duration_hours=8.0
+        ))
+        if offset % 2:
+            student.gpa = 9.9
+    db.commit()
+    assert service.record_students_update(db, [student.id for student in students])
+    
+    streamed = service.calculate_correlations(db)
+    exact = service.compute_correlations(db)
+    assert streamed['sample_size'] == exact['sample_size']
+    for key in ('screen_time_vs_gpa', 'focus_score_vs_trajectory', 'sleep_vs_academic'):
+        assert streamed[key] == pytest.approx(exact[key], abs=1e-3)
+    cells = db.query(func.sum(BehavioralStatCell.count)).scalar()
+    assert cells == len(SKETCH_GRIDS) * exact['sample_size']
+
+def test_statistics_are_only_read_until_refreshed(db):
+    """Reads never rebuild the statistics; needs_refresh tells the job to."""
+    _seed(db)
+    service = BehavioralAnalysisService(snapshot_max_age_seconds=60)
+    assert service.needs_refresh(db)
+    assert service.calculate_correlations(db) == service._get_default_correlations()
+    assert db.query(AnalyticsSnapshot).count() == 0
+    
+    first = service.refresh_correlations(db)
+    assert not service.needs_refresh(db)
+    assert service.calculate_correlations(db) == first
+    
+    snapshot = db.query(AnalyticsSnapshot).one()
+    snapshot.computed_at = datetime.utcnow() - timedelta(minutes=5)
+    # Simulate drift from a write that bypassed record_student_update
+    snapshot.payload = RunningMoments().to_dict()
+    db.commit()
+    
+    assert service.needs_refresh(db)
+    assert service.calculate_correlations(db)['sample_size'] == 0
+    assert service.refresh_correlations(db) == first
+    assert not service.needs_refresh(db)
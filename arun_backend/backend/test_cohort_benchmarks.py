@@ -0,0 +1,174 @@
+"""
+Tests for the cohort percentile tables.
+
+Tables maintained one student update at a time must equal a rebuild once
+their stale cohorts are recomputed, and percentile ranks read from them
+must match ranking against the whole cohort. Uses an in-memory SQLite
+database.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.models import Student, CohortBenchmark
+from app.services.cohort_benchmark_service import (
+    ALL_SEMESTERS, MIN_COHORT_SIZE, CohortBenchmarkService, percentile_rank
+)
+from app.services.feature_store import FeatureStore
+
+
+def _seed(db, rng, count=30):
+    """Students of two majors over three semesters, with wellbeing features."""
+    store = FeatureStore()
+    students = [
+        Student(
+            name=f"Student {i}",
+            major=("Computer Science", "Mechanical")[i % 2],
+            semester=(3, 5, 5)[i % 3] if i % 7 else None,
+            gpa=round(float(rng.uniform(5, 9.8)), 2),
+            attendance=round(float(rng.uniform(60, 99)), 1),
+            study_hours_per_week=round(float(rng.uniform(5, 40)), 1)
+        )
+        for i in range(count)
+    ]
+    db.add_all(students)
+    db.commit()
+    for student in students:
+        for offset in range(3):
+            store.observe(db, student.id, date(2026, 3, 1) + timedelta(days=offset), {
+                'screen_time': round(float(rng.uniform(2, 12)), 2),
+                'sleep': round(float(rng.uniform(5, 9)), 1),
+                'focus': round(float(rng.uniform(0, 1)), 2)
+            })
+    return students
+
+
+def _tables(db):
+    return {
+        (row.major, row.semester, row.metric): (row.sample_size, row.sorted_values, row.deciles)
+        for row in db.query(CohortBenchmark)
+        if row.sample_size
+    }
+
+
+def test_percentile_rank_counts_ties_as_half():
+    values = np.array([1.0, 2.0, 2.0, 3.0])
+    assert percentile_rank(values, 2.0) == 50.0
+    assert percentile_rank(values, 0.5) == 0.0
+    assert percentile_rank(values, 3.5) == 100.0
+    assert percentile_rank(values, 1.0) == 12.5
+
+
+def test_incremental_updates_match_rebuild(db):
+    rng = np.random.default_rng(8)
+    service = CohortBenchmarkService()
+    students = _seed(db, rng)
+    service.rebuild(db)
+    before = _tables(db)
+    
+    # New wellbeing data, profile changes and a change of cohort
+    store = FeatureStore()
+    for index, student in enumerate(students[:8]):
+        store.observe(db, student.id, date(2026, 3, 10), {'screen_time': 1.0 + index, 'sleep': 8.0})
+        if index % 2:
+            student.gpa = 9.9
+        if index == 3:
+            student.major = "Electrical"
+            student.semester = 5
+        db.commit()
+        assert service.record_student_update(db, student.id)
+    # A student created after the last rebuild
+    newcomer = Student(name="Newcomer", major="Mechanical", semester=3, gpa=6.0)
+    db.add(newcomer)
+    db.commit()
+    assert service.record_student_update(db, newcomer.id)
+    
+    # Updates only mark their cohorts stale; arrays are recomputed on read
+    assert _tables(db) == before
+    stale = {(row.major, row.semester) for row in db.query(CohortBenchmark).filter_by(stale=True)}
+    assert ("Electrical", ALL_SEMESTERS) in stale and ("Mechanical", 3) in stale
+    assert service.refresh_stale_cohorts(db) == len(stale)
+    assert not db.query(CohortBenchmark).filter_by(stale=True).count()
+    
+    incremental = _tables(db)
+    service.rebuild(db)
+    rebuilt = _tables(db)
+    
+    assert incremental.keys() == rebuilt.keys()
+    for key, (size, values, deciles) in rebuilt.items():
+        assert incremental[key][0] == size
+        assert incremental[key][1] == pytest.approx(values)
+        assert incremental[key][2] == pytest.approx(deciles)
+    assert ("Electrical", ALL_SEMESTERS, 'gpa') in rebuilt
+
+
+def test_student_percentiles_match_cohort_ranking(db):
+    rng = np.random.default_rng(9)
+    service = CohortBenchmarkService()
+    students = _seed(db, rng, count=60)
+    service.rebuild(db)
+    
+    student = next(s for s in students if s.major == "Computer Science" and s.semester == 5)
+    result = service.get_student_percentiles(db, student.id)
+    members = service.member_values(db, [s.id for s in students])
+    
+    cohort = [m for m in members.values() if m['major'] == student.major and m['semester'] == 5]
+    assert len(cohort) >= MIN_COHORT_SIZE
+    for metric in ('screen_time', 'gpa', 'study_hours'):
+        values = np.sort([m[metric] for m in cohort])
+        own = members[student.id][metric]
+        expected = 100.0 * (np.sum(values < own) + np.sum(values == own) / 2.0) / len(values)
+        assert result['metrics'][metric]['cohort'] == 'semester'
+        assert result['metrics'][metric]['percentile'] == pytest.approx(expected, abs=0.05)
+        assert result['metrics'][metric]['median'] == pytest.approx(np.median(values), abs=1e-4)
+
+
+def test_small_cohort_falls_back_to_major(db):
+    rng = np.random.default_rng(10)
+    service = CohortBenchmarkService()
+    _seed(db, rng)
+    loner = Student(name="Loner", major="Mechanical", semester=8, gpa=7.0)
+    db.add(loner)
+    db.commit()
+    service.rebuild(db)
+    
+    result = service.get_student_percentiles(db, loner.id)
+    major_size = db.query(Student).filter(Student.major == "Mechanical").count()
+    assert result['metrics']['gpa']['cohort'] == 'major'
+    assert result['metrics']['gpa']['sample_size'] == major_size
+
+
+def test_stale_cohort_recomputed_on_read(db):
+    rng = np.random.default_rng(11)
+    service = CohortBenchmarkService()
+    students = _seed(db, rng)
+    service.rebuild(db)
+    
+    student = next(s for s in students if s.major == "Mechanical" and s.semester == 5)
+    assert service.get_cohort(db, "Mechanical", 5)['gpa'][0][-1] < 9.9
+    student.gpa = 9.9
+    db.commit()
+    assert service.record_student_update(db, student.id)
+    
+    cohort = service.get_cohort(db, "Mechanical", 5)
+    assert cohort['gpa'][0][-1] == 9.9
+    assert not db.query(CohortBenchmark).filter_by(major="Mechanical", semester=5, stale=True).count()
+    # The major-wide cohort stays stale until it is read
+    assert db.query(CohortBenchmark).filter_by(major="Mechanical", semester=ALL_SEMESTERS, stale=True).count()
+
+
+def test_unchanged_student_releases_transaction(db):
+    rng = np.random.default_rng(12)
+    service = CohortBenchmarkService()
+    students = _seed(db, rng)
+    service.rebuild(db)
+    
+    assert service.record_students_update(db, [student.id for student in students])
+    assert not db.in_transaction()
+    assert not db.query(CohortBenchmark).filter_by(stale=True).count()
@@ -0,0 +1,300 @@
+"""
+Tests for the bulk CSV import engine.
+
+Survey rows are loaded in chunks with a fixed number of statements each,
+bad rows are reported instead of imported, re-imports update changed rows
+and skip unchanged ones, survey wellbeing is stored once as a baseline
+prior, passwords can be hashed in a process pool and dry runs roll
+everything back. Uses an in-memory SQLite database.
+"""
+
+import csv
+import io
+import math
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import bcrypt
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import (
+    User, Student, DigitalWellbeingData, WellbeingBaseline, BehavioralMetric, StudentSubjectScore,
+    Skill, CohortMember, TrajectoryScore, BehavioralStatMember
+)
+from app.services.behavioral_analysis_service import BehavioralAnalysisService
+from app.services.cohort_benchmark_service import get_cohort_benchmark_service
+from app.services.csv_import_engine import CsvImportEngine, parse_survey_csv
+from app.services.feature_store import DECAY_RATE, get_feature_store
+from app.services.import_profiler import dry_run_session, in_memory_backfill_service, profile_import, stand_in_engine
+from app.services.password_hasher import BulkPasswordHasher
+from benchmark_csv_import import write_synthetic_csv
+
+TODAY = date(2026, 4, 30)
+
+HEADER = [
+    'Timestamp', 'Full Name', 'Email Address', 'Major / Branch', 'Current Semester',
+    'Are you a Student or Alumni?', 'Current GPA (0–10)', 'Average Attendance Percentage',
+    'Subject 1 Name(current semester)', 'Subject 1 Marks (0–100)',
+    'Programming Languages Select all that apply)', 'Problem Solving Ability (1–5)',
+    'Study hours per day', 'Average daily screen time (hours)', 'Average sleep hours',
+    'Have you deployed a project?', 'Placement status '
+]
+
+
+def _csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    writer.writerows(rows)
+    return buffer.getvalue().splitlines(keepends=True)
+
+
+def _row(index, **overrides):
+    row = {
+        'Full Name': f"Student {index}", 'Email Address': f"Student{index}@Example.com",
+        'Major / Branch': "Computer Science", 'Current Semester': "5",
+        'Are you a Student or Alumni?': "Student", 'Current GPA (0–10)': "8.1",
+        'Average Attendance Percentage': "85%", 'Subject 1 Name(current semester)': "DBMS",
+        'Subject 1 Marks (0–100)': "78", 'Programming Languages Select all that apply)': "Python, Java, Python",
+        'Problem Solving Ability (1–5)': "4", 'Study hours per day': "2",
+        'Average daily screen time (hours)': "6", 'Average sleep hours': "6",
+        'Have you deployed a project?': "Yes", 'Placement status ': "Not Placed"
+    }
+    row.update(overrides)
+    return [row.get(name, '') for name in HEADER]
+
+
+def test_parse_reports_bad_rows():
+    parsed = parse_survey_csv(_csv([
+        _row(1),
+        _row(2, **{'Current GPA (0–10)': "eight"}),
+        _row(3, **{'Email Address': ""}),
+        _row(1, **{'Email Address': "student1@example.com"}),
+        _row(4, **{'Current Semester': "", 'Average sleep hours': ""}),
+    ]))
+    
+    assert parsed['row_numbers'] == [2, 6]
+    assert parsed['columns']['email'] == ["student1@example.com", "student4@example.com"]
+    assert parsed['columns']['attendance'] == [85.0, 85.0]
+    # Blank answers take the defaults
+    assert parsed['columns']['semester'][1] == 7
+    assert parsed['columns']['sleep'][1] == 7.0
+    assert [(error['row'], error['error']) for error in parsed['errors']] == [
+        (3, "Invalid value for Current GPA (0–10): 'eight'"),
+        (4, "Missing email address"),
+        (5, "Duplicate email address in file"),
+    ]
+
+
+def test_import_loads_every_table_in_chunks(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    engine = CsvImportEngine(chunk_size=4, hash_password=lambda count: ["hash"] * count)
+    
+    summary = engine.import_lines(db, _csv([_row(i) for i in range(10)]), today=TODAY)
+    
+    assert summary['rows'] == 10 and summary['imported'] == 10 and summary['failed'] == 0
+    # One insert per table per chunk, whatever the chunk size
+    assert sum(sql.startswith("INSERT INTO students") for sql in statements) == 3
+    assert db.query(User).count() == db.query(Student).count() == 10
+    assert db.query(BehavioralMetric).count() == db.query(StudentSubjectScore).count() == 10
+    assert db.query(Skill).count() == 20
+    # One baseline per student instead of synthetic days
+    assert db.query(WellbeingBaseline).count() == 10
+    assert db.query(DigitalWellbeingData).count() == 0
+    
+    student = db.query(Student).filter(Student.id == summary['student_ids'][0]).one()
+    user = db.query(User).filter(User.id == student.user_id).one()
+    assert user.email == "student0@example.com" and user.password_hash == "hash"
+    assert float(student.study_hours_per_week) == 14.0 and float(student.attendance) == 85.0
+    baseline = db.get(WellbeingBaseline, student.id)
+    assert (baseline.source, baseline.reported_on, float(baseline.sleep_duration_hours)) == ("survey", TODAY, 6.0)
+    # Derived data of the new students was refreshed, once per chunk
+    assert db.query(CohortMember).filter_by(student_id=student.id).one().sleep == 6.0
+    assert sum(sql.startswith("INSERT INTO cohort_members") for sql in statements) == 3
+
+
+def test_reimport_skips_registered_students(db):
+    engine = CsvImportEngine()
+    engine.import_lines(db, _csv([_row(1), _row(2)]), today=TODAY)
+    # A user who signed up but has no student profile yet
+    db.add(User(email="student3@example.com", password_hash="own", role="student"))
+    db.commit()
+    
+    summary = engine.import_lines(db, _csv([_row(1), _row(2), _row(3)]), today=TODAY)
+    
+    assert (summary['imported'], summary['skipped']) == (1, 2)
+    assert db.query(User).count() == 3
+    user = db.query(User).filter_by(email="student3@example.com").one()
+    assert user.password_hash == "own"
+    assert db.query(Student).filter_by(user_id=user.id).count() == 1
+
+
+def test_failed_chunk_is_reported_and_others_imported(db):
+    calls = []
+    
+    def hash_password(count):
+        calls.append(count)
+        if len(calls) == 2:
+            raise RuntimeError("hashing failed")
+        return ["hash"] * count
+    
+    engine = CsvImportEngine(chunk_size=2, hash_password=hash_password)
+    summary = engine.import_lines(db, _csv([_row(i) for i in range(5)]), today=TODAY)
+    
+    assert (summary['imported'], summary['failed']) == (3, 2)
+    assert [error['row'] for error in summary['errors']] == [4, 5]
+    assert "hashing failed" in summary['errors'][0]['error']
+    assert db.query(Student).count() == 3
+
+
+def test_passwords_hashed_in_pool_while_loading(db):
+    with BulkPasswordHasher(max_workers=2, rounds=4, batch_size=3) as hasher:
+        engine = CsvImportEngine(chunk_size=4, hash_password=lambda count: hasher.submit(["temp-pass"] * count))
+        summary = engine.import_lines(db, _csv([_row(i) for i in range(10)]), today=TODAY)
+        stats = hasher.stats()
+    
+    assert summary['imported'] == 10
+    assert stats['hashed'] == stats['submitted'] == 10 and stats['failed_batches'] == 0
+    hashes = [user.password_hash for user in db.query(User)]
+    assert len(set(hashes)) == 10
+    assert all(password_hash.startswith("$2b$04$") for password_hash in hashes)
+    assert all(bcrypt.checkpw(b"temp-pass", password_hash.encode()) for password_hash in hashes)
+
+
+def test_reimport_updates_only_changed_rows(db):
+    engine = CsvImportEngine(chunk_size=2)
+    first = engine.import_lines(db, _csv([_row(i) for i in range(4)]), today=TODAY)
+    
+    summary = engine.import_lines(db, _csv([
+        _row(0), _row(1, **{'Current GPA (0–10)': "9.4", 'Programming Languages Select all that apply)': "Rust"}),
+        _row(2), _row(3), _row(4)
+    ]), today=TODAY)
+    
+    assert (summary['imported'], summary['updated'], summary['skipped']) == (1, 1, 3)
+    changed = first['student_ids'][1]
+    assert summary['updated_ids'] == [changed] and len(summary['student_ids']) == 1
+    student = db.query(Student).filter_by(id=changed).one()
+    assert float(student.gpa) == 9.4
+    # Skills named in the row are replaced, the others kept
+    assert sorted(skill.skill_name for skill in db.query(Skill).filter_by(student_id=changed)) == ["Java", "Python", "Rust"]
+    assert db.query(BehavioralMetric).filter_by(student_id=changed).count() == 1
+    assert db.query(WellbeingBaseline).filter_by(student_id=changed).count() == 1
+
+
+def test_reimport_observes_changed_study_hours(db):
+    engine = CsvImportEngine()
+    first = engine.import_lines(db, _csv([_row(0), _row(1)]), today=TODAY)
+    db.query(Student).update({'updated_at': datetime(2026, 4, 30, 12)})
+    db.commit()
+    store = get_feature_store()
+    store.rebuild(db)
+    
+    later = TODAY + timedelta(days=7)
+    engine.import_lines(db, _csv([
+        _row(0, **{'Study hours per day': "6"}), _row(1, **{'Current GPA (0–10)': "9.4"})
+    ]), today=later)
+    
+    features = store.get_features(db, first['student_ids'])
+    decay = math.exp(-DECAY_RATE * 7)
+    assert features[first['student_ids'][0]]['study_hours'] == pytest.approx((14.0 * decay + 42.0) / (decay + 1))
+    # Unchanged study hours are not observed again
+    assert features[first['student_ids'][1]]['study_hours'] == 14.0
+
+
+def test_baseline_is_prior_until_first_wellbeing_day(db):
+    summary = CsvImportEngine().import_lines(db, _csv([
+        _row(0), _row(1, **{'Average daily screen time (hours)': "10", 'Average sleep hours': "5"})
+    ]), today=TODAY)
+    student_id = summary['student_ids'][1]
+    service = BehavioralAnalysisService()
+    
+    features = get_feature_store().get_features(db, summary['student_ids'])
+    assert (features[student_id]['screen_time'], features[student_id]['sleep']) == (10.0, 5.0)
+    matrix = service._load_correlation_matrix(db)
+    assert len(matrix) == 2 and matrix[1, service.CORRELATION_COLUMNS.index('screen_time')] == 10.0
+    student_ids, metrics = service._load_at_risk_matrix(db, student_id=student_id)
+    assert list(student_ids) == [student_id] and metrics[0, 0] == 10.0
+    
+    # The student's own days replace the baseline
+    db.add(DigitalWellbeingData(
+        student_id=student_id, date=TODAY, screen_time_hours=3.0, social_media_hours=1.0,
+        sleep_duration_hours=8.0, focus_score=0.6
+    ))
+    db.commit()
+    get_feature_store().observe(db, student_id, TODAY, {
+        'screen_time': 3.0, 'social_media': 1.0, 'sleep': 8.0, 'focus': 0.6
+    })
+    
+    features = get_feature_store().get_features(db, [student_id])[student_id]
+    assert (features['screen_time'], features['sleep']) == (3.0, 8.0)
+    matrix = service._load_correlation_matrix(db, student_id=student_id)
+    assert len(matrix) == 1 and matrix[0, service.CORRELATION_COLUMNS.index('screen_time')] == 3.0
+
+
+def test_baseline_prior_reaches_every_analysis(db):
+    """Comparison, streaming correlations and cohort values all see the baseline."""
+    summary = CsvImportEngine().import_lines(db, _csv([
+        _row(0), _row(1, **{'Average daily screen time (hours)': "10", 'Average sleep hours': "5"})
+    ]), today=TODAY)
+    student_id = summary['student_ids'][1]
+    student = db.get(Student, student_id)
+    db.add(TrajectoryScore(student_id=student_id, score=70.0, confidence=0.5, calculated_at=datetime(2026, 4, 1)))
+    db.commit()
+    service = BehavioralAnalysisService()
+    
+    comparison = service.compare_to_successful_alumni(student, db, service._get_default_optimal_ranges())
+    assert (comparison['screen_time']['student'], comparison['sleep']['student']) == (10.0, 5.0)
+    
+    service.refresh_correlations(db)
+    member = db.get(BehavioralStatMember, student_id)
+    assert (member.screen_time, member.sleep) == (10.0, 5.0)
+    
+    values = get_cohort_benchmark_service().member_values(db, [student_id])[student_id]
+    assert (values['screen_time'], values['sleep']) == (10.0, 5.0)
+
+
+def test_usns_normalized_and_duplicates_reported():
+    header = "Full Name,Email Address,USN,Current GPA (0–10)\n"
+    lines = [header, "Asha,asha@example.com,1xy21cs001,8.0\n", "Ravi,ravi@example.com,1XY21CS001,7.0\n"]
+    parsed = parse_survey_csv(lines)
+    
+    assert parsed['columns']['usn'] == ["1XY21CS001"]
+    assert parsed['errors'][0]['error'] == "Duplicate USN in file"
+
+
+def test_usn_matches_student_with_new_email(db):
+    header = "Full Name,Email Address,USN,Current GPA (0–10)\n"
+    engine = CsvImportEngine()
+    engine.import_lines(db, [header, "Asha,asha@example.com,1XY21CS001,8.0\n"], today=TODAY)
+    
+    summary = engine.import_lines(db, [header, "Asha,asha.k@example.com,1XY21CS001,8.5\n"], today=TODAY)
+    
+    assert (summary['imported'], summary['updated']) == (0, 1)
+    assert db.query(Student).count() == 1 and float(db.query(Student).one().gpa) == 8.5
+
+
+def test_dry_run_profile_rolls_back():
+    buffer = io.StringIO()
+    write_synthetic_csv(buffer, 30, seed=7, invalid_rate=0.1)
+    bind = stand_in_engine()
+    with dry_run_session(bind) as session:
+        report = profile_import(session, io.StringIO(buffer.getvalue()), engine=CsvImportEngine(chunk_size=8),
+                                backfill_service=in_memory_backfill_service())
+        assert session.query(Student).count() == report['imported']
+    
+    assert report['rows'] == 30 and report['imported'] + report['failed'] == 30 and report['failed'] > 0
+    assert report['vectors']['stored'] == report['imported']
+    assert set(report['stages']) == {'parse', 'lookup', 'transform', 'hash_wait', 'write', 'commit',
+                                     'refresh', 'vectorize', 'other'}
+    assert report['stages']['write']['seconds'] > 0 and report['rows_per_second'] > 0
+    # Per-chunk commits only released savepoints
+    session = sessionmaker(bind=bind)()
+    assert session.query(User).count() == session.query(Student).count() == 0
+    session.close()
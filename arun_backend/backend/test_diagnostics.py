@@ -0,0 +1,79 @@
+"""
+Tests for the bounded database diagnostics.
+
+Table sizes come from estimates (the highest id on SQLite), slow statements
+are sampled from engine events and rows are sampled a page at a time by
+primary key. Uses an in-memory SQLite database.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+
+from app.models import User
+from app.services.diagnostics_service import DiagnosticsService, SlowQuerySampler
+
+
+@pytest.fixture
+def db(db):
+    for i in range(5):
+        db.add(User(email=f"user{i}@example.com", password_hash="$2b$12$secret", role="student"))
+    db.commit()
+    return db
+
+
+def test_table_stats_estimated_without_counting(db):
+    stats = {stat['table']: stat for stat in DiagnosticsService().table_stats(db)}
+    
+    # Only tables of this database
+    assert "users" in stats and "vector_profiles" not in stats
+    assert stats["users"] == {'table': "users", 'estimated_rows': 5, 'source': 'max_id'}
+    assert stats["students"]['estimated_rows'] == 0
+    # Composite primary key: no cheap estimate
+    assert stats["student_badges"]['estimated_rows'] is None
+    assert DiagnosticsService().index_usage(db) is None
+
+
+def test_slow_statements_sampled(engine, db):
+    sampler = SlowQuerySampler(threshold_ms=0, max_samples=2)
+    sampler.install(engine)
+    sampler.install(engine)
+    
+    for _ in range(3):
+        db.execute(text("SELECT count(*) FROM users")).scalar()
+    
+    samples = DiagnosticsService(sampler).slow_queries(db)['samples']
+    assert len(samples) == 2
+    assert samples[0]['statement'] == "SELECT count(*) FROM users"
+    assert samples[0]['ms'] >= samples[1]['ms']
+
+
+def test_rows_sampled_a_page_at_a_time_without_password_hashes(db):
+    service = DiagnosticsService()
+    
+    first = service.sample_rows(db, "users", limit=3)
+    assert [row['id'] for row in first['rows']] == [1, 2, 3]
+    assert 'password_hash' not in first['rows'][0]
+    
+    second = service.sample_rows(db, "users", cursor=first['next_cursor'], limit=3, fields="id,email")
+    assert second['rows'] == [
+        {'id': 4, 'email': "user3@example.com"},
+        {'id': 5, 'email': "user4@example.com"},
+    ]
+    assert second['next_cursor'] is None
+
+
+def test_invalid_samples_rejected(db):
+    service = DiagnosticsService()
+    for kwargs, message in (
+        ({'table_name': "sqlite_master"}, "Unknown table"),
+        ({'table_name': "student_badges"}, "composite primary key"),
+        ({'table_name': "users", 'fields': "password_hash"}, "Unknown fields: password_hash"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            service.sample_rows(db, **kwargs)
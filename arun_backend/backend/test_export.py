@@ -0,0 +1,84 @@
+"""
+Tests for the streaming data export.
+
+Tables are streamed in batches as CSV chunks or Parquet row groups, with
+column selection and date filters. Uses an in-memory SQLite database.
+"""
+
+import csv
+import io
+import sys
+from datetime import date, datetime
+from pathlib import Path
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.models import Student, Alumni, TrajectoryScore, PlacementStatusEnum, CompanyTierEnum, TrendEnum
+from app.services.export_service import ExportService
+
+
+@pytest.fixture
+def service(session_factory):
+    db = session_factory()
+    for i in range(7):
+        db.add(Student(
+            name=f"Student {i}", major="Computer Science", gpa=7.5 + i / 10, semester=5,
+            import_hash="abc", updated_at=datetime(2026, 3, 1 + i, 12, 0)
+        ))
+    db.add(Alumni(
+        name="Rajesh Kumar", major="Computer Science", graduation_year=2023, gpa=8.5, attendance=90,
+        placement_status=PlacementStatusEnum.PLACED, company_tier=CompanyTierEnum.TIER1
+    ))
+    db.add(TrajectoryScore(student_id=1, score=72.5, confidence=0.8, trend=TrendEnum.IMPROVING))
+    db.commit()
+    db.close()
+    return ExportService(session_factory=session_factory, batch_size=3)
+
+
+def test_csv_streamed_in_batches_with_columns_and_dates(service):
+    chunks = list(service.export(
+        "students", "csv", columns=["id", "name", "gpa"], since=date(2026, 3, 2), until=date(2026, 3, 7)
+    ))
+    
+    # Header, then one chunk per batch of 3 rows
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+    assert rows[0] == ["id", "name", "gpa"]
+    assert [row[0] for row in rows[1:]] == ["2", "3", "4", "5", "6"]
+    assert rows[1][2] == "7.6"
+
+
+def test_enums_exported_as_values_and_internal_columns_hidden(service):
+    rows = list(csv.DictReader(io.StringIO(b''.join(service.export("alumni")).decode())))
+    
+    assert rows[0]['placement_status'] == "Placed" and rows[0]['company_tier'] == "Tier1"
+    assert 'import_hash' not in rows[0]
+
+
+def test_parquet_row_groups_read_back(service):
+    pq = pytest.importorskip("pyarrow.parquet")
+    
+    data = b''.join(service.export("students", "parquet", columns=["id", "gpa", "updated_at", "is_alumni"]))
+    
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 3 and parquet.metadata.num_rows == 7
+    table = parquet.read()
+    assert table.column_names == ["id", "gpa", "updated_at", "is_alumni"]
+    assert table.column("gpa").to_pylist()[0] == 7.5
+    assert table.column("updated_at").to_pylist()[6] == datetime(2026, 3, 7, 12, 0)
+    
+    scores = pq.ParquetFile(io.BytesIO(b''.join(service.export("trajectory_scores", "parquet")))).read()
+    assert scores.column("trend").to_pylist() == ["improving"]
+
+
+def test_invalid_exports_rejected_before_streaming(service):
+    for kwargs, message in (
+        ({'dataset': "courses"}, "Unknown dataset"),
+        ({'dataset': "students", 'file_format': "xlsx"}, "Unknown format"),
+        ({'dataset': "students", 'columns': ["name", "import_hash"]}, "Unknown columns for students: import_hash"),
+        ({'dataset': "students", 'since': date(2026, 3, 5), 'until': date(2026, 3, 5)}, "since must be before until"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            service.export(**kwargs)
@@ -0,0 +1,115 @@
+"""
+Tests for the incremental wellbeing feature store.
+
+Features updated one day at a time (including days arriving out of order
+and days that are later corrected) must equal time_weighted_avg over the
+student's full history and a rebuild from scratch. Uses an in-memory
+SQLite database.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.models import Student, DigitalWellbeingData, WellbeingFeature
+from app.services.feature_store import FeatureStore, day_features, record_columns
+from app.services.vector_generation import (
+    generate_student_vector, inverse_normalize, standard_normalize, time_weighted_avg
+)
+
+
+def _ingest(db, store, student_id, day, rng):
+    """Add or overwrite one wellbeing day the way POST /behavioral does."""
+    record = db.query(DigitalWellbeingData).filter(
+        DigitalWellbeingData.student_id == student_id,
+        DigitalWellbeingData.date == day
+    ).first()
+    previous = day_features(record_columns(record)) if record else None
+    if record is None:
+        record = DigitalWellbeingData(student_id=student_id, date=day)
+        db.add(record)
+    record.screen_time_hours = round(float(rng.uniform(2, 12)), 2)
+    record.social_media_hours = round(float(rng.uniform(0, 4)), 2)
+    record.sleep_duration_hours = round(float(rng.uniform(5, 9)), 1) if rng.random() > 0.1 else None
+    record.educational_app_hours = round(float(rng.uniform(0, 3)), 2)
+    record.productivity_hours = round(float(rng.uniform(0, 2)), 2)
+    db.commit()
+    assert store.observe(db, student_id, day, day_features(record_columns(record)), previous)
+
+
+def _reference(db, student_id, metric, today):
+    """time_weighted_avg over every stored day."""
+    records = db.query(DigitalWellbeingData).filter(DigitalWellbeingData.student_id == student_id).all()
+    return time_weighted_avg([
+        (day_features(record_columns(record))[metric], (today - record.date).days)
+        for record in records
+    ], decay_rate=0.1)
+
+
+def _seed(db, store, rng):
+    students = [Student(name=f"Student {i}", major="Computer Science", study_hours_per_week=12)
+                for i in range(3)]
+    db.add_all(students)
+    db.commit()
+    for student in students:
+        days = [date(2026, 3, 1) + timedelta(days=int(offset))
+                for offset in rng.permutation(60)[:40]]
+        # Out-of-order arrival, then corrections of already-stored days
+        for day in days + days[5:10]:
+            _ingest(db, store, student.id, day, rng)
+    return students
+
+
+def test_incremental_features_match_full_history(db):
+    rng = np.random.default_rng(4)
+    store = FeatureStore()
+    students = _seed(db, store, rng)
+    
+    features = store.get_features(db, [student.id for student in students])
+    for student in students:
+        assert set(features[student.id]) == {'screen_time', 'social_media', 'sleep', 'focus'}
+        for metric, value in features[student.id].items():
+            assert value == pytest.approx(_reference(db, student.id, metric, date(2026, 5, 1)))
+    
+    assert db.query(WellbeingFeature).filter(
+        WellbeingFeature.metric == 'screen_time'
+    ).first().observations == 40
+
+
+def test_rebuild_matches_incremental(db):
+    rng = np.random.default_rng(6)
+    store = FeatureStore()
+    students = _seed(db, store, rng)
+    ids = [student.id for student in students]
+    
+    incremental = store.get_features(db, ids)
+    summary = store.rebuild(db, batch_size=2)
+    rebuilt = store.get_features(db, ids)
+    
+    assert summary['students'] == 3
+    for student_id in ids:
+        assert rebuilt[student_id]['study_hours'] == 12.0
+        for metric, value in incremental[student_id].items():
+            assert rebuilt[student_id][metric] == pytest.approx(value)
+
+
+def test_vector_uses_features_over_recent_records():
+    features = {'screen_time': 3.0, 'focus': 0.8, 'sleep': 7.5, 'study_hours': 20.0}
+    profile = {'gpa': 8.0, 'attendance': 90.0, 'study_hours_per_week': 10.0,
+               'project_count': 2, 'wellbeing_features': features}
+    # A single recent record that disagrees with the full-history means
+    wellbeing = [{'screen_time_hours': 11.0, 'sleep_duration_hours': 4.0, 'social_media_hours': 5.0}]
+    
+    vector = generate_student_vector(profile, wellbeing, [])
+    without_features = generate_student_vector({**profile, 'wellbeing_features': {}}, wellbeing, [])
+    
+    assert vector[4] == pytest.approx(inverse_normalize(3.0, 0, 12))
+    assert vector[5] == pytest.approx(0.8)
+    assert vector[6] == pytest.approx(standard_normalize(7.5, 4, 10))
+    assert vector[2] > without_features[2]
+    assert vector[4] > without_features[4]
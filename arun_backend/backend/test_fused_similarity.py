@@ -0,0 +1,150 @@
+"""
+Tests for multi-vector (academic / behavioral / skills) fused similarity.
+
+The single-request Qdrant fused search and the in-process matrix path must
+rank alumni the same way as an exact NumPy computation of the weighted
+per-subspace cosine. Uses an in-memory Qdrant client.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from qdrant_client import QdrantClient
+
+from app.services.qdrant_service import QdrantService
+from app.services.alumni_snapshot import AlumniSnapshot, write_alumni_snapshot
+from app.services.similarity_service import find_similar_alumni, fused_similarity_batch
+from app.services.trajectory_service import MAJOR_WEIGHTS
+from app.services.vector_schema import (
+    FULL_VECTOR_NAME,
+    get_vector_subspaces,
+    split_vector,
+    versioned_collection_name
+)
+
+
+MAJORS = ["Computer Science", "Business Administration"]
+
+
+def _records(count=120, seed=3):
+    """Random alumni records in the (id, vector, metadata) format."""
+    rng = np.random.default_rng(seed)
+    return [
+        (i + 1, rng.random(15).astype(np.float32), {
+            'name': f"Alumni {i}",
+            'major': MAJORS[i % 2],
+            'company_tier': "Tier1",
+            'placement_status': "Placed",
+            'graduation_year': 2022,
+            'outcome_score': 95.0
+        })
+        for i in range(count)
+    ]
+
+
+def _exact_ranking(query, records, weights, major, top_k):
+    """Brute-force weighted per-subspace cosine ranking."""
+    subspaces = get_vector_subspaces(2)
+    scored = []
+    for alumni_id, vector, metadata in records:
+        if metadata['major'] != major:
+            continue
+        score = 0.0
+        for name, (start, end) in subspaces.items():
+            a, b = query[start:end], vector[start:end]
+            score += weights[name] * float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+        scored.append((score, alumni_id))
+    scored.sort(reverse=True)
+    return [alumni_id for _, alumni_id in scored[:top_k]]
+
+
+@pytest.fixture
+def qdrant():
+    """QdrantService with v2 collections active, backed by an in-memory client."""
+    service = QdrantService()
+    service.client = QdrantClient(":memory:")
+    service.is_available = True
+    service.create_collections()
+    assert service.create_version_collections(2)
+    assert service.store_vectors_batch("alumni", _records(), version=2)
+    assert service.activate_version("alumni", 2)
+    return service
+
+
+def test_split_vector_layout():
+    """v2 stores academic 0-1, behavioral 2-6 and skills 7-14 next to the full vector."""
+    vector = np.arange(15, dtype=np.float32)
+    named = split_vector(vector, 2)
+    assert named['academic'] == [0.0, 1.0]
+    assert named['behavioral'] == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert named['skills'] == [float(i) for i in range(7, 15)]
+    assert named[FULL_VECTOR_NAME] == vector.tolist()
+    assert split_vector(vector, 1) == vector.tolist()
+
+
+def test_v2_collection_has_named_vectors(qdrant):
+    config = qdrant.client.get_collection(versioned_collection_name("alumni", 2)).config.params.vectors
+    assert {name: params.size for name, params in config.items()} == {
+        FULL_VECTOR_NAME: 15, 'academic': 2, 'behavioral': 5, 'skills': 8
+    }
+
+
+@pytest.mark.parametrize("major", MAJORS)
+def test_qdrant_fused_search_matches_exact(qdrant, major):
+    """One prefetch/formula request ranks like the exact weighted computation."""
+    query = np.random.default_rng(11).random(15)
+    weights = MAJOR_WEIGHTS[major]
+    
+    results = qdrant.find_similar_alumni_fused(query, weights, major=major, top_k=10)
+    
+    assert [r['alumni_id'] for r in results] == _exact_ranking(query, _records(), weights, major, 10)
+    assert all(r['major'] == major for r in results)
+
+
+def test_similarity_service_uses_fused_search_with_weights(qdrant):
+    """Weights route to the fused search; without them the full vector is used."""
+    query = np.random.default_rng(12).random(15)
+    major = "Computer Science"
+    weights = MAJOR_WEIGHTS[major]
+    
+    fused = find_similar_alumni(query, qdrant, major=major, top_k=5, weights=weights)
+    assert [r['alumni_id'] for r in fused] == _exact_ranking(query, _records(), weights, major, 5)
+    
+    plain = find_similar_alumni(query, qdrant, major=major, top_k=5)
+    assert len(plain) == 5
+    assert all(r['major'] == major for r in plain)
+
+
+def test_snapshot_fused_search_matches_qdrant(qdrant, tmp_path):
+    """The in-process matrix path ranks like the Qdrant fused search."""
+    path = str(tmp_path / "alumni_v2.snapshot")
+    write_alumni_snapshot(path, _records(), vector_version=2)
+    snapshot = AlumniSnapshot(path)
+    
+    query = np.random.default_rng(13).random(15)
+    major = "Business Administration"
+    weights = MAJOR_WEIGHTS[major]
+    
+    from_snapshot = snapshot.search(query, major=major, top_k=10, weights=weights)
+    from_qdrant = qdrant.find_similar_alumni_fused(query, weights, major=major, top_k=10)
+    assert [r['alumni_id'] for r in from_snapshot] == [r['alumni_id'] for r in from_qdrant]
+
+
+def test_fused_similarity_batch_weights_subspaces():
+    """A subspace with zero weight does not affect the score."""
+    subspaces = get_vector_subspaces(2)
+    query = np.full(15, 0.5)
+    matrix = np.tile(query, (2, 1))
+    matrix[1, 7:] = np.linspace(0.1, 1.0, 8)
+    
+    skills_only = fused_similarity_batch(query, matrix, {'skills': 1.0}, subspaces)
+    academic_only = fused_similarity_batch(query, matrix, {'academic': 1.0}, subspaces)
+    
+    assert skills_only[0] == pytest.approx(1.0)
+    assert skills_only[1] < 1.0
+    assert academic_only == pytest.approx([1.0, 1.0])
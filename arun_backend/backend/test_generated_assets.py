@@ -0,0 +1,87 @@
+"""
+Tests for generated admin artifacts.
+
+Assets are built once and served with ETag/Last-Modified validators, gzip
+when accepted and 304 Not Modified for current client copies.
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from starlette.requests import Request
+
+from app.generated_assets import asset_response, generated_asset, get_asset
+from app.routes.admin import build_alumni_template  # noqa: F401 (registers the admin assets)
+
+
+builds = []
+
+
+@generated_asset("test-schema", "application/json")
+def build_test_schema():
+    builds.append(1)
+    return {'fields': [{'name': f"field_{i}", 'description': "Described"} for i in range(20)]}
+
+
+def make_request(**headers) -> Request:
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()]
+    })
+
+
+def test_built_once_and_gzipped_when_accepted():
+    plain = asset_response(make_request(), "test-schema")
+    compressed = asset_response(make_request(accept_encoding="br, gzip;q=0.8"), "test-schema")
+    refused = asset_response(make_request(accept_encoding="gzip;q=0"), "test-schema")
+    
+    assert len(builds) == 1
+    assert plain.status_code == 200 and 'content-encoding' not in plain.headers
+    assert json.loads(plain.body)['fields'][0]['name'] == "field_0"
+    assert compressed.headers['content-encoding'] == "gzip"
+    assert gzip.decompress(compressed.body) == plain.body
+    assert compressed.headers['etag'] != plain.headers['etag']
+    assert refused.body == plain.body
+    assert plain.headers['vary'] == "Accept-Encoding"
+
+
+def test_current_copies_answered_not_modified():
+    asset = get_asset("test-schema")
+    
+    for headers in (
+        {'if_none_match': asset.etag},
+        {'if_none_match': f'W/{asset.gzip_etag}', 'accept_encoding': "gzip"},
+        {'if_modified_since': "Fri, 01 Jan 2100 00:00:00 GMT"},
+    ):
+        response = asset_response(make_request(**headers), "test-schema")
+        assert response.status_code == 304 and response.body == b''
+        assert response.headers['etag'] in (asset.etag, asset.gzip_etag)
+    
+    for headers in (
+        {'if_none_match': '"1.0.0-outdated"'},
+        # If-None-Match decides when both are sent
+        {'if_none_match': '"1.0.0-outdated"', 'if_modified_since': "Fri, 01 Jan 2100 00:00:00 GMT"},
+        {'if_modified_since': "Thu, 01 Jan 2015 00:00:00 GMT"},
+        {'if_modified_since': "yesterday"},
+    ):
+        assert asset_response(make_request(**headers), "test-schema").status_code == 200
+
+
+def test_alumni_template_assets():
+    template = asset_response(make_request(), "alumni-template", filename="alumni_import_template.csv")
+    rows = list(csv.reader(io.StringIO(template.body.decode())))
+    assert rows[0][:3] == ['name', 'major', 'graduation_year'] and len(rows) == 5
+    assert template.headers['content-disposition'] == "attachment; filename=alumni_import_template.csv"
+    assert template.headers['content-type'].startswith("text/csv")
+    
+    info = json.loads(asset_response(make_request(), "alumni-template-info").body)
+    assert info['template_name'] == "Alumni Import Template"
+    assert "'Comp Sci' → 'Computer Science'" in info['notes'][2]
@@ -0,0 +1,146 @@
+"""
+Tests for CSV import jobs started from the admin API.
+
+Uploads are spooled to disk, imported in the background with row errors
+reported on the job, and the new records are vectorized in batches.
+Uses an in-memory Qdrant client and an in-memory SQLite database shared
+with the job threads.
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+import bcrypt
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from qdrant_client import QdrantClient
+
+from app.auth import verify_password
+from app.models import User, Student, Alumni, CompanyTierEnum
+from app.services.alumni_vector_service import AlumniVectorService
+from app.services.csv_import_engine import UNUSABLE_PASSWORD_HASH, CsvImportEngine, iter_alumni_csv
+from app.services.import_job_service import ImportJobService
+from app.services.password_hasher import BulkPasswordHasher
+from app.services.qdrant_service import QdrantService
+from app.services.student_vector_service import StudentVectorService
+from app.services.vector_backfill_service import VectorBackfillService
+
+ALUMNI_CSV = """name,major,graduation_year,gpa,attendance,placement_status,company_tier,role_title,salary_range,role_to_major_match_score,study_hours_per_week,project_count
+Rajesh Kumar,Computer Science,2023,8.5,90,Placed,Tier1,Software Engineer,15-20 LPA,95,25,5
+Priya Sharma,Computer Science,2023,7.8,85%,Placed,Tier2,Full Stack Developer,8-12 LPA,85,20,3
+Bad Year,Computer Science,20x3,11,85,Placed,Tier4,,,,,1.5
+Sneha Reddy,Business Administration,2023,6.5,70,Not Placed,,,,,15,1
+"""
+
+STUDENTS_CSV = """Full Name,Email Address,Major / Branch,Current Semester,Current GPA (0–10),Average Attendance Percentage
+Asha,asha@example.com,Computer Science,5,8.2,88
+Ravi,ravi@example.com,Computer Science,5,6.9,75
+Ravi Again,RAVI@example.com,Computer Science,5,6.9,75
+"""
+
+
+@pytest.fixture
+def service(session_factory):
+    qdrant = QdrantService()
+    qdrant.client = QdrantClient(":memory:")
+    qdrant.is_available = True
+    qdrant.create_collections()
+    backfill = VectorBackfillService(
+        alumni_service=AlumniVectorService(qdrant),
+        student_service=StudentVectorService(qdrant),
+        session_factory=session_factory,
+        settle_seconds=0
+    )
+    service = ImportJobService(
+        engine=CsvImportEngine(chunk_size=2),
+        session_factory=session_factory,
+        backfill_service=backfill,
+        hasher_factory=lambda: BulkPasswordHasher(max_workers=1, rounds=4),
+        default_password="temp-pass"
+    )
+    return service
+
+
+def _wait(job, timeout=30):
+    deadline = time.monotonic() + timeout
+    while job['finished_at'] is None:
+        assert time.monotonic() < deadline, "import job did not finish"
+        time.sleep(0.02)
+    return job
+
+
+def test_alumni_rows_validated_per_column():
+    chunks = list(iter_alumni_csv(io.StringIO(ALUMNI_CSV), chunk_size=2))
+    errors = [error for chunk in chunks for error in chunk['errors']]
+    
+    assert [chunk['row_numbers'] for chunk in chunks] == [[2, 3], [5]]
+    assert chunks[0]['columns']['attendance'] == [90.0, 85.0]
+    assert chunks[0]['columns']['company_tier'] == [CompanyTierEnum.TIER1, CompanyTierEnum.TIER2]
+    assert chunks[1]['columns']['company_tier'] == [None]
+    assert len(errors) == 1 and errors[0]['row'] == 4 and errors[0]['name'] == "Bad Year"
+    for message in ("Invalid number for graduation_year", "gpa must be between 0.0 and 10.0",
+                    "company_tier must be one of", "Missing role_title (required if placed)",
+                    "project_count must be a whole number"):
+        assert message in errors[0]['error']
+
+
+def test_alumni_import_job_vectorizes_new_records(service):
+    job = _wait(service.start_import("alumni", io.BytesIO(ALUMNI_CSV.encode()), "alumni.csv"))
+    
+    assert job['status'] == 'completed', job.get('error')
+    assert job['progress']['rows'] == 4
+    assert (job['progress']['imported'], job['progress']['failed']) == (3, 1)
+    assert [error['row'] for error in job['errors']] == [4]
+    assert job['vectors'] == {'processed': 3, 'stored': 3, 'failed': 0}
+    
+    db = service.session_factory()
+    references = sorted(alumni.vector_id for alumni in db.query(Alumni))
+    assert references == [f"alumni_{i}@v1" for i in (1, 2, 3)]
+    db.close()
+
+
+def test_student_import_job(service):
+    job = _wait(service.start_import("students", io.BytesIO(STUDENTS_CSV.encode("utf-8-sig"))))
+    
+    assert job['status'] == 'completed', job.get('error')
+    assert (job['progress']['imported'], job['progress']['failed']) == (2, 1)
+    assert job['errors'][0]['error'] == "Duplicate email address in file"
+    assert job['vectors']['stored'] == 2
+    
+    db = service.session_factory()
+    assert all(student.vector_id for student in db.query(Student))
+    # Imported users get a bcrypt hash of the initial password
+    for user in db.query(User):
+        assert bcrypt.checkpw(b"temp-pass", user.password_hash.encode())
+    db.close()
+    
+    # Users imported before hashing (unusable placeholder hash) are refused, not an error
+    assert not verify_password("temp-pass", UNUSABLE_PASSWORD_HASH)
+
+
+def test_invalid_header_rejected_before_job(service):
+    with pytest.raises(ValueError, match="missing required columns: graduation_year"):
+        service.start_import("alumni", io.BytesIO(b"name,major,gpa,attendance,placement_status\n"))
+    with pytest.raises(ValueError):
+        service.start_import("courses", io.BytesIO(ALUMNI_CSV.encode()))
+    assert service.jobs == {}
+
+
+def test_alumni_reimport_vectorizes_changed_records_only(service):
+    _wait(service.start_import("alumni", io.BytesIO(ALUMNI_CSV.encode())))
+    changed = ALUMNI_CSV.replace("Priya Sharma,Computer Science,2023,7.8", "priya sharma,Computer Science,2023,8.1")
+    
+    job = _wait(service.start_import("alumni", io.BytesIO(changed.encode())))
+    
+    assert job['status'] == 'completed', job.get('error')
+    progress = job['progress']
+    assert (progress['imported'], progress['updated'], progress['skipped'], progress['failed']) == (0, 1, 2, 1)
+    assert job['vectors']['processed'] == 1
+    db = service.session_factory()
+    assert db.query(Alumni).count() == 3
+    assert float(db.query(Alumni).filter_by(name="priya sharma").one().gpa) == 8.1
+    db.close()
@@ -0,0 +1,112 @@
+"""
+Tests for the keyset pagination of list endpoints.
+
+Pages follow each other through cursors on (created_at/date, id) without
+gaps or repeats, filtered pages are index range scans, only the requested
+fields are selected and invalid cursors or fields are rejected. Uses an in-memory SQLite database.
+"""
+
+import json
+import sys
+from datetime import date, datetime
+from pathlib import Path
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from fastapi import HTTPException
+from sqlalchemy import event, update
+
+from app.models import Student, DailyLog, SkillAssessment
+from app.pagination import NEXT_CURSOR_HEADER, PageParams, keyset_page, paginate
+from app.routes.metrics import DailyLogSchema
+from app.routes.students import StudentResponse
+
+
+@pytest.fixture
+def db(db):
+    for i in range(7):
+        # Pairs of students share a creation time
+        db.add(Student(
+            name=f"Student {i}", major="Computer Science", gpa=7.0 + i / 10,
+            created_at=datetime(2026, 3, 1 + i // 2, 9, 30)
+        ))
+    for i in range(5):
+        db.add(DailyLog(student_id=1, date=date(2026, 4, 1 + i % 3), activity_description=f"Log {i}", mood_score=5))
+    db.add(DailyLog(student_id=2, date=date(2026, 4, 1), activity_description="Other", mood_score=5))
+    for i in range(3):
+        db.add(SkillAssessment(student_id=1, final_score=60.0 + i, created_at=datetime(2026, 4, 1 + i)))
+    db.commit()
+    # A legacy row without a creation time, as backfilled by the migration
+    db.execute(update(Student).where(Student.id == 7).values(created_at=datetime(1970, 1, 1)))
+    db.commit()
+    return db
+
+
+def _pages(db, model, fields, key, limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(db, model, fields, key, cursor, limit, **kwargs)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_pages_follow_key_order_without_gaps(db):
+    pages = _pages(db, Student, ['id', 'name'], ('created_at', 'id'), 3)
+    
+    assert [len(page) for page in pages] == [3, 3, 1]
+    # Backfilled creation times sort first
+    assert [row['id'] for page in pages for row in page] == [7, 1, 2, 3, 4, 5, 6]
+
+
+def test_descending_pages_with_filters(db):
+    pages = _pages(db, DailyLog, ['date', 'activity_description'], ('date', 'id'), 2,
+                   filters=[DailyLog.student_id == 1], descending=True)
+    
+    rows = [row for page in pages for row in page]
+    assert [row['activity_description'] for row in rows] == ["Log 2", "Log 4", "Log 1", "Log 3", "Log 0"]
+    assert set(rows[0]) == {'date', 'activity_description'}
+
+
+def test_filtered_page_is_an_index_range_scan(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append((args[2], args[3])))
+    _, cursor = keyset_page(db, SkillAssessment, ['final_score'], ('created_at', 'id'), None, 2,
+                            filters=[SkillAssessment.student_id == 1], descending=True)
+    rows, _ = keyset_page(db, SkillAssessment, ['final_score'], ('created_at', 'id'), cursor, 2,
+                          filters=[SkillAssessment.student_id == 1], descending=True)
+    assert [row['final_score'] for row in rows] == [60.0]
+    
+    sql, parameters = statements[-1]
+    plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters))
+    assert "ix_skill_assessments_student_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan, plan
+
+def test_only_requested_fields_selected(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    
+    response = paginate(db, Student, StudentResponse, ('created_at', 'id'), PageParams(None, 2, "gpa, name"))
+    
+    assert json.loads(response.body) == [{'name': "Student 6", 'gpa': 7.6}, {'name': "Student 0", 'gpa': 7.0}]
+    assert "students.major" not in statements[-1] and "LIMIT" in statements[-1]
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = paginate(db, Student, StudentResponse, ('created_at', 'id'), PageParams(cursor, 10, None))
+    assert [row['id'] for row in json.loads(response.body)] == [2, 3, 4, 5, 6]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_invalid_cursor_and_fields_rejected(db):
+    for params, message in (
+        (PageParams("not-a-cursor", 10, None), "Malformed cursor"),
+        (PageParams(None, 10, "date,password_hash"), "Unknown fields: password_hash"),
+    ):
+        with pytest.raises(HTTPException) as error:
+            paginate(db, DailyLog, DailyLogSchema, ('date', 'id'), params)
+        assert error.value.status_code == 400 and message in error.value.detail
+    
+    _, cursor = keyset_page(db, Student, ['id'], ('created_at', 'id'), None, 2)
+    with pytest.raises(HTTPException):
+        paginate(db, DailyLog, DailyLogSchema, ('id',), PageParams(cursor, 10, None))
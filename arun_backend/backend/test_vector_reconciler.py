@@ -0,0 +1,208 @@
+"""
+Tests for the PostgreSQL / Qdrant vector reconciler.
+
+Uses an in-memory Qdrant client and an in-memory SQLite database, so no
+running services are required.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from qdrant_client import QdrantClient
+
+from app.models import User, Student, Alumni, PlacementStatusEnum, CompanyTierEnum
+from app.services.qdrant_service import QdrantService
+from app.services.alumni_vector_service import AlumniVectorService
+from app.services.student_vector_service import StudentVectorService
+from app.services.vector_reconciler import (
+    RateLimiter,
+    VectorReconciler,
+    diff_sorted_streams,
+    is_point_stale
+)
+
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def qdrant():
+    """QdrantService backed by an in-memory client."""
+    service = QdrantService()
+    service.client = QdrantClient(":memory:")
+    service.is_available = True
+    service.create_collections()
+    return service
+
+
+@pytest.fixture
+def reconciler(qdrant, session_factory):
+    return VectorReconciler(
+        alumni_service=AlumniVectorService(qdrant_service=qdrant),
+        student_service=StudentVectorService(qdrant_service=qdrant),
+        session_factory=session_factory,
+        batch_size=2
+    )
+
+
+def _seed_and_vectorize(db, reconciler):
+    """Insert 5 alumni and 2 students and store all their vectors."""
+    alumni = []
+    for i in range(5):
+        record = Alumni(
+            name=f"Alumni {i}", major="Computer Science", graduation_year=2022,
+            gpa=6.0 + i, attendance=80, study_hours_per_week=20, project_count=i,
+            placement_status=PlacementStatusEnum.PLACED, company_tier=CompanyTierEnum.TIER1,
+            updated_at=T0
+        )
+        db.add(record)
+        alumni.append(record)
+    students = []
+    for i in range(2):
+        user = User(email=f"s{i}@test.edu", password_hash="x", role="student")
+        db.add(user)
+        db.flush()
+        student = Student(user_id=user.id, name=f"Student {i}", major="Computer Science",
+                          semester=5, gpa=8.0, attendance=90, updated_at=T0)
+        db.add(student)
+        students.append(student)
+    db.commit()
+    
+    for record in alumni:
+        assert reconciler.alumni_service.process_alumni_record(record, db)['vector_stored']
+    for student in students:
+        assert reconciler.student_service.process_student_record(student, db)['success']
+    return alumni, students
+
+
+# ============================================================================
+# SORTED MERGE
+# ============================================================================
+
+def test_diff_sorted_streams():
+    """One pass classifies missing, stale and orphaned ids."""
+    fresh = {'vector_version': 1, 'source_updated_at': T0.isoformat()}
+    rows = [(1, T0), (2, T0), (4, T0 + timedelta(minutes=1)), (6, T0)]
+    points = [(2, fresh), (3, fresh), (4, fresh), (6, {'vector_version': 2}), (7, fresh)]
+    
+    assert list(diff_sorted_streams(rows, points, version=1)) == [
+        ("missing", 1),
+        ("orphaned", 3),
+        ("stale", 4),
+        ("stale", 6),
+        ("orphaned", 7),
+    ]
+
+
+def test_diff_sorted_streams_empty_sides():
+    assert list(diff_sorted_streams([], [], 1)) == []
+    assert list(diff_sorted_streams([(1, T0)], [], 1)) == [("missing", 1)]
+    assert list(diff_sorted_streams([], [(1, {})], 1)) == [("orphaned", 1)]
+
+
+def test_is_point_stale():
+    payload = {'vector_version': 1, 'source_updated_at': T0.isoformat()}
+    assert not is_point_stale(T0, payload, 1)
+    assert not is_point_stale(T0 - timedelta(seconds=1), payload, 1)
+    assert is_point_stale(T0 + timedelta(seconds=1), payload, 1)
+    assert is_point_stale(T0, payload, 2)
+    assert is_point_stale(T0, {'vector_version': 1}, 1)
+    assert not is_point_stale(None, {'vector_version': 1}, 1)
+
+
+def test_rate_limiter_sleeps_off_deficit():
+    """Writes beyond the per-second budget wait for the bucket to refill."""
+    now = [0.0]
+    slept = []
+    
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+    
+    limiter = RateLimiter(10, clock=lambda: now[0], sleep=sleep)
+    assert limiter.acquire(10) == 0.0
+    assert limiter.acquire(5) == pytest.approx(0.5)
+    now[0] += 1.0
+    assert limiter.acquire(10) == 0.0
+    assert RateLimiter(None).acquire(10 ** 6) == 0.0
+    assert slept == [pytest.approx(0.5)]
+
+
+# ============================================================================
+# END TO END
+# ============================================================================
+
+def test_vector_reference_does_not_bump_updated_at(session_factory, reconciler):
+    """Recording vector_id must not make the row look newer than its vector."""
+    db = session_factory()
+    alumni, students = _seed_and_vectorize(db, reconciler)
+    
+    db.expire_all()
+    assert alumni[0].vector_id == "alumni_1@v1"
+    assert alumni[0].updated_at == T0
+    assert students[0].vector_id == "student_1@v1"
+    assert students[0].updated_at == T0
+
+
+def test_consistent_stores_report_no_drift(session_factory, reconciler):
+    db = session_factory()
+    _seed_and_vectorize(db, reconciler)
+    
+    report = reconciler.reconcile(dry_run=True)
+    for key, stats in report['collections'].items():
+        assert stats['missing'] == stats['stale'] == stats['orphaned'] == 0, key
+    assert report['collections']['alumni@v1']['postgres_rows'] == 5
+    assert report['collections']['alumni@v1']['qdrant_points'] == 5
+
+
+def test_dry_run_reports_then_repair_fixes(qdrant, session_factory, reconciler):
+    """Dry run changes nothing; a repair run leaves no drift behind."""
+    db = session_factory()
+    alumni, _ = _seed_and_vectorize(db, reconciler)
+    
+    # Drift: one point lost, one row edited, one point without a row
+    qdrant.delete_points("alumni", [alumni[1].id])
+    alumni[2].gpa = 9.9
+    db.commit()
+    assert alumni[2].updated_at > T0
+    qdrant.store_alumni_vector(999, np.ones(15), {'name': 'ghost'})
+    
+    dry = reconciler.reconcile(dry_run=True, collections=["alumni"])['collections']['alumni@v1']
+    assert (dry['missing'], dry['stale'], dry['orphaned']) == (1, 1, 1)
+    assert dry['samples'] == {'missing': [2], 'stale': [3], 'orphaned': [999]}
+    assert dry['repaired'] == dry['deleted'] == 0
+    assert qdrant.client.count("alumni").count == 5
+    
+    fixed = reconciler.reconcile(dry_run=False, collections=["alumni"])['collections']['alumni@v1']
+    assert (fixed['repaired'], fixed['deleted'], fixed['failed']) == (2, 1, 0)
+    
+    again = reconciler.reconcile(dry_run=True, collections=["alumni"])['collections']['alumni@v1']
+    assert (again['missing'], again['stale'], again['orphaned']) == (0, 0, 0)
+    
+    point = qdrant.client.retrieve("alumni", [alumni[2].id])[0]
+    db.expire_all()
+    assert datetime.fromisoformat(point.payload['source_updated_at']) == alumni[2].updated_at
+
+
+def test_failed_store_leaves_reference_unset(session_factory):
+    """Alumni whose vector could not be stored keep vector_id empty."""
+    unavailable = QdrantService()
+    unavailable.is_available = False
+    service = AlumniVectorService(qdrant_service=unavailable)
+    
+    db = session_factory()
+    record = Alumni(name="Offline", major="Computer Science", graduation_year=2022, gpa=7.0,
+                    attendance=80, placement_status=PlacementStatusEnum.NOT_PLACED)
+    db.add(record)
+    db.commit()
+    
+    result = service.process_alumni_record(record, db)
+    assert result['success']
+    assert not result['vector_stored']
+    assert record.vector_id is None
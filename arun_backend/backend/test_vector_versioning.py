@@ -0,0 +1,234 @@
+"""
+Tests for vector schema versioning and dual-write backfill.
+
+Uses an in-memory Qdrant client and an in-memory SQLite database, so no
+running services are required.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from qdrant_client import QdrantClient
+
+from app.models import User, Student, Alumni, PlacementStatusEnum, CompanyTierEnum
+from app.services import vector_schema
+from app.services.qdrant_service import QdrantService
+from app.services.alumni_vector_service import AlumniVectorService
+from app.services.student_vector_service import StudentVectorService
+from app.services.vector_backfill_service import VectorBackfillService
+from app.services.similarity_service import find_similar_alumni
+from app.services.vector_schema import (
+    versioned_collection_name,
+    parse_collection_version,
+    format_vector_id,
+    parse_vector_id,
+    generate_student_vector_for_version
+)
+
+
+def _double(vector_fn):
+    """Build a test generator that returns a 2x longer vector."""
+    def generator(*args, **kwargs):
+        vector = vector_fn(*args, **kwargs)
+        return np.concatenate([vector, vector])
+    return generator
+
+
+@pytest.fixture
+def schema_v2(monkeypatch):
+    """Register a temporary 30-dimensional schema version 2."""
+    monkeypatch.setitem(vector_schema.VECTOR_SCHEMAS, 2, {
+        'dimension': 30,
+        'description': 'test layout',
+        'student_generator': _double(vector_schema.generate_student_vector),
+        'alumni_generator': _double(vector_schema.generate_alumni_vector),
+    })
+
+
+@pytest.fixture
+def qdrant():
+    """QdrantService backed by an in-memory client."""
+    service = QdrantService()
+    service.client = QdrantClient(":memory:")
+    service.is_available = True
+    service.create_collections()
+    return service
+
+
+def _seed(db):
+    """Insert 3 alumni and 2 students."""
+    for i in range(3):
+        db.add(Alumni(
+            name=f"Alumni {i}", major="Computer Science", graduation_year=2022,
+            gpa=7.0 + i, attendance=80 + i, study_hours_per_week=20, project_count=i,
+            placement_status=PlacementStatusEnum.PLACED, company_tier=CompanyTierEnum.TIER2,
+            vector_id=f"alumni_{i + 1}"
+        ))
+    for i in range(2):
+        user = User(email=f"s{i}@test.edu", password_hash="x", role="student")
+        db.add(user)
+        db.flush()
+        db.add(Student(
+            user_id=user.id, name=f"Student {i}", major="Computer Science", semester=5,
+            gpa=8.0, attendance=90, study_hours_per_week=25, project_count=3
+        ))
+    db.commit()
+
+
+# ============================================================================
+# NAMING AND REGISTRY
+# ============================================================================
+
+def test_collection_names_round_trip():
+    """Version 1 keeps the legacy collection; later versions get a suffix."""
+    assert versioned_collection_name("alumni", 1) == "alumni"
+    assert versioned_collection_name("alumni", 2) == "alumni_v2"
+    assert parse_collection_version("alumni", "alumni") == 1
+    assert parse_collection_version("alumni", "alumni_v12") == 12
+    assert parse_collection_version("alumni", "students_v2") is None
+    assert parse_collection_version("alumni", "alumni_vx") is None
+
+
+def test_vector_id_round_trip():
+    """Versioned references parse back; legacy references are version 1."""
+    assert format_vector_id("alumni", 12, 2) == "alumni_12@v2"
+    assert parse_vector_id("alumni_12@v2") == ("alumni", 12, 2)
+    assert parse_vector_id("alumni_12") == ("alumni", 12, 1)
+    assert parse_vector_id("student_7@v1") == ("student", 7, 1)
+    assert parse_vector_id("alumni_x@v2") is None
+    assert parse_vector_id(None) is None
+
+
+def test_unknown_version_rejected():
+    """Unregistered versions raise ValueError."""
+    with pytest.raises(ValueError):
+        vector_schema.get_vector_schema(99)
+
+
+def test_v1_generator_is_15_dimensional():
+    """Version 1 matches the original 15-dimensional layout."""
+    vector = generate_student_vector_for_version(1, {'gpa': 8.0, 'attendance': 90})
+    assert vector.shape == (15,)
+
+
+# ============================================================================
+# QDRANT VERSION ROUTING
+# ============================================================================
+
+def test_default_active_version_is_legacy(qdrant):
+    """Without an alias, reads and writes use version 1."""
+    assert qdrant.get_active_version("alumni") == 1
+    assert qdrant.get_write_versions("alumni") == [1]
+
+
+def test_dual_write_once_new_collection_exists(qdrant, schema_v2, session_factory):
+    """Creating v2 collections makes writes go to both versions."""
+    assert qdrant.create_version_collections(2)
+    assert qdrant.get_write_versions("alumni") == [1, 2]
+    
+    db = session_factory()
+    alumni = Alumni(
+        id=5, name="Dual", major="Computer Science", graduation_year=2022,
+        gpa=8.0, attendance=90, placement_status=PlacementStatusEnum.NOT_PLACED
+    )
+    db.add(alumni)
+    db.commit()
+    
+    service = AlumniVectorService(qdrant_service=qdrant)
+    result = service.process_alumni_record(alumni, db)
+    assert result['success']
+    assert alumni.vector_id == "alumni_5@v1"
+    
+    for version, dim in ((1, 15), (2, 30)):
+        points = qdrant.client.retrieve(versioned_collection_name("alumni", version), [5], with_vectors=True)
+        assert len(points) == 1
+        assert len(points[0].vector) == dim
+        assert points[0].payload['vector_version'] == version
+
+
+def test_activate_version_flips_reads(qdrant, schema_v2):
+    """Activating v2 routes similarity queries to the v2 collection."""
+    qdrant.create_version_collections(2)
+    qdrant.store_alumni_vector(1, np.ones(15), {'name': 'v1'}, version=1)
+    qdrant.store_alumni_vector(1, np.ones(30), {'name': 'v2'}, version=2)
+    
+    assert find_similar_alumni(np.ones(15), qdrant)[0]['name'] == 'v1'
+    assert find_similar_alumni(np.ones(30), qdrant) == []
+    
+    assert qdrant.activate_version("alumni", 2)
+    assert qdrant.get_active_version("alumni") == 2
+    assert qdrant.get_write_versions("alumni") == [2, 1]
+    assert find_similar_alumni(np.ones(30), qdrant)[0]['name'] == 'v2'
+    
+    # Flipping back is also a single alias swap
+    assert qdrant.activate_version("alumni", 1)
+    assert find_similar_alumni(np.ones(15), qdrant)[0]['name'] == 'v1'
+
+
+# ============================================================================
+# BACKFILL
+# ============================================================================
+
+def test_backfill_builds_and_activates_new_version(qdrant, schema_v2, session_factory):
+    """A backfill fills v2 for every record, flips reads and updates references."""
+    db = session_factory()
+    _seed(db)
+    
+    backfill = VectorBackfillService(
+        alumni_service=AlumniVectorService(qdrant_service=qdrant),
+        student_service=StudentVectorService(qdrant_service=qdrant),
+        session_factory=session_factory,
+        settle_seconds=0
+    )
+    job = {
+        'job_id': 'test', 'target_version': 2, 'status': 'queued',
+        'activate': True, 'activated': False,
+        'progress': {base: {'processed': 0, 'stored': 0, 'failed': 0}
+                     for base in vector_schema.VECTOR_COLLECTIONS}
+    }
+    backfill.run_backfill(job)
+    
+    assert job['status'] == 'completed', job.get('error')
+    assert job['activated']
+    assert job['progress']['alumni'] == {'processed': 3, 'stored': 3, 'failed': 0}
+    assert job['progress']['students'] == {'processed': 2, 'stored': 2, 'failed': 0}
+    
+    assert qdrant.get_active_version("alumni") == 2
+    assert qdrant.get_active_version("students") == 2
+    assert qdrant.client.count("alumni_v2").count == 3
+    assert qdrant.client.count("students_v2").count == 2
+    
+    db.expire_all()
+    assert sorted(a.vector_id for a in db.query(Alumni)) == ["alumni_1@v2", "alumni_2@v2", "alumni_3@v2"]
+    assert sorted(s.vector_id for s in db.query(Student)) == ["student_1@v2", "student_2@v2"]
+
+
+def test_backfill_rejects_unknown_version(qdrant):
+    """Starting a backfill to an unregistered version fails fast."""
+    backfill = VectorBackfillService(
+        alumni_service=AlumniVectorService(qdrant_service=qdrant),
+        student_service=StudentVectorService(qdrant_service=qdrant),
+        settle_seconds=0
+    )
+    with pytest.raises(ValueError):
+        backfill.start_backfill(99)
+
+
+def test_availability_probes_the_server(qdrant, monkeypatch):
+    """is_available reflects whether Qdrant answers, re-checked after the TTL."""
+    unreachable = QdrantService(port=1)
+    assert not unreachable.is_available
+    
+    monkeypatch.setattr(QdrantService, "AVAILABILITY_TTL", 0.0)
+    assert qdrant.is_available
+    
+    def down():
+        raise ConnectionError("connection refused")
+    
+    monkeypatch.setattr(qdrant.client, "get_collections", down)
+    assert not qdrant.is_available
@@ -0,0 +1,97 @@
+"""
+Tests for the columnar wellbeing history.
+
+The month-partitioned store must return exactly what the SQL backend
+returns, including for months changed after their export. Uses an
+in-memory SQLite database and a temporary store directory.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.models import Student, DigitalWellbeingData
+from app.services.wellbeing_history import ColumnarHistoryStore, WellbeingHistory
+
+
+@pytest.fixture
+def db(db):
+    rng = np.random.default_rng(3)
+    for i in range(8):
+        student = Student(name=f"Student {i}", major="Computer Science")
+        db.add(student)
+        db.flush()
+        # Irregular history over ~4 months, some students sparse
+        for offset in sorted(rng.choice(120, size=10 + 5 * (i % 3), replace=False)):
+            db.add(DigitalWellbeingData(
+                student_id=student.id,
+                date=date(2026, 1, 10) + timedelta(days=int(offset)),
+                screen_time_hours=round(float(rng.uniform(2, 12)), 2),
+                social_media_hours=round(float(rng.uniform(0, 5)), 2),
+                focus_score=round(float(rng.uniform(0.2, 0.9)), 2) if offset % 4 else None,
+                sleep_duration_hours=round(float(rng.uniform(5, 9)), 1)
+            ))
+    db.commit()
+    return db
+
+
+def _assert_same(left, right):
+    assert left.keys() == right.keys()
+    for key in left:
+        np.testing.assert_array_equal(left[key], right[key])
+
+
+@pytest.fixture
+def stored(db, tmp_path):
+    history = WellbeingHistory(ColumnarHistoryStore(str(tmp_path)))
+    written = history.export(db)
+    assert sum(written.values()) == db.query(DigitalWellbeingData).count()
+    return history
+
+
+def test_load_matches_sql(db, stored):
+    sql = WellbeingHistory()
+    window = dict(student_ids=[2, 5, 7], start=date(2026, 2, 14), end=date(2026, 4, 3))
+    
+    _assert_same(stored.load(db, **window), sql.load(db, **window))
+    _assert_same(stored.load(db), sql.load(db))
+    
+    result = stored.load(db, student_ids=[3], metrics=('focus_score',))
+    assert set(result) == {'student_id', 'date', 'focus_score'}
+    assert np.isnan(result['focus_score']).any()
+
+
+def test_latest_matches_sql(db, stored):
+    sql = WellbeingHistory()
+    for count in (1, 7, 30):
+        _assert_same(stored.latest(db, [1, 4, 6, 99], count), sql.latest(db, [1, 4, 6, 99], count))
+    
+    latest = sql.latest(db, [1], 7)
+    assert len(latest['date']) == 7
+    assert np.all(np.diff(latest['date'].astype(np.int64)) < 0)
+
+
+def test_changed_month_is_read_from_sql(db, stored):
+    record = db.query(DigitalWellbeingData).filter(DigitalWellbeingData.date >= date(2026, 3, 1)).first()
+    record.screen_time_hours = 23.5
+    db.commit()
+    stored.invalidate(record.date)
+    
+    result = stored.load(db, student_ids=[record.student_id])
+    assert 23.5 in result['screen_time_hours']
+    _assert_same(result, WellbeingHistory().load(db, student_ids=[record.student_id]))
+    
+    assert stored.store.dirty_months() == [date(record.date.year, record.date.month, 1)]
+    stored.export(db, stored.store.dirty_months())
+    assert stored.store.dirty_months() == []
+    assert stored.store.is_current(date(record.date.year, record.date.month, 1))
+
+
+def test_unknown_metric_is_rejected(db):
+    with pytest.raises(ValueError):
+        WellbeingHistory().load(db, metrics=('heart_rate',))
@@ -0,0 +1,180 @@
+"""
+Tests for bulk wellbeing ingestion.
+
+A batch is written with one upsert statement, rejected as a whole when any
+entry is invalid, and leaves the derived data (features, rollups) the same
+as rebuilding it from the raw rows. Uses an in-memory SQLite database.
+"""
+
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import event
+
+from app.models import Student, DigitalWellbeingData, SleepQualityEnum
+from fastapi import BackgroundTasks
+from app.routes.metrics import (
+    DigitalWellbeingDaily,
+    WellbeingBulkSyncRequest,
+    regenerate_student_vectors,
+    sync_wellbeing,
+    sync_wellbeing_bulk
+)
+from app.services.feature_store import FeatureStore
+from app.services.wellbeing_ingest_service import WellbeingIngestError, WellbeingIngestService
+from app.services.wellbeing_rollup_service import WellbeingRollupService
+
+TODAY = date(2026, 4, 30)
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([Student(name=f"Student {i}", major="Computer Science", gpa=7.0) for i in range(3)])
+    db.commit()
+    return db
+
+
+def _entries(student_ids, days, rng):
+    return [
+        {
+            'student_id': student_id,
+            'date': day,
+            'screen_time_hours': round(float(rng.uniform(2, 12)), 2),
+            'educational_app_hours': round(float(rng.uniform(0, 3)), 2),
+            'social_media_hours': round(float(rng.uniform(0, 4)), 2),
+            'entertainment_hours': 1.0,
+            'productivity_hours': 0.5,
+            'communication_hours': 0.0,
+            'sleep_duration_hours': round(float(rng.uniform(5, 9)), 1),
+            'sleep_bedtime': None,
+            'sleep_wake_time': None,
+            'sleep_quality': 'good'
+        }
+        for student_id in student_ids
+        for day in days
+    ]
+
+
+def test_bulk_upsert_inserts_and_updates_in_one_statement(db):
+    rng = np.random.default_rng(1)
+    service = WellbeingIngestService()
+    week = [TODAY - timedelta(days=offset) for offset in range(7)]
+    service.ingest(db, _entries([1, 2], week[:3], rng), today=TODAY)
+    
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    entries = _entries([1, 2, 3], week, rng)
+    # Unset optional values keep what is stored
+    entries[0]['sleep_duration_hours'] = None
+    summary = service.ingest(db, entries, today=TODAY)
+    
+    assert summary == {'received': 21, 'inserted': 15, 'updated': 6, 'student_ids': [1, 2, 3]}
+    upserts = [sql for sql in statements if sql.startswith("INSERT INTO digital_wellbeing_data")]
+    assert len(upserts) == 1 and "ON CONFLICT" in upserts[0]
+    
+    assert db.query(DigitalWellbeingData).count() == 21
+    row = db.query(DigitalWellbeingData).filter_by(student_id=1, date=week[0]).one()
+    assert float(row.screen_time_hours) == entries[0]['screen_time_hours']
+    assert row.sleep_duration_hours is not None
+    assert row.sleep_quality == SleepQualityEnum.GOOD
+
+
+def test_invalid_batch_writes_nothing(db):
+    rng = np.random.default_rng(2)
+    entries = _entries([1, 99], [TODAY, TODAY + timedelta(days=1)], rng)
+    entries.append(dict(entries[0]))
+    
+    with pytest.raises(WellbeingIngestError) as error:
+        WellbeingIngestService().ingest(db, entries, today=TODAY)
+    
+    problems = {(item['index'], item['error']) for item in error.value.errors}
+    assert problems == {
+        (1, "Cannot add behavioral data for future dates"),
+        (2, "Unknown student"),
+        (3, "Unknown student"),
+        (3, "Cannot add behavioral data for future dates"),
+        (4, "Duplicate entry for this student and date"),
+    }
+    assert db.query(DigitalWellbeingData).count() == 0
+
+
+def test_derived_data_matches_rebuild(db):
+    rng = np.random.default_rng(3)
+    service = WellbeingIngestService()
+    days = [TODAY - timedelta(days=offset) for offset in range(20)]
+    # Out-of-order batches, the second one overlapping the first
+    service.ingest(db, _entries([1, 2], days[5:15], rng), today=TODAY)
+    service.ingest(db, _entries([1, 2, 3], days[:10], rng), today=TODAY)
+    
+    assert WellbeingRollupService().check_consistency(db)['consistent']
+    
+    store = FeatureStore()
+    incremental = store.get_features(db, [1, 2, 3])
+    store.rebuild(db)
+    rebuilt = store.get_features(db, [1, 2, 3])
+    for student_id in (1, 2, 3):
+        assert set(incremental[student_id]) == {'screen_time', 'social_media', 'sleep', 'focus'}
+        for metric, value in incremental[student_id].items():
+            assert rebuilt[student_id][metric] == pytest.approx(value)
+
+
+def test_derived_data_refreshed_once_per_batch(db):
+    """The derived stores commit once per ingest, not once per student."""
+    rng = np.random.default_rng(4)
+    service = WellbeingIngestService()
+    service.ingest(db, _entries([1, 2, 3], [TODAY - timedelta(days=2)], rng), today=TODAY)
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+    
+    service.ingest(db, _entries([1], [TODAY], rng), today=TODAY)
+    single = len(commits)
+    commits.clear()
+    service.ingest(db, _entries([1, 2, 3], [TODAY - timedelta(days=1)], rng), today=TODAY)
+    
+    assert len(commits) == single
+    assert WellbeingRollupService().check_consistency(db)['consistent']
+
+
+def test_single_day_sync_updates_instead_of_counting_twice(db):
+    def synced(screen_time):
+        return DigitalWellbeingDaily(
+            date=TODAY, total_screen_time=screen_time, educational_time=2.0, social_time=1.0,
+            entertainment_time=1.0, productivity_time=0.0, communication_time=0.5, sleep_hours=7.5,
+            sleep_schedule="regular", use_phone_while_studying=False, distraction_level=0.3,
+            mental_exhaustion=False, focus_score=0.0
+        )
+    
+    sync_wellbeing(synced(6.0), 1, db)
+    response = sync_wellbeing(synced(9.0), 1, db)
+    
+    row = db.query(DigitalWellbeingData).filter_by(student_id=1).one()
+    assert float(row.screen_time_hours) == 9.0 and float(row.sleep_duration_hours) == 7.5
+    assert response.focus_score == 0.5 and response.total_screen_time == 9.0
+    assert WellbeingRollupService().check_consistency(db)['consistent']
+    
+    store = FeatureStore()
+    incremental = store.get_features(db, [1])[1]
+    store.rebuild(db)
+    assert store.get_features(db, [1])[1] == pytest.approx(incremental)
+
+
+def test_bulk_sync_regenerates_vectors_after_responding(db):
+    """Vectors are queued as one batched background task, not built in the request."""
+    rng = np.random.default_rng(5)
+    request = WellbeingBulkSyncRequest(entries=_entries([1, 2], [TODAY - timedelta(days=1)], rng))
+    tasks = BackgroundTasks()
+    synced_at = datetime.utcnow()
+    
+    response = asyncio.run(sync_wellbeing_bulk(request, tasks, db))
+    
+    assert (response.received, response.inserted, response.students) == (2, 2, 2)
+    assert [(task.func, task.args) for task in tasks.tasks] == [(regenerate_student_vectors, ([1, 2],))]
+    # Marked as changed, so the reconciler repairs vectors the task fails to store
+    assert sorted(student.id for student in db.query(Student).filter(Student.updated_at >= synced_at)) == [1, 2]
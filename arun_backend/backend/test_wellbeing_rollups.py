@@ -0,0 +1,240 @@
+"""
+Tests for the daily/weekly wellbeing rollups.
+
+Rollups maintained one written day at a time must equal a backfill from
+the raw data, and the consistency check must catch rows that drifted.
+The insights analyses read them through a per-request loader.
+Uses an in-memory SQLite database.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import event
+
+from app.models import Student, DigitalWellbeingData, WellbeingBaseline, WellbeingRollup
+from app.services.behavioral_analysis_service import BehavioralAnalysisService, BehavioralDataLoader
+from app.services.feature_store import FeatureStore
+from app.services.wellbeing_rollup_service import (
+    WellbeingRollupService,
+    build_student_rollups,
+    rollup_columns,
+    week_start
+)
+
+
+def _add_day(db, student_id, day, rng):
+    db.add(DigitalWellbeingData(
+        student_id=student_id,
+        date=day,
+        screen_time_hours=round(float(rng.uniform(2, 11)), 2),
+        social_media_hours=round(float(rng.choice([0, rng.uniform(0.5, 5)])), 2),
+        focus_score=round(float(rng.uniform(0.3, 0.9)), 2),
+        sleep_duration_hours=round(float(rng.uniform(5, 9)), 1)
+    ))
+    db.commit()
+
+
+def _stored(db):
+    return {
+        (row.student_id, row.period, row.period_start): rollup_columns(row)
+        for row in db.query(WellbeingRollup)
+    }
+
+
+def test_week_rollup_matches_numpy():
+    days = [
+        (date(2026, 3, 2) + timedelta(days=offset), {
+            'screen_time': 4.0 + offset, 'social_media': None,
+            'focus_score': 0.5, 'sleep': 7.0 - offset / 2
+        })
+        for offset in (0, 2, 3, 6)
+    ]
+    week = next(r for r in build_student_rollups(days, half_life_days=7.0) if r['period'] == 'week')
+    
+    screen = np.array([4.0, 6.0, 7.0, 10.0])
+    weights = 0.5 ** (np.array([6, 4, 3, 0]) / 7.0)
+    assert week['period_start'] == date(2026, 3, 2)
+    assert week['screen_time_count'] == 4
+    assert week['screen_time_mean'] == pytest.approx(screen.mean())
+    assert (week['screen_time_min'], week['screen_time_max']) == (4.0, 10.0)
+    assert week['screen_time_decayed'] == pytest.approx(np.average(screen, weights=weights))
+    assert week['social_media_count'] == 0
+    assert week['social_media_decayed'] is None
+
+
+def test_decayed_mean_carries_across_weeks():
+    """The decayed mean of a week covers the whole history with halving weights."""
+    history = [(date(2026, 3, 2) + timedelta(days=offset), offset) for offset in range(0, 21, 2)]
+    days = [
+        (day, {'screen_time': float(value), 'social_media': None, 'focus_score': None, 'sleep': None})
+        for day, value in history
+    ]
+    last_week = [r for r in build_student_rollups(days, half_life_days=5.0) if r['period'] == 'week'][-1]
+    
+    end = last_week['period_start'] + timedelta(days=6)
+    values = np.array([value for _, value in history], dtype=float)
+    weights = 0.5 ** (np.array([(end - day).days for day, _ in history]) / 5.0)
+    assert last_week['screen_time_decayed'] == pytest.approx(np.average(values, weights=weights))
+
+
+def test_incremental_updates_match_backfill(db):
+    rng = np.random.default_rng(4)
+    service = WellbeingRollupService()
+    students = [Student(name=f"Student {i}", major="Computer Science") for i in range(3)]
+    db.add_all(students)
+    db.commit()
+    
+    # Days written out of order, including an older week after newer ones
+    start = date(2026, 3, 2)
+    for student in students:
+        for offset in rng.permutation(24)[:15]:
+            day = start + timedelta(days=int(offset))
+            _add_day(db, student.id, day, rng)
+            assert service.update_student_day(db, student.id, day)
+    
+    # Update one day and delete another
+    record = db.query(DigitalWellbeingData).filter_by(student_id=students[0].id).first()
+    record.sleep_duration_hours = 4.5
+    db.commit()
+    assert service.update_student_day(db, students[0].id, record.date)
+    
+    removed = db.query(DigitalWellbeingData).filter_by(student_id=students[1].id).first()
+    db.delete(removed)
+    db.commit()
+    assert service.update_student_day(db, students[1].id, removed.date)
+    
+    incremental = _stored(db)
+    assert service.check_consistency(db)['consistent']
+    
+    summary = service.backfill(db)
+    assert summary == {'students': 3, 'rows': len(incremental)}
+    backfilled = _stored(db)
+    
+    assert incremental.keys() == backfilled.keys()
+    for key, columns in backfilled.items():
+        for name, value in columns.items():
+            assert incremental[key][name] == pytest.approx(value), (key, name)
+
+
+def test_consistency_check_reports_drift(db):
+    rng = np.random.default_rng(6)
+    service = WellbeingRollupService()
+    student = Student(name="Student", major="Computer Science")
+    db.add(student)
+    db.commit()
+    for offset in range(10):
+        _add_day(db, student.id, date(2026, 3, 2) + timedelta(days=offset), rng)
+    service.backfill(db)
+    
+    week = db.query(WellbeingRollup).filter_by(period='week').first()
+    week.sleep_max = 99.0
+    db.delete(db.query(WellbeingRollup).filter_by(period='day').first())
+    db.add(WellbeingRollup(student_id=student.id, period='day', period_start=date(2025, 1, 1)))
+    db.commit()
+    
+    report = service.check_consistency(db)
+    problems = {(m['period'], m['period_start']): m['problem'] for m in report['mismatches']}
+    assert not report['consistent']
+    assert report['mismatch_count'] == 3
+    assert problems[('week', week.period_start)] == "differs: sleep_max"
+    assert problems[('day', date(2026, 3, 2))] == 'missing'
+    assert problems[('day', date(2025, 1, 1))] == 'no raw data'
+    
+    service.backfill(db, student_ids=[student.id])
+    assert service.check_consistency(db)['consistent']
+
+
+def test_comparison_reads_latest_week_rollup(db):
+    rng = np.random.default_rng(8)
+    service = WellbeingRollupService()
+    student = Student(name="Student", major="Computer Science")
+    db.add(student)
+    db.commit()
+    
+    today = date.today()
+    for offset in range(5):
+        _add_day(db, student.id, today - timedelta(days=offset), rng)
+        service.update_student_day(db, student.id, today - timedelta(days=offset))
+    
+    optimal = BehavioralAnalysisService()._get_default_optimal_ranges()
+    comparison = BehavioralAnalysisService().compare_to_successful_alumni(student, db, optimal)
+    
+    latest = service.get_latest_week(db, student.id)
+    assert latest.period_start == week_start(today)
+    assert comparison['sleep']['student'] == round(latest.sleep_decayed, 1)
+    assert comparison['focus_score']['optimal'] == optimal['focus_score']['median']
+
+
+def test_comparison_falls_back_to_features_without_recent_rollup(db):
+    """Old days only, or only a survey baseline: decayed features instead of nothing."""
+    rng = np.random.default_rng(9)
+    lapsed = Student(name="Lapsed", major="Computer Science")
+    surveyed = Student(name="Surveyed", major="Computer Science")
+    db.add_all([lapsed, surveyed])
+    db.commit()
+    
+    old_days = [date.today() - timedelta(days=30 + offset) for offset in range(3)]
+    for day in old_days:
+        _add_day(db, lapsed.id, day, rng)
+    WellbeingRollupService().update_student_days(db, lapsed.id, old_days)
+    FeatureStore().rebuild(db)
+    db.add(WellbeingBaseline(student_id=surveyed.id, reported_on=date.today(), screen_time_hours=9.5,
+                             educational_app_hours=1.0, social_media_hours=3.0, sleep_duration_hours=6.5))
+    db.commit()
+    
+    service = BehavioralAnalysisService()
+    optimal = service._get_default_optimal_ranges()
+    for student in (lapsed, surveyed):
+        features = FeatureStore().get_features(db, [student.id])[student.id]
+        comparison = service.compare_to_successful_alumni(student, db, optimal)
+        assert comparison['screen_time']['student'] == round(features['screen_time'], 1)
+        assert comparison['sleep']['student'] == round(features['sleep'], 1)
+        assert comparison['focus_score']['student'] == round(features['focus'], 2)
+    assert comparison['sleep']['student'] == 6.5
+
+
+def _count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def _insights(db, student):
+    """The analyses of /behavioral/insights sharing one loader."""
+    service = BehavioralAnalysisService()
+    loader = BehavioralDataLoader(db, student, service)
+    correlations = loader.correlations()
+    flags = service.identify_at_risk_patterns(student, db, loader=loader)
+    comparison = service.compare_to_successful_alumni(student, db, correlations['optimal_ranges'], loader=loader)
+    return flags, comparison
+
+
+@pytest.mark.parametrize("population", [5, 40])
+def test_insights_query_count_is_constant(db, population):
+    rng = np.random.default_rng(10)
+    rollups = WellbeingRollupService()
+    students = [Student(name=f"Student {i}", major="Computer Science", gpa=7.5) for i in range(population)]
+    db.add_all(students)
+    db.commit()
+    today = date.today()
+    for student in students:
+        for offset in range(3):
+            _add_day(db, student.id, today - timedelta(days=offset), rng)
+    rollups.backfill(db)
+    
+    # Build the correlation statistics as the analytics job would have
+    BehavioralAnalysisService().refresh_correlations(db)
+    
+    statements = _count_statements(db)
+    flags, comparison = _insights(db, students[0])
+    
+    assert set(comparison) == {'screen_time', 'focus_score', 'sleep'}
+    assert len(statements) == 5
+    assert sum('digital_wellbeing_data' in sql for sql in statements) == 1